@@ -2,32 +2,33 @@
 
 A sophisticated cryptocurrency arbitrage system designed to identify and execute
 profitable trading opportunities across decentralized exchanges (DEXs).
-"""
 
-import logging
+Exported components are imported on first access, so importing the package
+(or a light submodule such as ``arbitrage_bot.utils.telemetry``) does not
+pull in web3 and the arbitrage subsystems. Logging is configured by the
+entry points.
+"""
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from typing import TYPE_CHECKING
 
-from .core.arbitrage import (
-    DiscoveryManager,
-    EnhancedExecutionManager,
-    AnalyticsManager,
-    BaseArbitrageSystem,
-)
+from .utils.lazy_import import lazy_exports
 
-# from .core.ml import MLSystem # Removed as ml directory was deleted
-from .core.web3 import Web3Manager
-from .core.flashbots import FlashbotsProvider
-from .core.market import EnhancedMarketDataProvider
-from .core.memory import MemoryManager
-from .utils.async_manager import (
-    async_init,
-    manager as async_manager,
-    run_with_async_context,
-)
+if TYPE_CHECKING:
+    from .core.arbitrage import (
+        DiscoveryManager,
+        EnhancedExecutionManager,
+        AnalyticsManager,
+        BaseArbitrageSystem,
+    )
+    from .core.web3 import Web3Manager
+    from .core.flashbots import FlashbotsProvider
+    from .core.market import EnhancedMarketDataProvider
+    from .core.memory import MemoryManager
+    from .utils.async_manager import (
+        async_init,
+        manager as async_manager,
+        run_with_async_context,
+    )
 
 __version__ = "0.1.0"
 __all__ = [
@@ -49,3 +50,21 @@
     # Version
     "__version__",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseArbitrageSystem": ".core.arbitrage",
+        "DiscoveryManager": ".core.arbitrage",
+        "EnhancedExecutionManager": ".core.arbitrage",
+        "AnalyticsManager": ".core.arbitrage",
+        "EnhancedMarketDataProvider": ".core.market",
+        "Web3Manager": ".core.web3",
+        "FlashbotsProvider": ".core.flashbots",
+        "MemoryManager": ".core.memory",
+        "async_init": ".utils.async_manager",
+        "async_manager": ".utils.async_manager:manager",
+        "run_with_async_context": ".utils.async_manager",
+    },
+)
+
@@ -4,13 +4,18 @@
 and arbitrage system implementations.
 """
 
-from .errors import Web3Error
-from .arbitrage import (
-    DiscoveryManager,
-    ExecutionManager,
-    AnalyticsManager,
-    MarketDataProvider,
-)
+from typing import TYPE_CHECKING
+
+from ..utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .errors import Web3Error
+    from .arbitrage import (
+        DiscoveryManager,
+        ExecutionManager,
+        AnalyticsManager,
+        MarketDataProvider,
+    )
 
 __all__ = [
     "Web3Error",
@@ -19,3 +24,14 @@
     "AnalyticsManager",
     "MarketDataProvider",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Web3Error": ".errors",
+        "DiscoveryManager": ".arbitrage",
+        "ExecutionManager": ".arbitrage",
+        "AnalyticsManager": ".arbitrage",
+        "MarketDataProvider": ".arbitrage",
+    },
+)
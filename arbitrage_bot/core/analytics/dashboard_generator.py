@@ -117,7 +117,7 @@ async def generate_profit_dashboard(self, timeframe: str = "7d") -> Dict[str, An
 
         async with self.lock:
             # Get profit data
-            profit_summary = await self.profit_tracker.get_profit_summary()
+            profit_summary = await self.profit_tracker.get_timeframe_summary(timeframe)
             profit_time_series = await self.profit_tracker.get_profit_time_series(
                 timeframe=timeframe, interval="1h"
             )
@@ -129,7 +129,7 @@ async def generate_profit_dashboard(self, timeframe: str = "7d") -> Dict[str, An
             # Prepare dashboard data
             dashboard_data = {
                 "timeframe": timeframe,
-                "summary": profit_summary.get(timeframe, {}),
+                "summary": profit_summary,
                 "time_series": profit_time_series,
                 "top_token_pairs": top_token_pairs,
                 "roi": roi_data,
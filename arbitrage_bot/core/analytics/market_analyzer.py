@@ -12,11 +12,17 @@
 from datetime import datetime, timedelta
 import json
 import os
+from bisect import bisect_left, insort
 import numpy as np
+
+from .trade_store import TradeStore, get_trade_store
 # from pathlib import Path # Removed unused import
 
 logger = logging.getLogger(__name__)
 
+# Store stream name -> primary numeric field of its samples
+STREAM_FIELDS = {"price": "price", "liquidity": "liquidity", "volume": "volume"}
+
 
 class MarketAnalyzer:
     """
@@ -48,6 +54,10 @@ def __init__(self, config: Optional[Dict[str, Any]] = None):
         # Storage paths
         self.storage_dir = self.config.get("storage_dir", "analytics")
         self.market_data_file = os.path.join(self.storage_dir, "market_data.json")
+        self.store: Optional[TradeStore] = None
+
+        # Samples older than this are dropped from memory and storage
+        self.history_retention = timedelta(days=int(self.config.get("history_days", 90)))
 
         # Analysis settings
         self.trend_detection_window = int(
@@ -71,6 +81,7 @@ async def initialize(self) -> bool:
         try:
             # Create storage directory if it doesn't exist
             os.makedirs(self.storage_dir, exist_ok=True)
+            self.store = get_trade_store(self.storage_dir)
 
             # Load historical data if available
             await self._load_historical_data()
@@ -86,105 +97,83 @@ async def initialize(self) -> bool:
     async def _load_historical_data(self) -> None:
         """Load historical market data from storage."""
         try:
-            if os.path.exists(self.market_data_file):
-                async with self.lock:
+            async with self.lock:
+                # Move a legacy JSON history into the store once
+                if os.path.exists(self.market_data_file):
                     with open(self.market_data_file, "r") as f:
                         data = json.load(f)
-
-                    # Process price history
-                    if "price_history" in data:
-                        for token, history in data["price_history"].items():
-                            # Convert string timestamps to datetime objects
-                            for entry in history:
-                                if "timestamp" in entry:
-                                    entry["timestamp"] = datetime.fromisoformat(
-                                        entry["timestamp"]
-                                    )
-                            self._price_history[token] = history
-
-                    # Process liquidity history
-                    if "liquidity_history" in data:
-                        for token, history in data["liquidity_history"].items():
-                            # Convert string timestamps to datetime objects
-                            for entry in history:
-                                if "timestamp" in entry:
-                                    entry["timestamp"] = datetime.fromisoformat(
-                                        entry["timestamp"]
-                                    )
-                            self._liquidity_history[token] = history
-
-                    # Process volume history
-                    if "volume_history" in data:
-                        for token, history in data["volume_history"].items():
-                            # Convert string timestamps to datetime objects
-                            for entry in history:
-                                if "timestamp" in entry:
-                                    entry["timestamp"] = datetime.fromisoformat(
-                                        entry["timestamp"]
-                                    )
-                            self._volume_history[token] = history
-
-                    logger.info(
-                        f"Loaded market data for {len(self._price_history)} tokens"
+                    await self.store.import_legacy_async(
+                        self.market_data_file,
+                        {
+                            stream: [
+                                (
+                                    {**entry, "token": token},
+                                    {"key": token, "value": entry.get(field)},
+                                )
+                                for token, history in data.get(
+                                    f"{stream}_history", {}
+                                ).items()
+                                for entry in history
+                            ]
+                            for stream, field in STREAM_FIELDS.items()
+                        },
                     )
-            else:
-                logger.info("No historical market data found")
+
+                cutoff = datetime.utcnow() - self.history_retention
+                for stream, history in self._histories().items():
+                    history.clear()
+                    for _, entry in await self.store.scan_async(stream, start=cutoff):
+                        history.setdefault(entry.get("token"), []).append(entry)
+
+                logger.info(
+                    f"Loaded market data for {len(self._price_history)} tokens"
+                )
         except Exception as e:
             logger.error(f"Error loading historical market data: {e}")
 
-    async def _save_historical_data(self) -> None:
-        """Save historical market data to storage."""
-        try:
-            async with self.lock:
-                # Prepare data for serialization
-                data = {
-                    "price_history": {},
-                    "liquidity_history": {},
-                    "volume_history": {},
-                }
+    def _histories(self) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """In-memory history for each stream."""
+        return {
+            "price": self._price_history,
+            "liquidity": self._liquidity_history,
+            "volume": self._volume_history,
+        }
+
+    def _record_sample(
+        self, stream: str, token_address: str, sample: Dict[str, Any]
+    ) -> None:
+        """
+        Add a sample to memory and storage in constant time.
+
+        Samples are kept sorted by timestamp (in-order arrivals are a plain
+        append) and those older than the retention window are trimmed.
+        """
+        history = self._histories()[stream].setdefault(token_address, [])
+        timestamp = sample.get("timestamp", datetime.min)
+
+        if not history or history[-1].get("timestamp", datetime.min) <= timestamp:
+            history.append(sample)
+        else:
+            insort(history, sample, key=lambda x: x.get("timestamp", datetime.min))
 
-                # Process price history
-                for token, history in self._price_history.items():
-                    serialized_history = []
-                    for entry in history:
-                        entry_copy = entry.copy()
-                        if isinstance(entry_copy.get("timestamp"), datetime):
-                            entry_copy["timestamp"] = entry_copy[
-                                "timestamp"
-                            ].isoformat()
-                        serialized_history.append(entry_copy)
-                    data["price_history"][token] = serialized_history
-
-                # Process liquidity history
-                for token, history in self._liquidity_history.items():
-                    serialized_history = []
-                    for entry in history:
-                        entry_copy = entry.copy()
-                        if isinstance(entry_copy.get("timestamp"), datetime):
-                            entry_copy["timestamp"] = entry_copy[
-                                "timestamp"
-                            ].isoformat()
-                        serialized_history.append(entry_copy)
-                    data["liquidity_history"][token] = serialized_history
-
-                # Process volume history
-                for token, history in self._volume_history.items():
-                    serialized_history = []
-                    for entry in history:
-                        entry_copy = entry.copy()
-                        if isinstance(entry_copy.get("timestamp"), datetime):
-                            entry_copy["timestamp"] = entry_copy[
-                                "timestamp"
-                            ].isoformat()
-                        serialized_history.append(entry_copy)
-                    data["volume_history"][token] = serialized_history
-
-                with open(self.market_data_file, "w") as f:
-                    json.dump(data, f, indent=2)
-
-                logger.info(f"Saved market data for {len(self._price_history)} tokens")
+        # Trim expired samples from the front
+        cutoff = datetime.utcnow() - self.history_retention
+        if history[0].get("timestamp", datetime.min) < cutoff:
+            expired = bisect_left(
+                history, cutoff, key=lambda x: x.get("timestamp", datetime.min)
+            )
+            del history[:expired]
+            self.store.prune(stream, cutoff, key=token_address)
+
+        try:
+            self.store.append(
+                stream,
+                {**sample, "token": token_address},
+                key=token_address,
+                value=sample.get(STREAM_FIELDS[stream]),
+            )
         except Exception as e:
-            logger.error(f"Error saving historical market data: {e}")
+            logger.error(f"Error saving {stream} sample: {e}")
 
     async def track_price(self, token_address: str, price_data: Dict[str, Any]) -> None:
         """
@@ -209,32 +198,11 @@ async def track_price(self, token_address: str, price_data: Dict[str, Any]) -> N
             price_data["timestamp"] = datetime.utcnow()
 
         async with self.lock:
-            # Initialize price history for token if not exists
-            if token_address not in self._price_history:
-                self._price_history[token_address] = []
-
-            # Add price data
-            self._price_history[token_address].append(price_data)
-
-            # Sort by timestamp
-            self._price_history[token_address].sort(
-                key=lambda x: x.get("timestamp", datetime.min)
-            )
-
-            # Limit history size (keep last 90 days)
-            cutoff = datetime.utcnow() - timedelta(days=90)
-            self._price_history[token_address] = [
-                entry
-                for entry in self._price_history[token_address]
-                if entry.get("timestamp", datetime.utcnow()) >= cutoff
-            ]
+            self._record_sample("price", token_address, price_data)
 
             # Invalidate cache
             self._cached_analysis = {}
 
-            # Save to storage
-            await self._save_historical_data()
-
     async def track_liquidity(
         self, token_address: str, liquidity_data: Dict[str, Any]
     ) -> None:
@@ -261,32 +229,11 @@ async def track_liquidity(
             liquidity_data["timestamp"] = datetime.utcnow()
 
         async with self.lock:
-            # Initialize liquidity history for token if not exists
-            if token_address not in self._liquidity_history:
-                self._liquidity_history[token_address] = []
-
-            # Add liquidity data
-            self._liquidity_history[token_address].append(liquidity_data)
-
-            # Sort by timestamp
-            self._liquidity_history[token_address].sort(
-                key=lambda x: x.get("timestamp", datetime.min)
-            )
-
-            # Limit history size (keep last 90 days)
-            cutoff = datetime.utcnow() - timedelta(days=90)
-            self._liquidity_history[token_address] = [
-                entry
-                for entry in self._liquidity_history[token_address]
-                if entry.get("timestamp", datetime.utcnow()) >= cutoff
-            ]
+            self._record_sample("liquidity", token_address, liquidity_data)
 
             # Invalidate cache
             self._cached_analysis = {}
 
-            # Save to storage
-            await self._save_historical_data()
-
     async def track_volume(
         self, token_address: str, volume_data: Dict[str, Any]
     ) -> None:
@@ -313,32 +260,11 @@ async def track_volume(
             volume_data["timestamp"] = datetime.utcnow()
 
         async with self.lock:
-            # Initialize volume history for token if not exists
-            if token_address not in self._volume_history:
-                self._volume_history[token_address] = []
-
-            # Add volume data
-            self._volume_history[token_address].append(volume_data)
-
-            # Sort by timestamp
-            self._volume_history[token_address].sort(
-                key=lambda x: x.get("timestamp", datetime.min)
-            )
-
-            # Limit history size (keep last 90 days)
-            cutoff = datetime.utcnow() - timedelta(days=90)
-            self._volume_history[token_address] = [
-                entry
-                for entry in self._volume_history[token_address]
-                if entry.get("timestamp", datetime.utcnow()) >= cutoff
-            ]
+            self._record_sample("volume", token_address, volume_data)
 
             # Invalidate cache
             self._cached_analysis = {}
 
-            # Save to storage
-            await self._save_historical_data()
-
     async def detect_market_trend(
         self, token_address: str, timeframe: str = "24h"
     ) -> Dict[str, Any]:
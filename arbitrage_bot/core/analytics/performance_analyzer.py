@@ -7,6 +7,7 @@
 import logging
 import asyncio
 import math
+import time
 from typing import Dict, Any, Optional, List, Tuple
 # from decimal import Decimal # Removed unused import
 from datetime import datetime, timedelta
@@ -15,8 +16,21 @@
 import numpy as np
 # from pathlib import Path # Removed unused import
 
+from .rolling_aggregates import RollingAggregator, Sample, SlidingWindow
+from .trade_store import TradeStore, get_trade_store, to_epoch
+
 logger = logging.getLogger(__name__)
 
+# Rolling timeframes and their spans in seconds (None for all time)
+TIMEFRAMES = {
+    "1d": 24 * 3600,
+    "7d": 7 * 24 * 3600,
+    "30d": 30 * 24 * 3600,
+    "90d": 90 * 24 * 3600,
+    "1y": 365 * 24 * 3600,
+    "all": None,
+}
+
 
 class PerformanceAnalyzer:
     """
@@ -40,10 +54,12 @@ def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.initialized = False
         self.lock = asyncio.Lock()
 
-        # Storage for performance data
-        self._performance_history = []
+        # Storage for performance data; the entries themselves stay in the store
         self._benchmark_data = {}
-        self._drawdown_history = {}
+        self._last_entry: Optional[Tuple[float, float, float]] = None  # ts, value, peak
+
+        # Incremental aggregates per timeframe (returns, P&L, drawdowns)
+        self._aggregates = RollingAggregator(TIMEFRAMES, tiers={})
 
         # Storage paths
         self.storage_dir = self.config.get("storage_dir", "analytics")
@@ -51,6 +67,7 @@ def __init__(self, config: Optional[Dict[str, Any]] = None):
             self.storage_dir, "performance_history.json"
         )
         self.benchmark_file = os.path.join(self.storage_dir, "benchmark_data.json")
+        self.store: Optional[TradeStore] = None
 
         # Risk-free rate for Sharpe ratio calculation (default: 2%)
         self.risk_free_rate = float(self.config.get("risk_free_rate", 0.02))
@@ -69,6 +86,7 @@ async def initialize(self) -> bool:
         try:
             # Create storage directory if it doesn't exist
             os.makedirs(self.storage_dir, exist_ok=True)
+            self.store = get_trade_store(self.storage_dir)
 
             # Load historical data if available
             await self._load_historical_data()
@@ -85,22 +103,26 @@ async def _load_historical_data(self) -> None:
         """Load historical performance data from storage."""
         try:
             # Load performance history
-            if os.path.exists(self.performance_file):
-                async with self.lock:
+            async with self.lock:
+                # Move a legacy JSON history into the store once
+                if os.path.exists(self.performance_file):
                     with open(self.performance_file, "r") as f:
                         data = json.load(f)
+                    await self.store.import_legacy_async(
+                        self.performance_file,
+                        {
+                            "performance": [
+                                (entry, self._columns(entry)) for entry in data
+                            ]
+                        },
+                    )
 
-                    # Convert string timestamps back to datetime objects
-                    for entry in data:
-                        if "timestamp" in entry:
-                            entry["timestamp"] = datetime.fromisoformat(
-                                entry["timestamp"]
-                            )
+                loaded = await self._rebuild_aggregates()
 
-                    self._performance_history = data
-                    logger.info(f"Loaded {len(data)} historical performance entries")
-            else:
-                logger.info("No historical performance data found")
+                if loaded:
+                    logger.info(f"Loaded {loaded} historical performance entries")
+                else:
+                    logger.info("No historical performance data found")
 
             # Load benchmark data
             if os.path.exists(self.benchmark_file):
@@ -116,34 +138,24 @@ async def _load_historical_data(self) -> None:
         except Exception as e:
             logger.error(f"Error loading historical performance data: {e}")
 
-    async def _save_historical_data(self) -> None:
-        """Save historical performance data to storage."""
+    @staticmethod
+    def _columns(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Typed store columns for a performance entry."""
+        return {
+            "value": entry.get("profit_loss"),
+            "amount": entry.get("portfolio_value"),
+            "cost": entry.get("gas_cost"),
+        }
+
+    def _save_benchmark_data(self) -> None:
+        """Save benchmark data to storage (caller holds the lock)."""
         try:
-            # Save performance history
-            async with self.lock:
-                # Convert datetime objects to ISO format strings for JSON serialization
-                data_to_save = []
-                for entry in self._performance_history:
-                    entry_copy = entry.copy()
-                    if isinstance(entry_copy.get("timestamp"), datetime):
-                        entry_copy["timestamp"] = entry_copy["timestamp"].isoformat()
-                    data_to_save.append(entry_copy)
-
-                with open(self.performance_file, "w") as f:
-                    json.dump(data_to_save, f, indent=2)
-
-                logger.info(
-                    f"Saved {len(data_to_save)} performance entries to {self.performance_file}"
-                )
-
-            # Save benchmark data
-            async with self.lock:
-                with open(self.benchmark_file, "w") as f:
-                    json.dump(self._benchmark_data, f, indent=2)
-                logger.info(f"Saved benchmark data to {self.benchmark_file}")
+            with open(self.benchmark_file, "w") as f:
+                json.dump(self._benchmark_data, f, indent=2)
+            logger.info(f"Saved benchmark data to {self.benchmark_file}")
 
         except Exception as e:
-            logger.error(f"Error saving historical performance data: {e}")
+            logger.error(f"Error saving benchmark data: {e}")
 
     async def track_performance(self, performance_data: Dict[str, Any]) -> None:
         """
@@ -170,60 +182,81 @@ async def track_performance(self, performance_data: Dict[str, Any]) -> None:
         if "timestamp" not in performance_data:
             performance_data["timestamp"] = datetime.utcnow()
 
-        async with self.lock:
-            # Add to performance history
-            self._performance_history.append(performance_data)
-
-            # Update drawdown history
-            await self._update_drawdown_history()
+        timestamp = to_epoch(performance_data["timestamp"])
 
-            # Save to storage
-            await self._save_historical_data()
+        async with self.lock:
+            # Append to storage
+            try:
+                self.store.append(
+                    "performance", performance_data, **self._columns(performance_data)
+                )
+            except Exception as e:
+                logger.error(f"Error saving performance entry: {e}")
+
+            if self._last_entry is None or timestamp >= self._last_entry[0]:
+                self._aggregate_entry(
+                    timestamp,
+                    float(performance_data.get("portfolio_value", 0)),
+                    float(performance_data.get("profit_loss", 0)),
+                    float(performance_data.get("gas_cost", 0) or 0),
+                )
+            else:
+                # Out of order: rebuild from the store, which now holds the entry
+                await self._rebuild_aggregates()
 
-    async def _update_drawdown_history(self) -> None:
-        """Update drawdown history based on performance data."""
-        if not self._performance_history:
-            return
+    async def _rebuild_aggregates(self) -> int:
+        """
+        Rebuild the rolling aggregates from the stored performance columns.
 
+        Returns:
+            Number of performance entries folded into the aggregates
+        """
         try:
-            # Sort by timestamp
-            sorted_history = sorted(
-                self._performance_history,
-                key=lambda x: x.get("timestamp", datetime.min),
+            columns = await self.store.columns_async(
+                "performance", ("ts", "value", "amount", "cost")
             )
-
-            # Calculate running maximum and drawdowns
-            running_max = float(sorted_history[0].get("portfolio_value", 0))
-            drawdowns = []
-
-            for entry in sorted_history:
-                value = float(entry.get("portfolio_value", 0))
-                timestamp = entry.get("timestamp", datetime.min)
-
-                # Update running maximum
-                running_max = max(running_max, value)
-
-                # Calculate drawdown
-                drawdown = (running_max - value) / running_max if running_max > 0 else 0
-
-                drawdowns.append(
-                    {
-                        "timestamp": timestamp,
-                        "portfolio_value": value,
-                        "peak_value": running_max,
-                        "drawdown": drawdown,
-                    }
+            profit_loss = np.nan_to_num(columns["value"])
+            portfolio_values = np.nan_to_num(columns["amount"])
+            gas_costs = np.nan_to_num(columns["cost"])
+
+            self._aggregates.clear()
+            self._last_entry = None
+            for i, timestamp in enumerate(columns["ts"]):
+                self._aggregate_entry(
+                    float(timestamp),
+                    float(portfolio_values[i]),
+                    float(profit_loss[i]),
+                    float(gas_costs[i]),
                 )
-
-            self._drawdown_history = {
-                "drawdowns": drawdowns,
-                "max_drawdown": (
-                    max(d.get("drawdown", 0) for d in drawdowns) if drawdowns else 0
-                ),
-            }
+            return len(columns["ts"])
 
         except Exception as e:
-            logger.error(f"Error updating drawdown history: {e}")
+            logger.error(f"Error rebuilding performance aggregates: {e}")
+            return 0
+
+    def _aggregate_entry(
+        self, timestamp: float, value: float, profit_loss: float, gas_cost: float
+    ) -> None:
+        """Fold one entry, in time order, into the rolling aggregates."""
+        previous = self._last_entry
+        running_max = max(previous[2], value) if previous else value
+        drawdown = (running_max - value) / running_max if running_max > 0 else 0
+
+        self._aggregates.add(
+            Sample(
+                timestamp=timestamp,
+                value=profit_loss,
+                cost=gas_cost,
+                level=value,
+                ret=(
+                    (value - previous[1]) / previous[1]
+                    if previous is not None and previous[1] > 0
+                    else None
+                ),
+                drawdown=drawdown,
+            )
+        )
+        self._last_entry = (timestamp, value, running_max)
 
     async def add_benchmark_data(self, benchmark_id: str, data: Dict[str, Any]) -> None:
         """
@@ -263,7 +296,7 @@ async def add_benchmark_data(self, benchmark_id: str, data: Dict[str, Any]) -> N
             }
 
             # Save to storage
-            await self._save_historical_data()
+            self._save_benchmark_data()
 
     async def get_performance_metrics(self, timeframe: str = "all") -> Dict[str, Any]:
         """
@@ -278,7 +311,18 @@ async def get_performance_metrics(self, timeframe: str = "all") -> Dict[str, Any
         if not self.initialized:
             raise RuntimeError("Performance analyzer not initialized")
 
-        if not self._performance_history:
+        async with self.lock:
+            return self._performance_metrics(timeframe)
+
+    def _window(self, timeframe: str) -> SlidingWindow:
+        """Up-to-date aggregates for a timeframe (unknown timeframes mean all time)."""
+        return self._aggregates.window(timeframe if timeframe in TIMEFRAMES else "all")
+
+    def _performance_metrics(self, timeframe: str) -> Dict[str, Any]:
+        """Performance metrics from the rolling aggregates (caller holds the lock)."""
+        window = self._window(timeframe)
+
+        if not window.stats.count:
             return {
                 "timeframe": timeframe,
                 "total_return": 0,
@@ -293,166 +337,80 @@ async def get_performance_metrics(self, timeframe: str = "all") -> Dict[str, Any
                 "recovery_factor": 0,
             }
 
-        async with self.lock:
-            # Filter data by timeframe
-            filtered_data = await self._filter_by_timeframe(
-                self._performance_history, timeframe
-            )
-
-            if not filtered_data:
-                return {
-                    "timeframe": timeframe,
-                    "total_return": 0,
-                    "annualized_return": 0,
-                    "volatility": 0,
-                    "sharpe_ratio": 0,
-                    "sortino_ratio": 0,
-                    "calmar_ratio": 0,
-                    "max_drawdown": 0,
-                    "win_rate": 0,
-                    "profit_factor": 0,
-                    "recovery_factor": 0,
-                }
-
-            # Calculate basic metrics
-            total_return = await self._calculate_total_return(filtered_data)
-            annualized_return = await self._calculate_annualized_return(filtered_data)
-            volatility = await self._calculate_volatility(filtered_data)
-
-            # Calculate drawdown metrics
-            drawdown_data = await self._filter_by_timeframe(
-                self._drawdown_history.get("drawdowns", []), timeframe
-            )
-            max_drawdown = (
-                max(d.get("drawdown", 0) for d in drawdown_data) if drawdown_data else 0
-            )
-
-            # Calculate risk-adjusted metrics
-            sharpe_ratio = await self._calculate_sharpe_ratio(
-                filtered_data, annualized_return, volatility
-            )
-            sortino_ratio = await self._calculate_sortino_ratio(
-                filtered_data, annualized_return
-            )
-            calmar_ratio = annualized_return / max_drawdown if max_drawdown > 0 else 0
-
-            # Calculate trading metrics
-            win_rate = await self._calculate_win_rate(filtered_data)
-            profit_factor = await self._calculate_profit_factor(filtered_data)
-            recovery_factor = total_return / max_drawdown if max_drawdown > 0 else 0
-
-            return {
-                "timeframe": timeframe,
-                "total_return": total_return,
-                "annualized_return": annualized_return,
-                "volatility": volatility,
-                "sharpe_ratio": sharpe_ratio,
-                "sortino_ratio": sortino_ratio,
-                "calmar_ratio": calmar_ratio,
-                "max_drawdown": max_drawdown,
-                "win_rate": win_rate,
-                "profit_factor": profit_factor,
-                "recovery_factor": recovery_factor,
-            }
-
-    async def _filter_by_timeframe(
-        self, data: List[Dict[str, Any]], timeframe: str
-    ) -> List[Dict[str, Any]]:
-        """Filter data by timeframe."""
-        now = datetime.utcnow()
-
-        if timeframe == "1d":
-            start_time = now - timedelta(days=1)
-        elif timeframe == "7d":
-            start_time = now - timedelta(days=7)
-        elif timeframe == "30d":
-            start_time = now - timedelta(days=30)
-        elif timeframe == "90d":
-            start_time = now - timedelta(days=90)
-        elif timeframe == "1y":
-            start_time = now - timedelta(days=365)
-        else:  # "all"
-            return data
-
-        return [entry for entry in data if entry.get("timestamp", now) >= start_time]
-
-    async def _calculate_total_return(self, data: List[Dict[str, Any]]) -> float:
-        """Calculate total return from performance data."""
-        if not data:
-            return 0
-
-        # Sort by timestamp
-        sorted_data = sorted(data, key=lambda x: x.get("timestamp", datetime.min))
-
-        # Get first and last portfolio values
-        first_value = float(sorted_data[0].get("portfolio_value", 0))
-        last_value = float(sorted_data[-1].get("portfolio_value", 0))
+        # Calculate basic metrics
+        total_return = self._calculate_total_return(window)
+        annualized_return = self._calculate_annualized_return(window, total_return)
+        volatility = window.returns.std
+
+        # Calculate drawdown metrics
+        max_drawdown = window.max_drawdown
+
+        # Calculate risk-adjusted metrics
+        sharpe_ratio = self._calculate_sharpe_ratio(annualized_return, volatility)
+        sortino_ratio = self._calculate_sortino_ratio(window, annualized_return)
+        calmar_ratio = annualized_return / max_drawdown if max_drawdown > 0 else 0
+
+        # Calculate trading metrics
+        win_rate = window.stats.wins / window.stats.count
+        profit_factor = self._calculate_profit_factor(window)
+        recovery_factor = total_return / max_drawdown if max_drawdown > 0 else 0
+
+        return {
+            "timeframe": timeframe,
+            "total_return": total_return,
+            "annualized_return": annualized_return,
+            "volatility": volatility,
+            "sharpe_ratio": sharpe_ratio,
+            "sortino_ratio": sortino_ratio,
+            "calmar_ratio": calmar_ratio,
+            "max_drawdown": max_drawdown,
+            "win_rate": win_rate,
+            "profit_factor": profit_factor,
+            "recovery_factor": recovery_factor,
+        }
+
+    async def _portfolio_values(
+        self, timeframe: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Stored timestamps and portfolio values inside a timeframe."""
+        span = TIMEFRAMES.get(timeframe)
+        columns = await self.store.columns_async(
+            "performance",
+            ("ts", "amount"),
+            start=time.time() - span if span is not None else None,
+        )
+        return columns["ts"], np.nan_to_num(columns["amount"])
 
-        if first_value <= 0:
+    def _calculate_total_return(self, window: SlidingWindow) -> float:
+        """Calculate total return from the first and last portfolio values."""
+        first, last = window.first, window.last
+        if first is None or not first.level or first.level <= 0:
             return 0
 
-        return (last_value - first_value) / first_value
+        return (last.level - first.level) / first.level
 
-    async def _calculate_annualized_return(self, data: List[Dict[str, Any]]) -> float:
-        """Calculate annualized return from performance data."""
-        if not data or len(data) < 2:
+    def _calculate_annualized_return(
+        self, window: SlidingWindow, total_return: float
+    ) -> float:
+        """Calculate annualized return from the total return and time span."""
+        if window.stats.count < 2:
             return 0
 
-        # Sort by timestamp
-        sorted_data = sorted(data, key=lambda x: x.get("timestamp", datetime.min))
-
-        # Get first and last portfolio values and timestamps
-        first_entry = sorted_data[0]
-        last_entry = sorted_data[-1]
-
-        first_value = float(first_entry.get("portfolio_value", 0))
-        last_value = float(last_entry.get("portfolio_value", 0))
-
-        first_timestamp = first_entry.get("timestamp", datetime.min)
-        last_timestamp = last_entry.get("timestamp", datetime.max)
-
-        if first_value <= 0:
+        first, last = window.first, window.last
+        if not first.level or first.level <= 0:
             return 0
 
         # Calculate time difference in years
-        time_diff = (last_timestamp - first_timestamp).total_seconds() / (
-            365.25 * 24 * 60 * 60
-        )
+        time_diff = (last.timestamp - first.timestamp) / (365.25 * 24 * 60 * 60)
 
         if time_diff <= 0:
             return 0
 
         # Calculate annualized return
-        total_return = (last_value - first_value) / first_value
         return math.pow(1 + total_return, 1 / time_diff) - 1
 
-    async def _calculate_volatility(self, data: List[Dict[str, Any]]) -> float:
-        """Calculate volatility (standard deviation of returns)."""
-        if not data or len(data) < 2:
-            return 0
-
-        # Sort by timestamp
-        sorted_data = sorted(data, key=lambda x: x.get("timestamp", datetime.min))
-
-        # Calculate daily returns
-        returns = []
-        prev_value = float(sorted_data[0].get("portfolio_value", 0))
-
-        for entry in sorted_data[1:]:
-            curr_value = float(entry.get("portfolio_value", 0))
-            if prev_value > 0:
-                daily_return = (curr_value - prev_value) / prev_value
-                returns.append(daily_return)
-            prev_value = curr_value
-
-        if not returns:
-            return 0
-
-        # Calculate standard deviation of returns
-        return np.std(returns, ddof=1)
-
-    async def _calculate_sharpe_ratio(
-        self, data: List[Dict[str, Any]], annualized_return: float, volatility: float
+    def _calculate_sharpe_ratio(
+        self, annualized_return: float, volatility: float
     ) -> float:
         """Calculate Sharpe ratio."""
         if volatility <= 0:
@@ -461,38 +419,18 @@ async def _calculate_sharpe_ratio(
         # Sharpe ratio = (Return - Risk-free rate) / Volatility
         return (annualized_return - self.risk_free_rate) / volatility
 
-    async def _calculate_sortino_ratio(
-        self, data: List[Dict[str, Any]], annualized_return: float
+    def _calculate_sortino_ratio(
+        self, window: SlidingWindow, annualized_return: float
     ) -> float:
         """Calculate Sortino ratio (using only negative returns for volatility)."""
-        if not data or len(data) < 2:
+        if not window.returns.count:
             return 0
 
-        # Sort by timestamp
-        sorted_data = sorted(data, key=lambda x: x.get("timestamp", datetime.min))
-
-        # Calculate daily returns
-        returns = []
-        prev_value = float(sorted_data[0].get("portfolio_value", 0))
-
-        for entry in sorted_data[1:]:
-            curr_value = float(entry.get("portfolio_value", 0))
-            if prev_value > 0:
-                daily_return = (curr_value - prev_value) / prev_value
-                returns.append(daily_return)
-            prev_value = curr_value
-
-        if not returns:
-            return 0
-
-        # Filter for negative returns only
-        negative_returns = [r for r in returns if r < 0]
-
-        if not negative_returns:
+        if not window.downside.count:
             return float("inf")  # No negative returns
 
-        # Calculate downside deviation (standard deviation of negative returns)
-        downside_deviation = np.std(negative_returns, ddof=1)
+        # Downside deviation (standard deviation of negative returns)
+        downside_deviation = window.downside.std
 
         if downside_deviation <= 0:
             return 0
@@ -500,35 +438,10 @@ async def _calculate_sortino_ratio(
         # Sortino ratio = (Return - Risk-free rate) / Downside Deviation
         return (annualized_return - self.risk_free_rate) / downside_deviation
 
-    async def _calculate_win_rate(self, data: List[Dict[str, Any]]) -> float:
-        """Calculate win rate (percentage of profitable periods)."""
-        if not data:
-            return 0
-
-        # Count profitable periods
-        profitable_periods = sum(
-            1 for entry in data if float(entry.get("profit_loss", 0)) > 0
-        )
-
-        return profitable_periods / len(data)
-
-    async def _calculate_profit_factor(self, data: List[Dict[str, Any]]) -> float:
+    def _calculate_profit_factor(self, window: SlidingWindow) -> float:
         """Calculate profit factor (gross profit / gross loss)."""
-        if not data:
-            return 0
-
-        # Calculate gross profit and gross loss
-        gross_profit = sum(
-            float(entry.get("profit_loss", 0))
-            for entry in data
-            if float(entry.get("profit_loss", 0)) > 0
-        )
-
-        gross_loss = sum(
-            abs(float(entry.get("profit_loss", 0)))
-            for entry in data
-            if float(entry.get("profit_loss", 0)) < 0
-        )
+        gross_profit = window.stats.gross_profit
+        gross_loss = window.stats.gross_loss
 
         if gross_loss <= 0:
             return float("inf") if gross_profit > 0 else 0
@@ -549,12 +462,9 @@ async def get_drawdown_analysis(self, timeframe: str = "all") -> Dict[str, Any]:
             raise RuntimeError("Performance analyzer not initialized")
 
         async with self.lock:
-            # Filter drawdown data by timeframe
-            drawdown_data = await self._filter_by_timeframe(
-                self._drawdown_history.get("drawdowns", []), timeframe
-            )
+            window = self._window(timeframe)
 
-            if not drawdown_data:
+            if not window.drawdowns.count:
                 return {
                     "timeframe": timeframe,
                     "max_drawdown": 0,
@@ -563,24 +473,18 @@ async def get_drawdown_analysis(self, timeframe: str = "all") -> Dict[str, Any]:
                     "drawdown_periods": [],
                 }
 
-            # Calculate max and average drawdown
-            max_drawdown = max(d.get("drawdown", 0) for d in drawdown_data)
-            avg_drawdown = sum(d.get("drawdown", 0) for d in drawdown_data) / len(
-                drawdown_data
-            )
-
-            # Get current drawdown (from most recent entry)
-            sorted_data = sorted(
-                drawdown_data, key=lambda x: x.get("timestamp", datetime.min)
-            )
-            current_drawdown = sorted_data[-1].get("drawdown", 0) if sorted_data else 0
+            # Max, average and current drawdown from the aggregates
+            max_drawdown = window.max_drawdown
+            avg_drawdown = window.drawdowns.mean
+            current_drawdown = window.last.drawdown or 0
 
             # Identify drawdown periods (continuous periods of drawdown > threshold)
             threshold = float(
                 self.config.get("drawdown_threshold", 0.05)
             )  # 5% drawdown threshold
+            timestamps, drawdowns = await self._recent_drawdowns(timeframe)
             drawdown_periods = await self._identify_drawdown_periods(
-                sorted_data, threshold
+                timestamps, drawdowns, threshold
             )
 
             return {
@@ -591,67 +495,67 @@ async def get_drawdown_analysis(self, timeframe: str = "all") -> Dict[str, Any]:
                 "drawdown_periods": drawdown_periods,
             }
 
+    async def _recent_drawdowns(
+        self, timeframe: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and drawdowns inside a timeframe, measured from all-time peaks."""
+        timestamps, values = await self._portfolio_values("all")
+        peaks = np.maximum.accumulate(values) if len(values) else values
+        drawdowns = np.divide(
+            peaks - values, peaks, out=np.zeros_like(values), where=peaks > 0
+        )
+
+        span = TIMEFRAMES.get(timeframe)
+        if span is None:
+            return timestamps, drawdowns
+        keep = timestamps >= time.time() - span
+        return timestamps[keep], drawdowns[keep]
+
     async def _identify_drawdown_periods(
-        self, data: List[Dict[str, Any]], threshold: float
+        self, timestamps: np.ndarray, drawdowns: np.ndarray, threshold: float
     ) -> List[Dict[str, Any]]:
         """Identify significant drawdown periods."""
-        if not data:
-            return []
-
         periods = []
-        in_drawdown = False
-        start_idx = 0
-
-        for i, entry in enumerate(data):
-            drawdown = entry.get("drawdown", 0)
+        start_idx = None
 
-            if not in_drawdown and drawdown >= threshold:
+        for i, drawdown in enumerate(drawdowns):
+            if start_idx is None and drawdown >= threshold:
                 # Start of a drawdown period
-                in_drawdown = True
                 start_idx = i
-            elif in_drawdown and drawdown < threshold:
+            elif start_idx is not None and drawdown < threshold:
                 # End of a drawdown period
-                in_drawdown = False
-
-                # Calculate drawdown period metrics
-                period_data = data[start_idx:i]
-                start_time = period_data[0].get("timestamp")
-                end_time = period_data[-1].get("timestamp")
-                max_dd = max(d.get("drawdown", 0) for d in period_data)
-                duration = (
-                    (end_time - start_time).days if start_time and end_time else 0
-                )
-
                 periods.append(
-                    {
-                        "start_date": start_time.isoformat() if start_time else None,
-                        "end_date": end_time.isoformat() if end_time else None,
-                        "duration_days": duration,
-                        "max_drawdown": max_dd,
-                        "recovery": True,
-                    }
+                    self._drawdown_period(
+                        timestamps[start_idx:i], drawdowns[start_idx:i], True
+                    )
                 )
+                start_idx = None
 
         # Check if still in a drawdown period at the end
-        if in_drawdown:
-            period_data = data[start_idx:]
-            start_time = period_data[0].get("timestamp")
-            end_time = period_data[-1].get("timestamp")
-            max_dd = max(d.get("drawdown", 0) for d in period_data)
-            duration = (end_time - start_time).days if start_time and end_time else 0
-
+        if start_idx is not None:
             periods.append(
-                {
-                    "start_date": start_time.isoformat() if start_time else None,
-                    "end_date": None,  # Still ongoing
-                    "duration_days": duration,
-                    "max_drawdown": max_dd,
-                    "recovery": False,
-                }
+                self._drawdown_period(
+                    timestamps[start_idx:], drawdowns[start_idx:], False
+                )
             )
 
         return periods
 
+    @staticmethod
+    def _drawdown_period(
+        timestamps: np.ndarray, drawdowns: np.ndarray, recovered: bool
+    ) -> Dict[str, Any]:
+        """Summary of one continuous drawdown period."""
+        start_time = datetime.utcfromtimestamp(timestamps[0])
+        end_time = datetime.utcfromtimestamp(timestamps[-1])
+        return {
+            "start_date": start_time.isoformat(),
+            "end_date": end_time.isoformat() if recovered else None,  # None: ongoing
+            "duration_days": (end_time - start_time).days,
+            "max_drawdown": float(drawdowns.max()),
+            "recovery": recovered,
+        }
+
     async def benchmark_performance(
         self, benchmark_id: str, timeframe: str = "all"
     ) -> Dict[str, Any]:
@@ -673,7 +577,7 @@ async def benchmark_performance(
 
         async with self.lock:
             # Get performance metrics
-            performance_metrics = await self.get_performance_metrics(timeframe)
+            performance_metrics = self._performance_metrics(timeframe)
 
             # Get benchmark data for the timeframe
             benchmark = self._benchmark_data[benchmark_id]
@@ -765,12 +669,10 @@ async def _calculate_alpha_beta(
         self, timeframe: str, benchmark_id: str
     ) -> Tuple[float, float]:
         """Calculate alpha and beta against benchmark."""
-        # Filter performance data by timeframe
-        performance_data = await self._filter_by_timeframe(
-            self._performance_history, timeframe
-        )
+        # Portfolio values inside the timeframe, in time order
+        perf_ts, perf_values = await self._portfolio_values(timeframe)
 
-        if not performance_data or len(performance_data) < 3:
+        if len(perf_values) < 3:
             return 0, 0
 
         # Get benchmark data
@@ -789,26 +691,16 @@ async def _calculate_alpha_beta(
             else:
                 timestamps.append(ts)
 
-        # Sort performance data by timestamp
-        sorted_perf = sorted(
-            performance_data, key=lambda x: x.get("timestamp", datetime.min)
-        )
-
         # Calculate daily returns for performance data
         perf_returns = []
-        prev_value = float(sorted_perf[0].get("portfolio_value", 0))
         perf_timestamps = []
 
-        for entry in sorted_perf[1:]:
-            curr_value = float(entry.get("portfolio_value", 0))
-            timestamp = entry.get("timestamp")
-
-            if prev_value > 0 and timestamp:
-                daily_return = (curr_value - prev_value) / prev_value
+        for i in range(1, len(perf_values)):
+            prev_value = float(perf_values[i - 1])
+            if prev_value > 0:
+                daily_return = (float(perf_values[i]) - prev_value) / prev_value
                 perf_returns.append(daily_return)
-                perf_timestamps.append(timestamp)
-
-            prev_value = curr_value
+                perf_timestamps.append(datetime.utcfromtimestamp(perf_ts[i]))
 
         # Calculate daily returns for benchmark data
         benchmark_returns = []
@@ -8,13 +8,31 @@
 import asyncio
 from typing import Dict, Any, Optional, List
 # from decimal import Decimal # Removed unused import
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 import os
+import time
 # from pathlib import Path # Removed unused import
 
+import numpy as np
+
+from .rolling_aggregates import Accumulator, RollingAggregator, Sample, SlidingWindow
+from .trade_store import TradeStore, get_trade_store, to_epoch
+
 logger = logging.getLogger(__name__)
 
+# Rolling timeframes and their spans in seconds (None for all time)
+TIMEFRAMES = {
+    "1h": 3600,
+    "24h": 24 * 3600,
+    "7d": 7 * 24 * 3600,
+    "30d": 30 * 24 * 3600,
+    "all": None,
+}
+
+# Time series intervals in minutes
+INTERVAL_MINUTES = {"5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440}
+
 
 class ProfitTracker:
     """
@@ -38,14 +56,17 @@ def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.initialized = False
         self.lock = asyncio.Lock()
 
-        # Storage for profit data
-        self._profit_history = []
-        self._token_pair_profits = {}
-        self._timeframe_profits = {"1h": [], "24h": [], "7d": [], "30d": [], "all": []}
+        # Incremental aggregates: rolling timeframes and per-token-pair totals
+        self._aggregates = RollingAggregator(TIMEFRAMES)
+        self._timeframe_profits: Dict[str, SlidingWindow] = self._aggregates.windows
+        self._token_pair_profits: Dict[str, Accumulator] = self._timeframe_profits[
+            "all"
+        ].keys
 
         # Storage paths
         self.storage_dir = self.config.get("storage_dir", "analytics")
         self.profit_file = os.path.join(self.storage_dir, "profit_history.json")
+        self.store: Optional[TradeStore] = None
 
         # Cache settings
         self.cache_ttl = int(self.config.get("cache_ttl", 300))  # 5 minutes
@@ -61,6 +82,7 @@ async def initialize(self) -> bool:
         try:
             # Create storage directory if it doesn't exist
             os.makedirs(self.storage_dir, exist_ok=True)
+            self.store = get_trade_store(self.storage_dir)
 
             # Load historical data if available
             await self._load_historical_data()
@@ -76,46 +98,37 @@ async def initialize(self) -> bool:
     async def _load_historical_data(self) -> None:
         """Load historical profit data from storage."""
         try:
-            if os.path.exists(self.profit_file):
-                async with self.lock:
+            async with self.lock:
+                # Move a legacy JSON history into the store once
+                if os.path.exists(self.profit_file):
                     with open(self.profit_file, "r") as f:
                         data = json.load(f)
+                    await self.store.import_legacy_async(
+                        self.profit_file,
+                        {"profit": [(entry, self._columns(entry)) for entry in data]},
+                    )
 
-                    # Convert string timestamps back to datetime objects
-                    for entry in data:
-                        if "timestamp" in entry:
-                            entry["timestamp"] = datetime.fromisoformat(
-                                entry["timestamp"]
-                            )
+                loaded = await self._update_derived_metrics()
 
-                    self._profit_history = data
-                    await self._update_derived_metrics()
-                    logger.info(f"Loaded {len(data)} historical profit entries")
-            else:
-                logger.info("No historical profit data found")
+                if loaded:
+                    logger.info(f"Loaded {loaded} historical profit entries")
+                else:
+                    logger.info("No historical profit data found")
         except Exception as e:
             logger.error(f"Error loading historical profit data: {e}")
 
-    async def _save_historical_data(self) -> None:
-        """Save historical profit data to storage."""
-        try:
-            async with self.lock:
-                # Convert datetime objects to ISO format strings for JSON serialization
-                data_to_save = []
-                for entry in self._profit_history:
-                    entry_copy = entry.copy()
-                    if isinstance(entry_copy.get("timestamp"), datetime):
-                        entry_copy["timestamp"] = entry_copy["timestamp"].isoformat()
-                    data_to_save.append(entry_copy)
-
-                with open(self.profit_file, "w") as f:
-                    json.dump(data_to_save, f, indent=2)
-
-                logger.info(
-                    f"Saved {len(data_to_save)} profit entries to {self.profit_file}"
-                )
-        except Exception as e:
-            logger.error(f"Error saving historical profit data: {e}")
+    @staticmethod
+    def _columns(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Typed store columns for a profit entry."""
+        token_pair = entry.get("token_pair")
+        if not token_pair and "token_in" in entry and "token_out" in entry:
+            token_pair = f"{entry['token_in']}_{entry['token_out']}"
+        return {
+            "key": token_pair,
+            "value": entry.get("profit"),
+            "amount": entry.get("amount_in"),
+            "cost": entry.get("gas_cost"),
+        }
 
     async def track_profit(self, trade_data: Dict[str, Any]) -> None:
         """
@@ -151,71 +164,131 @@ async def track_profit(self, trade_data: Dict[str, Any]) -> None:
         trade_data["token_pair"] = token_pair
 
         async with self.lock:
-            # Add to profit history
-            self._profit_history.append(trade_data)
+            # Fold the new entry into the rolling aggregates
+            self._attribute_entry(trade_data, time.time())
 
-            # Update derived metrics
-            await self._update_derived_metrics()
+            # Append to storage
+            try:
+                self.store.append("profit", trade_data, **self._columns(trade_data))
+            except Exception as e:
+                logger.error(f"Error saving profit entry: {e}")
 
-            # Save to storage
-            await self._save_historical_data()
-
-    async def _update_derived_metrics(self) -> None:
-        """Update all derived profit metrics."""
-        try:
-            # Update cache timestamp
-            self._last_cache_update = asyncio.get_event_loop().time()
+    async def _update_derived_metrics(self) -> int:
+        """
+        Rebuild all derived profit metrics from the stored profit columns.
 
-            # Clear existing derived metrics
-            self._token_pair_profits = {}
-            for timeframe in self._timeframe_profits:
-                self._timeframe_profits[timeframe] = []
+        Only the typed columns are read; payloads are never decoded or kept.
 
-            # Process all profit entries
-            now = datetime.utcnow()
-            for entry in self._profit_history:
-                # Token pair attribution
-                token_pair = entry.get("token_pair")
-                if not token_pair and "token_in" in entry and "token_out" in entry:
-                    token_pair = f"{entry['token_in']}_{entry['token_out']}"
+        Returns:
+            Number of profit entries folded into the aggregates
+        """
+        try:
+            columns = await self.store.columns_async(
+                "profit", ("ts", "value", "amount", "cost", "key")
+            )
+            values = np.nan_to_num(columns["value"])
+            volumes = np.nan_to_num(columns["amount"])
+            costs = np.nan_to_num(columns["cost"])
+
+            self._aggregates.clear()
+            now = time.time()
+            for i, timestamp in enumerate(columns["ts"]):
+                self._aggregates.add(
+                    Sample(
+                        timestamp=float(timestamp),
+                        value=float(values[i]),
+                        volume=float(volumes[i]),
+                        cost=float(costs[i]),
+                        key=columns["key"][i],
+                    ),
+                    now,
+                )
 
-                if token_pair:
-                    if token_pair not in self._token_pair_profits:
-                        self._token_pair_profits[token_pair] = []
-                    self._token_pair_profits[token_pair].append(entry)
+            self._last_cache_update = asyncio.get_event_loop().time()
+            logger.debug("Updated derived profit metrics")
+            return len(columns["ts"])
 
-                # Timeframe attribution
-                timestamp = entry.get("timestamp", now)
+        except Exception as e:
+            logger.error(f"Error updating derived profit metrics: {e}")
+            return 0
+
+    def _attribute_entry(self, entry: Dict[str, Any], now: float) -> None:
+        """Fold one entry into the token pair and timeframe aggregates."""
+        columns = self._columns(entry)
+        self._aggregates.add(
+            Sample(
+                timestamp=to_epoch(entry.get("timestamp") or datetime.utcnow()),
+                value=float(columns["value"] or 0),
+                volume=float(columns["amount"] or 0),
+                cost=float(columns["cost"] or 0),
+                key=columns["key"],
+            ),
+            now,
+        )
 
-                # All time
-                self._timeframe_profits["all"].append(entry)
+    async def _ensure_cache_fresh(self) -> None:
+        """Expire buckets that have left the rolling timeframes."""
+        self._aggregates.expire()
 
-                # Last 30 days
-                if timestamp >= now - timedelta(days=30):
-                    self._timeframe_profits["30d"].append(entry)
+    def _validate_timeframe(self, timeframe: str) -> None:
+        """Raise ValueError for unknown timeframes."""
+        if timeframe not in self._timeframe_profits:
+            raise ValueError(
+                f"Invalid timeframe: {timeframe}. Valid options: {list(self._timeframe_profits.keys())}"
+            )
 
-                # Last 7 days
-                if timestamp >= now - timedelta(days=7):
-                    self._timeframe_profits["7d"].append(entry)
+    @staticmethod
+    def _pair_metrics(stats: Accumulator) -> Dict[str, Any]:
+        """Profit metrics for one accumulator."""
+        return {
+            "total_profit": stats.total,
+            "total_volume": stats.volume,
+            "trade_count": stats.count,
+            "avg_profit": stats.mean,
+            "profit_per_volume": (
+                stats.total / stats.volume if stats.volume > 0 else 0
+            ),
+        }
 
-                # Last 24 hours
-                if timestamp >= now - timedelta(hours=24):
-                    self._timeframe_profits["24h"].append(entry)
+    def _profit_by_token_pair(
+        self, token_pair: Optional[str], timeframe: str
+    ) -> Dict[str, Any]:
+        """Token pair metrics from the timeframe aggregates (caller holds the lock)."""
+        window = self._timeframe_profits[timeframe]
 
-                # Last hour
-                if timestamp >= now - timedelta(hours=1):
-                    self._timeframe_profits["1h"].append(entry)
+        if token_pair:
+            stats = window.keys.get(token_pair, Accumulator())
+            return {
+                "token_pair": token_pair,
+                "timeframe": timeframe,
+                **self._pair_metrics(stats),
+            }
 
-            logger.debug("Updated derived profit metrics")
+        result = {
+            "timeframe": timeframe,
+            "total_profit": window.stats.total,
+            "total_volume": window.stats.volume,
+            "trade_count": window.stats.count,
+            "token_pairs": {},
+        }
 
-        except Exception as e:
-            logger.error(f"Error updating derived profit metrics: {e}")
+        for pair, stats in window.keys.items():
+            result["token_pairs"][pair] = {
+                **self._pair_metrics(stats),
+                "percentage_of_total": (
+                    stats.total / result["total_profit"] * 100
+                    if result["total_profit"] > 0
+                    else 0
+                ),
+            }
 
-    async def _ensure_cache_fresh(self) -> None:
-        """Ensure the cache is fresh, update if needed."""
-        current_time = asyncio.get_event_loop().time()
-        if current_time - self._last_cache_update > self.cache_ttl:
-            await self._update_derived_metrics()
+        result["avg_profit"] = window.stats.mean
+        result["profit_per_volume"] = (
+            result["total_profit"] / result["total_volume"]
+            if result["total_volume"] > 0
+            else 0
+        )
+        return result
 
     async def get_profit_by_token_pair(
         self, token_pair: Optional[str] = None, timeframe: str = "24h"
@@ -234,108 +307,42 @@ async def get_profit_by_token_pair(
         if not self.initialized:
             raise RuntimeError("Profit tracker not initialized")
 
-        if timeframe not in self._timeframe_profits:
-            raise ValueError(
-                f"Invalid timeframe: {timeframe}. Valid options: {list(self._timeframe_profits.keys())}"
-            )
+        self._validate_timeframe(timeframe)
 
         async with self.lock:
             await self._ensure_cache_fresh()
+            return self._profit_by_token_pair(token_pair, timeframe)
+
+    @staticmethod
+    def _roi_metrics(stats: Accumulator, timeframe: str) -> Dict[str, Any]:
+        """ROI metrics for an accumulator covering ``timeframe``."""
+        net_profit = stats.total - stats.cost
+
+        # Calculate ROI
+        roi = net_profit / stats.volume * 100 if stats.volume > 0 else 0
+
+        # Calculate annualized ROI (none for all time or custom periods)
+        days_factor = {
+            "1h": 365 * 24,  # Hourly to annual
+            "24h": 365,  # Daily to annual
+            "7d": 365 / 7,  # Weekly to annual
+            "30d": 12,  # Monthly to annual
+        }
 
-            # Filter by timeframe
-            entries = self._timeframe_profits[timeframe]
-
-            if token_pair:
-                # Filter by token pair
-                entries = [
-                    e
-                    for e in entries
-                    if e.get("token_pair") == token_pair
-                    or (
-                        e.get("token_in")
-                        and e.get("token_out")
-                        and f"{e['token_in']}_{e['token_out']}" == token_pair
-                    )
-                ]
-
-                # Calculate metrics for specific token pair
-                total_profit = sum(float(e.get("profit", 0)) for e in entries)
-                total_volume = sum(float(e.get("amount_in", 0)) for e in entries)
-                trade_count = len(entries)
-                avg_profit = total_profit / trade_count if trade_count > 0 else 0
-
-                return {
-                    "token_pair": token_pair,
-                    "timeframe": timeframe,
-                    "total_profit": total_profit,
-                    "total_volume": total_volume,
-                    "trade_count": trade_count,
-                    "avg_profit": avg_profit,
-                    "profit_per_volume": (
-                        total_profit / total_volume if total_volume > 0 else 0
-                    ),
-                }
-            else:
-                # Calculate metrics for all token pairs
-                result = {
-                    "timeframe": timeframe,
-                    "total_profit": sum(float(e.get("profit", 0)) for e in entries),
-                    "total_volume": sum(float(e.get("amount_in", 0)) for e in entries),
-                    "trade_count": len(entries),
-                    "token_pairs": {},
-                }
-
-                # Group by token pair
-                token_pair_entries = {}
-                for entry in entries:
-                    pair = entry.get("token_pair")
-                    if not pair and "token_in" in entry and "token_out" in entry:
-                        pair = f"{entry['token_in']}_{entry['token_out']}"
-
-                    if pair:
-                        if pair not in token_pair_entries:
-                            token_pair_entries[pair] = []
-                        token_pair_entries[pair].append(entry)
-
-                # Calculate metrics for each token pair
-                for pair, pair_entries in token_pair_entries.items():
-                    pair_profit = sum(float(e.get("profit", 0)) for e in pair_entries)
-                    pair_volume = sum(
-                        float(e.get("amount_in", 0)) for e in pair_entries
-                    )
-                    pair_count = len(pair_entries)
-
-                    result["token_pairs"][pair] = {
-                        "total_profit": pair_profit,
-                        "total_volume": pair_volume,
-                        "trade_count": pair_count,
-                        "avg_profit": pair_profit / pair_count if pair_count > 0 else 0,
-                        "profit_per_volume": (
-                            pair_profit / pair_volume if pair_volume > 0 else 0
-                        ),
-                        "percentage_of_total": (
-                            pair_profit / result["total_profit"] * 100
-                            if result["total_profit"] > 0
-                            else 0
-                        ),
-                    }
-
-                # Add average metrics
-                if result["trade_count"] > 0:
-                    result["avg_profit"] = (
-                        result["total_profit"] / result["trade_count"]
-                    )
-                else:
-                    result["avg_profit"] = 0
-
-                if result["total_volume"] > 0:
-                    result["profit_per_volume"] = (
-                        result["total_profit"] / result["total_volume"]
-                    )
-                else:
-                    result["profit_per_volume"] = 0
+        annualized_roi = (
+            roi * days_factor[timeframe] if timeframe in days_factor else None
+        )
 
-                return result
+        return {
+            "timeframe": timeframe,
+            "total_investment": stats.volume,
+            "total_profit": stats.total,
+            "total_gas_cost": stats.cost,
+            "net_profit": net_profit,
+            "roi": roi,
+            "annualized_roi": annualized_roi,
+            "trade_count": stats.count,
+        }
 
     async def get_roi(self, timeframe: str = "24h") -> Dict[str, Any]:
         """
@@ -350,47 +357,43 @@ async def get_roi(self, timeframe: str = "24h") -> Dict[str, Any]:
         if not self.initialized:
             raise RuntimeError("Profit tracker not initialized")
 
-        if timeframe not in self._timeframe_profits:
-            raise ValueError(
-                f"Invalid timeframe: {timeframe}. Valid options: {list(self._timeframe_profits.keys())}"
-            )
+        self._validate_timeframe(timeframe)
 
         async with self.lock:
             await self._ensure_cache_fresh()
+            return self._roi_metrics(self._timeframe_profits[timeframe].stats, timeframe)
 
-            entries = self._timeframe_profits[timeframe]
+    async def get_period_profit(
+        self, start_time: datetime, end_time: datetime
+    ) -> Dict[str, Any]:
+        """
+        Get profit and ROI for a calendar period.
 
-            total_investment = sum(float(e.get("amount_in", 0)) for e in entries)
-            total_profit = sum(float(e.get("profit", 0)) for e in entries)
-            total_gas_cost = sum(float(e.get("gas_cost", 0)) for e in entries)
-            net_profit = total_profit - total_gas_cost
+        Reads the daily pre-aggregates, so the period is rounded to whole
+        UTC days.
 
-            # Calculate ROI
-            roi = net_profit / total_investment * 100 if total_investment > 0 else 0
+        Args:
+            start_time: Period start (inclusive)
+            end_time: Period end (exclusive)
 
-            # Calculate annualized ROI
-            days_factor = {
-                "1h": 365 * 24,  # Hourly to annual
-                "24h": 365,  # Daily to annual
-                "7d": 365 / 7,  # Weekly to annual
-                "30d": 12,  # Monthly to annual
-                "all": 1,  # All time (no annualization)
-            }
+        Returns:
+            Dictionary with the same metrics as get_roi, plus total_volume,
+            annualized over the period length
+        """
+        if not self.initialized:
+            raise RuntimeError("Profit tracker not initialized")
 
-            annualized_roi = (
-                roi * days_factor.get(timeframe, 1) if timeframe != "all" else None
+        async with self.lock:
+            stats = self._aggregates.tiers["day"].total(
+                to_epoch(start_time), to_epoch(end_time)
             )
-
-            return {
-                "timeframe": timeframe,
-                "total_investment": total_investment,
-                "total_profit": total_profit,
-                "total_gas_cost": total_gas_cost,
-                "net_profit": net_profit,
-                "roi": roi,
-                "annualized_roi": annualized_roi,
-                "trade_count": len(entries),
-            }
+            result = self._roi_metrics(stats, "custom")
+            days = (end_time - start_time).total_seconds() / 86400
+            result["annualized_roi"] = result["roi"] * 365 / days if days > 0 else None
+            result["start_time"] = start_time.isoformat()
+            result["end_time"] = end_time.isoformat()
+            result["total_volume"] = stats.volume
+            return result
 
     async def get_profit_time_series(
         self, timeframe: str = "7d", interval: str = "1h"
@@ -398,6 +401,8 @@ async def get_profit_time_series(
         """
         Get profit time series data for visualization.
 
+        Intervals are aligned to the bucket boundaries of the pre-aggregates.
+
         Args:
             timeframe: Time frame for data ("1h", "24h", "7d", "30d", "all")
             interval: Data aggregation interval ("5m", "15m", "1h", "4h", "1d")
@@ -414,84 +419,81 @@ async def get_profit_time_series(
                 f"Invalid timeframe: {timeframe}. Valid options: {list(self._timeframe_profits.keys())}"
             )
 
-        # Define interval durations in minutes
-        interval_minutes = {"5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440}
-
-        if interval not in interval_minutes:
+        if interval not in INTERVAL_MINUTES:
             raise ValueError(
-                f"Invalid interval: {interval}. Valid options: {list(interval_minutes.keys())}"
+                f"Invalid interval: {interval}. Valid options: {list(INTERVAL_MINUTES.keys())}"
             )
 
         async with self.lock:
-            await self._ensure_cache_fresh()
-
             # Determine time range
-            now = datetime.utcnow()
-            if timeframe == "1h":
-                start_time = now - timedelta(hours=1)
-            elif timeframe == "24h":
-                start_time = now - timedelta(hours=24)
-            elif timeframe == "7d":
-                start_time = now - timedelta(days=7)
-            elif timeframe == "30d":
-                start_time = now - timedelta(days=30)
-            else:  # "all"
-                # Find earliest timestamp in data
-                if self._profit_history:
-                    timestamps = [e.get("timestamp", now) for e in self._profit_history]
-                    start_time = min(timestamps)
-                else:
-                    start_time = now - timedelta(
-                        days=30
-                    )  # Default to 30 days if no data
+            now = time.time()
+            span = TIMEFRAMES.get(timeframe)
+            if span is not None:
+                start_time = now - span
+            elif self._aggregates.first_timestamp is not None:
+                start_time = self._aggregates.first_timestamp
+            else:
+                start_time = now - TIMEFRAMES["30d"]  # Default to 30 days if no data
+
+            step = INTERVAL_MINUTES[interval] * 60
+            tier = self._aggregates.tier_for(step, start_time)
+            resolution = tier.resolution if tier else step
+            start_time -= start_time % resolution
+            interval_count = int((now - start_time) // step) + 1
+
+            profit = np.zeros(interval_count)
+            volume = np.zeros(interval_count)
+            trade_count = np.zeros(interval_count, dtype=np.int64)
+
+            if tier is not None:
+                for bucket_start, stats in tier.range(start_time):
+                    index = int((bucket_start - start_time) // step)
+                    if index < interval_count:
+                        profit[index] += stats.total
+                        volume[index] += stats.volume
+                        trade_count[index] += stats.count
+            elif self.store is not None:
+                # Older than every tier's retention: bin the stored columns
+                columns = await self.store.columns_async(
+                    "profit", ("ts", "value", "amount"), start=start_time
+                )
+                index = ((columns["ts"] - start_time) // step).astype(np.int64)
+                keep = index < interval_count
+                index = index[keep]
+                profit += np.bincount(
+                    index, np.nan_to_num(columns["value"][keep]), interval_count
+                )
+                volume += np.bincount(
+                    index, np.nan_to_num(columns["amount"][keep]), interval_count
+                )
+                trade_count += np.bincount(index, minlength=interval_count)
 
-            # Filter entries by timeframe
-            entries = [
-                e for e in self._profit_history if e.get("timestamp", now) >= start_time
+            timestamps = [
+                datetime.utcfromtimestamp(start_time + i * step).isoformat()
+                for i in range(interval_count)
             ]
 
-            # Group entries by interval
-            interval_delta = timedelta(minutes=interval_minutes[interval])
-            intervals = []
-
-            current_time = start_time
-            while current_time <= now:
-                intervals.append((current_time, current_time + interval_delta))
-                current_time += interval_delta
-
-            # Initialize result structure
-            result = {
-                "timestamps": [],
-                "profit": [],
-                "cumulative_profit": [],
-                "trade_count": [],
-                "volume": [],
+            return {
+                "timestamps": timestamps,
+                "profit": profit.tolist(),
+                "cumulative_profit": np.cumsum(profit).tolist(),
+                "trade_count": trade_count.tolist(),
+                "volume": volume.tolist(),
             }
 
-            # Calculate metrics for each interval
-            cumulative_profit = 0
-            for start, end in intervals:
-                interval_entries = [
-                    e for e in entries if start <= e.get("timestamp", now) < end
-                ]
-
-                interval_profit = sum(
-                    float(e.get("profit", 0)) for e in interval_entries
-                )
-                interval_volume = sum(
-                    float(e.get("amount_in", 0)) for e in interval_entries
-                )
-                interval_count = len(interval_entries)
-
-                cumulative_profit += interval_profit
+    def _top_token_pairs(self, timeframe: str, limit: int) -> List[Dict[str, Any]]:
+        """Top token pairs by profit (caller holds the lock)."""
+        all_pairs = self._profit_by_token_pair(None, timeframe)
 
-                result["timestamps"].append(start.isoformat())
-                result["profit"].append(interval_profit)
-                result["cumulative_profit"].append(cumulative_profit)
-                result["trade_count"].append(interval_count)
-                result["volume"].append(interval_volume)
+        # Extract and sort token pairs
+        pairs = [
+            {"token_pair": pair_id, **metrics}
+            for pair_id, metrics in all_pairs.get("token_pairs", {}).items()
+        ]
+        pairs.sort(key=lambda x: x.get("total_profit", 0), reverse=True)
 
-            return result
+        # Return top N pairs
+        return pairs[:limit]
 
     async def get_top_token_pairs(
         self, timeframe: str = "7d", limit: int = 10
@@ -509,27 +511,43 @@ async def get_top_token_pairs(
         if not self.initialized:
             raise RuntimeError("Profit tracker not initialized")
 
-        if timeframe not in self._timeframe_profits:
-            raise ValueError(
-                f"Invalid timeframe: {timeframe}. Valid options: {list(self._timeframe_profits.keys())}"
-            )
+        self._validate_timeframe(timeframe)
 
         async with self.lock:
             await self._ensure_cache_fresh()
+            return self._top_token_pairs(timeframe, limit)
+
+    def _timeframe_summary(self, timeframe: str) -> Dict[str, Any]:
+        """Summary metrics for one timeframe (caller holds the lock)."""
+        window = self._timeframe_profits[timeframe]
+        roi = self._roi_metrics(window.stats, timeframe)
+        return {
+            "total_profit": window.stats.total,
+            "total_volume": window.stats.volume,
+            "trade_count": window.stats.count,
+            "roi": roi["roi"],
+            "annualized_roi": roi["annualized_roi"],
+            "token_pair_count": len(window.keys),
+        }
 
-            # Get all token pairs with their metrics
-            all_pairs = await self.get_profit_by_token_pair(timeframe=timeframe)
+    async def get_timeframe_summary(self, timeframe: str = "24h") -> Dict[str, Any]:
+        """
+        Get summary metrics for a single timeframe.
 
-            # Extract and sort token pairs
-            pairs = []
-            for pair_id, metrics in all_pairs.get("token_pairs", {}).items():
-                pairs.append({"token_pair": pair_id, **metrics})
+        Args:
+            timeframe: Time frame for the summary ("1h", "24h", "7d", "30d", "all")
 
-            # Sort by total profit (descending)
-            pairs.sort(key=lambda x: x.get("total_profit", 0), reverse=True)
+        Returns:
+            Dictionary with profit, volume, trade count and ROI
+        """
+        if not self.initialized:
+            raise RuntimeError("Profit tracker not initialized")
 
-            # Return top N pairs
-            return pairs[:limit]
+        self._validate_timeframe(timeframe)
+
+        async with self.lock:
+            await self._ensure_cache_fresh()
+            return self._timeframe_summary(timeframe)
 
     async def get_profit_summary(self) -> Dict[str, Any]:
         """
@@ -545,19 +563,10 @@ async def get_profit_summary(self) -> Dict[str, Any]:
             await self._ensure_cache_fresh()
 
             # Get metrics for all timeframes
-            result = {}
-            for timeframe in self._timeframe_profits:
-                metrics = await self.get_profit_by_token_pair(timeframe=timeframe)
-                roi = await self.get_roi(timeframe=timeframe)
-
-                result[timeframe] = {
-                    "total_profit": metrics.get("total_profit", 0),
-                    "total_volume": metrics.get("total_volume", 0),
-                    "trade_count": metrics.get("trade_count", 0),
-                    "roi": roi.get("roi", 0),
-                    "annualized_roi": roi.get("annualized_roi"),
-                    "token_pair_count": len(metrics.get("token_pairs", {})),
-                }
+            result = {
+                timeframe: self._timeframe_summary(timeframe)
+                for timeframe in self._timeframe_profits
+            }
 
             # Add all-time stats
             all_time = result.get("all", {})
@@ -566,53 +575,37 @@ async def get_profit_summary(self) -> Dict[str, Any]:
                 "total_volume_all_time": all_time.get("total_volume", 0),
                 "trade_count_all_time": all_time.get("trade_count", 0),
                 "first_trade_date": self._get_first_trade_date(),
-                "most_profitable_day": await self._get_most_profitable_day(),
-                "most_profitable_pair": await self._get_most_profitable_pair(),
+                "most_profitable_day": self._get_most_profitable_day(),
+                "most_profitable_pair": self._get_most_profitable_pair(),
             }
 
             return result
 
     def _get_first_trade_date(self) -> Optional[str]:
         """Get the date of the first recorded trade."""
-        if not self._profit_history:
+        if self._aggregates.first_timestamp is None:
             return None
 
-        timestamps = [
-            e.get("timestamp") for e in self._profit_history if e.get("timestamp")
-        ]
-        if not timestamps:
-            return None
+        return datetime.utcfromtimestamp(self._aggregates.first_timestamp).date().isoformat()
 
-        return min(timestamps).date().isoformat()
-
-    async def _get_most_profitable_day(self) -> Dict[str, Any]:
-        """Get the most profitable day."""
-        if not self._profit_history:
+    def _get_most_profitable_day(self) -> Dict[str, Any]:
+        """Get the most profitable day from the daily pre-aggregates."""
+        best = max(
+            self._aggregates.tiers["day"].range(),
+            key=lambda item: item[1].total,
+            default=None,
+        )
+        if best is None:
             return {"date": None, "profit": 0}
 
-        # Group profits by day
-        daily_profits = {}
-        for entry in self._profit_history:
-            timestamp = entry.get("timestamp")
-            if not timestamp:
-                continue
-
-            date_str = timestamp.date().isoformat()
-            if date_str not in daily_profits:
-                daily_profits[date_str] = 0
-
-            daily_profits[date_str] += float(entry.get("profit", 0))
-
-        if not daily_profits:
-            return {"date": None, "profit": 0}
-
-        # Find the most profitable day
-        most_profitable_date = max(daily_profits.items(), key=lambda x: x[1])
-        return {"date": most_profitable_date[0], "profit": most_profitable_date[1]}
+        return {
+            "date": datetime.utcfromtimestamp(best[0]).date().isoformat(),
+            "profit": best[1].total,
+        }
 
-    async def _get_most_profitable_pair(self) -> Dict[str, Any]:
+    def _get_most_profitable_pair(self) -> Dict[str, Any]:
         """Get the most profitable token pair."""
-        all_time_pairs = await self.get_top_token_pairs(timeframe="all", limit=1)
+        all_time_pairs = self._top_token_pairs("all", 1)
         if not all_time_pairs:
             return {"token_pair": None, "profit": 0}
 
@@ -621,7 +614,6 @@ async def _get_most_profitable_pair(self) -> Dict[str, Any]:
             "profit": all_time_pairs[0].get("total_profit", 0),
         }
 
-
 async def create_profit_tracker(
     config: Optional[Dict[str, Any]] = None,
 ) -> ProfitTracker:
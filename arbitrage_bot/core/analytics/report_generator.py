@@ -356,9 +356,8 @@ async def _generate_daily_report(self, date: Optional[str] = None) -> Dict[str,
         # Get profit data if available
         if self.profit_tracker:
             try:
-                # Get profit data for the day
-                profit_data = await self.profit_tracker.get_profit_by_token_pair(timeframe="24h")
-                roi_data = await self.profit_tracker.get_roi(timeframe="24h")
+                # Get profit data for the day from the daily aggregates
+                profit_data = roi_data = await self.profit_tracker.get_period_profit(start_time, end_time)
 
                 report_data['profit'] = {
                     'total_profit': profit_data.get('total_profit', 0),
@@ -469,9 +468,8 @@ async def _generate_weekly_report(self, week_start: Optional[str] = None) -> Dic
         # Get profit data if available
         if self.profit_tracker:
             try:
-                # Get profit data for the week
-                profit_data = await self.profit_tracker.get_profit_by_token_pair(timeframe="7d")
-                roi_data = await self.profit_tracker.get_roi(timeframe="7d")
+                # Get profit data for the week from the daily aggregates
+                profit_data = roi_data = await self.profit_tracker.get_period_profit(start_date, end_date)
 
                 report_data['profit'] = {
                     'total_profit': profit_data.get('total_profit', 0),
@@ -594,9 +592,8 @@ async def _generate_monthly_report(self, month: Optional[str] = None) -> Dict[st
         # Get profit data if available
         if self.profit_tracker:
             try:
-                # Get profit data for the month
-                profit_data = await self.profit_tracker.get_profit_by_token_pair(timeframe="30d") # Approximation
-                roi_data = await self.profit_tracker.get_roi(timeframe="30d") # Approximation
+                # Get profit data for the month from the daily aggregates
+                profit_data = roi_data = await self.profit_tracker.get_period_profit(start_date, end_date)
 
                 report_data['profit'] = {
                     'total_profit': profit_data.get('total_profit', 0),
@@ -0,0 +1,430 @@
+"""
+Rolling Aggregates Module
+
+Provides incremental, time-bucketed aggregates for the analytics components.
+
+Samples are folded into:
+- Tiers: minute/hour/day pre-aggregates used for time series and calendar
+  periods, each trimmed to its retention
+- Sliding windows (e.g. 1h, 24h, 7d): running sums kept per bucket and
+  subtracted when a bucket leaves the window
+
+Adding a sample is O(1) and every query is O(buckets), independent of the
+number of trades.
+"""
+
+import logging
+import math
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Tier name -> (resolution in seconds, retention in seconds or None to keep)
+DEFAULT_TIERS: Dict[str, Tuple[int, Optional[int]]] = {
+    "minute": (MINUTE, 30 * DAY),
+    "hour": (HOUR, 400 * DAY),
+    "day": (DAY, None),
+}
+
+# Windows use the finest default tier resolution that keeps them under this many buckets
+MAX_WINDOW_BUCKETS = 2400
+
+
+@dataclass
+class Accumulator:
+    """Subtractable running statistics over a set of samples."""
+
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    volume: float = 0.0
+    cost: float = 0.0
+    wins: int = 0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+
+    def add(self, value: float, volume: float = 0.0, cost: float = 0.0) -> None:
+        """Add one sample."""
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.volume += volume
+        self.cost += cost
+        if value > 0:
+            self.wins += 1
+            self.gross_profit += value
+        elif value < 0:
+            self.gross_loss -= value
+
+    def merge(self, other: "Accumulator", sign: int = 1) -> None:
+        """Add (sign=1) or subtract (sign=-1) another accumulator."""
+        self.count += sign * other.count
+        self.total += sign * other.total
+        self.total_sq += sign * other.total_sq
+        self.volume += sign * other.volume
+        self.cost += sign * other.cost
+        self.wins += sign * other.wins
+        self.gross_profit += sign * other.gross_profit
+        self.gross_loss += sign * other.gross_loss
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mean(self) -> float:
+        """Mean of the sample values."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1) of the values."""
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.count) / (
+            self.count - 1
+        )
+        # Clamp rounding noise from subtracting expired buckets
+        return math.sqrt(max(variance, 0.0))
+
+
+@dataclass
+class Sample:
+    """
+    One aggregated observation.
+
+    ``value`` feeds the main statistics (e.g. profit). ``level`` is a
+    running level such as portfolio value, ``ret`` the return since the
+    previous sample and ``drawdown`` the drawdown from the running peak.
+    """
+
+    timestamp: float
+    value: float
+    volume: float = 0.0
+    cost: float = 0.0
+    key: Optional[str] = None
+    level: Optional[float] = None
+    ret: Optional[float] = None
+    drawdown: Optional[float] = None
+
+
+class Aggregates:
+    """Statistics for a group of samples, overall and per key."""
+
+    def __init__(self):
+        self.stats = Accumulator()
+        self.returns = Accumulator()
+        self.downside = Accumulator()
+        self.drawdowns = Accumulator()
+        self.keys: Dict[str, Accumulator] = {}
+
+    def add(self, sample: Sample) -> None:
+        """Add one sample."""
+        self.stats.add(sample.value, sample.volume, sample.cost)
+        if sample.key is not None:
+            if sample.key not in self.keys:
+                self.keys[sample.key] = Accumulator()
+            self.keys[sample.key].add(sample.value, sample.volume, sample.cost)
+        if sample.ret is not None:
+            self.returns.add(sample.ret)
+            if sample.ret < 0:
+                self.downside.add(sample.ret)
+        if sample.drawdown is not None:
+            self.drawdowns.add(sample.drawdown)
+
+    def merge(self, other: "Aggregates", sign: int = 1) -> None:
+        """Add (sign=1) or subtract (sign=-1) another group."""
+        self.stats.merge(other.stats, sign)
+        self.returns.merge(other.returns, sign)
+        self.downside.merge(other.downside, sign)
+        self.drawdowns.merge(other.drawdowns, sign)
+        for key, acc in other.keys.items():
+            if key not in self.keys:
+                self.keys[key] = Accumulator()
+            self.keys[key].merge(acc, sign)
+            if self.keys[key].count <= 0:
+                del self.keys[key]
+
+    def reset(self) -> None:
+        """Drop all statistics, keeping the same key mapping object."""
+        self.stats = Accumulator()
+        self.returns = Accumulator()
+        self.downside = Accumulator()
+        self.drawdowns = Accumulator()
+        self.keys.clear()
+
+
+class Bucket(Aggregates):
+    """Aggregates for one time bucket, plus its first/last samples and peak drawdown."""
+
+    def __init__(self, start: float):
+        super().__init__()
+        self.start = start
+        self.first: Optional[Sample] = None
+        self.last: Optional[Sample] = None
+        self.max_drawdown = 0.0
+
+    def add(self, sample: Sample) -> None:
+        """Add one sample."""
+        super().add(sample)
+        if self.first is None or sample.timestamp < self.first.timestamp:
+            self.first = sample
+        if self.last is None or sample.timestamp >= self.last.timestamp:
+            self.last = sample
+        if sample.drawdown is not None:
+            self.max_drawdown = max(self.max_drawdown, sample.drawdown)
+
+
+class SlidingWindow(Aggregates):
+    """
+    Running aggregates over the last ``span`` seconds.
+
+    Samples are grouped into buckets of ``resolution`` seconds. A bucket is
+    subtracted once it lies entirely before the window, so the window covers
+    at most one extra bucket. A window without a span never expires.
+    """
+
+    def __init__(self, name: str, span: Optional[float], resolution: Optional[float]):
+        super().__init__()
+        self.name = name
+        self.span = span
+        self.resolution = resolution
+        self._buckets: List[Bucket] = []
+
+    def _bucket_start(self, timestamp: float) -> float:
+        if not self.resolution:
+            return 0.0
+        return timestamp - timestamp % self.resolution
+
+    def add(self, sample: Sample, now: Optional[float] = None) -> None:
+        """Add a sample unless it is already outside the window."""
+        if self.span is not None:
+            now = time.time() if now is None else now
+            if sample.timestamp < self._bucket_start(now - self.span):
+                return
+
+        start = self._bucket_start(sample.timestamp)
+        if self._buckets and self._buckets[-1].start == start:
+            bucket = self._buckets[-1]
+        elif not self._buckets or start > self._buckets[-1].start:
+            bucket = Bucket(start)
+            self._buckets.append(bucket)
+        else:
+            # Out-of-order sample
+            index = bisect_left(self._buckets, start, key=lambda b: b.start)
+            if index < len(self._buckets) and self._buckets[index].start == start:
+                bucket = self._buckets[index]
+            else:
+                bucket = Bucket(start)
+                self._buckets.insert(index, bucket)
+
+        bucket.add(sample)
+        super().add(sample)
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """Subtract buckets that have left the window."""
+        if self.span is None:
+            return
+        now = time.time() if now is None else now
+        cutoff = now - self.span
+
+        expired = 0
+        for bucket in self._buckets:
+            if bucket.start + self.resolution > cutoff:
+                break
+            self.merge(bucket, -1)
+            expired += 1
+
+        if expired:
+            del self._buckets[:expired]
+            if not self._buckets:
+                # Start clean rather than carry rounding residue
+                self.reset()
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._buckets = []
+        self.reset()
+
+    def __len__(self) -> int:
+        return self.stats.count
+
+    @property
+    def first(self) -> Optional[Sample]:
+        """Earliest sample in the window."""
+        return self._buckets[0].first if self._buckets else None
+
+    @property
+    def last(self) -> Optional[Sample]:
+        """Latest sample in the window."""
+        return self._buckets[-1].last if self._buckets else None
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest drawdown of any sample in the window."""
+        return max((b.max_drawdown for b in self._buckets), default=0.0)
+
+
+class Tier:
+    """Fixed-resolution pre-aggregates with optional retention."""
+
+    def __init__(self, resolution: float, retention: Optional[float] = None):
+        self.resolution = resolution
+        self.retention = retention
+        self._starts: List[float] = []
+        self._buckets: Dict[float, Accumulator] = {}
+
+    def add(self, sample: Sample) -> None:
+        """Add one sample to its bucket."""
+        start = sample.timestamp - sample.timestamp % self.resolution
+        bucket = self._buckets.get(start)
+        if bucket is None:
+            if self.retention is not None and self._starts:
+                if start < self._starts[-1] - self.retention:
+                    return
+            bucket = Accumulator()
+            self._buckets[start] = bucket
+            if not self._starts or start > self._starts[-1]:
+                self._starts.append(start)
+            else:
+                self._starts.insert(bisect_left(self._starts, start), start)
+            self._prune()
+        bucket.add(sample.value, sample.volume, sample.cost)
+
+    def _prune(self) -> None:
+        """Drop buckets older than the retention."""
+        if self.retention is None:
+            return
+        cutoff = self._starts[-1] - self.retention
+        expired = bisect_left(self._starts, cutoff)
+        for start in self._starts[:expired]:
+            del self._buckets[start]
+        del self._starts[:expired]
+
+    @property
+    def horizon(self) -> Optional[float]:
+        """Start of the oldest retained bucket."""
+        return self._starts[0] if self._starts else None
+
+    def covers(self, start: float) -> bool:
+        """Whether the tier still holds every bucket from ``start`` on."""
+        if self.retention is None or not self._starts:
+            return True
+        return start >= self._starts[-1] - self.retention
+
+    def range(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[Tuple[float, Accumulator]]:
+        """Iterate (bucket start, stats) for buckets in [start, end)."""
+        lo = 0 if start is None else bisect_left(self._starts, start)
+        hi = len(self._starts) if end is None else bisect_left(self._starts, end)
+        for bucket_start in self._starts[lo:hi]:
+            yield bucket_start, self._buckets[bucket_start]
+
+    def total(self, start: Optional[float] = None, end: Optional[float] = None) -> Accumulator:
+        """Combined stats of the buckets in [start, end)."""
+        result = Accumulator()
+        for _, bucket in self.range(start, end):
+            result.merge(bucket)
+        return result
+
+    def clear(self) -> None:
+        """Drop all buckets."""
+        self._starts = []
+        self._buckets = {}
+
+
+class RollingAggregator:
+    """
+    Incremental aggregates over named sliding windows and bucket tiers.
+
+    Args:
+        windows: Window name -> span in seconds (None for all time)
+        tiers: Tier name -> (resolution, retention) in seconds
+        max_window_buckets: Upper bound on buckets kept per window
+    """
+
+    def __init__(
+        self,
+        windows: Dict[str, Optional[float]],
+        tiers: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+        max_window_buckets: int = MAX_WINDOW_BUCKETS,
+    ):
+        tiers = DEFAULT_TIERS if tiers is None else tiers
+        self.tiers: Dict[str, Tier] = {
+            name: Tier(resolution, retention)
+            for name, (resolution, retention) in tiers.items()
+        }
+
+        resolutions = sorted(r for r, _ in DEFAULT_TIERS.values())
+        self.windows: Dict[str, SlidingWindow] = {}
+        for name, span in windows.items():
+            resolution = None
+            if span is not None:
+                resolution = next(
+                    (r for r in resolutions if span / r <= max_window_buckets),
+                    resolutions[-1],
+                )
+            self.windows[name] = SlidingWindow(name, span, resolution)
+
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+    def add(self, sample: Sample, now: Optional[float] = None) -> None:
+        """Fold one sample into every window and tier."""
+        now = time.time() if now is None else now
+        for window in self.windows.values():
+            window.add(sample, now)
+        for tier in self.tiers.values():
+            tier.add(sample)
+
+        if self.first_timestamp is None or sample.timestamp < self.first_timestamp:
+            self.first_timestamp = sample.timestamp
+        if self.last_timestamp is None or sample.timestamp > self.last_timestamp:
+            self.last_timestamp = sample.timestamp
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """Expire old buckets from every window."""
+        now = time.time() if now is None else now
+        for window in self.windows.values():
+            window.expire(now)
+
+    def window(self, name: str, now: Optional[float] = None) -> SlidingWindow:
+        """Get an up-to-date window by name."""
+        window = self.windows[name]
+        window.expire(now)
+        return window
+
+    def tier_for(self, interval: float, start: float) -> Optional[Tier]:
+        """
+        Pick the coarsest tier that can serve a series.
+
+        Args:
+            interval: Series interval in seconds
+            start: Series start time
+
+        Returns:
+            Tier whose resolution divides the interval and whose retention
+            covers the start, or None if no tier can
+        """
+        candidates = [
+            tier
+            for tier in self.tiers.values()
+            if interval % tier.resolution == 0 and tier.covers(start)
+        ]
+        return max(candidates, key=lambda t: t.resolution, default=None)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        for window in self.windows.values():
+            window.clear()
+        for tier in self.tiers.values():
+            tier.clear()
+        self.first_timestamp = None
+        self.last_timestamp = None
@@ -0,0 +1,465 @@
+"""
+Trade Store Module
+
+Provides an append-only store for trades, profits and market samples shared
+by the analytics components.
+
+Records live in a single SQLite database in WAL mode. Each record belongs to
+a stream (e.g. "profit", "journal", "price") and carries typed numeric
+columns used for aggregation next to its full JSON payload:
+- Appends are a single indexed INSERT, independent of history size, queued
+  to a writer thread and group-committed off the event loop
+- Time-range scans use the (stream, ts) index
+- Typed columns can be read straight into NumPy arrays
+- Async callers use the ``*_async`` variants, which wait for pending
+  commits and run the SELECT in an executor so the loop never blocks
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...utils.sqlite_writer import SQLiteWriter
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "analytics.db"
+
+# Typed columns available for column reads
+NUMERIC_COLUMNS = ("ts", "value", "amount", "cost")
+TEXT_COLUMNS = ("key",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream TEXT NOT NULL,
+    ts REAL NOT NULL,
+    key TEXT,
+    value REAL,
+    amount REAL,
+    cost REAL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_stream_ts ON records (stream, ts);
+CREATE INDEX IF NOT EXISTS idx_records_stream_key_ts ON records (stream, key, ts);
+"""
+
+INSERT_RECORD = (
+    "INSERT INTO records (id, stream, ts, key, value, amount, cost, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# One store per database file, shared by all analytics components
+_stores: Dict[str, "TradeStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def to_epoch(timestamp: Any) -> float:
+    """Convert a datetime (naive values are UTC) or ISO string to epoch seconds."""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _encode(value: Any) -> Any:
+    """JSON fallback for datetimes, Decimals and sets."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, set):
+        return sorted(value)
+    return str(value)
+
+
+def _decode(payload: str) -> Dict[str, Any]:
+    """Load a payload, restoring its top-level timestamp as a datetime."""
+    record = json.loads(payload)
+    if isinstance(record.get("timestamp"), str):
+        try:
+            record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+        except ValueError:
+            pass
+    return record
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Best-effort numeric conversion for typed columns."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TradeStore:
+    """
+    Append-only SQLite store for analytics records.
+
+    Use :func:`get_trade_store` to share one instance per database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # Row ids are assigned here so appends return without waiting for the writer
+        last_id = self._conn.execute("SELECT MAX(id) FROM records").fetchone()[0]
+        self._next_id = (last_id or 0) + 1
+        self._writer = SQLiteWriter(path).start()
+
+    def _allocate_ids(self, count: int) -> int:
+        """Reserve ``count`` consecutive row ids and return the first."""
+        with self._lock:
+            first = self._next_id
+            self._next_id += count
+            return first
+
+    def flush(self) -> None:
+        """Wait until every queued write is committed."""
+        self._writer.flush()
+
+    async def flush_async(self) -> None:
+        """Wait, without blocking the loop, until every queued write is committed."""
+        await self._writer.flush_async()
+
+    def append(
+        self,
+        stream: str,
+        record: Dict[str, Any],
+        key: Optional[str] = None,
+        value: Any = None,
+        amount: Any = None,
+        cost: Any = None,
+    ) -> int:
+        """
+        Append a record.
+
+        Args:
+            stream: Stream name
+            record: Full record; its ``timestamp`` (default now) orders the stream
+            key: Optional grouping key (token pair, token address, trade id)
+            value: Primary numeric value (e.g. profit or price)
+            amount: Secondary numeric value (e.g. volume or amount in)
+            cost: Cost value (e.g. gas cost)
+
+        Returns:
+            Row id of the new record
+        """
+        ts = to_epoch(record.get("timestamp") or datetime.utcnow())
+        payload = json.dumps(record, default=_encode)
+        row_id = self._allocate_ids(1)
+        self._writer.submit(
+            INSERT_RECORD,
+            (row_id, stream, ts, key, _as_float(value), _as_float(amount), _as_float(cost), payload),
+        )
+        return row_id
+
+    def append_many(
+        self, stream: str, rows: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> None:
+        """
+        Append several records in one transaction.
+
+        Args:
+            stream: Stream name
+            rows: (record, columns) pairs, columns holding key/value/amount/cost
+        """
+        self._writer.submit(INSERT_RECORD, self._rows_params(stream, rows), many=True).result()
+
+    async def append_many_async(
+        self, stream: str, rows: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> None:
+        """Append several records in one transaction without blocking the loop."""
+        future = await self._writer.enqueue(
+            INSERT_RECORD, self._rows_params(stream, rows), many=True
+        )
+        await asyncio.wrap_future(future)
+
+    def _rows_params(
+        self, stream: str, rows: Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Tuple[Any, ...]]:
+        """INSERT parameters for ``rows``, with freshly allocated row ids."""
+        first_id = self._allocate_ids(len(rows))
+        return [
+            (
+                first_id + i,
+                stream,
+                to_epoch(record.get("timestamp") or datetime.utcnow()),
+                columns.get("key"),
+                _as_float(columns.get("value")),
+                _as_float(columns.get("amount")),
+                _as_float(columns.get("cost")),
+                json.dumps(record, default=_encode),
+            )
+            for i, (record, columns) in enumerate(rows)
+        ]
+
+    def replace(self, row_id: int, record: Dict[str, Any]) -> None:
+        """Rewrite the payload of one record (e.g. journal notes and tags)."""
+        self._writer.submit(
+            "UPDATE records SET payload = ? WHERE id = ?",
+            (json.dumps(record, default=_encode), row_id),
+        )
+
+    def _where(
+        self,
+        stream: str,
+        start: Any = None,
+        end: Any = None,
+        key: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause for a stream/time/key selection."""
+        clauses = ["stream = ?"]
+        params: List[Any] = [stream]
+        if key is not None:
+            clauses.append("key = ?")
+            params.append(key)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(to_epoch(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(to_epoch(end))
+        return " AND ".join(clauses), params
+
+    def scan(
+        self,
+        stream: str,
+        start: Any = None,
+        end: Any = None,
+        key: Optional[str] = None,
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Iterate records of a stream in time order.
+
+        Args:
+            stream: Stream name
+            start: Inclusive start time
+            end: Exclusive end time
+            key: Optional key filter
+
+        Yields:
+            (row id, record) pairs
+        """
+        where, params = self._where(stream, start, end, key)
+        self.flush()
+        for row_id, payload in self._select_payloads(where, params):
+            yield row_id, _decode(payload)
+
+    async def scan_async(
+        self,
+        stream: str,
+        start: Any = None,
+        end: Any = None,
+        key: Optional[str] = None,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Like :meth:`scan`, without blocking the loop; returns a list."""
+        where, params = self._where(stream, start, end, key)
+        await self.flush_async()
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: [
+                (row_id, _decode(payload))
+                for row_id, payload in self._select_payloads(where, params)
+            ],
+        )
+
+    def _select_payloads(self, where: str, params: List[Any]) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT id, payload FROM records WHERE {where} ORDER BY ts, id", params
+            ).fetchall()
+
+    def columns(
+        self,
+        stream: str,
+        names: Sequence[str] = NUMERIC_COLUMNS,
+        start: Any = None,
+        end: Any = None,
+        key: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read typed columns of a stream as NumPy arrays, in time order.
+
+        Numeric columns are float arrays with missing values as NaN; the
+        ``key`` column is an object array with missing values as None.
+        """
+        where, params = self._columns_query(stream, names, start, end, key)
+        self.flush()
+        return self._select_columns(names, where, params)
+
+    async def columns_async(
+        self,
+        stream: str,
+        names: Sequence[str] = NUMERIC_COLUMNS,
+        start: Any = None,
+        end: Any = None,
+        key: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Like :meth:`columns`, without blocking the loop."""
+        where, params = self._columns_query(stream, names, start, end, key)
+        await self.flush_async()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._select_columns, names, where, params
+        )
+
+    def _columns_query(
+        self, stream: str, names: Sequence[str], start: Any, end: Any, key: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        unknown = set(names) - set(NUMERIC_COLUMNS) - set(TEXT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {sorted(unknown)}")
+        return self._where(stream, start, end, key)
+
+    def _select_columns(
+        self, names: Sequence[str], where: str, params: List[Any]
+    ) -> Dict[str, np.ndarray]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(names)} FROM records WHERE {where} ORDER BY ts, id",
+                params,
+            ).fetchall()
+
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        return {
+            name: np.array(
+                column, dtype=object if name in TEXT_COLUMNS else np.float64
+            )
+            for name, column in zip(names, values)
+        }
+
+    def count(self, stream: str) -> int:
+        """Number of records in a stream."""
+        self.flush()
+        return self._select_count(stream)
+
+    async def count_async(self, stream: str) -> int:
+        """Like :meth:`count`, without blocking the loop."""
+        await self.flush_async()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._select_count, stream
+        )
+
+    def _select_count(self, stream: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM records WHERE stream = ?", (stream,)
+            ).fetchone()[0]
+
+    def prune(self, stream: str, before: Any, key: Optional[str] = None) -> Future:
+        """
+        Delete records older than ``before``.
+
+        Returns:
+            Future resolved with the writer result; its ``rowcount`` is the
+            number of records removed
+        """
+        where, params = self._where(stream, end=before, key=key)
+        return self._writer.submit(f"DELETE FROM records WHERE {where}", params)
+
+    def import_legacy(
+        self,
+        legacy_file: str,
+        rows_by_stream: Dict[str, Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]],
+    ) -> int:
+        """
+        Import records from a legacy JSON file once, then retire the file.
+
+        Streams that already hold records are skipped. The file is renamed
+        with a ``.migrated`` suffix so it is not imported again.
+
+        Args:
+            legacy_file: Legacy JSON file the rows were read from
+            rows_by_stream: (record, columns) pairs per stream, columns
+                holding key/value/amount/cost
+
+        Returns:
+            Number of records imported
+        """
+        imported = 0
+        for stream, rows in rows_by_stream.items():
+            if rows and self.count(stream) == 0:
+                self.append_many(stream, rows)
+                imported += len(rows)
+        self._retire_legacy(legacy_file, imported)
+        return imported
+
+    async def import_legacy_async(
+        self,
+        legacy_file: str,
+        rows_by_stream: Dict[str, Sequence[Tuple[Dict[str, Any], Dict[str, Any]]]],
+    ) -> int:
+        """Like :meth:`import_legacy`, without blocking the loop."""
+        imported = 0
+        for stream, rows in rows_by_stream.items():
+            if rows and await self.count_async(stream) == 0:
+                await self.append_many_async(stream, rows)
+                imported += len(rows)
+        self._retire_legacy(legacy_file, imported)
+        return imported
+
+    def _retire_legacy(self, legacy_file: str, imported: int) -> None:
+        try:
+            os.replace(legacy_file, legacy_file + ".migrated")
+        except OSError as e:
+            logger.error(f"Failed to retire legacy file {legacy_file}: {e}")
+
+        logger.info(f"Imported {imported} records from {legacy_file}")
+
+    def close(self) -> None:
+        """Commit queued writes and close the database connections."""
+        self._writer.close()
+        with self._lock:
+            self._conn.close()
+        with _stores_lock:
+            if _stores.get(self.path) is self:
+                del _stores[self.path]
+
+
+def get_trade_store(storage_dir: str) -> TradeStore:
+    """
+    Get the shared store for an analytics storage directory.
+
+    Args:
+        storage_dir: Analytics storage directory
+
+    Returns:
+        TradeStore instance
+    """
+    path = os.path.join(storage_dir, DB_FILENAME)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = TradeStore(path)
+            _stores[path] = store
+        return store
+
@@ -13,6 +13,8 @@
 import os
 # from pathlib import Path # Removed unused import
 
+from .trade_store import TradeStore, get_trade_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +48,8 @@ def __init__(self, config: Optional[Dict[str, Any]] = None):
         # Storage paths
         self.storage_dir = self.config.get("storage_dir", "analytics")
         self.journal_file = os.path.join(self.storage_dir, "trading_journal.json")
+        self.store: Optional[TradeStore] = None
+        self._trade_rows: Dict[str, int] = {}  # trade id -> store row id
 
         # Analysis settings
         self.min_profit_threshold = float(self.config.get("min_profit_threshold", 0.0))
@@ -61,6 +65,7 @@ async def initialize(self) -> bool:
         try:
             # Create storage directory if it doesn't exist
             os.makedirs(self.storage_dir, exist_ok=True)
+            self.store = get_trade_store(self.storage_dir)
 
             # Load historical data if available
             await self._load_journal_data()
@@ -76,58 +81,60 @@ async def initialize(self) -> bool:
     async def _load_journal_data(self) -> None:
         """Load journal data from storage."""
         try:
-            if os.path.exists(self.journal_file):
-                async with self.lock:
+            async with self.lock:
+                # Move a legacy JSON journal into the store once
+                if os.path.exists(self.journal_file):
                     with open(self.journal_file, "r") as f:
                         data = json.load(f)
+                    await self.store.import_legacy_async(
+                        self.journal_file,
+                        {
+                            "journal": [
+                                (trade, self._columns(trade))
+                                for trade in data.get("trades", [])
+                            ]
+                        },
+                    )
 
-                    # Process trades
-                    if "trades" in data:
-                        trades = data["trades"]
-                        # Convert string timestamps to datetime objects
-                        for trade in trades:
-                            if "timestamp" in trade:
-                                trade["timestamp"] = datetime.fromisoformat(
-                                    trade["timestamp"]
-                                )
-                        self._trades = trades
-
-                    # Process tags and categories
-                    if "tags" in data:
-                        self._tags = set(data["tags"])
-                    if "categories" in data:
-                        self._categories = set(data["categories"])
+                self._trades = []
+                for row_id, trade in await self.store.scan_async("journal"):
+                    self._index_trade(trade, row_id)
 
+                if self._trades:
                     logger.info(f"Loaded {len(self._trades)} trades from journal")
-            else:
-                logger.info("No trading journal data found")
+                else:
+                    logger.info("No trading journal data found")
         except Exception as e:
             logger.error(f"Error loading trading journal data: {e}")
 
-    async def _save_journal_data(self) -> None:
-        """Save journal data to storage."""
+    @staticmethod
+    def _columns(trade: Dict[str, Any]) -> Dict[str, Any]:
+        """Typed store columns for a journal trade."""
+        return {
+            "key": trade.get("id"),
+            "value": trade.get("profit"),
+            "amount": trade.get("amount_in"),
+            "cost": trade.get("gas_cost"),
+        }
+
+    def _index_trade(self, trade: Dict[str, Any], row_id: int) -> None:
+        """Add a stored trade to the in-memory journal."""
+        self._trades.append(trade)
+        if trade.get("id") is not None:
+            self._trade_rows[trade["id"]] = row_id
+        if "category" in trade:
+            self._categories.add(trade["category"])
+        for tag in trade.get("tags", []):
+            self._tags.add(tag)
+
+    def _persist_trade_update(self, trade: Dict[str, Any]) -> None:
+        """Rewrite a single stored trade after notes or tags change."""
         try:
-            async with self.lock:
-                # Prepare data for serialization
-                serialized_trades = []
-                for trade in self._trades:
-                    trade_copy = trade.copy()
-                    if isinstance(trade_copy.get("timestamp"), datetime):
-                        trade_copy["timestamp"] = trade_copy["timestamp"].isoformat()
-                    serialized_trades.append(trade_copy)
-
-                data = {
-                    "trades": serialized_trades,
-                    "tags": list(self._tags),
-                    "categories": list(self._categories),
-                }
-
-                with open(self.journal_file, "w") as f:
-                    json.dump(data, f, indent=2)
-
-                logger.info(f"Saved {len(self._trades)} trades to journal")
+            row_id = self._trade_rows.get(trade.get("id"))
+            if row_id is not None:
+                self.store.replace(row_id, trade)
         except Exception as e:
-            logger.error(f"Error saving trading journal data: {e}")
+            logger.error(f"Error saving trade update: {e}")
 
     async def log_trade(self, trade_data: Dict[str, Any]) -> None:
         """
@@ -203,18 +210,15 @@ async def log_trade(self, trade_data: Dict[str, Any]) -> None:
                 trade_data["tags"].append("gas_heavy")
 
         async with self.lock:
-            # Add to trades
-            self._trades.append(trade_data)
-
-            # Update tags and categories
-            if "category" in trade_data:
-                self._categories.add(trade_data["category"])
-
-            for tag in trade_data.get("tags", []):
-                self._tags.add(tag)
-
-            # Save to storage
-            await self._save_journal_data()
+            # Append to storage, then add to trades, tags and categories
+            try:
+                row_id = self.store.append(
+                    "journal", trade_data, **self._columns(trade_data)
+                )
+            except Exception as e:
+                logger.error(f"Error saving journal trade: {e}")
+                row_id = None
+            self._index_trade(trade_data, row_id)
 
     async def get_trades(
         self,
@@ -450,7 +454,7 @@ async def add_note_to_trade(self, trade_id: str, note: str) -> bool:
                     )
 
                     # Save to storage
-                    await self._save_journal_data()
+                    self._persist_trade_update(trade)
                     return True
 
             return False
@@ -482,7 +486,7 @@ async def add_tag_to_trade(self, trade_id: str, tag: str) -> bool:
                         self._tags.add(tag)
 
                     # Save to storage
-                    await self._save_journal_data()
+                    self._persist_trade_update(trade)
                     return True
 
             return False
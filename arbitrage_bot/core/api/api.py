@@ -10,8 +10,11 @@
 from fastapi import FastAPI, HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel, Field
 
+from ...utils.profiler import Profile, SamplingProfiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,6 +82,14 @@ def __init__(self, config: Dict[str, Any]):
         # Security
         self.security = HTTPBearer()
 
+        # Sampling profiler (opt-in)
+        self.profiler: Optional[SamplingProfiler] = None
+        if config.get("profiler_enabled", False):
+            self.profiler = SamplingProfiler(
+                interval=config.get("profiler_interval", 0.01),
+                max_duration=config.get("profiler_max_duration", 60.0),
+            )
+
         # Register routes
         self._register_routes()
 
@@ -194,6 +205,79 @@ async def delete_api_key(
                 logger.error(f"Failed to delete API key: {e}")
                 raise HTTPException(status_code=500, detail="Failed to delete API key")
 
+        # Profiler endpoints
+        @self.app.get("/api/v1/profiler/status")
+        async def profiler_status(
+            token: HTTPAuthorizationCredentials = Security(self.security),
+        ) -> Dict[str, Any]:
+            """Get profiler status."""
+            self._verify_token(token.credentials)
+            profiler = self._get_profiler()
+            return profiler.get_stats()
+
+        @self.app.post("/api/v1/profiler/capture")
+        async def capture_profile(
+            duration: float = 10.0,
+            interval: Optional[float] = None,
+            output: str = "json",
+            token: HTTPAuthorizationCredentials = Security(self.security),
+        ):
+            """Sample all threads for ``duration`` seconds and return the profile."""
+            self._verify_token(token.credentials)
+            profiler = self._get_profiler()
+            if output not in ("json", "collapsed", "svg"):
+                raise HTTPException(status_code=400, detail=f"Unknown output: {output}")
+
+            try:
+                profile = await profiler.capture(duration, interval)
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            except Exception as e:
+                logger.error(f"Profile capture failed: {e}")
+                raise HTTPException(status_code=500, detail="Profile capture failed")
+
+            return self._render_profile(profile, output)
+
+        @self.app.get("/api/v1/profiler/last")
+        async def last_profile(
+            output: str = "json",
+            token: HTTPAuthorizationCredentials = Security(self.security),
+        ):
+            """Get the most recent profile."""
+            self._verify_token(token.credentials)
+            profiler = self._get_profiler()
+            if profiler.last_profile is None:
+                raise HTTPException(status_code=404, detail="No profile captured")
+            if output not in ("json", "collapsed", "svg"):
+                raise HTTPException(status_code=400, detail=f"Unknown output: {output}")
+            return self._render_profile(profiler.last_profile, output)
+
+    def _get_profiler(self) -> SamplingProfiler:
+        """Get the profiler, or fail if it is not enabled.
+
+        Returns:
+            Sampling profiler
+        """
+        if self.profiler is None:
+            raise HTTPException(status_code=404, detail="Profiler is not enabled")
+        return self.profiler
+
+    def _render_profile(self, profile: Profile, output: str):
+        """Render a profile as a JSON summary, collapsed stacks or SVG.
+
+        Args:
+            profile: Captured profile
+            output: ``json``, ``collapsed`` or ``svg``
+
+        Returns:
+            Response body
+        """
+        if output == "collapsed":
+            return PlainTextResponse(profile.collapsed())
+        if output == "svg":
+            return Response(content=profile.to_svg(), media_type="image/svg+xml")
+        return profile.summary()
+
     def _verify_credentials(self, username: str, password: str) -> bool:
         """Verify user credentials.
 
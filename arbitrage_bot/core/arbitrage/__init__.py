@@ -5,19 +5,24 @@
 execution, analytics, and market data management.
 """
 
-from .base_system import BaseArbitrageSystem
-from .discovery_manager import DiscoveryManager
-from .execution_manager import EnhancedExecutionManager
-from .analytics_manager import AnalyticsManager
-from .interfaces import ExecutionManager # Removed MarketDataProvider
-from .market_data_provider import MarketDataProvider
-from .discovery.integration import integrate_dex_discovery, setup_dex_discovery
-from .discovery import (
-    DEXDiscoveryManager,
-    create_dex_discovery_manager,
-    DEXInfo,
-    DEXProtocolType,
-)
+from typing import TYPE_CHECKING
+
+from ...utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .base_system import BaseArbitrageSystem
+    from .discovery_manager import DiscoveryManager
+    from .execution_manager import EnhancedExecutionManager
+    from .analytics_manager import AnalyticsManager
+    from .interfaces import ExecutionManager # Removed MarketDataProvider
+    from .market_data_provider import MarketDataProvider
+    from .discovery.integration import integrate_dex_discovery, setup_dex_discovery
+    from .discovery import (
+        DEXDiscoveryManager,
+        create_dex_discovery_manager,
+        DEXInfo,
+        DEXProtocolType,
+    )
 
 __all__ = [
     "BaseArbitrageSystem",
@@ -33,3 +38,21 @@
     "DEXInfo",
     "DEXProtocolType",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseArbitrageSystem": ".base_system",
+        "DiscoveryManager": ".discovery_manager",
+        "ExecutionManager": ".interfaces",
+        "EnhancedExecutionManager": ".execution_manager",
+        "AnalyticsManager": ".analytics_manager",
+        "MarketDataProvider": ".market_data_provider",
+        "integrate_dex_discovery": ".discovery.integration",
+        "setup_dex_discovery": ".discovery.integration",
+        "DEXDiscoveryManager": ".discovery",
+        "create_dex_discovery_manager": ".discovery",
+        "DEXInfo": ".discovery",
+        "DEXProtocolType": ".discovery",
+    },
+)
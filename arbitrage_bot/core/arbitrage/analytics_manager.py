@@ -14,6 +14,7 @@
 from .interfaces import ArbitrageAnalytics
 from .models import ArbitrageOpportunity, ExecutionResult
 from ..memory.memory_bank import MemoryBank
+from ...utils.telemetry import RecordType, publish
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,7 @@ async def record_opportunity(self, opportunity: ArbitrageOpportunity) -> None:
 
             # Store in memory bank
             await self._memory_bank.add_trade(opportunity_data)
+            publish(RecordType.OPPORTUNITY, opportunity_data)
 
             logger.debug(
                 f"Recorded opportunity {opportunity.id} with "
@@ -103,6 +105,7 @@ async def record_execution(self, execution_result: ExecutionResult) -> None:
 
             # Store in memory bank
             await self._memory_bank.add_trade(execution_data)
+            publish(RecordType.EXECUTION, execution_data)
 
             logger.debug(
                 f"Recorded execution {execution_result.id} with "
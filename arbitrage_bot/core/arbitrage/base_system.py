@@ -23,6 +23,7 @@
     ExecutionResult,
     ExecutionStatus,
 )
+from ...utils.latency import STATE_REFRESHED, mark, start_trace
 
 
 from .discovery.detectors.cross_dex_detector import CrossDexDetector
@@ -291,10 +292,14 @@ async def _discovery_loop(self):
 
         while True:
             try:
+                # Each cycle is one latency trace, starting from fresh market data
+                start_trace()
+
                 # Get current market condition
                 market_condition = (
                     await self._market_data_provider.get_current_market_condition()
                 )
+                mark(STATE_REFRESHED)
 
                 # Discover opportunities
                 opportunities = await self._discovery_manager.discover_opportunities(
@@ -365,6 +370,8 @@ async def _on_market_update(self, market_condition: Dict[str, Any]):
         """
         logger.debug("Received market update")
         # Trigger immediate opportunity discovery
+        start_trace()
+        mark(STATE_REFRESHED)
         try:
             opportunities = await self._discovery_manager.discover_opportunities(
                 max_results=self._max_opportunities,
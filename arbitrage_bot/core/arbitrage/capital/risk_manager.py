@@ -18,11 +18,12 @@
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Tuple, Set, Union
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from ..path.interfaces import ArbitragePath, MultiPathOpportunity
 from ...utils.async_utils import gather_with_concurrency
 from ...utils.retry import with_retry
+from arbitrage_bot.utils.streaming_stats import EWMA
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,8 @@ def __init__(
         self._lock = asyncio.Lock()
 
         # Historical performance data
-        self._trade_history = []
+        self._trade_history = deque(maxlen=volatility_window)
+        self._return_stats = EWMA(span=volatility_window)  # Realized per-trade returns
         self._token_risk_exposure = defaultdict(Decimal)
         self._dex_risk_exposure = defaultdict(Decimal)
         self._current_drawdown = Decimal("0")
@@ -325,9 +327,10 @@ async def update_risk_metrics(
                     }
                 )
 
-                # Limit history size
-                if len(self._trade_history) > self.volatility_window:
-                    self._trade_history = self._trade_history[-self.volatility_window :]
+                # Track realized return volatility
+                profit_loss = trade_result.get("profit_loss")
+                if profit_loss is not None and self._current_capital > 0:
+                    self._return_stats.add(float(profit_loss) / float(self._current_capital))
 
                 # Update current capital
                 self._current_capital = current_capital
@@ -476,8 +479,10 @@ def _calculate_sharpe_ratio(
             # Adjust for confidence
             expected_return *= Decimal(str(path.confidence))
 
-            # Calculate volatility (simplified)
+            # Calculate volatility: path uncertainty, or realized return volatility if higher
             volatility = Decimal("1") - Decimal(str(path.confidence))
+            if self._return_stats.count > 1:
+                volatility = max(volatility, Decimal(str(self._return_stats.std)))
             volatility = max(volatility, Decimal("0.01"))  # Avoid division by zero
 
             # Calculate Sharpe ratio
@@ -4,14 +4,19 @@
 This package provides components for discovering and validating arbitrage opportunities.
 """
 
-from .default_manager import DefaultDiscoveryManager
-from .sources.manager import DEXDiscoveryManager, create_dex_discovery_manager
-from .sources.base import DEXInfo, DEXProtocolType, DEXSource
-from .sources.repository import DEXRepository, create_dex_repository
-from .sources.validator import DEXValidator, create_dex_validator
-from .sources.defillama import DefiLlamaSource, create_defillama_source
-from .sources.dexscreener import DexScreenerSource, create_dexscreener_source
-from .sources.defipulse import DefiPulseSource, create_defipulse_source
+from typing import TYPE_CHECKING
+
+from ....utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .default_manager import DefaultDiscoveryManager
+    from .sources.manager import DEXDiscoveryManager, create_dex_discovery_manager
+    from .sources.base import DEXInfo, DEXProtocolType, DEXSource
+    from .sources.repository import DEXRepository, create_dex_repository
+    from .sources.validator import DEXValidator, create_dex_validator
+    from .sources.defillama import DefiLlamaSource, create_defillama_source
+    from .sources.dexscreener import DexScreenerSource, create_dexscreener_source
+    from .sources.defipulse import DefiPulseSource, create_defipulse_source
 
 __all__ = [
     "DefaultDiscoveryManager",
@@ -31,3 +36,25 @@
     "DefiPulseSource",
     "create_defipulse_source",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "DefaultDiscoveryManager": ".default_manager",
+        "DEXDiscoveryManager": ".sources.manager",
+        "create_dex_discovery_manager": ".sources.manager",
+        "DEXInfo": ".sources.base",
+        "DEXProtocolType": ".sources.base",
+        "DEXSource": ".sources.base",
+        "DEXRepository": ".sources.repository",
+        "create_dex_repository": ".sources.repository",
+        "DEXValidator": ".sources.validator",
+        "create_dex_validator": ".sources.validator",
+        "DefiLlamaSource": ".sources.defillama",
+        "create_defillama_source": ".sources.defillama",
+        "DexScreenerSource": ".sources.dexscreener",
+        "create_dexscreener_source": ".sources.dexscreener",
+        "DefiPulseSource": ".sources.defipulse",
+        "create_defipulse_source": ".sources.defipulse",
+    },
+)
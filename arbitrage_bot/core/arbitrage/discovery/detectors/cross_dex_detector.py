@@ -13,6 +13,7 @@
 from typing import Dict, List, Any, Optional, Set, Tuple, cast # Import Any
 
 from arbitrage_bot.dex.base_dex import BaseDEX
+from arbitrage_bot.utils.fixed_point import WAD, to_wad
 from ...interfaces import OpportunityDetector, MarketDataProvider
 # Import only the models that actually exist and are used
 from ...models import (
@@ -66,6 +67,10 @@ def __init__(self, dexes: List[BaseDEX], config: Dict[str, Any] = None):
             self.config.get("confidence_threshold", "0.7")
         )  # 70% confidence
 
+        # Integer thresholds for the opportunity math (ppm and basis points)
+        self._min_profit_ppm = int(self.min_profit_percentage * 10000)
+        self._gas_cost_buffer_bps = int(self.gas_cost_buffer_percentage * 100)
+
         # Cache for token pairs with timestamps
         self._token_pair_cache: Dict[str, Tuple[List[Any], float]] = {} # Use Any
         self._price_cache: Dict[str, Tuple[Decimal, float]] = {}
@@ -745,11 +750,17 @@ async def _create_opportunity(
             output_token_address = token_pair_buy.token1_address
             intermediate_token_address = token_pair_buy.token0_address
 
-        # Calculate price difference and potential profit
-        price_diff_percentage = (sell_price - buy_price) / buy_price * Decimal("100")
+        # Quoted prices become WAD fixed point once; the math below is integer
+        buy_price_wad = to_wad(buy_price)
+        sell_price_wad = to_wad(sell_price)
+        if buy_price_wad <= 0:
+            return None
+
+        # Calculate price difference (parts per million) and potential profit
+        price_diff_ppm = (sell_price_wad - buy_price_wad) * 1_000_000 // buy_price_wad
 
         # Skip if price difference is too small
-        if price_diff_percentage < self.min_profit_percentage:
+        if price_diff_ppm < self._min_profit_ppm:
             return None
 
         # Estimate gas costs
@@ -767,20 +778,16 @@ async def _create_opportunity(
         total_gas_estimate = estimated_gas_buy + estimated_gas_sell
 
         # Calculate gas cost
-        gas_cost_wei = total_gas_estimate * (gas_price + priority_fee)
+        gas_cost_wei = total_gas_estimate * int(gas_price + priority_fee)
 
         # Add buffer for potential increases
-        gas_cost_with_buffer = (
-            gas_cost_wei
-            * (Decimal("100") + self.gas_cost_buffer_percentage)
-            / Decimal("100")
-        )
+        gas_cost_with_buffer = gas_cost_wei * (10000 + self._gas_cost_buffer_bps) // 10000
 
         # Calculate token amounts for a sample trade to estimate profit
         # This uses a simplified approach - actual implementation would account for price impact
         input_amount_wei = 1 * 10**18  # 1 token as sample size
-        intermediate_amount_wei = input_amount_wei * buy_price
-        output_amount_wei = intermediate_amount_wei * sell_price
+        intermediate_amount_wei = input_amount_wei * buy_price_wad // WAD
+        output_amount_wei = intermediate_amount_wei * sell_price_wad // WAD
         expected_profit_wei = output_amount_wei - input_amount_wei
 
         # Check if profit exceeds gas costs and minimum profit threshold
@@ -834,11 +841,6 @@ async def _create_opportunity(
             },
         ]
 
-        # Calculate profit margin as percentage
-        profit_margin_percentage = (
-            Decimal("100") * (output_amount_wei - input_amount_wei) / input_amount_wei
-        )
-
         # Calculate profit after gas costs
         profit_after_gas = expected_profit_wei - gas_cost_wei
 
@@ -860,7 +862,7 @@ async def _create_opportunity(
             gas_cost_usd=0.0, # Placeholder
             net_profit_usd=0.0, # Placeholder
             confidence_score=float(self._calculate_confidence_score( # Ensure float
-                price_diff_percentage=price_diff_percentage,
+                price_diff_percentage=Decimal(price_diff_ppm) / 10000,
                 market_condition=market_condition,
                 token_pair_buy=token_pair_buy,
                 token_pair_sell=token_pair_sell,
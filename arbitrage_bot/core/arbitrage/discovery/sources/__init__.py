@@ -5,11 +5,16 @@
 and other sources of DEX contract addresses.
 """
 
-from .base import DEXSource, DEXInfo
-from .defillama import DefiLlamaSource
-from .defipulse import DefiPulseSource
-from .dexscreener import DexScreenerSource
-from .repository import DEXRepository
+from typing import TYPE_CHECKING
+
+from .....utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import DEXSource, DEXInfo
+    from .defillama import DefiLlamaSource
+    from .defipulse import DefiPulseSource
+    from .dexscreener import DexScreenerSource
+    from .repository import DEXRepository
 
 __all__ = [
     "DEXSource",
@@ -19,3 +24,15 @@
     "DexScreenerSource",
     "DEXRepository",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "DEXSource": ".base",
+        "DEXInfo": ".base",
+        "DefiLlamaSource": ".defillama",
+        "DefiPulseSource": ".defipulse",
+        "DexScreenerSource": ".dexscreener",
+        "DEXRepository": ".repository",
+    },
+)
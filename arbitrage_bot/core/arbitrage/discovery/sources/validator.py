@@ -6,12 +6,13 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
 
 from eth_utils import to_checksum_address
 
-# Assuming Web3Manager is correctly imported elsewhere if needed by the caller
-from arbitrage_bot.core.web3.web3_manager import Web3Manager # Use absolute import
+if TYPE_CHECKING:
+    # Only needed for annotations; importing web3 here would load it at startup
+    from arbitrage_bot.core.web3.web3_manager import Web3Manager
 from .base import DEXInfo, DEXProtocolType
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,7 @@ class DEXValidator:
     checking contract addresses and verifying protocol types.
     """
 
-    def __init__(self, web3_manager: Web3Manager, config: Optional[Dict[str, Any]] = None): # Use specific type hint
+    def __init__(self, web3_manager: "Web3Manager", config: Optional[Dict[str, Any]] = None): # Use specific type hint
         """
         Initialize the DEX validator.
 
@@ -362,7 +363,7 @@ async def _has_function(self, contract_address: str, function_signature_hash: st
 
 
 async def create_dex_validator(
-    web3_manager: Web3Manager, config: Optional[Dict[str, Any]] = None # Use specific type hint
+    web3_manager: "Web3Manager", config: Optional[Dict[str, Any]] = None # Use specific type hint
 ) -> DEXValidator:
     """
     Create and initialize a DEX validator.
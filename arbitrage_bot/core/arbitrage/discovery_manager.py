@@ -17,6 +17,7 @@
     OpportunityDiscoveryManager,
 )
 from ..memory.memory_bank import MemoryBank
+from ...utils.latency import CANDIDATES_GENERATED, PATHS_EVALUATED, mark, span
 from .models import ArbitrageOpportunity
 
 logger = logging.getLogger(__name__)
@@ -122,13 +123,15 @@ async def discover_opportunities(
         # Discover opportunities from all detectors
         for detector_id, detector in self._detectors.items():
             try:
-                opportunities = await detector.detect_opportunities(
-                    market_condition=market_condition, **kwargs
-                )
+                with span(f"detector.{detector_id}"):
+                    opportunities = await detector.detect_opportunities(
+                        market_condition=market_condition, **kwargs
+                    )
                 all_opportunities.extend(opportunities)
             except Exception as e:
                 logger.error(f"Error in detector {detector_id}: {e}", exc_info=True)
 
+        mark(CANDIDATES_GENERATED)
         logger.debug(
             f"Detected {len(all_opportunities)} raw opportunities before profit filtering."
         )
@@ -179,6 +182,8 @@ async def discover_opportunities(
             if is_valid:
                 valid_opportunities.append(opportunity)
 
+        mark(PATHS_EVALUATED)
+
         # Sort by expected profit and return top results
         valid_opportunities.sort(key=lambda x: x.expected_profit_wei, reverse=True)
 
@@ -17,12 +17,12 @@
 import time
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Tuple, Set, Union
-import numpy as np
 from collections import defaultdict
 
 from ..path.interfaces import ArbitragePath, MultiPathOpportunity
 from ...utils.async_utils import gather_with_concurrency
 from ...utils.retry import with_retry
+from arbitrage_bot.utils.streaming_stats import RollingTrend
 from ...web3.interfaces import Web3Client, Transaction
 
 logger = logging.getLogger(__name__)
@@ -70,8 +70,8 @@ def __init__(
         # Thread safety
         self._lock = asyncio.Lock()
 
-        # Gas price history
-        self._gas_price_history = []
+        # Gas price history: running least-squares trend over the window
+        self._gas_price_history = RollingTrend(gas_price_history_window)
         self._last_gas_price_update = 0
         self._current_gas_price = 0
         self._current_base_fee = 0
@@ -320,6 +320,38 @@ async def estimate_gas_for_path(
             logger.error(f"Error estimating gas for path: {e}")
             return {"success": False, "error": str(e), "path": path}
 
+    def snapshot_state(self) -> Dict[str, Any]:
+        """
+        Get the gas price history for a warm-start snapshot.
+
+        Returns:
+            Serializable state
+        """
+        return {
+            "gas_price_history": self._gas_price_history.to_state(),
+            "current_gas_price": self._current_gas_price,
+            "current_base_fee": self._current_base_fee,
+        }
+
+    def restore_state(self, state: Dict[str, Any], block_number: int) -> None:
+        """
+        Restore the gas price history from a warm-start snapshot.
+
+        The current gas price is still refreshed on first use.
+
+        Args:
+            state: Output of ``snapshot_state``
+            block_number: Block the snapshot was taken at
+        """
+        # Refit in this optimizer's window, which may differ from the saved one
+        history = RollingTrend.from_state(
+            {**state["gas_price_history"], "window": self.gas_price_history_window}
+        )
+        self._gas_price_history = history
+        self._current_gas_price = state["current_gas_price"]
+        self._current_base_fee = state["current_base_fee"]
+        logger.info(f"Restored {len(history)} gas price samples from block {block_number}")
+
     async def _update_gas_price(self) -> None:
         """Update current gas price if needed."""
         try:
@@ -347,19 +379,7 @@ async def _update_gas_price(self) -> None:
                 self._current_base_fee = base_fee_gwei
 
                 # Add to history
-                self._gas_price_history.append(
-                    {
-                        "timestamp": current_time,
-                        "gas_price": gas_price_gwei,
-                        "base_fee": base_fee_gwei,
-                    }
-                )
-
-                # Limit history size
-                if len(self._gas_price_history) > self.gas_price_history_window:
-                    self._gas_price_history = self._gas_price_history[
-                        -self.gas_price_history_window :
-                    ]
+                self._gas_price_history.add(current_time, gas_price_gwei)
 
                 # Update timestamp
                 self._last_gas_price_update = current_time
@@ -623,24 +643,13 @@ def _predict_gas_price_from_history(self, time_horizon: int) -> float:
             Predicted gas price in gwei
         """
         try:
-            if not self._gas_price_history:
-                return self._current_gas_price
-
-            # Extract timestamps and gas prices
-            timestamps = [entry["timestamp"] for entry in self._gas_price_history]
-            gas_prices = [entry["gas_price"] for entry in self._gas_price_history]
-
-            # Calculate time differences
-            time_diffs = [t - timestamps[0] for t in timestamps]
-
-            # Fit linear regression
-            if len(time_diffs) > 1:
-                # Use numpy for linear regression
-                slope, intercept = np.polyfit(time_diffs, gas_prices, 1)
-
-                # Predict gas price
-                prediction_time = time_diffs[-1] + time_horizon
-                predicted_gas_price = slope * prediction_time + intercept
+            # Extrapolate the least-squares trend over the history window
+            if len(self._gas_price_history) > 1:
+                predicted_gas_price = self._gas_price_history.predict(
+                    self._gas_price_history.last_x + time_horizon
+                )
+                if predicted_gas_price is None:
+                    return self._current_gas_price
 
                 # Ensure prediction is positive
                 predicted_gas_price = max(1.0, predicted_gas_price)
@@ -670,18 +679,17 @@ def _calculate_gas_price_confidence_interval(
             Confidence interval
         """
         try:
-            if not self._gas_price_history:
+            if not len(self._gas_price_history):
                 return {
                     "lower": predicted_gas_price * 0.8,
                     "upper": predicted_gas_price * 1.2,
                 }
 
-            # Extract gas prices
-            gas_prices = [entry["gas_price"] for entry in self._gas_price_history]
-
             # Calculate standard deviation
             std_dev = (
-                np.std(gas_prices) if len(gas_prices) > 1 else predicted_gas_price * 0.1
+                self._gas_price_history.y_std
+                if len(self._gas_price_history) > 1
+                else predicted_gas_price * 0.1
             )
 
             # Calculate confidence interval (95%)
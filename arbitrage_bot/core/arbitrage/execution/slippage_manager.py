@@ -17,12 +17,12 @@
 import time
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Tuple, Set, Union
-import numpy as np
 from collections import defaultdict
 
 from ..path.interfaces import ArbitragePath, Pool, MultiPathOpportunity
 from ...utils.async_utils import gather_with_concurrency
 from ...utils.retry import with_retry
+from arbitrage_bot.utils.streaming_stats import WindowedQuantile
 from ...web3.interfaces import Web3Client
 
 logger = logging.getLogger(__name__)
@@ -67,10 +67,13 @@ def __init__(
         # Thread safety
         self._lock = asyncio.Lock()
 
-        # Slippage history
-        self._pool_slippage_history = defaultdict(list)
-        self._token_slippage_history = defaultdict(list)
-        self._dex_slippage_history = defaultdict(list)
+        # Slippage history: streaming 95th percentiles over the last history_window samples
+        def new_history() -> WindowedQuantile:
+            return WindowedQuantile(0.95, history_window)
+
+        self._pool_slippage_history = defaultdict(new_history)
+        self._token_slippage_history = defaultdict(new_history)
+        self._dex_slippage_history = defaultdict(new_history)
 
         logger.info(
             f"Initialized SlippageManager with base_slippage_tolerance={base_slippage_tolerance:.2%}, "
@@ -353,6 +356,42 @@ async def adapt_strategy(
             logger.error(f"Error adapting strategy: {e}")
             return {"success": False, "error": str(e)}
 
+    def snapshot_state(self) -> Dict[str, Any]:
+        """
+        Get the slippage histories for a warm-start snapshot.
+
+        Returns:
+            Serializable state
+        """
+        return {
+            "base_slippage_tolerance": str(self.base_slippage_tolerance),
+            "pools": {k: v.to_state() for k, v in self._pool_slippage_history.items()},
+            "tokens": {k: v.to_state() for k, v in self._token_slippage_history.items()},
+            "dexes": {k: v.to_state() for k, v in self._dex_slippage_history.items()},
+        }
+
+    def restore_state(self, state: Dict[str, Any], block_number: int) -> None:
+        """
+        Restore the slippage histories from a warm-start snapshot.
+
+        Args:
+            state: Output of ``snapshot_state``
+            block_number: Block the snapshot was taken at
+        """
+        self.base_slippage_tolerance = Decimal(state["base_slippage_tolerance"])
+        for key, histories in (
+            ("pools", self._pool_slippage_history),
+            ("tokens", self._token_slippage_history),
+            ("dexes", self._dex_slippage_history),
+        ):
+            histories.clear()
+            for name, history in state[key].items():
+                histories[name] = WindowedQuantile.from_state(history)
+        logger.info(
+            f"Restored slippage history for {len(self._pool_slippage_history)} pools "
+            f"from block {block_number}"
+        )
+
     async def _calculate_historical_slippage(self, path: ArbitragePath) -> Decimal:
         """
         Calculate historical slippage for a path.
@@ -368,28 +407,28 @@ async def _calculate_historical_slippage(self, path: ArbitragePath) -> Decimal:
             pool_slippages = []
 
             for pool in path.pools:
-                pool_history = self._pool_slippage_history.get(pool.address, [])
-                if pool_history:
+                pool_history = self._pool_slippage_history.get(pool.address)
+                if pool_history is not None:
                     # Use 95th percentile of historical slippage
-                    pool_slippages.append(np.percentile(pool_history, 95))
+                    pool_slippages.append(pool_history.value())
 
             # Calculate token-specific slippage
             token_slippages = []
 
             for token in path.tokens:
-                token_history = self._token_slippage_history.get(token, [])
-                if token_history:
+                token_history = self._token_slippage_history.get(token)
+                if token_history is not None:
                     # Use 95th percentile of historical slippage
-                    token_slippages.append(np.percentile(token_history, 95))
+                    token_slippages.append(token_history.value())
 
             # Calculate DEX-specific slippage
             dex_slippages = []
 
             for dex in path.dexes:
-                dex_history = self._dex_slippage_history.get(dex, [])
-                if dex_history:
+                dex_history = self._dex_slippage_history.get(dex)
+                if dex_history is not None:
                     # Use 95th percentile of historical slippage
-                    dex_slippages.append(np.percentile(dex_history, 95))
+                    dex_slippages.append(dex_history.value())
 
             # Combine slippages
             if pool_slippages and token_slippages and dex_slippages:
@@ -646,37 +685,19 @@ def _update_slippage_history(self, path: ArbitragePath, slippage: Decimal) -> No
             slippage: Observed slippage
         """
         try:
+            value = float(slippage)
+
             # Update pool slippage history
             for pool in path.pools:
-                self._pool_slippage_history[pool.address].append(float(slippage))
-
-                # Limit history size
-                if len(self._pool_slippage_history[pool.address]) > self.history_window:
-                    self._pool_slippage_history[pool.address] = (
-                        self._pool_slippage_history[pool.address][
-                            -self.history_window :
-                        ]
-                    )
+                self._pool_slippage_history[pool.address].add(value)
 
             # Update token slippage history
             for token in path.tokens:
-                self._token_slippage_history[token].append(float(slippage))
-
-                # Limit history size
-                if len(self._token_slippage_history[token]) > self.history_window:
-                    self._token_slippage_history[token] = self._token_slippage_history[
-                        token
-                    ][-self.history_window :]
+                self._token_slippage_history[token].add(value)
 
             # Update DEX slippage history
             for dex in path.dexes:
-                self._dex_slippage_history[dex].append(float(slippage))
-
-                # Limit history size
-                if len(self._dex_slippage_history[dex]) > self.history_window:
-                    self._dex_slippage_history[dex] = self._dex_slippage_history[dex][
-                        -self.history_window :
-                    ]
+                self._dex_slippage_history[dex].add(value)
 
         except Exception as e:
             logger.error(f"Error updating slippage history: {e}")
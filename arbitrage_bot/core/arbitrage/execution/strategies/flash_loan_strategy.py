@@ -15,16 +15,12 @@
 
 from .....core.web3.interfaces import Web3Client
 from .....core.finance.flash_loans import (
-    FlashLoanProvider,
     FlashLoanCallback,
     FlashLoanParams,
     FlashLoanResult,
     FlashLoanStatus,
     TokenAmount,
-    create_flash_loan_provider,
-    get_best_provider,
-    get_optimal_multi_token_provider,
-    estimate_flash_loan_cost,
+    FlashLoanLiquidityService,
 )
 from ....arbitrage.interfaces import (
     ExecutionStrategy,
@@ -35,6 +31,13 @@
 
 logger = logging.getLogger(__name__)
 
+# Tokens whose flash loan liquidity is tracked from startup (mainnet)
+COMMON_TOKENS = {
+    "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+    "DAI": "0x6B175474E89094C44Da98b954EedeAC495271d0F",
+    "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+}
+
 
 class ArbitrageFlashLoanCallback(FlashLoanCallback):
     """
@@ -253,7 +256,7 @@ def __init__(
         self._is_initialized = False
         self._initialization_lock = asyncio.Lock()
         self._execution_lock = asyncio.Lock()
-        self._cached_providers: Dict[str, FlashLoanProvider] = {}
+        self.liquidity_service: Optional[FlashLoanLiquidityService] = None
 
     @property
     def name(self) -> str:
@@ -278,10 +281,16 @@ async def initialize(self) -> None:
             if not hasattr(self.web3_client, "get_default_account"):
                 raise ValueError("Web3 client must implement get_default_account")
 
-            # Pre-initialize providers for common tokens to speed up execution
-            # This is optional but can reduce execution time
-            if self.flash_loan_config.get("pre_initialize_providers", True):
-                await self._pre_initialize_providers()
+            # Create the providers once and keep their liquidity and fees
+            # cached per block, so selection adds no RPC calls at execution
+            tokens = self.flash_loan_config.get("tokens", COMMON_TOKENS)
+            self.liquidity_service = FlashLoanLiquidityService(
+                self.web3_client,
+                self.provider_config,
+                tokens=tokens.values() if isinstance(tokens, dict) else tokens,
+                poll_interval=self.flash_loan_config.get("block_poll_interval", 1.0),
+            )
+            await self.liquidity_service.start()
 
             self._is_initialized = True
             logger.info("Flash loan execution strategy initialized")
@@ -291,48 +300,6 @@ async def _ensure_initialized(self) -> None:
         if not self._is_initialized:
             await self.initialize()
 
-    async def _pre_initialize_providers(self) -> None:
-        """
-        Pre-initialize providers for common tokens.
-
-        This method creates and initializes providers for common tokens
-        to speed up execution time.
-        """
-        try:
-            # Common tokens to pre-initialize (addresses are network-specific)
-            # For now, just use a few common tokens on mainnet
-            common_tokens = {
-                "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
-                "DAI": "0x6B175474E89094C44Da98b954EedeAC495271d0F",
-                "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-            }
-
-            logger.info("Pre-initializing flash loan providers for common tokens")
-
-            for token_name, token_address in common_tokens.items():
-                try:
-                    # Create provider and add to cache
-                    provider = await get_best_provider(
-                        self.web3_client,
-                        token_address,
-                        Decimal("1000"),  # Use 1000 as a default amount
-                        self.provider_config,
-                    )
-
-                    # Add to cache
-                    self._cached_providers[token_address.lower()] = provider
-                    logger.info(f"Pre-initialized {provider.name} for {token_name}")
-
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to pre-initialize provider for {token_name}: {e}"
-                    )
-
-            logger.info(f"Pre-initialized {len(self._cached_providers)} providers")
-
-        except Exception as e:
-            logger.warning(f"Failed to pre-initialize providers: {e}")
-
     async def can_execute(self, opportunity: ArbitrageOpportunity) -> bool:
         """
         Determine if the opportunity can be executed with this strategy.
@@ -355,40 +322,23 @@ async def can_execute(self, opportunity: ArbitrageOpportunity) -> bool:
             token_address = opportunity.input_token.address
             amount = opportunity.input_amount
 
-            # Try to find a provider that supports this token and amount
-            try:
-                # Check cached providers first
-                if token_address.lower() in self._cached_providers:
-                    provider = self._cached_providers[token_address.lower()]
-                    if await provider.check_liquidity(token_address, amount):
-                        return True
-
-                # Try getting a provider
-                provider = await get_best_provider(
-                    self.web3_client, token_address, amount, self.provider_config
+            # Look up a provider with enough liquidity in the cached snapshot
+            if self.liquidity_service.best_provider(token_address, amount) is None:
+                # Track the token so later blocks include it
+                self.liquidity_service.track(token_address)
+                logger.info(
+                    f"No flash loan provider has liquidity for {amount} of {token_address}"
                 )
-
-                # Provider found, check liquidity
-                has_liquidity = await provider.check_liquidity(token_address, amount)
-
-                # Cache provider for future use
-                if has_liquidity:
-                    self._cached_providers[token_address.lower()] = provider
-                    return True
-                else:
-                    await provider.close()
-                    return False
-
-            except ValueError:
-                # No provider supports this token
-                logger.info(f"No flash loan provider supports token {token_address}")
                 return False
+            return True
 
         except Exception as e:
             logger.error(f"Error checking if opportunity can be executed: {e}")
             return False
 
-    async def get_estimated_cost(self, opportunity: ArbitrageOpportunity) -> Decimal:
+    async def get_estimated_cost(
+        self, opportunity: ArbitrageOpportunity
+    ) -> Optional[Decimal]:
         """
         Get the estimated cost of executing the opportunity.
 
@@ -399,7 +349,8 @@ async def get_estimated_cost(self, opportunity: ArbitrageOpportunity) -> Decimal
             opportunity: Arbitrage opportunity to estimate costs for
 
         Returns:
-            Estimated cost in the opportunity's output token
+            Estimated cost in the opportunity's output token, or None if no
+            provider has a quote for the token
         """
         await self._ensure_initialized()
 
@@ -408,10 +359,11 @@ async def get_estimated_cost(self, opportunity: ArbitrageOpportunity) -> Decimal
             token_address = opportunity.input_token.address
             amount = opportunity.input_amount
 
-            # Estimate flash loan fee
-            fee_costs = await estimate_flash_loan_cost(
-                self.web3_client, token_address, amount, self.provider_config
-            )
+            # Estimate flash loan fee from the cached snapshot
+            fee_costs = self.liquidity_service.estimate_costs(token_address, amount)
+            if not fee_costs:
+                logger.info(f"No flash loan fee quote for {token_address}")
+                return None
 
             # Get lowest fee (Balancer should be 0)
             min_fee_provider = min(fee_costs.items(), key=lambda x: x[1])[0]
@@ -452,6 +404,8 @@ async def is_profitable(self, opportunity: ArbitrageOpportunity) -> bool:
 
             # Get estimated cost
             estimated_cost = await self.get_estimated_cost(opportunity)
+            if estimated_cost is None:
+                return False
 
             # Calculate profit threshold (cost * multiplier)
             profit_threshold = estimated_cost * self.profit_threshold_multiplier
@@ -540,93 +494,41 @@ async def execute(
                     callback_data=execution_params.get("callback_data", b""),
                 )
 
-                # Try with primary provider first
-                primary_success = False
-
-                try:
-                    # Get best provider
-                    provider = await get_best_provider(
-                        self.web3_client, token_address, amount, self.provider_config
+                # Providers able to lend the amount, cheapest first; the
+                # first is the primary and the next one the fallback
+                providers = self.liquidity_service.fallback_providers(
+                    token_address, amount
+                )[:2]
+                if not providers:
+                    raise ValueError(
+                        f"No flash loan provider with sufficient liquidity for token "
+                        f"{token_address}, amount {amount}"
                     )
 
-                    logger.info(f"Executing with primary provider: {provider.name}")
-
-                    # Execute flash loan
-                    flash_loan_result = await provider.execute_flash_loan(
-                        params, callback
-                    )
-
-                    # Check result
-                    if flash_loan_result.success:
-                        primary_success = True
-                        logger.info(
-                            f"Successfully executed with primary provider {provider.name}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Failed with primary provider {provider.name}: "
-                            f"{flash_loan_result.error_message}"
-                        )
-
-                    # Close provider
-                    await provider.close()
-
-                except Exception as e:
-                    logger.error(f"Error with primary provider: {e}")
-
-                # If primary failed, try fallback provider
-                if not primary_success:
-                    logger.info("Trying fallback provider")
-
+                flash_loan_result = None
+                for attempt, provider in enumerate(providers):
+                    role = "primary" if attempt == 0 else "fallback"
                     try:
-                        # Current best provider failed, try others
-                        # Try Aave if Balancer failed and vice versa
-                        provider_type = (
-                            "aave"
-                            if "Balancer"
-                            in self._cached_providers.get(
-                                token_address.lower(), FlashLoanProvider
-                            ).name
-                            else "balancer"
-                        )
-
-                        provider = await create_flash_loan_provider(
-                            provider_type,
-                            self.web3_client,
-                            self.provider_config.get(provider_type, {}),
-                        )
+                        logger.info(f"Executing with {role} provider: {provider.name}")
 
-                        logger.info(
-                            f"Executing with fallback provider: {provider.name}"
+                        # Execute flash loan
+                        flash_loan_result = await provider.execute_flash_loan(
+                            params, callback
                         )
 
-                        # Check liquidity
-                        if await provider.check_liquidity(token_address, amount):
-                            # Execute flash loan
-                            flash_loan_result = await provider.execute_flash_loan(
-                                params, callback
+                        # Check result
+                        if flash_loan_result.success:
+                            logger.info(
+                                f"Successfully executed with {role} provider {provider.name}"
                             )
-
-                            # Check result
-                            if flash_loan_result.success:
-                                logger.info(
-                                    f"Successfully executed with fallback provider {provider.name}"
-                                )
-                            else:
-                                logger.warning(
-                                    f"Failed with fallback provider {provider.name}: "
-                                    f"{flash_loan_result.error_message}"
-                                )
-                        else:
-                            logger.warning(
-                                f"Fallback provider {provider.name} has insufficient liquidity"
-                            )
-
-                        # Close provider
-                        await provider.close()
+                            break
+                        logger.warning(
+                            f"Failed with {role} provider {provider.name}: "
+                            f"{flash_loan_result.error_message}"
+                        )
 
                     except Exception as e:
-                        logger.error(f"Error with fallback provider: {e}")
+                        logger.error(f"Error with {role} provider: {e}")
 
                 # Update result based on callback
                 if callback.success:
@@ -654,12 +556,9 @@ async def close(self) -> None:
         """Clean up resources used by the strategy."""
         logger.info("Closing flash loan execution strategy")
 
-        # Close cached providers
-        for token_address, provider in self._cached_providers.items():
-            try:
-                await provider.close()
-            except Exception as e:
-                logger.warning(f"Error closing provider for {token_address}: {e}")
+        # Close the liquidity service and its providers
+        if self.liquidity_service:
+            await self.liquidity_service.close()
+            self.liquidity_service = None
 
-        self._cached_providers = {}
         self._is_initialized = False
@@ -3,6 +3,8 @@
 
 This module contains the implementation of the TransactionMonitor,
 which is responsible for monitoring and tracking transaction status.
+Receipts are resolved by a shared ReceiptWatcher, so monitoring many
+transactions costs one receipt request per block.
 """
 
 import asyncio
@@ -10,7 +12,8 @@
 import time
 from typing import Dict, List, Any, Optional, Set, Tuple
 
-from ...web3.interfaces import Web3Client, TransactionReceipt
+from ...web3.interfaces import Web3Client
+from ...web3.receipt_watcher import ReceiptUpdate, ReceiptWatcher
 from ..interfaces import TransactionMonitor as TransactionMonitorInterface
 from ..models import ArbitrageOpportunity, TransactionInfo
 
@@ -25,22 +28,28 @@ class TransactionMonitor(TransactionMonitorInterface):
     provides updates, and handles timeouts and retries.
     """
 
-    def __init__(self, web3_client: Web3Client, config: Dict[str, Any] = None):
+    def __init__(
+        self,
+        web3_client: Web3Client,
+        config: Dict[str, Any] = None,
+        receipt_watcher: Optional[ReceiptWatcher] = None,
+    ):
         """
         Initialize the transaction monitor.
 
         Args:
             web3_client: Web3 client for blockchain interactions
             config: Configuration dictionary
+            receipt_watcher: Shared receipt watcher (created on first use if omitted)
         """
         self.web3_client = web3_client
         self.config = config or {}
 
         # Configuration
         self.poll_interval = float(self.config.get("poll_interval", 2.0))  # 2 seconds
-        self.max_attempts = int(
-            self.config.get("max_attempts", 30)
-        )  # 30 attempts (60 seconds with default poll)
+        self.timeout = float(
+            self.config.get("timeout", 60.0)
+        )  # Seconds to wait for a receipt before giving up
         self.confirmation_blocks = int(
             self.config.get("confirmation_blocks", 1)
         )  # Number of blocks to consider confirmed
@@ -50,6 +59,13 @@ def __init__(self, web3_client: Web3Client, config: Dict[str, Any] = None):
         self._monitoring_tasks: Dict[str, asyncio.Task] = {}
         self._transaction_lock = asyncio.Lock()
 
+        # Receipt resolution (normalized hash -> monitored hash)
+        self._receipt_watcher = receipt_watcher
+        self._owns_receipt_watcher = receipt_watcher is None
+        self._watched_hashes: Dict[str, str] = {}
+        if receipt_watcher is not None:
+            receipt_watcher.add_listener(self._handle_receipt_update)
+
         logger.info("TransactionMonitor initialized")
 
     async def monitor_transaction(
@@ -73,7 +89,7 @@ async def monitor_transaction(
 
         # Extract monitoring parameters
         wait_for_confirmations = kwargs.get("wait_for_confirmations", True)
-        timeout = float(kwargs.get("timeout", self.poll_interval * self.max_attempts))
+        timeout = float(kwargs.get("timeout", self.timeout))
 
         # Check if already monitoring this transaction
         async with self._transaction_lock:
@@ -104,6 +120,8 @@ async def monitor_transaction(
                     error_message=None,
                 )
 
+            self._watched_hashes[transaction_hash.lower()] = transaction_hash
+
             # Create monitoring task if not already running
             if (
                 transaction_hash not in self._monitoring_tasks
@@ -125,6 +143,7 @@ async def monitor_transaction(
 
         except asyncio.TimeoutError:
             logger.warning(f"Monitoring of transaction {transaction_hash} timed out")
+            self._get_receipt_watcher().unwatch(transaction_hash)
 
             # Update transaction info with timeout
             async with self._transaction_lock:
@@ -139,94 +158,53 @@ async def monitor_transaction(
                 tx_info = self._monitored_transactions[transaction_hash]
                 tx_info.error_message = f"Monitoring error: {e}"
 
+        finally:
+            # Resolved or given up: nothing left to route receipt updates to
+            self._monitoring_tasks.pop(transaction_hash, None)
+            self._watched_hashes.pop(transaction_hash.lower(), None)
+
         # Return the current transaction info
         async with self._transaction_lock:
             return self._monitored_transactions.get(transaction_hash)
 
+    def _get_receipt_watcher(self) -> ReceiptWatcher:
+        """Get the receipt watcher, creating one bound to the web3 client if needed."""
+        if self._receipt_watcher is None:
+            w3 = getattr(self.web3_client, "w3", self.web3_client)
+            self._receipt_watcher = ReceiptWatcher(
+                w3, self.config.get("receipt_watcher", {"poll_interval": self.poll_interval / 4})
+            )
+            self._receipt_watcher.add_listener(self._handle_receipt_update)
+        return self._receipt_watcher
+
     async def _monitor_transaction_task(
         self, transaction_hash: str, wait_for_confirmations: bool, timeout: float
     ) -> None:
         """
         Internal task to monitor a transaction.
 
+        Registers the transaction with the shared receipt watcher and waits for
+        it to be mined (and confirmed, if requested). Receipt data is applied by
+        :meth:`_handle_receipt_update` as blocks arrive.
+
         Args:
             transaction_hash: Hash of the transaction to monitor
             wait_for_confirmations: Whether to wait for confirmations
             timeout: Monitoring timeout in seconds
         """
-        try:
-            attempts = 0
-            last_block_number = None
-
-            while attempts < self.max_attempts:
-                try:
-                    # Get transaction receipt
-                    receipt = await self.web3_client.get_transaction_receipt(
-                        transaction_hash
-                    )
+        watcher = self._get_receipt_watcher()
+        required = self.confirmation_blocks if wait_for_confirmations else 0
 
-                    if receipt:
-                        # Update transaction info with receipt data
-                        await self._update_transaction_info(transaction_hash, receipt)
-
-                        # If not waiting for confirmations, we're done
-                        if not wait_for_confirmations:
-                            logger.info(
-                                f"Transaction {transaction_hash} received receipt and not waiting for confirmations"
-                            )
-                            return
-
-                        # Check if we have enough confirmations
-                        current_block_number = await self.web3_client.get_block_number()
-                        confirmations = 0
-
-                        if receipt.block_number and current_block_number:
-                            confirmations = current_block_number - receipt.block_number
-
-                        if confirmations >= self.confirmation_blocks:
-                            logger.info(
-                                f"Transaction {transaction_hash} confirmed with "
-                                f"{confirmations} confirmations"
-                            )
-                            return
-
-                        # Track last seen block number to detect chain reorgs
-                        if last_block_number and receipt.block_number:
-                            if receipt.block_number < last_block_number:
-                                logger.warning(
-                                    f"Possible chain reorganization detected for "
-                                    f"transaction {transaction_hash}: "
-                                    f"block {receipt.block_number} < {last_block_number}"
-                                )
-
-                        last_block_number = receipt.block_number
-
-                        # Wait for next poll with reduced interval for confirmations
-                        await asyncio.sleep(self.poll_interval * 0.5)
-                    else:
-                        # Transaction not mined yet
-                        logger.debug(
-                            f"Transaction {transaction_hash} not mined yet, attempt {attempts+1}/{self.max_attempts}"
-                        )
-                        attempts += 1
-                        await asyncio.sleep(self.poll_interval)
-
-                except Exception as e:
-                    logger.error(
-                        f"Error checking transaction {transaction_hash} status: {e}"
-                    )
-                    attempts += 1
-                    await asyncio.sleep(self.poll_interval)
-
-            # If we get here, we've exceeded max attempts
-            logger.warning(
-                f"Transaction {transaction_hash} monitoring exceeded max attempts"
+        try:
+            update = await watcher.watch(transaction_hash, confirmations=required)
+            logger.info(
+                f"Transaction {transaction_hash} resolved in block {update.block_number} "
+                f"with {update.confirmations} confirmations"
             )
 
-            # Update transaction info with timeout
-            async with self._transaction_lock:
-                tx_info = self._monitored_transactions[transaction_hash]
-                tx_info.error_message = "Monitoring exceeded max attempts"
+        except asyncio.CancelledError:
+            watcher.unwatch(transaction_hash)
+            raise
 
         except Exception as e:
             logger.error(
@@ -238,31 +216,49 @@ async def _monitor_transaction_task(
                 tx_info = self._monitored_transactions[transaction_hash]
                 tx_info.error_message = f"Monitoring task error: {e}"
 
+    async def _handle_receipt_update(self, update: ReceiptUpdate) -> None:
+        """
+        Apply a receipt update from the watcher to a monitored transaction.
+
+        Args:
+            update: Normalized receipt update
+        """
+        transaction_hash = self._watched_hashes.get(update.tx_hash)
+        if transaction_hash is None:
+            return
+        await self._update_transaction_info(transaction_hash, update)
+
     async def _update_transaction_info(
-        self, transaction_hash: str, receipt: TransactionReceipt
+        self, transaction_hash: str, receipt: ReceiptUpdate
     ) -> None:
         """
         Update transaction info with receipt data.
 
         Args:
             transaction_hash: Hash of the transaction
-            receipt: Transaction receipt
+            receipt: Receipt update from the watcher
         """
         async with self._transaction_lock:
             # Get current transaction info
-            tx_info = self._monitored_transactions[transaction_hash]
+            tx_info = self._monitored_transactions.get(transaction_hash)
+            if tx_info is None:
+                return
+
+            # Only log the first time the receipt is seen
+            first_seen = tx_info.block_number is None
 
             # Update with receipt data
-            tx_info.status = receipt.status
+            tx_info.status = receipt.success
             tx_info.gas_used = receipt.gas_used
             tx_info.effective_gas_price = receipt.effective_gas_price
             tx_info.block_number = receipt.block_number
 
             # Add error message if transaction failed
-            if not receipt.status:
+            if receipt.reverted:
                 tx_info.error_message = "Transaction reverted"
-                logger.warning(f"Transaction {transaction_hash} reverted")
-            else:
+                if first_seen:
+                    logger.warning(f"Transaction {transaction_hash} reverted")
+            elif first_seen:
                 logger.info(
                     f"Transaction {transaction_hash} succeeded in block {receipt.block_number}"
                 )
@@ -311,6 +307,9 @@ async def stop_monitoring(self, transaction_hash: str) -> bool:
                 # Remove from monitored transactions
                 if transaction_hash in self._monitored_transactions:
                     del self._monitored_transactions[transaction_hash]
+                self._watched_hashes.pop(transaction_hash.lower(), None)
+                if self._receipt_watcher is not None:
+                    self._receipt_watcher.unwatch(transaction_hash)
 
                 logger.info(f"Stopped monitoring transaction {transaction_hash}")
                 return True
@@ -330,10 +329,19 @@ async def close(self) -> None:
 
             self._monitoring_tasks.clear()
             self._monitored_transactions.clear()
+            self._watched_hashes.clear()
+
+        # Detach from (or shut down) the receipt watcher
+        if self._receipt_watcher is not None:
+            self._receipt_watcher.remove_listener(self._handle_receipt_update)
+            if self._owns_receipt_watcher:
+                await self._receipt_watcher.close()
 
 
 async def create_transaction_monitor(
-    web3_client: Web3Client, config: Dict[str, Any] = None
+    web3_client: Web3Client,
+    config: Dict[str, Any] = None,
+    receipt_watcher: Optional[ReceiptWatcher] = None,
 ) -> TransactionMonitor:
     """
     Factory function to create a transaction monitor.
@@ -341,8 +349,11 @@ async def create_transaction_monitor(
     Args:
         web3_client: Web3 client for blockchain interactions
         config: Configuration dictionary
+        receipt_watcher: Optional shared receipt watcher
 
     Returns:
         Initialized transaction monitor
     """
-    return TransactionMonitor(web3_client=web3_client, config=config)
+    return TransactionMonitor(
+        web3_client=web3_client, config=config, receipt_watcher=receipt_watcher
+    )
@@ -22,6 +22,9 @@
 
 logger = logging.getLogger(__name__)
 
+# UniswapV2-style Sync(uint112 reserve0, uint112 reserve1)
+SYNC_TOPIC = "0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"
+
 
 class NetworkXGraphExplorer(GraphExplorer):
     """
@@ -37,6 +40,7 @@ def __init__(
         dex_manager: DexManager,
         price_fetcher: Optional[PriceFetcher] = None,
         config: Optional[Dict[str, Any]] = None,
+        web3_client: Optional[Any] = None,
     ):
         """
         Initialize the NetworkX graph explorer.
@@ -45,10 +49,13 @@ def __init__(
             dex_manager: Manager for DEX interactions
             price_fetcher: Optional price fetcher for price data
             config: Configuration parameters
+            web3_client: Optional Web3 client, used to record the block a
+                refresh started at (the block the pool state reflects)
         """
         self.dex_manager = dex_manager
         self.price_fetcher = price_fetcher
         self.config = config or {}
+        self.web3_client = web3_client
 
         # Extract configuration parameters
         self.graph_ttl = self.config.get("graph_ttl", 60)  # seconds
@@ -74,6 +81,8 @@ def __init__(
         self._initialized = False
         self._initialization_lock = asyncio.Lock()
         self._last_update = 0
+        # Oldest block the pool state may reflect (None if unknown)
+        self._state_block: Optional[int] = None
 
     async def initialize(self) -> bool:
         """
@@ -128,6 +137,9 @@ async def update_graph(self) -> None:
 
             logger.info("Updating graph with latest pool data")
 
+            # Pools are read at or after this block
+            state_block = await self._head()
+
             # Get list of supported DEXes
             dexes = await self.dex_manager.get_supported_dexes()
 
@@ -163,47 +175,10 @@ async def update_graph(self) -> None:
                 f"Using {len(filtered_pools)} out of {len(all_pools)} pools after filtering"
             )
 
-            # Build new graph
-            new_graph = nx.DiGraph()
-
-            # Add nodes and edges
-            for pool in filtered_pools:
-                # Add token nodes if they don't exist
-                if pool.token0 not in new_graph:
-                    new_graph.add_node(pool.token0, is_token=True)
-
-                if pool.token1 not in new_graph:
-                    new_graph.add_node(pool.token1, is_token=True)
-
-                # Calculate edge weights based on liquidity and fee
-                # Weight is -log of (1 - fee), so lower fee = lower weight
-                fee_factor = 1 - (pool.fee / 10000)  # Convert basis points to decimal
-                weight = -log(fee_factor) if fee_factor > 0 else 99999
-
-                # Add bidirectional edges
-                new_graph.add_edge(
-                    pool.token0,
-                    pool.token1,
-                    weight=weight,
-                    pool=pool,
-                    fee=pool.fee,
-                    liquidity=pool.liquidity or 0,
-                    dex=pool.dex,
-                )
-
-                new_graph.add_edge(
-                    pool.token1,
-                    pool.token0,
-                    weight=weight,
-                    pool=pool,
-                    fee=pool.fee,
-                    liquidity=pool.liquidity or 0,
-                    dex=pool.dex,
-                )
-
             # Update the graph
-            self.graph = new_graph
+            self.graph = self._build_graph(filtered_pools)
             self._last_update = current_time
+            self._state_block = state_block
 
             logger.info(
                 f"Graph updated with {len(self.graph.nodes)} tokens and {len(self.graph.edges)} edges"
@@ -212,6 +187,160 @@ async def update_graph(self) -> None:
         except Exception as e:
             logger.error(f"Failed to update graph: {e}")
 
+    def _build_graph(self, pools: Iterable[Pool]) -> nx.DiGraph:
+        """
+        Build a graph with tokens as nodes and pools as edges in both directions.
+
+        Args:
+            pools: Pools to add
+
+        Returns:
+            The new graph
+        """
+        new_graph = nx.DiGraph()
+
+        # Add nodes and edges
+        for pool in pools:
+            # Add token nodes if they don't exist
+            if pool.token0 not in new_graph:
+                new_graph.add_node(pool.token0, is_token=True)
+
+            if pool.token1 not in new_graph:
+                new_graph.add_node(pool.token1, is_token=True)
+
+            # Calculate edge weights based on liquidity and fee
+            # Weight is -log of (1 - fee), so lower fee = lower weight
+            fee_factor = 1 - (pool.fee / 10000)  # Convert basis points to decimal
+            weight = -log(fee_factor) if fee_factor > 0 else 99999
+
+            # Add bidirectional edges
+            new_graph.add_edge(
+                pool.token0,
+                pool.token1,
+                weight=weight,
+                pool=pool,
+                fee=pool.fee,
+                liquidity=pool.liquidity or 0,
+                dex=pool.dex,
+            )
+
+            new_graph.add_edge(
+                pool.token1,
+                pool.token0,
+                weight=weight,
+                pool=pool,
+                fee=pool.fee,
+                liquidity=pool.liquidity or 0,
+                dex=pool.dex,
+            )
+
+        return new_graph
+
+    def snapshot_state(self) -> Dict[str, Any]:
+        """
+        Get the graph's pools for a warm-start snapshot.
+
+        Returns:
+            Serializable state
+        """
+        pools = {}
+        for _, _, pool in self.graph.edges(data="pool"):
+            if pool.address in pools:
+                continue
+            liquidity = getattr(pool, "liquidity", None)
+            pools[pool.address] = [
+                pool.token0,
+                pool.token1,
+                None if pool.reserves0 is None else str(pool.reserves0),
+                None if pool.reserves1 is None else str(pool.reserves1),
+                pool.fee,
+                pool.pool_type,
+                pool.dex,
+                None if liquidity is None else str(liquidity),
+            ]
+        return {"pools": pools}
+
+    def restore_state(self, state: Dict[str, Any], block_number: Optional[int]) -> None:
+        """
+        Rebuild the graph from a warm-start snapshot.
+
+        A non-empty restored graph counts as fresh, so the first
+        ``update_graph`` call (from ``initialize``) does not refetch pools
+        from the DEXes.
+
+        Args:
+            state: Output of ``snapshot_state``
+            block_number: Block the snapshot was taken at (None when rolled back)
+        """
+        pools = []
+        for address, fields in state["pools"].items():
+            token0, token1, reserves0, reserves1, fee, pool_type, dex, liquidity = fields
+            pool = Pool(
+                address=address,
+                token0=token0,
+                token1=token1,
+                reserves0=None if reserves0 is None else Decimal(reserves0),
+                reserves1=None if reserves1 is None else Decimal(reserves1),
+                fee=fee,
+                pool_type=pool_type,
+                dex=dex,
+            )
+            pool.liquidity = None if liquidity is None else Decimal(liquidity)
+            pools.append(pool)
+
+        self.graph = self._build_graph(self._filter_pools(pools))
+        self._last_update = time.time() if pools else 0
+        self._state_block = block_number
+        logger.info(
+            f"Restored graph with {len(self.graph.nodes)} tokens and "
+            f"{len(self.graph.edges)} edges from block {block_number}"
+        )
+
+    def log_addresses(self) -> List[str]:
+        """Addresses of the pools in the graph, for the warm-start log catch-up."""
+        return list({pool.address for _, _, pool in self.graph.edges(data="pool")})
+
+    def apply_logs(self, logs: Iterable[Dict[str, Any]]) -> None:
+        """
+        Apply reserve updates (Sync events) emitted since a snapshot.
+
+        Args:
+            logs: Logs in block order, as returned by ``eth_getLogs``
+        """
+        pools = {pool.address.lower(): pool for _, _, pool in self.graph.edges(data="pool")}
+        for entry in logs:
+            topics = entry.get("topics") or []
+            if not topics:
+                continue
+            topic = topics[0] if isinstance(topics[0], str) else Web3.to_hex(topics[0])
+            if topic.lower() != SYNC_TOPIC:
+                continue
+            pool = pools.get(str(entry["address"]).lower())
+            if pool is None:
+                continue
+            data = entry["data"]
+            if isinstance(data, str):
+                data = Web3.to_bytes(hexstr=data)
+            pool.reserves0 = Decimal(int.from_bytes(data[:32], "big"))
+            pool.reserves1 = Decimal(int.from_bytes(data[32:64], "big"))
+            block = entry.get("blockNumber")
+            if block is not None and self._state_block is not None:
+                self._state_block = max(self._state_block, int(block))
+
+    def state_block(self) -> Optional[int]:
+        """Block the pool state reflects, for stamping warm-start snapshots."""
+        return self._state_block
+
+    async def _head(self) -> Optional[int]:
+        """Latest block number, or None without a client or on error."""
+        if self.web3_client is None:
+            return None
+        try:
+            return await self.web3_client.eth.block_number
+        except Exception as e:
+            logger.debug(f"Could not read block number: {e}")
+            return None
+
     async def get_graph(self) -> nx.DiGraph:
         """
         Get the current graph representation.
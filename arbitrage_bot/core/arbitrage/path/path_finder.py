@@ -14,7 +14,9 @@
 
 from web3 import Web3
 
+from arbitrage_bot.utils.fixed_point import get_amount_out
 from ...dex.interfaces import DexManager
+from ...memory.warm_start import WarmStartManager
 from ...price.interfaces import PriceFetcher
 from ...utils.decimal import format_decimal
 from .interfaces import (
@@ -44,6 +46,7 @@ def __init__(
         dex_manager: DexManager,
         price_fetcher: Optional[PriceFetcher] = None,
         config: Optional[Dict[str, Any]] = None,
+        warm_start: Optional[WarmStartManager] = None,
     ):
         """
         Initialize the multi-path finder.
@@ -53,6 +56,9 @@ def __init__(
             dex_manager: Manager for DEX interactions
             price_fetcher: Optional price fetcher for price data
             config: Configuration parameters
+            warm_start: Optional snapshot manager; the graph and token
+                metadata are restored from it on initialize and saved to it
+                periodically and on close
         """
         self.graph_explorer = graph_explorer
         self.dex_manager = dex_manager
@@ -81,6 +87,14 @@ def __init__(
             config=optimizer_config,
         )
 
+        # Token metadata by address, kept across restarts via warm start
+        self._token_info: Dict[str, Dict[str, Any]] = {}
+
+        self.warm_start = warm_start
+        if warm_start:
+            warm_start.register("graph", graph_explorer)
+            warm_start.register("token_info", self)
+
         # State
         self._initialized = False
         self._initialization_lock = asyncio.Lock()
@@ -106,6 +120,10 @@ async def initialize(self) -> bool:
                     )
                     return False
 
+                # Restore the graph first so initialize() finds it fresh
+                if self.warm_start:
+                    await self.warm_start.restore()
+
                 if not await self.graph_explorer.initialize():
                     logger.error("Failed to initialize graph explorer")
                     return False
@@ -115,6 +133,9 @@ async def initialize(self) -> bool:
                     logger.error("Failed to initialize optimizer")
                     return False
 
+                if self.warm_start:
+                    await self.warm_start.start()
+
                 self._initialized = True
                 logger.info("Multi-path finder initialized successfully")
                 return True
@@ -362,6 +383,10 @@ async def close(self) -> None:
         if hasattr(self, "optimizer") and self.optimizer:
             await self.optimizer.close()
 
+        # Final snapshot, before the graph explorer drops its graph
+        if self.warm_start:
+            await self.warm_start.close()
+
         if hasattr(self, "graph_explorer") and self.graph_explorer:
             await self.graph_explorer.close()
 
@@ -433,7 +458,9 @@ async def _calculate_optimal_amount(
         Calculate the optimal amount to trade through a path.
 
         This method uses numerical optimization to find the amount that
-        maximizes profit for the given path.
+        maximizes profit for the given path. Amounts are simulated in integer
+        wei; constant-product pools with known reserves are simulated locally
+        with the pair contract's exact math instead of asking the DEX.
 
         Args:
             path: Arbitrage path to optimize
@@ -451,17 +478,14 @@ async def _calculate_optimal_amount(
 
         decimals = token_info.get("decimals", 18)
 
-        # Initial amounts to try
-        test_amounts = [
-            Decimal("0.1") * Decimal(10**decimals),
-            Decimal("1") * Decimal(10**decimals),
-            Decimal("10") * Decimal(10**decimals),
-            Decimal("100") * Decimal(10**decimals),
-        ]
+        # Initial amounts to try (0.1, 1, 10 and 100 tokens in wei)
+        unit = 10**decimals
+        test_amounts = [unit // 10, unit, 10 * unit, 100 * unit]
 
-        best_amount = Decimal("0")
-        best_output = Decimal("0")
-        best_profit = Decimal("0")
+        best_amount = 0
+        best_output = 0
+        best_profit = 0
+        best_confidence = 0.0
 
         # Try each amount
         for amount in test_amounts:
@@ -474,11 +498,21 @@ async def _calculate_optimal_amount(
                     zip(path.tokens[:-1], path.tokens[1:])
                 ):
                     pool = path.pools[i]
+
+                    local_output = self._simulate_constant_product(
+                        pool, token_from, current_amount
+                    )
+                    if local_output is not None:
+                        current_amount = local_output
+                        if current_amount <= 0:
+                            break
+                        continue
+
                     dex = await self.dex_manager.get_dex(pool.dex)
 
                     if not dex:
                         logger.warning(f"DEX not found: {pool.dex}")
-                        current_amount = Decimal("0")
+                        current_amount = 0
                         break
 
                     # Get quote
@@ -493,11 +527,11 @@ async def _calculate_optimal_amount(
                         logger.warning(
                             f"Failed to get quote for {token_from} -> {token_to}"
                         )
-                        current_amount = Decimal("0")
+                        current_amount = 0
                         break
 
                     # Update current amount and confidence
-                    current_amount = Decimal(str(quote_result.get("amount_out", 0)))
+                    current_amount = int(quote_result.get("amount_out", 0))
                     confidence = quote_result.get("confidence", 0.95)
                     confidence_product *= confidence
 
@@ -509,6 +543,7 @@ async def _calculate_optimal_amount(
                         best_amount = amount
                         best_output = current_amount
                         best_profit = profit
+                        best_confidence = confidence_product
 
             except Exception as e:
                 logger.warning(f"Error simulating amount {amount}: {e}")
@@ -517,7 +552,35 @@ async def _calculate_optimal_amount(
         if best_profit <= 0:
             return Decimal("0"), Decimal("0"), 0.0
 
-        return best_amount, best_output, confidence_product
+        return Decimal(best_amount), Decimal(best_output), best_confidence
+
+    def _simulate_constant_product(
+        self, pool: Pool, token_from: str, amount_in: int
+    ) -> Optional[int]:
+        """
+        Simulate a swap through a constant-product pool with known reserves.
+
+        Args:
+            pool: Pool to swap through
+            token_from: Input token address
+            amount_in: Input amount in wei
+
+        Returns:
+            Output amount in wei, or None if the pool cannot be simulated locally
+        """
+        if pool.pool_type != "constant_product":
+            return None
+        if pool.reserves0 is None or pool.reserves1 is None:
+            return None
+
+        if token_from.lower() == pool.token0.lower():
+            reserve_in, reserve_out = int(pool.reserves0), int(pool.reserves1)
+        else:
+            reserve_in, reserve_out = int(pool.reserves1), int(pool.reserves0)
+
+        if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+            return 0
+        return get_amount_out(amount_in, reserve_in, reserve_out, pool.fee)
 
     async def _estimate_gas_cost(self, path: ArbitragePath) -> Tuple[int, Decimal]:
         """
@@ -604,10 +667,15 @@ async def _get_token_info(self, token_address: str) -> Dict[str, Any]:
         Returns:
             Token information dictionary
         """
+        cached = self._token_info.get(token_address)
+        if cached:
+            return cached
+
         try:
             # Try to get from dex manager
             token_info = await self.dex_manager.get_token_info(token_address)
             if token_info:
+                self._token_info[token_address] = token_info
                 return token_info
 
             # Use default if not available
@@ -627,6 +695,28 @@ async def _get_token_info(self, token_address: str) -> Dict[str, Any]:
                 "decimals": 18,
             }
 
+    def snapshot_state(self) -> Dict[str, Any]:
+        """
+        Get token metadata for a warm-start snapshot.
+
+        Returns:
+            Serializable state
+        """
+        return {
+            address: {k: v for k, v in info.items() if isinstance(v, (str, int, float, bool))}
+            for address, info in self._token_info.items()
+        }
+
+    def restore_state(self, state: Dict[str, Any], block_number: int) -> None:
+        """
+        Restore token metadata from a warm-start snapshot.
+
+        Args:
+            state: Output of ``snapshot_state``
+            block_number: Block the snapshot was taken at
+        """
+        self._token_info.update(state)
+
     async def _get_available_capital(self, token_address: str) -> Decimal:
         """
         Get the available capital for a token.
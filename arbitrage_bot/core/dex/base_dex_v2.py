@@ -8,6 +8,7 @@
 
 from .base_dex import BaseDEX
 from ..web3.web3_manager import Web3Manager
+from ...utils.fixed_point import WAD, get_amount_out, price_impact_wad
 
 
 class BaseDEXV2(BaseDEX):
@@ -122,7 +123,7 @@ async def get_quote_with_impact(
                 "liquidity_depth": min(reserve_in, reserve_out),
                 "fee_rate": self.fee / 1000000,  # Convert from basis points
                 "estimated_gas": 150000,  # Base estimate for V2 swap
-                "min_out": int(amount_out * 0.995),  # 0.5% slippage default
+                "min_out": amount_out * 995 // 1000,  # 0.5% slippage default
             }
 
         except Exception as e:
@@ -240,31 +241,17 @@ async def swap_exact_tokens_for_tokens(
             return None
 
     def _get_amount_out(self, amount_in: int, reserve_in: int, reserve_out: int) -> int:
-        """Calculate output amount for V2 pools."""
-        amount_in_with_fee = amount_in * (10000 - self.fee)
-        numerator = amount_in_with_fee * reserve_out
-        denominator = reserve_in * 10000 + amount_in_with_fee
-        return numerator // denominator
+        """Calculate output amount for V2 pools, exactly as the pair contract does."""
+        return get_amount_out(amount_in, reserve_in, reserve_out, self.fee)
 
     def _calculate_price_impact(
         self, amount_in: int, amount_out: int, reserve_in: int, reserve_out: int
     ) -> float:
         """Calculate price impact percentage for V2 pools."""
         try:
-            # Calculate price before trade
-            price_before = Decimal(str(reserve_out)) / Decimal(str(reserve_in))
-
-            # Calculate expected output without impact
-            expected_out = Decimal(str(amount_in)) * price_before
-
-            # Calculate actual price impact
-            impact = (expected_out - Decimal(str(amount_out))) / expected_out
-
-            # Adjust impact based on liquidity depth
-            liquidity_factor = min(1, amount_in / reserve_in)
-            adjusted_impact = impact * liquidity_factor
-
-            return float(adjusted_impact)
+            # Shortfall against the spot price, weighted by liquidity depth
+            impact = price_impact_wad(amount_in, amount_out, reserve_in, reserve_out)
+            return impact / WAD
 
         except Exception as e:
             self.logger.error("Failed to calculate price impact: %s", str(e))
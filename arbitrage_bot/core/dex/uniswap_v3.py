@@ -6,6 +6,7 @@
 
 from .base_dex_v3 import BaseDEXV3
 from ..web3.web3_manager import Web3Manager
+from ...utils.fixed_point import WAD, v3_price_impact_wad
 
 
 class UniswapV3DEX(BaseDEXV3):
@@ -92,7 +93,7 @@ async def get_quote_with_impact(
                 "liquidity_depth": liquidity,
                 "fee_rate": self.config["fee"] / 1000000,
                 "estimated_gas": 200000,  # Base estimate for V3 swap
-                "min_out": int(quote.amountOut * 0.995),  # 0.5% slippage
+                "min_out": quote.amountOut * 995 // 1000,  # 0.5% slippage
             }
 
         except Exception as e:
@@ -152,20 +153,9 @@ def _calculate_price_impact_v3(
     ) -> float:
         """Calculate price impact for V3 pools."""
         try:
-            # Convert sqrtPriceX96 to price
-            price = (sqrt_price_x96**2) / (2**192)
-
-            # Calculate expected output without impact
-            expected_out = amount_in * price
-
-            # Calculate actual price impact
-            impact = (expected_out - amount_out) / expected_out
-
-            # Adjust impact based on liquidity depth
-            liquidity_factor = min(1, (amount_in * price) / liquidity)
-            adjusted_impact = impact * liquidity_factor
-
-            return float(adjusted_impact)
+            # Shortfall against the spot price, weighted by liquidity depth
+            impact = v3_price_impact_wad(amount_in, amount_out, sqrt_price_x96, liquidity)
+            return impact / WAD
 
         except Exception as e:
             self.logger.error(f"Failed to calculate V3 price impact: {e}")
@@ -3,18 +3,20 @@
 import asyncio
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
 from decimal import Decimal
 from web3 import Web3
 from web3.contract import AsyncContract
 
 from arbitrage_bot.core.events.event_emitter import Event, EventEmitter
+from arbitrage_bot.utils.fixed_point import price_x96, price_x96_to_decimal
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class SwapEvent:
     """Standardized representation of a DEX swap event."""
 
@@ -22,16 +24,17 @@ class SwapEvent:
     pool_address: str
     token0_address: str
     token1_address: str
-    amount0_delta: Decimal
-    amount1_delta: Decimal
-    price: Decimal  # Price computed from the swap
+    amount0_delta: int  # Raw token0 units
+    amount1_delta: int  # Raw token1 units
+    price: Decimal  # Price computed from the swap (reporting only)
     block_number: int
     transaction_hash: str
     timestamp: float
     raw_event: Optional[Dict[str, Any]] = None
+    price_x96: int = 0  # Q64.96 raw-unit price, |amount1 / amount0|
 
 
-@dataclass
+@dataclass(slots=True)
 class LiquidityEvent:
     """Standardized representation of a liquidity change event."""
 
@@ -39,9 +42,9 @@ class LiquidityEvent:
     pool_address: str
     token0_address: str
     token1_address: str
-    amount0_delta: Decimal
-    amount1_delta: Decimal
-    liquidity_delta: Decimal
+    amount0_delta: int  # Raw token0 units
+    amount1_delta: int  # Raw token1 units
+    liquidity_delta: int
     block_number: int
     transaction_hash: str
     timestamp: float
@@ -63,6 +66,7 @@ def __init__(
         web3_manager,  # Avoiding circular import
         dex_manager=None,  # Avoiding circular import
         polling_interval: int = 15,
+        keep_raw_events: bool = False,
     ):
         """
         Initialize DEX event monitor.
@@ -72,11 +76,13 @@ def __init__(
             web3_manager: Web3Manager instance for blockchain interaction
             dex_manager: DexManager instance for accessing DEXs (optional)
             polling_interval: Time between event polling in seconds
+            keep_raw_events: Keep the decoded web3 log on each event (debugging only)
         """
         self.event_emitter = event_emitter
         self.web3_manager = web3_manager
         self.dex_manager = dex_manager
         self.polling_interval = polling_interval
+        self.keep_raw_events = keep_raw_events
 
         # Last processed block per DEX
         self._last_block: Dict[str, int] = {}
@@ -94,9 +100,11 @@ def __init__(
         self._max_processed_txs = 1000  # Prevent memory growth
 
         # Event cache
-        self._swap_events_cache: List[SwapEvent] = []
-        self._liquidity_events_cache: List[LiquidityEvent] = []
         self._max_cache_size = 5000  # Limit cache size
+        self._swap_events_cache: Deque[SwapEvent] = deque(maxlen=self._max_cache_size)
+        self._liquidity_events_cache: Deque[LiquidityEvent] = deque(
+            maxlen=self._max_cache_size
+        )
 
         # Event signature lookup
         self._event_signatures = {
@@ -367,32 +375,21 @@ async def _fetch_swap_events(
                     timestamp = block.get("timestamp", time.time())
 
                     # Extract values depending on DEX version
-                    if (
-                        "amount0" in parsed_log["args"]
-                        and "amount1" in parsed_log["args"]
-                    ):
+                    args = parsed_log["args"]
+                    if "amount0" in args and "amount1" in args:
                         # V3 style
-                        amount0 = Decimal(str(parsed_log["args"]["amount0"]))
-                        amount1 = Decimal(str(parsed_log["args"]["amount1"]))
-                    elif (
-                        "amount0In" in parsed_log["args"]
-                        and "amount0Out" in parsed_log["args"]
-                    ):
+                        amount0 = int(args["amount0"])
+                        amount1 = int(args["amount1"])
+                    elif "amount0In" in args and "amount0Out" in args:
                         # V2 style
-                        amount0 = Decimal(
-                            str(parsed_log["args"]["amount0Out"])
-                        ) - Decimal(str(parsed_log["args"]["amount0In"]))
-                        amount1 = Decimal(
-                            str(parsed_log["args"]["amount1Out"])
-                        ) - Decimal(str(parsed_log["args"]["amount1In"]))
+                        amount0 = int(args["amount0Out"]) - int(args["amount0In"])
+                        amount1 = int(args["amount1Out"]) - int(args["amount1In"])
                     else:
                         # Unknown format
                         continue
 
-                    # Calculate price (safe division)
-                    price = Decimal("0")
-                    if amount0 != 0 and amount1 != 0:
-                        price = abs(amount1 / amount0) if amount0 != 0 else 0
+                    # Calculate Q64.96 price (safe division)
+                    swap_price_x96 = price_x96(amount0, amount1) if amount1 else 0
 
                     # Create swap event object
                     swap_event = SwapEvent(
@@ -402,17 +399,16 @@ async def _fetch_swap_events(
                         token1_address=token1,
                         amount0_delta=amount0,
                         amount1_delta=amount1,
-                        price=price,
+                        price=price_x96_to_decimal(swap_price_x96),
                         block_number=log.get("blockNumber"),
                         transaction_hash=tx_hash,
                         timestamp=timestamp,
-                        raw_event=parsed_log,
+                        raw_event=parsed_log if self.keep_raw_events else None,
+                        price_x96=swap_price_x96,
                     )
 
                     # Add to cache
                     self._swap_events_cache.append(swap_event)
-                    if len(self._swap_events_cache) > self._max_cache_size:
-                        self._swap_events_cache.pop(0)
 
                     # Mark as processed
                     self._processed_txs.add(tx_hash)
@@ -533,9 +529,9 @@ async def _process_mint_events(
                     timestamp = block.get("timestamp", time.time())
 
                     # Extract values
-                    amount0 = Decimal(str(parsed_log["args"].get("amount0", 0)))
-                    amount1 = Decimal(str(parsed_log["args"].get("amount1", 0)))
-                    liquidity = Decimal(str(parsed_log["args"].get("liquidity", 0)))
+                    amount0 = int(parsed_log["args"].get("amount0", 0))
+                    amount1 = int(parsed_log["args"].get("amount1", 0))
+                    liquidity = int(parsed_log["args"].get("liquidity", 0))
 
                     # Create liquidity event
                     liquidity_event = LiquidityEvent(
@@ -549,13 +545,11 @@ async def _process_mint_events(
                         block_number=log.get("blockNumber"),
                         transaction_hash=tx_hash,
                         timestamp=timestamp,
-                        raw_event=parsed_log,
+                        raw_event=parsed_log if self.keep_raw_events else None,
                     )
 
                     # Add to cache
                     self._liquidity_events_cache.append(liquidity_event)
-                    if len(self._liquidity_events_cache) > self._max_cache_size:
-                        self._liquidity_events_cache.pop(0)
 
                     # Mark as processed
                     self._processed_txs.add(tx_hash)
@@ -618,15 +612,10 @@ async def _process_burn_events(
                     timestamp = block.get("timestamp", time.time())
 
                     # Extract values
-                    amount0 = -Decimal(
-                        str(parsed_log["args"].get("amount0", 0))
-                    )  # Negative for liquidity removal
-                    amount1 = -Decimal(
-                        str(parsed_log["args"].get("amount1", 0))
-                    )  # Negative for liquidity removal
-                    liquidity = -Decimal(
-                        str(parsed_log["args"].get("liquidity", 0))
-                    )  # Negative for liquidity removal
+                    # Negative for liquidity removal
+                    amount0 = -int(parsed_log["args"].get("amount0", 0))
+                    amount1 = -int(parsed_log["args"].get("amount1", 0))
+                    liquidity = -int(parsed_log["args"].get("liquidity", 0))
 
                     # Create liquidity event
                     liquidity_event = LiquidityEvent(
@@ -640,13 +629,11 @@ async def _process_burn_events(
                         block_number=log.get("blockNumber"),
                         transaction_hash=tx_hash,
                         timestamp=timestamp,
-                        raw_event=parsed_log,
+                        raw_event=parsed_log if self.keep_raw_events else None,
                     )
 
                     # Add to cache
                     self._liquidity_events_cache.append(liquidity_event)
-                    if len(self._liquidity_events_cache) > self._max_cache_size:
-                        self._liquidity_events_cache.pop(0)
 
                     # Mark as processed
                     self._processed_txs.add(tx_hash)
@@ -742,7 +729,8 @@ async def _analyze_price_movements(self) -> None:
 
                     # Use latest event
                     latest = max(events, key=lambda e: e.timestamp)
-                    prices[dex_name] = latest.price
+                    if latest.price_x96:
+                        prices[dex_name] = latest.price_x96
 
                 # Need at least 2 prices for comparison
                 if len(prices) < 2:
@@ -752,13 +740,13 @@ async def _analyze_price_movements(self) -> None:
                 max_price_dex = max(prices.items(), key=lambda x: x[1])
                 min_price_dex = min(prices.items(), key=lambda x: x[1])
 
-                # Calculate price difference
-                price_diff_pct = (
-                    (max_price_dex[1] - min_price_dex[1]) / min_price_dex[1]
-                ) * 100
+                # Calculate price difference in basis points
+                price_diff_bps = (
+                    (max_price_dex[1] - min_price_dex[1]) * 10000 // min_price_dex[1]
+                )
 
                 # Emit opportunity event if difference is significant (> 0.5%)
-                if price_diff_pct > 0.5:
+                if price_diff_bps > 50:
                     token_addresses = pair_key.split("_")
 
                     # Emit opportunity event
@@ -766,14 +754,14 @@ async def _analyze_price_movements(self) -> None:
                         "arbitrage:opportunity",
                         {
                             "token_pair": token_addresses,
-                            "price_diff_pct": float(price_diff_pct),
+                            "price_diff_pct": price_diff_bps / 100,
                             "high_price": {
                                 "dex": max_price_dex[0],
-                                "price": float(max_price_dex[1]),
+                                "price": float(price_x96_to_decimal(max_price_dex[1])),
                             },
                             "low_price": {
                                 "dex": min_price_dex[0],
-                                "price": float(min_price_dex[1]),
+                                "price": float(price_x96_to_decimal(min_price_dex[1])),
                             },
                             "timestamp": time.time(),
                         },
@@ -0,0 +1,397 @@
+"""
+Event Bus
+
+Topic-based event delivery with one bounded queue and one consumer task per
+subscriber:
+- Publishing appends to each subscriber's queue; no task is created per
+  event, and a slow subscriber only delays itself
+- Consumers drain up to ``batch_size`` events per wake-up and hand them to
+  the handler one at a time or as a list
+- Each subscription picks an overflow policy: block the publisher, drop
+  the oldest event, or coalesce by key (latest event per key wins, e.g.
+  price updates)
+- Per-topic and per-subscription throughput, drop and lag metrics
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from arbitrage_bot.core.events.event_emitter import Event
+from arbitrage_bot.utils.streaming_stats import EWMA
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WILDCARD = "*"
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_BATCH_SIZE = 64
+
+# Smoothing factor for lag averages
+LAG_ALPHA = 0.05
+
+
+@dataclass(frozen=True)
+class Topic(Generic[T]):
+    """Named topic with the payload type its events carry."""
+
+    name: str
+    payload_type: Optional[Type[T]] = None
+
+
+TopicLike = Union[str, Topic]
+
+
+class OverflowPolicy(str, Enum):
+    """What a full subscriber queue does with a new event."""
+
+    BLOCK = "block"  # Publisher waits for space
+    DROP_OLDEST = "drop_oldest"  # Oldest queued event is discarded
+    COALESCE = "coalesce"  # Replace the queued event with the same key
+
+
+class TopicStats:
+    """Delivery metrics for one topic."""
+
+    __slots__ = ("published", "delivered", "dropped", "coalesced", "lag", "max_lag", "started")
+
+    def __init__(self):
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.lag = EWMA(alpha=LAG_ALPHA)
+        self.max_lag = 0.0
+        self.started = time.time()
+
+    def record_delivery(self, lag: float) -> None:
+        self.delivered += 1
+        self.lag.add(lag)
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.time() - self.started, 1e-9)
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "publish_rate": self.published / elapsed,
+            "avg_lag_ms": self.lag.mean * 1000,
+            "max_lag_ms": self.max_lag * 1000,
+        }
+
+
+class Subscription:
+    """A subscriber's queue and consumer task."""
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        topic: str,
+        handler: Callable,
+        max_queue: int,
+        policy: OverflowPolicy,
+        key: Optional[Callable[[Event[Any]], Hashable]],
+        batch_size: int,
+        batch: bool,
+    ):
+        if policy == OverflowPolicy.COALESCE and key is None:
+            raise ValueError("Coalescing subscriptions need a key function")
+        self.bus = bus
+        self.topic = topic
+        self.handler = handler
+        self.max_queue = max_queue
+        self.policy = policy
+        self.key = key
+        self.batch_size = batch_size
+        self.batch = batch
+        self.is_async = asyncio.iscoroutinefunction(handler)
+
+        # Coalescing subscriptions queue by key; insertion order is delivery order
+        self._queue: Deque[Event[Any]] = deque()
+        self._keyed: Dict[Hashable, Event[Any]] = {}
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._busy = False
+        self._task: Optional[asyncio.Task] = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._keyed) if self.policy == OverflowPolicy.COALESCE else len(self._queue)
+
+    @property
+    def idle(self) -> bool:
+        """Whether nothing is queued or being handled."""
+        return not len(self) and not self._busy
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._consume())
+
+    async def stop(self) -> None:
+        task = self._task
+        self._task = None
+        if task is None:
+            return
+        task.cancel()
+        # Release publishers blocked on this queue
+        self._space.set()
+        # A handler unsubscribing itself cannot wait for its own consumer
+        if task is asyncio.current_task():
+            return
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def offer(self, event: Event[Any], stats: TopicStats) -> None:
+        """Queue an event, applying the overflow policy."""
+        if self.policy == OverflowPolicy.COALESCE:
+            key = self.key(event)
+            if key in self._keyed:
+                self._keyed[key] = event
+                self.coalesced += 1
+                stats.coalesced += 1
+                return
+            if len(self._keyed) >= self.max_queue:
+                del self._keyed[next(iter(self._keyed))]
+                self.dropped += 1
+                stats.dropped += 1
+            self._keyed[key] = event
+        else:
+            if len(self._queue) >= self.max_queue:
+                if self.policy == OverflowPolicy.BLOCK:
+                    while len(self._queue) >= self.max_queue and self._task is not None:
+                        self._space.clear()
+                        await self._space.wait()
+                else:
+                    self._queue.popleft()
+                    self.dropped += 1
+                    stats.dropped += 1
+            self._queue.append(event)
+        self._ready.set()
+
+    def _take(self) -> List[Event[Any]]:
+        """Remove up to batch_size queued events."""
+        count = min(self.batch_size, len(self))
+        if self.policy == OverflowPolicy.COALESCE:
+            keys = list(self._keyed)[:count]
+            return [self._keyed.pop(key) for key in keys]
+        queue = self._queue
+        return [queue.popleft() for _ in range(count)]
+
+    async def _consume(self) -> None:
+        while True:
+            while not len(self):
+                self._ready.clear()
+                await self._ready.wait()
+
+            events = self._take()
+            self._busy = True
+            self._space.set()
+            try:
+                await self._deliver(events)
+            finally:
+                self._busy = False
+
+            now = time.time()
+            for event in events:
+                self.bus._topic_stats(event.name).record_delivery(now - event.timestamp)
+            self.delivered += len(events)
+
+    async def _deliver(self, events: List[Event[Any]]) -> None:
+        handler = self.handler
+        if self.batch:
+            try:
+                if self.is_async:
+                    await handler(events)
+                else:
+                    handler(events)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error in batch handler for {self.topic}: {e}")
+            return
+
+        for event in events:
+            try:
+                if self.is_async:
+                    await handler(event)
+                else:
+                    handler(event)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error in event handler for {self.topic}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "policy": self.policy.value,
+            "queued": len(self),
+            "max_queue": self.max_queue,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+class EventBus:
+    """Publishes events to per-subscriber bounded queues."""
+
+    def __init__(self):
+        """Initialize the bus."""
+        self._routes: Dict[str, List[Subscription]] = {}
+        self._topic_types: Dict[str, type] = {}
+        self._stats: Dict[str, TopicStats] = {}
+
+    def subscribe(
+        self,
+        topic: TopicLike,
+        handler: Callable,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        key: Optional[Callable[[Event[Any]], Hashable]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch: bool = False,
+    ) -> Subscription:
+        """
+        Subscribe a handler to a topic. Must be called from the event loop.
+
+        Args:
+            topic: Topic or topic name ("*" for every topic)
+            handler: Function or coroutine function; receives an Event, or a
+                list of Events if ``batch`` is set. Sync handlers run on the
+                loop and must not block.
+            max_queue: Queue bound (distinct keys when coalescing)
+            policy: Overflow policy when the queue is full
+            key: Key function for COALESCE
+            batch_size: Maximum events drained per wake-up
+            batch: Deliver drained events to the handler as one list
+
+        Returns:
+            The subscription, for unsubscribe() and stats
+        """
+        name = self._register_topic(topic)
+        subscription = Subscription(
+            self, name, handler, max_queue, OverflowPolicy(policy), key, batch_size, batch
+        )
+        subscription.start()
+        self._routes.setdefault(name, []).append(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription and stop its consumer; queued events are discarded.
+
+        Returns:
+            True if the subscription was active
+        """
+        subscriptions = self._routes.get(subscription.topic, [])
+        if subscription not in subscriptions:
+            return False
+        subscriptions.remove(subscription)
+        if not subscriptions:
+            del self._routes[subscription.topic]
+        await subscription.stop()
+        return True
+
+    async def publish(self, topic: TopicLike, data: Any, **kwargs) -> Event[Any]:
+        """
+        Publish an event to the topic's and the wildcard subscribers.
+
+        Only waits if a BLOCK subscriber's queue is full.
+
+        Args:
+            topic: Topic or topic name
+            data: Event payload
+            **kwargs: Event metadata (source, severity, ...)
+
+        Returns:
+            The published event
+        """
+        name = topic.name if isinstance(topic, Topic) else topic
+        expected = self._topic_types.get(name)
+        if expected is not None and not isinstance(data, expected):
+            raise TypeError(f"Topic {name} expects {expected.__name__}, got {type(data).__name__}")
+
+        event = Event(name=name, data=data, **kwargs)
+        await self.publish_event(event)
+        return event
+
+    async def publish_event(self, event: Event[Any]) -> None:
+        """Publish an existing Event object."""
+        stats = self._topic_stats(event.name)
+        stats.published += 1
+        for subscription in self._routes.get(event.name, ()):
+            await subscription.offer(event, stats)
+        for subscription in self._routes.get(WILDCARD, ()):
+            await subscription.offer(event, stats)
+
+    def subscriptions(self, topic: Optional[str] = None) -> List[Subscription]:
+        """Get the subscriptions for a topic (None = all)."""
+        if topic is not None:
+            return list(self._routes.get(topic, ()))
+        return [sub for subs in self._routes.values() for sub in subs]
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queue is empty and no handler is running.
+
+        Returns:
+            True if drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not all(sub.idle for sub in self.subscriptions()):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.001)
+        return True
+
+    async def close(self) -> None:
+        """Stop every consumer."""
+        for subscription in self.subscriptions():
+            await self.unsubscribe(subscription)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-topic and per-subscription metrics."""
+        return {
+            "topics": {name: stats.to_dict() for name, stats in self._stats.items()},
+            "subscriptions": [sub.get_stats() for sub in self.subscriptions()],
+        }
+
+    def _register_topic(self, topic: TopicLike) -> str:
+        if not isinstance(topic, Topic):
+            return topic
+        if topic.payload_type is not None:
+            registered = self._topic_types.setdefault(topic.name, topic.payload_type)
+            if registered is not topic.payload_type:
+                raise TypeError(f"Topic {topic.name} is already typed as {registered.__name__}")
+        return topic.name
+
+    def _topic_stats(self, name: str) -> TopicStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = TopicStats()
+        return stats
@@ -8,13 +8,10 @@
     Any,
     Callable,
     Dict,
-    List,
     Optional,
-    Set,
     TypeVar,
     Generic,
     Union,
-    cast,
 )
 
 logger = logging.getLogger(__name__)
@@ -76,33 +73,32 @@ def __repr__(self) -> str:
 
 class EventEmitter:
     """
-    Thread-safe async event emitter.
+    Async event emitter.
 
-    Handles both synchronous and asynchronous event handlers, with support
-    for typed events and comprehensive event metadata.
+    Each handler gets its own bounded queue and consumer task on an
+    ``EventBus``, so emitting never creates a task per event and a slow
+    handler only delays its own queue. Sync handlers run on the loop and
+    must not block.
     """
 
     def __init__(self):
         """Initialize event emitter."""
-        self._handlers: Dict[str, List[EventHandler]] = {}
-        self._handler_lock = asyncio.Lock()
-        self._running_tasks: Set[asyncio.Task] = set()
-        self._task_lock = asyncio.Lock()
+        from arbitrage_bot.core.events.event_bus import EventBus
 
-    async def on(self, event_name: str, handler: EventHandler) -> None:
+        self.bus = EventBus()
+
+    async def on(self, event_name: str, handler: EventHandler, **options) -> None:
         """
         Register an event handler.
 
         Args:
             event_name: Name of the event to listen for
             handler: Function or coroutine function to handle the event
+            **options: Queue options passed to EventBus.subscribe
+                (max_queue, policy, key, batch_size, batch)
         """
-        async with self._handler_lock:
-            if event_name not in self._handlers:
-                self._handlers[event_name] = []
-
-            self._handlers[event_name].append(handler)
-            logger.debug("Registered handler for event %s", event_name)
+        self.bus.subscribe(event_name, handler, **options)
+        logger.debug("Registered handler for event %s", event_name)
 
     async def off(self, event_name: str, handler: EventHandler) -> bool:
         """
@@ -115,22 +111,12 @@ async def off(self, event_name: str, handler: EventHandler) -> bool:
         Returns:
             True if handler was removed, False otherwise
         """
-        async with self._handler_lock:
-            if event_name not in self._handlers:
-                return False
-
-            handlers = self._handlers[event_name]
-            if handler not in handlers:
-                return False
-
-            handlers.remove(handler)
-            logger.debug("Removed handler for event %s", event_name)
-
-            # Clean up empty handler lists
-            if not handlers:
-                del self._handlers[event_name]
-
-            return True
+        for subscription in self.bus.subscriptions(event_name):
+            if subscription.handler == handler:
+                await self.bus.unsubscribe(subscription)
+                logger.debug("Removed handler for event %s", event_name)
+                return True
+        return False
 
     async def emit(self, event_name: str, data: Any, **kwargs) -> None:
         """
@@ -153,53 +139,10 @@ async def _emit_event(self, event: Event[Any]) -> None:
         Args:
             event: Event object to emit
         """
-        async with self._handler_lock:
-            handlers = self._handlers.get(event.name, []).copy()
-            # Also notify wildcard handlers
-            handlers.extend(self._handlers.get("*", []))
-
-        if not handlers:
-            logger.debug("No handlers for event %s", event.name)
-            return
-
-        logger.debug("Emitting event %s to %d handlers", event.name, len(handlers))
-
-        # Process handlers
-        for handler in handlers:
-            try:
-                if asyncio.iscoroutinefunction(handler):
-                    # Async handler
-                    task = asyncio.create_task(
-                        self._run_async_handler(cast(AsyncHandler, handler), event)
-                    )
-
-                    async with self._task_lock:
-                        self._running_tasks.add(task)
-                        # Clean up task when done
-                        task.add_done_callback(
-                            lambda t: asyncio.create_task(self._cleanup_task(t))
-                        )
-                else:
-                    # Sync handler - run in executor to avoid blocking
-                    loop = asyncio.get_event_loop()
-                    await loop.run_in_executor(None, cast(SyncHandler, handler), event)
-            except Exception as e:
-                logger.error("Error calling event handler: %s", str(e))
-
-    async def _run_async_handler(
-        self, handler: AsyncHandler, event: Event[Any]
-    ) -> None:
-        """Run an async handler with error handling."""
         try:
-            await handler(event)
+            await self.bus.publish_event(event)
         except Exception as e:
-            logger.error("Error in async event handler: %s", str(e))
-
-    async def _cleanup_task(self, task: asyncio.Task) -> None:
-        """Clean up completed task from tracking set."""
-        async with self._task_lock:
-            if task in self._running_tasks:
-                self._running_tasks.remove(task)
+            logger.error("Error emitting event %s: %s", event.name, str(e))
 
     async def wait_for_pending_events(self, timeout: Optional[float] = None) -> bool:
         """
@@ -211,22 +154,10 @@ async def wait_for_pending_events(self, timeout: Optional[float] = None) -> bool
         Returns:
             True if all handlers completed, False if timeout occurred
         """
-        async with self._task_lock:
-            pending_tasks = list(self._running_tasks)
-
-        if not pending_tasks:
-            return True
-
-        try:
-            logger.debug("Waiting for %d pending event handlers", len(pending_tasks))
-            await asyncio.wait(pending_tasks, timeout=timeout)
-
-            # Check if all tasks are done
-            return all(task.done() for task in pending_tasks)
-
-        except asyncio.TimeoutError:
+        drained = await self.bus.drain(timeout)
+        if not drained:
             logger.warning("Timeout waiting for event handlers to complete")
-            return False
+        return drained
 
     async def once(self, event_name: str) -> Event[Any]:
         """
@@ -253,6 +184,10 @@ async def one_time_handler(event: Event[Any]) -> None:
         # Wait for the event
         return await future
 
+    async def close(self) -> None:
+        """Stop all handler consumers."""
+        await self.bus.close()
+
     def get_handler_count(self, event_name: Optional[str] = None) -> int:
         """
         Get count of registered handlers.
@@ -263,8 +198,8 @@ def get_handler_count(self, event_name: Optional[str] = None) -> int:
         Returns:
             Number of registered handlers
         """
-        if event_name:
-            return len(self._handlers.get(event_name, []))
+        return len(self.bus.subscriptions(event_name or None))
 
-        # Count all handlers
-        return sum(len(handlers) for handlers in self._handlers.values())
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-topic throughput, drop and lag metrics."""
+        return self.bus.get_stats()
@@ -7,6 +7,7 @@
 from typing import Dict, List, Optional, Any, Union, Set
 
 from arbitrage_bot.core.events.event_emitter import EventEmitter, Event
+from arbitrage_bot.core.events.event_bus import Subscription
 from arbitrage_bot.core.events.dex_events import (
     DEXEventMonitor,
     SwapEvent,
@@ -69,7 +70,7 @@ def __init__(
 
         # For storing active event subscriptions
         self._subscriptions: Dict[str, Set[int]] = {}
-        self._subscription_callbacks: Dict[int, Any] = {}
+        self._subscription_callbacks: Dict[int, Subscription] = {}
         self._next_subscription_id = 1
 
         logger.info("Initialized event system")
@@ -122,9 +123,6 @@ async def start(self) -> bool:
             if self.transaction_monitor:
                 success = success and await self.transaction_monitor.start()
 
-            # Register global event handlers
-            await self._register_event_handlers()
-
             return success
 
     async def stop(self) -> bool:
@@ -155,50 +153,14 @@ async def stop(self) -> bool:
             if self.transaction_monitor:
                 success = success and await self.transaction_monitor.stop()
 
-            # Unregister event handlers
-            await self._unregister_event_handlers()
-
             # Clear subscriptions
+            for subscription in self._subscription_callbacks.values():
+                await self.event_emitter.bus.unsubscribe(subscription)
             self._subscriptions.clear()
             self._subscription_callbacks.clear()
 
             return success
 
-    async def _register_event_handlers(self) -> None:
-        """Register global event handlers."""
-        # Register wildcard handler for subscription routing
-        await self.event_emitter.on("*", self._route_event_to_subscribers)
-
-    async def _unregister_event_handlers(self) -> None:
-        """Unregister global event handlers."""
-        await self.event_emitter.off("*", self._route_event_to_subscribers)
-
-    async def _route_event_to_subscribers(self, event: Event[Any]) -> None:
-        """
-        Route events to subscribers.
-
-        Args:
-            event: Event to route
-        """
-        # Get subscriptions for this event
-        subscriber_ids = self._subscriptions.get(event.name, set())
-
-        # Also check for wildcard subscribers
-        wildcard_ids = self._subscriptions.get("*", set())
-        all_subscribers = subscriber_ids.union(wildcard_ids)
-
-        # Invoke callbacks
-        for sub_id in all_subscribers:
-            callback = self._subscription_callbacks.get(sub_id)
-            if callback:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(event)
-                    else:
-                        callback(event)
-                except Exception as e:
-                    logger.error(f"Error in subscription callback {sub_id}: {e}")
-
     async def emit(
         self,
         event_name: str,
@@ -219,13 +181,17 @@ async def emit(
             event_name, data, source=source, severity=severity
         )
 
-    async def subscribe(self, event_name: str, callback: Any) -> int:
+    async def subscribe(self, event_name: str, callback: Any, **options) -> int:
         """
         Subscribe to events.
 
+        Each subscription gets its own bounded queue and consumer task.
+
         Args:
             event_name: Event name to subscribe to (or '*' for all)
             callback: Function or coroutine to call with events
+            **options: Queue options passed to EventBus.subscribe
+                (max_queue, policy, key, batch_size, batch)
 
         Returns:
             Subscription ID for later unsubscription
@@ -240,7 +206,9 @@ async def subscribe(self, event_name: str, callback: Any) -> int:
                 self._subscriptions[event_name] = set()
 
             self._subscriptions[event_name].add(sub_id)
-            self._subscription_callbacks[sub_id] = callback
+            self._subscription_callbacks[sub_id] = self.event_emitter.bus.subscribe(
+                event_name, callback, **options
+            )
 
             return sub_id
 
@@ -263,8 +231,9 @@ async def unsubscribe(self, subscription_id: int) -> bool:
                 if subscription_id in subs:
                     subs.remove(subscription_id)
 
-            # Remove callback
-            del self._subscription_callbacks[subscription_id]
+            # Stop delivery
+            subscription = self._subscription_callbacks.pop(subscription_id)
+            await self.event_emitter.bus.unsubscribe(subscription)
 
             return True
 
@@ -548,7 +517,8 @@ def get_event_stats(self) -> Dict[str, Any]:
                 "by_event": {
                     name: len(subs) for name, subs in self._subscriptions.items()
                 },
-            }
+            },
+            "bus": self.event_emitter.get_stats(),
         }
 
         # Add component stats
@@ -0,0 +1,332 @@
+"""Append-only binary log for persisted arbitrage opportunities."""
+
+import asyncio
+import logging
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+# Record: 4-byte big-endian length followed by a msgpack map
+_LENGTH = struct.Struct(">I")
+
+# Index entry: record offset, opportunity timestamp, id length, then the id
+_INDEX_ENTRY = struct.Struct("<QdH")
+
+# msgpack ext type for integers outside the 64-bit range (wei amounts)
+_BIGINT_EXT = 1
+
+
+def _encode_big(value: Any) -> Any:
+    """Replace integers msgpack cannot hold with ext values."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        if -(2**63) <= value < 2**64:
+            return value
+        length = (value.bit_length() + 8) // 8
+        return msgpack.ExtType(_BIGINT_EXT, value.to_bytes(length, "big", signed=True))
+    if isinstance(value, dict):
+        return {k: _encode_big(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_big(v) for v in value]
+    return value
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _BIGINT_EXT:
+        return int.from_bytes(data, "big", signed=True)
+    return msgpack.ExtType(code, data)
+
+
+def _pack(data: Dict[str, Any]) -> bytes:
+    try:
+        return msgpack.packb(data, use_bin_type=True)
+    except OverflowError:
+        return msgpack.packb(_encode_big(data), use_bin_type=True)
+
+
+def _unpack(payload: bytes) -> Dict[str, Any]:
+    return msgpack.unpackb(payload, raw=False, ext_hook=_ext_hook, strict_map_key=False)
+
+
+class OpportunityLog:
+    """
+    Daily-rotated, length-prefixed msgpack log of opportunity states.
+
+    Every write appends the full state of an opportunity to the current
+    day's ``.log`` file and an entry (offset, timestamp, id) to the matching
+    ``.idx`` file. The latest entry for an id is its current state, so
+    replay only reads the index and the records that are still current.
+
+    Async callers use ``append_async``, which encodes and writes on a
+    single background writer thread so appends stay in submission order
+    and the event loop never blocks on msgpack or file I/O.
+    """
+
+    def __init__(self, directory: str, prefix: str = "opportunities"):
+        """
+        Initialize the log.
+
+        Args:
+            directory: Directory holding the log and index files
+            prefix: File name prefix
+        """
+        self.directory = directory
+        self.prefix = prefix
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._day: Optional[str] = None
+        self._log = None
+        self._index = None
+        self._lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {"records_written": 0, "bytes_written": 0, "rotations": 0}
+
+    def append(self, records: Iterable[Tuple[str, float, Dict[str, Any]]]) -> int:
+        """
+        Append opportunity states to the current day's log.
+
+        Args:
+            records: (opportunity id, timestamp, state) tuples
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            return self._append(records)
+
+    async def append_async(self, records: List[Tuple[str, float, Dict[str, Any]]]) -> int:
+        """
+        Append opportunity states on the background writer thread.
+
+        Args:
+            records: (opportunity id, timestamp, state) tuples; the states
+                must not be mutated until the returned coroutine completes
+
+        Returns:
+            Number of records written
+        """
+        if not records:
+            return 0
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="opportunity-log"
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._writer, self.append, records
+        )
+
+    def _append(self, records: Iterable[Tuple[str, float, Dict[str, Any]]]) -> int:
+        """Encode and write records; the caller holds the lock."""
+        self._rotate()
+        offset = self._log.tell()
+        log_chunks: List[bytes] = []
+        index_chunks: List[bytes] = []
+
+        for opportunity_id, timestamp, data in records:
+            payload = _pack(data)
+            key = opportunity_id.encode()
+            log_chunks.append(_LENGTH.pack(len(payload)))
+            log_chunks.append(payload)
+            index_chunks.append(_INDEX_ENTRY.pack(offset, float(timestamp), len(key)))
+            index_chunks.append(key)
+            offset += _LENGTH.size + len(payload)
+
+        if not index_chunks:
+            return 0
+
+        # Log before index: an index entry never points past the log
+        log_bytes = b"".join(log_chunks)
+        self._log.write(log_bytes)
+        self._log.flush()
+        self._index.write(b"".join(index_chunks))
+        self._index.flush()
+
+        count = len(index_chunks) // 2
+        self.stats["records_written"] += count
+        self.stats["bytes_written"] += len(log_bytes)
+        return count
+
+    def replay(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Load the latest state of each logged opportunity.
+
+        Files are read newest first and only the current record for each id
+        is decoded, stopping once ``limit`` opportunities are collected.
+
+        Args:
+            limit: Maximum number of opportunities to load
+
+        Returns:
+            Opportunity states, oldest first
+        """
+        latest: Dict[str, Tuple[str, int]] = {}
+        for day in reversed(self.days()):
+            for offset, _, opportunity_id in reversed(self._read_index(day)):
+                if opportunity_id not in latest:
+                    latest[opportunity_id] = (day, offset)
+                    if limit is not None and len(latest) >= limit:
+                        break
+            if limit is not None and len(latest) >= limit:
+                break
+
+        by_day: Dict[str, List[int]] = {}
+        for day, offset in latest.values():
+            by_day.setdefault(day, []).append(offset)
+
+        states = []
+        for day in sorted(by_day):
+            states.extend(self._read_records(day, sorted(by_day[day])))
+        return states
+
+    def get(self, opportunity_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest logged state of an opportunity.
+
+        Args:
+            opportunity_id: Opportunity ID
+
+        Returns:
+            Opportunity state, or None if never logged
+        """
+        for day in reversed(self.days()):
+            for offset, _, logged_id in reversed(self._read_index(day)):
+                if logged_id == opportunity_id:
+                    return self._read_records(day, [offset])[0]
+        return None
+
+    def scan(
+        self, start_time: Optional[float] = None, end_time: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over logged states with timestamps in a range.
+
+        Args:
+            start_time: Minimum opportunity timestamp
+            end_time: Maximum opportunity timestamp
+
+        Yields:
+            Opportunity states in write order, including superseded ones
+        """
+        for day in self.days():
+            offsets = [
+                offset
+                for offset, timestamp, _ in self._read_index(day)
+                if (start_time is None or timestamp >= start_time)
+                and (end_time is None or timestamp <= end_time)
+            ]
+            if offsets:
+                yield from self._read_records(day, offsets)
+
+    def days(self) -> List[str]:
+        """Get the dates of all log files, oldest first."""
+        days = []
+        for name in os.listdir(self.directory):
+            if name.startswith(f"{self.prefix}-") and name.endswith(".log"):
+                days.append(name[len(self.prefix) + 1 : -len(".log")])
+        return sorted(days)
+
+    def close(self) -> None:
+        """Wait for queued appends, then close the open log and index files."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._lock:
+            self._close_files()
+
+    def _close_files(self) -> None:
+        for handle in (self._log, self._index):
+            if handle is not None:
+                handle.close()
+        self._log = self._index = None
+        self._day = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get log statistics."""
+        return {**self.stats, "current_day": self._day, "days": len(self.days())}
+
+    def _path(self, day: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}-{day}{suffix}")
+
+    def _rotate(self) -> None:
+        """Open the current day's files, switching over at midnight UTC."""
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if day == self._day:
+            return
+        if self._day is not None:
+            self.stats["rotations"] += 1
+        self._close_files()
+
+        self._repair(day)
+        self._log = open(self._path(day, ".log"), "ab")
+        self._index = open(self._path(day, ".idx"), "ab")
+        self._day = day
+
+    def _repair(self, day: str) -> None:
+        """Drop a torn tail left by a crash so appends stay aligned."""
+        log_path = self._path(day, ".log")
+        index_path = self._path(day, ".idx")
+        if not os.path.exists(log_path):
+            return
+
+        entries, index_end = self._parse_index(day)
+        log_end = 0
+        if entries:
+            last_offset = entries[-1][0]
+            with open(log_path, "rb") as f:
+                f.seek(last_offset)
+                header = f.read(_LENGTH.size)
+                if len(header) == _LENGTH.size:
+                    log_end = last_offset + _LENGTH.size + _LENGTH.unpack(header)[0]
+
+        if os.path.getsize(log_path) != log_end:
+            logger.warning(f"Truncating unindexed tail of {log_path} to {log_end} bytes")
+            os.truncate(log_path, log_end)
+        if os.path.exists(index_path) and os.path.getsize(index_path) != index_end:
+            os.truncate(index_path, index_end)
+
+    def _parse_index(self, day: str) -> Tuple[List[Tuple[int, float, str]], int]:
+        """Parse an index file into entries and the end of its last complete entry."""
+        path = self._path(day, ".idx")
+        if not os.path.exists(path):
+            return [], 0
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        entries = []
+        position = 0
+        while position + _INDEX_ENTRY.size <= len(data):
+            offset, timestamp, length = _INDEX_ENTRY.unpack_from(data, position)
+            end = position + _INDEX_ENTRY.size + length
+            if end > len(data):
+                break
+            key = data[position + _INDEX_ENTRY.size : end].decode()
+            entries.append((offset, timestamp, key))
+            position = end
+        return entries, position
+
+    def _read_index(self, day: str) -> List[Tuple[int, float, str]]:
+        return self._parse_index(day)[0]
+
+    def _read_records(self, day: str, offsets: List[int]) -> List[Dict[str, Any]]:
+        """Decode the records at the given offsets of a day's log."""
+        records = []
+        with open(self._path(day, ".log"), "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                header = f.read(_LENGTH.size)
+                if len(header) < _LENGTH.size:
+                    break
+                payload = f.read(_LENGTH.unpack(header)[0])
+                try:
+                    records.append(_unpack(payload))
+                except Exception as e:
+                    logger.error(f"Error decoding opportunity record at {day}:{offset}: {e}")
+        return records
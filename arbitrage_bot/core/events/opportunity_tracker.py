@@ -6,18 +6,18 @@
 import json
 import os
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
 from typing import Dict, List, Optional, Set, Any, Tuple
 from decimal import Decimal
 from web3 import Web3
 from pathlib import Path
 
 from arbitrage_bot.core.events.event_emitter import Event, EventEmitter
+from arbitrage_bot.core.events.opportunity_log import OpportunityLog
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ArbitrageOpportunity:
     """Representation of a discovered arbitrage opportunity."""
 
@@ -132,6 +132,11 @@ def __init__(
         self._opportunities: Dict[str, ArbitrageOpportunity] = {}
         self._max_memory_opportunities = max_memory_opportunities
 
+        # Persistence: append-only log, written once per state change
+        self._log = OpportunityLog(self.data_dir)
+        self._dirty: Set[str] = set()
+        self._evicted_dirty: Dict[str, ArbitrageOpportunity] = {}
+
         # Statistics and analytics
         self._token_pair_stats: Dict[str, Dict[str, Any]] = {}
         self._dex_pair_stats: Dict[str, Dict[str, Any]] = {}
@@ -215,8 +220,9 @@ async def stop(self) -> bool:
                     logger.warning("Timeout waiting for persist task to complete")
                 self._persist_task = None
 
-            # Final persist
-            await self.persist_opportunities()
+            # Final persist (the lock is already held)
+            await self._persist_changes()
+            self._log.close()
 
             return True
 
@@ -376,6 +382,7 @@ async def track_opportunity(self, opportunity: ArbitrageOpportunity) -> bool:
         async with self._lock:
             # Add to tracked opportunities
             self._opportunities[opportunity.id] = opportunity
+            self._dirty.add(opportunity.id)
 
             # Update statistics
             self._update_statistics(opportunity)
@@ -440,10 +447,12 @@ async def update_opportunity_execution(
 
             # Update execution statistics
             self._update_execution_statistics(opportunity)
+            self._dirty.add(opportunity_id)
 
             # Save immediately for executed opportunities
             if status == "executed" and self._auto_persist:
-                await self._save_single_opportunity(opportunity)
+                if await self._save_single_opportunity(opportunity):
+                    self._dirty.discard(opportunity_id)
 
             # Emit event for other components
             await self.event_emitter.emit(
@@ -545,6 +554,8 @@ def _get_route_key(self, route: List[Dict[str, Any]]) -> str:
 
     def _trim_opportunities(self) -> None:
         """Trim the opportunity storage to the maximum size."""
+        previous = self._opportunities
+
         # Keep executed opportunities and most recent
         executed = {}
         pending = {}
@@ -586,6 +597,11 @@ def _trim_opportunities(self) -> None:
                 opp_id, opp = sorted_executed[i]
                 self._opportunities[opp_id] = opp
 
+        # Unpersisted changes of evicted opportunities are still written
+        for opp_id in self._dirty.difference(self._opportunities):
+            if opp_id in previous:
+                self._evicted_dirty[opp_id] = previous[opp_id]
+
     async def _auto_persist_loop(self) -> None:
         """Loop for automatically persisting opportunities."""
         try:
@@ -617,88 +633,54 @@ async def _auto_persist_loop(self) -> None:
 
     async def persist_opportunities(self) -> bool:
         """
-        Persist opportunities to disk.
+        Persist opportunities changed since the last persist.
+
+        Each changed opportunity is appended to the opportunity log once, so
+        the I/O per cycle is proportional to the number of changes.
 
         Returns:
             True if persisted successfully
         """
         async with self._lock:
-            try:
-                # Get all opportunities that need persisting
-                executed_opportunities = [
-                    opp
-                    for opp in self._opportunities.values()
-                    if opp.execution_status == "executed"
-                ]
+            return await self._persist_changes()
 
-                # Get date for file organization
-                today = datetime.now().strftime("%Y-%m-%d")
-                persist_dir = os.path.join(self.data_dir, today)
-                os.makedirs(persist_dir, exist_ok=True)
-
-                # Persist executed opportunities
-                for opp in executed_opportunities:
-                    await self._save_single_opportunity(opp, persist_dir)
+    async def _persist_changes(self) -> bool:
+        """Append changed opportunities to the log; the caller holds the lock."""
+        try:
+            changed = dict(self._evicted_dirty)
+            for opp_id in self._dirty:
+                opp = self._opportunities.get(opp_id)
+                if opp is not None:
+                    changed[opp_id] = opp
+
+            written = await self._log.append_async(
+                [(opp.id, opp.timestamp, opp.to_dict()) for opp in changed.values()]
+            )
+            self._dirty.clear()
+            self._evicted_dirty.clear()
 
-                # Save current opportunities snapshot
-                snapshot_path = os.path.join(
-                    self.data_dir, "current_opportunities.json"
-                )
-                with open(snapshot_path, "w") as f:
-                    json.dump(
-                        {
-                            "opportunities": [
-                                opp.to_dict() for opp in self._opportunities.values()
-                            ],
-                            "timestamp": time.time(),
-                            "stats": {
-                                "total_count": self._opportunity_count,
-                                "executed_count": self._executed_count,
-                                "success_rate": self._execution_success_rate,
-                                "average_profit": self._average_profit,
-                                "total_profit": self._total_profit,
-                            },
-                        },
-                        f,
-                        indent=2,
-                    )
-
-                logger.info(
-                    f"Persisted {len(executed_opportunities)} executed opportunities"
-                )
-                return True
+            if written:
+                logger.info(f"Persisted {written} changed opportunities")
+            return True
 
-            except Exception as e:
-                logger.error(f"Error persisting opportunities: {e}")
-                return False
+        except Exception as e:
+            logger.error(f"Error persisting opportunities: {e}")
+            return False
 
-    async def _save_single_opportunity(
-        self, opportunity: ArbitrageOpportunity, directory: Optional[str] = None
-    ) -> bool:
+    async def _save_single_opportunity(self, opportunity: ArbitrageOpportunity) -> bool:
         """
-        Save a single opportunity to disk.
+        Append the current state of a single opportunity to the log.
 
         Args:
             opportunity: Opportunity to save
-            directory: Directory to save in (default: today's date directory)
 
         Returns:
             True if saved successfully
         """
         try:
-            # Get date for file organization
-            today = datetime.now().strftime("%Y-%m-%d")
-            persist_dir = directory or os.path.join(self.data_dir, today)
-            os.makedirs(persist_dir, exist_ok=True)
-
-            # Create filename
-            filename = f"opportunity_{opportunity.id}.json"
-            filepath = os.path.join(persist_dir, filename)
-
-            # Save opportunity
-            with open(filepath, "w") as f:
-                json.dump(opportunity.to_dict(), f, indent=2)
-
+            await self._log.append_async(
+                [(opportunity.id, opportunity.timestamp, opportunity.to_dict())]
+            )
             return True
 
         except Exception as e:
@@ -706,32 +688,45 @@ async def _save_single_opportunity(
             return False
 
     async def _load_opportunities(self) -> None:
-        """Load previously saved opportunities."""
+        """Load the latest state of previously saved opportunities."""
         try:
-            # Look for snapshot file
-            snapshot_path = os.path.join(self.data_dir, "current_opportunities.json")
-            if not os.path.exists(snapshot_path):
+            if not self._log.days():
+                self._load_legacy_snapshot()
                 return
 
-            # Load snapshot
-            with open(snapshot_path, "r") as f:
-                data = json.load(f)
-
-            # Load opportunities
-            for opp_data in data.get("opportunities", []):
+            for opp_data in self._log.replay(limit=self._max_memory_opportunities):
                 try:
                     opportunity = ArbitrageOpportunity.from_dict(opp_data)
                     self._opportunities[opportunity.id] = opportunity
                 except Exception as e:
                     logger.error(f"Error loading opportunity: {e}")
 
-            logger.info(
-                f"Loaded {len(self._opportunities)} opportunities from snapshot"
-            )
+            logger.info(f"Loaded {len(self._opportunities)} opportunities from log")
 
         except Exception as e:
             logger.error(f"Error loading opportunities: {e}")
 
+    def _load_legacy_snapshot(self) -> None:
+        """Load a JSON snapshot written by earlier versions and queue it for the log."""
+        snapshot_path = os.path.join(self.data_dir, "current_opportunities.json")
+        if not os.path.exists(snapshot_path):
+            return
+
+        with open(snapshot_path, "r") as f:
+            data = json.load(f)
+
+        for opp_data in data.get("opportunities", []):
+            try:
+                opportunity = ArbitrageOpportunity.from_dict(opp_data)
+                self._opportunities[opportunity.id] = opportunity
+                self._dirty.add(opportunity.id)
+            except Exception as e:
+                logger.error(f"Error loading opportunity: {e}")
+
+        logger.info(
+            f"Loaded {len(self._opportunities)} opportunities from legacy snapshot"
+        )
+
     def get_opportunity(self, opportunity_id: str) -> Optional[ArbitrageOpportunity]:
         """
         Get a specific opportunity by ID.
@@ -838,6 +833,8 @@ def get_stats(self) -> Dict[str, Any]:
             "token_pairs": len(self._token_pair_stats),
             "top_token_pairs": self._get_top_token_pairs(5),
             "top_dex_pairs": self._get_top_dex_pairs(5),
+            "pending_writes": len(self._dirty) + len(self._evicted_dirty),
+            "log": self._log.get_stats(),
         }
 
     def _get_top_token_pairs(self, count: int = 5) -> List[Dict[str, Any]]:
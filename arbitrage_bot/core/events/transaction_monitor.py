@@ -12,6 +12,7 @@
 from web3.types import TxReceipt
 
 from arbitrage_bot.core.events.event_emitter import Event, EventEmitter
+from arbitrage_bot.core.web3.receipt_watcher import ReceiptUpdate, ReceiptWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +130,7 @@ def __init__(
         confirmations_required: int = 12,
         polling_interval: int = 15,
         max_track_transactions: int = 1000,
+        receipt_watcher: Optional[ReceiptWatcher] = None,
     ):
         """
         Initialize transaction lifecycle monitor.
@@ -137,8 +139,9 @@ def __init__(
             event_emitter: EventEmitter instance
             web3_manager: Web3Manager instance for blockchain interaction
             confirmations_required: Required confirmations for finality
-            polling_interval: Block polling interval in seconds
+            polling_interval: Bundle check interval in seconds
             max_track_transactions: Maximum transactions to track
+            receipt_watcher: Shared receipt watcher (created on start if omitted)
         """
         self.event_emitter = event_emitter
         self.web3_manager = web3_manager
@@ -151,6 +154,11 @@ def __init__(
         self._pending_transactions: Set[str] = set()
         self._pending_bundles: Dict[str, List[str]] = {}  # bundle_id -> [tx_hash, ...]
 
+        # Receipts are resolved per block by the shared watcher
+        self._receipt_watcher = receipt_watcher
+        self._owns_receipt_watcher = receipt_watcher is None
+        self._watched: Dict[str, str] = {}  # normalized hash -> tx_hash
+
         # Statistics
         self._success_count = 0
         self._fail_count = 0
@@ -185,6 +193,11 @@ async def start(self) -> bool:
             # Register event handlers
             await self._register_event_handlers()
 
+            # Attach to the receipt watcher
+            if self._receipt_watcher is None:
+                self._receipt_watcher = ReceiptWatcher(self.web3_manager.w3)
+            self._receipt_watcher.add_listener(self._handle_receipt_update)
+
             # Start monitoring task
             self._monitor_task = asyncio.create_task(self._monitor_loop())
 
@@ -217,6 +230,16 @@ async def stop(self) -> bool:
                     logger.warning("Timeout waiting for monitoring task to complete")
                 self._monitor_task = None
 
+            # Detach from the receipt watcher
+            if self._receipt_watcher is not None:
+                self._receipt_watcher.remove_listener(self._handle_receipt_update)
+                for tx_hash in self._watched.values():
+                    self._receipt_watcher.unwatch(tx_hash)
+                self._watched.clear()
+                if self._owns_receipt_watcher:
+                    await self._receipt_watcher.close()
+                    self._receipt_watcher = None
+
             return True
 
     async def _register_event_handlers(self) -> None:
@@ -365,6 +388,7 @@ async def _handle_bundle_included(self, event: Event[Any]) -> None:
 
                     # Add to pending list for detailed receipt fetching
                     self._pending_transactions.add(tx_hash)
+                    self._watch_transaction(tx_hash)
 
             # Remove from pending bundles
             if bundle_id in self._pending_bundles:
@@ -530,6 +554,7 @@ async def track_transaction(
                     TransactionStatus.BUNDLE_PENDING,
                 ]:
                     self._pending_transactions.add(tx_hash)
+                    self._watch_transaction(tx_hash)
 
                 # Track bundle if needed
                 if bundle_id and bundle_id not in self._pending_bundles:
@@ -712,72 +737,68 @@ async def _monitor_loop(self) -> None:
             logger.error(f"Unexpected error in transaction monitor: {e}")
 
     async def _check_pending_transactions(self) -> None:
-        """Check status of pending transactions."""
-        if not self._pending_transactions:
+        """Register pending transactions with the receipt watcher."""
+        if not self._pending_transactions or self._receipt_watcher is None:
             return
 
-        # Get current block for confirmation count
-        try:
-            current_block = await self.web3_manager.w3.eth.block_number
-        except Exception as e:
-            logger.error(f"Error getting current block number: {e}")
-            return
+        # No RPC here: the watcher fetches receipts once per block for all of them
+        for tx_hash in list(self._pending_transactions):
+            self._watch_transaction(tx_hash)
 
-        # Process transactions in batches to avoid overloading the node
-        batch_size = 10
-        pending_list = list(self._pending_transactions)
+    def _watch_transaction(self, tx_hash: str) -> None:
+        """Register a transaction with the receipt watcher if not already watched."""
+        key = tx_hash.lower()
+        if self._receipt_watcher is None or key in self._watched:
+            return
+        self._watched[key] = tx_hash
+        future = self._receipt_watcher.watch(
+            tx_hash, confirmations=self.confirmations_required
+        )
+        future.add_done_callback(lambda f, key=key: self._forget_watch(key, f))
 
-        for i in range(0, len(pending_list), batch_size):
-            batch = pending_list[i : i + batch_size]
+    def _forget_watch(self, key: str, future: asyncio.Future) -> None:
+        """Stop tracking a hash once the watcher resolved, timed out or cancelled it."""
+        self._watched.pop(key, None)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Stopped watching {key}: {future.exception()}")
 
-            for tx_hash in batch:
-                try:
-                    # Skip if transaction is no longer in pending list
-                    if tx_hash not in self._pending_transactions:
-                        continue
+    async def _handle_receipt_update(self, update: ReceiptUpdate) -> None:
+        """
+        Apply a receipt update from the watcher.
 
-                    # Get transaction receipt
-                    receipt = await self.web3_manager.w3.eth.get_transaction_receipt(
-                        tx_hash
-                    )
+        Args:
+            update: Normalized receipt update
+        """
+        tx_hash = self._watched.get(update.tx_hash)
+        if tx_hash is None or tx_hash not in self._transactions:
+            return
 
-                    if receipt:
-                        # Transaction is mined
-                        block_number = receipt.blockNumber
-                        confirmations = current_block - block_number + 1
-
-                        record = self._transactions[tx_hash]
-                        record.block_number = block_number
-                        record.gas_used = receipt.gasUsed
-                        record.effective_gas_price = receipt.effectiveGasPrice
-                        record.success = receipt.status == 1
-                        record.confirmation_blocks = confirmations
-
-                        # Get block timestamp
-                        try:
-                            block = await self.web3_manager.w3.eth.get_block(
-                                block_number
-                            )
-                            record.block_timestamp = block.timestamp
-                        except Exception as e:
-                            logger.error(f"Error getting block timestamp: {e}")
-
-                        # Update status based on confirmations
-                        if confirmations >= self.confirmations_required:
-                            await self.update_transaction_status(
-                                tx_hash=tx_hash,
-                                status=TransactionStatus.CONFIRMED,
-                                block_number=block_number,
-                                gas_used=receipt.gasUsed,
-                                success=(receipt.status == 1),
-                            )
-                        else:
-                            record.status = TransactionStatus.CONFIRMING
+        try:
+            record = self._transactions[tx_hash]
+            record.block_number = update.block_number
+            record.gas_used = update.gas_used
+            record.effective_gas_price = update.effective_gas_price
+            record.success = update.success
+            record.confirmation_blocks = update.confirmations
+            if update.block_timestamp is not None:
+                record.block_timestamp = update.block_timestamp
+
+            # Update status based on confirmations
+            if update.confirmations >= self.confirmations_required:
+                self._watched.pop(update.tx_hash, None)
+                await self.update_transaction_status(
+                    tx_hash=tx_hash,
+                    status=TransactionStatus.CONFIRMED,
+                    block_number=update.block_number,
+                    gas_used=update.gas_used,
+                    success=update.success,
+                    error="Transaction reverted" if update.reverted else None,
+                )
+            else:
+                record.status = TransactionStatus.CONFIRMING
 
-                except Exception as e:
-                    logger.error(
-                        f"Error checking transaction status for {tx_hash}: {e}"
-                    )
+        except Exception as e:
+            logger.error(f"Error applying receipt update for {tx_hash}: {e}")
 
     async def _check_pending_bundles(self) -> None:
         """Check status of pending Flashbots bundles."""
@@ -10,13 +10,28 @@
     FlashLoanCallback,
     FlashLoanResult,
     FlashLoanParams,
+    FlashLoanStatus,
+    TokenAmount,
 )
-from .factory import create_flash_loan_provider
+from .factory import (
+    create_flash_loan_provider,
+    get_best_provider,
+    get_optimal_multi_token_provider,
+    estimate_flash_loan_cost,
+)
+from .liquidity_service import FlashLoanLiquidityService, LiquidityQuote
 
 __all__ = [
     "FlashLoanProvider",
     "FlashLoanCallback",
     "FlashLoanResult",
     "FlashLoanParams",
+    "FlashLoanStatus",
+    "TokenAmount",
     "create_flash_loan_provider",
+    "get_best_provider",
+    "get_optimal_multi_token_provider",
+    "estimate_flash_loan_cost",
+    "FlashLoanLiquidityService",
+    "LiquidityQuote",
 ]
@@ -12,6 +12,7 @@
 
 from ....core.web3.interfaces import Web3Client
 from .interfaces import FlashLoanProvider, TokenAmount
+from .liquidity_service import FlashLoanLiquidityService
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -73,6 +74,7 @@ async def get_best_provider(
     token_address: str,
     amount: Decimal,
     config: Optional[Dict[str, Any]] = None,
+    liquidity_service: Optional[FlashLoanLiquidityService] = None,
 ) -> FlashLoanProvider:
     """
     Get the best flash loan provider for the given token and amount.
@@ -87,6 +89,8 @@ async def get_best_provider(
         token_address: Address of the token to borrow
         amount: Amount to borrow
         config: Configuration for flash loan providers
+        liquidity_service: If given, answer from its cached snapshot
+            instead of creating providers and querying the chain
 
     Returns:
         Best flash loan provider for the token
@@ -94,6 +98,14 @@ async def get_best_provider(
     Raises:
         ValueError: If no suitable provider is found
     """
+    if liquidity_service is not None:
+        provider = liquidity_service.best_provider(token_address, amount)
+        if provider is None:
+            raise ValueError(
+                f"No flash loan provider with sufficient liquidity for token {token_address}, amount {amount}"
+            )
+        return provider
+
     config = config or {}
     all_types = await get_all_provider_types()
     balancer_config = config.get("balancer", {})
@@ -152,6 +164,7 @@ async def create_providers_for_token_amounts(
     web3_client: Web3Client,
     token_amounts: List[TokenAmount],
     config: Optional[Dict[str, Any]] = None,
+    liquidity_service: Optional[FlashLoanLiquidityService] = None,
 ) -> Dict[str, FlashLoanProvider]:
     """
     Create optimal flash loan providers for a list of token amounts.
@@ -163,6 +176,7 @@ async def create_providers_for_token_amounts(
         web3_client: Web3 client to use
         token_amounts: List of token amounts to borrow
         config: Provider configurations
+        liquidity_service: If given, answer from its cached snapshot
 
     Returns:
         Dictionary mapping token addresses to providers
@@ -177,7 +191,7 @@ async def create_providers_for_token_amounts(
         if token_address not in providers:
             try:
                 provider = await get_best_provider(
-                    web3_client, token_address, amount, config
+                    web3_client, token_address, amount, config, liquidity_service
                 )
                 providers[token_address] = provider
             except ValueError as e:
@@ -191,6 +205,7 @@ async def get_optimal_multi_token_provider(
     web3_client: Web3Client,
     token_amounts: List[TokenAmount],
     config: Optional[Dict[str, Any]] = None,
+    liquidity_service: Optional[FlashLoanLiquidityService] = None,
 ) -> Optional[FlashLoanProvider]:
     """
     Find the optimal provider for a multi-token flash loan.
@@ -207,10 +222,14 @@ async def get_optimal_multi_token_provider(
         web3_client: Web3 client to use
         token_amounts: List of token amounts to borrow
         config: Provider configurations
+        liquidity_service: If given, answer from its cached snapshot
 
     Returns:
         Optimal provider for all tokens or None if no single provider works
     """
+    if liquidity_service is not None:
+        return liquidity_service.best_multi_token_provider(token_amounts)
+
     config = config or {}
     balancer_config = config.get("balancer", {})
     aave_config = config.get("aave", {})
@@ -280,6 +299,7 @@ async def estimate_flash_loan_cost(
     token_address: str,
     amount: Decimal,
     config: Optional[Dict[str, Any]] = None,
+    liquidity_service: Optional[FlashLoanLiquidityService] = None,
 ) -> Dict[str, Decimal]:
     """
     Estimate the cost of a flash loan across different providers.
@@ -293,10 +313,14 @@ async def estimate_flash_loan_cost(
         token_address: Address of the token to borrow
         amount: Amount to borrow
         config: Configuration for providers
+        liquidity_service: If given, answer from its cached snapshot
 
     Returns:
         Dictionary mapping provider names to fee costs
     """
+    if liquidity_service is not None:
+        return liquidity_service.estimate_costs(token_address, amount)
+
     config = config or {}
     costs = {}
     provider_types = await get_all_provider_types()
@@ -0,0 +1,335 @@
+"""
+Flash Loan Liquidity Service
+
+This module keeps long-lived flash loan provider instances and a per-block
+snapshot of their available liquidity and fees, so that provider selection
+on the execution path is a synchronous in-memory lookup.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ....core.web3.interfaces import Web3Client
+from .interfaces import FlashLoanProvider, TokenAmount
+
+logger = logging.getLogger(__name__)
+
+# Providers in order of preference when fees are equal
+PROVIDER_PRIORITY = ["balancer", "aave"]
+
+
+@dataclass(frozen=True)
+class LiquidityQuote:
+    """Available liquidity and fee of one provider for one token."""
+
+    provider_type: str
+    available: Decimal
+    fee_percentage: Decimal
+    block_number: Optional[int]
+
+    def fee_for(self, amount: Decimal) -> Decimal:
+        """Fee for borrowing ``amount``."""
+        return amount * self.fee_percentage
+
+
+class FlashLoanLiquidityService:
+    """
+    Per-block cache of flash loan liquidity and fees.
+
+    Providers are created and initialized once. Every new block, liquidity
+    and fee reads for all tracked tokens across all providers are issued
+    concurrently as one batch and swapped in as a new snapshot; queries
+    only ever read the current snapshot.
+    """
+
+    def __init__(
+        self,
+        web3_client: Web3Client,
+        config: Optional[Dict[str, Any]] = None,
+        tokens: Optional[Iterable[str]] = None,
+        providers: Optional[Dict[str, FlashLoanProvider]] = None,
+        poll_interval: float = 1.0,
+        refresh_interval: float = 12.0,
+    ):
+        """
+        Initialize the liquidity service.
+
+        Args:
+            web3_client: Web3 client shared by the providers
+            config: Provider configurations keyed by provider type
+            tokens: Token addresses to track in addition to the providers'
+                supported tokens
+            providers: Already initialized providers keyed by provider type
+                (default: created from ``config`` on start)
+            poll_interval: Seconds between chain head checks
+            refresh_interval: Seconds between refreshes while the chain head
+                cannot be read
+        """
+        self.web3_client = web3_client
+        self.config = config or {}
+        self.poll_interval = poll_interval
+        self.refresh_interval = refresh_interval
+        self.providers: Dict[str, FlashLoanProvider] = dict(providers or {})
+        self._owns_providers = providers is None
+        self._tokens = {token.lower(): token for token in tokens or ()}
+
+        # token (lowercase) -> provider type -> quote
+        self._quotes: Dict[str, Dict[str, LiquidityQuote]] = {}
+        self.block_number: Optional[int] = None
+        self._refreshed_at = 0.0  # monotonic time of the last refresh
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats: Dict[str, Any] = {
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "last_refresh_ms": 0.0,
+            "lookups": 0,
+            "misses": 0,
+        }
+
+    @property
+    def tokens(self) -> List[str]:
+        """Tracked token addresses."""
+        return list(self._tokens.values())
+
+    async def start(self) -> None:
+        """Create the providers, load the first snapshot and follow new blocks."""
+        if self._owns_providers and not self.providers:
+            from .factory import create_flash_loan_provider
+
+            for provider_type in PROVIDER_PRIORITY:
+                try:
+                    self.providers[provider_type] = await create_flash_loan_provider(
+                        provider_type, self.web3_client, self.config.get(provider_type, {})
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to create {provider_type} flash loan provider: {e}")
+
+        for provider in self.providers.values():
+            for token in provider.supported_tokens:
+                self._tokens.setdefault(token.lower(), token)
+
+        await self.refresh(await self._head())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Flash loan liquidity service tracking {len(self._tokens)} tokens "
+            f"across {len(self.providers)} providers"
+        )
+
+    async def close(self) -> None:
+        """Stop following blocks and close owned providers."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._owns_providers:
+            for provider_type, provider in self.providers.items():
+                try:
+                    await provider.close()
+                except Exception as e:
+                    logger.warning(f"Error closing {provider_type} provider: {e}")
+            self.providers = {}
+        self._quotes = {}
+
+    def track(self, token_address: str) -> None:
+        """Track a token from the next refresh on."""
+        self._tokens.setdefault(token_address.lower(), token_address)
+
+    async def on_block(self, block_number: int) -> None:
+        """
+        Refresh the snapshot for a new head block.
+
+        Args:
+            block_number: Latest block number
+        """
+        if self.block_number is not None and block_number <= self.block_number:
+            return
+        await self.refresh(block_number)
+
+    async def refresh(self, block_number: Optional[int] = None) -> None:
+        """
+        Read liquidity and fees for all tracked tokens in one batch.
+
+        Args:
+            block_number: Block the reads belong to
+        """
+        async with self._refresh_lock:
+            start = time.perf_counter()
+            keys: List[Tuple[str, str]] = []
+            reads = []
+            for provider_type, provider in self.providers.items():
+                for key, token in self._tokens.items():
+                    keys.append((key, provider_type))
+                    reads.append(provider.max_flash_loan(token))
+                    reads.append(provider.get_flash_loan_fee(token, Decimal("1")))
+
+            results = await asyncio.gather(*reads, return_exceptions=True)
+
+            quotes: Dict[str, Dict[str, LiquidityQuote]] = {}
+            for i, (key, provider_type) in enumerate(keys):
+                available, fee = results[2 * i], results[2 * i + 1]
+                if isinstance(available, BaseException) or isinstance(fee, BaseException):
+                    self.stats["refresh_errors"] += 1
+                    error = available if isinstance(available, BaseException) else fee
+                    logger.warning(f"Error reading {provider_type} liquidity for {key}: {error}")
+                    continue
+                quotes.setdefault(key, {})[provider_type] = LiquidityQuote(
+                    provider_type, Decimal(available), Decimal(fee), block_number
+                )
+
+            # Swap in the new snapshot; readers never see a partial one
+            self._quotes = quotes
+            self.block_number = block_number
+            self._refreshed_at = time.monotonic()
+            self.stats["refreshes"] += 1
+            self.stats["last_refresh_ms"] = (time.perf_counter() - start) * 1000
+
+    def quotes(self, token_address: str) -> List[LiquidityQuote]:
+        """
+        Get a token's quotes, cheapest first.
+
+        Args:
+            token_address: Address of the token to borrow
+
+        Returns:
+            Quotes ordered by fee, then provider priority
+        """
+        by_provider = self._quotes.get(token_address.lower(), {})
+        return sorted(by_provider.values(), key=self._rank)
+
+    def best_provider(
+        self, token_address: str, amount: Decimal
+    ) -> Optional[FlashLoanProvider]:
+        """
+        Get the cheapest provider with enough liquidity, from memory.
+
+        Args:
+            token_address: Address of the token to borrow
+            amount: Amount to borrow
+
+        Returns:
+            Provider instance, or None if no provider can lend the amount
+        """
+        self.stats["lookups"] += 1
+        for quote in self.quotes(token_address):
+            if quote.available >= amount:
+                return self.providers.get(quote.provider_type)
+        self.stats["misses"] += 1
+        return None
+
+    def best_multi_token_provider(
+        self, token_amounts: List[TokenAmount]
+    ) -> Optional[FlashLoanProvider]:
+        """
+        Get the preferred provider that can lend every token amount.
+
+        Args:
+            token_amounts: Token amounts to borrow in one flash loan
+
+        Returns:
+            Provider instance, or None if no single provider can lend them all
+        """
+        self.stats["lookups"] += 1
+        snapshot = self._quotes
+        for provider_type in self._provider_order():
+            if all(
+                (quote := snapshot.get(t.token_address.lower(), {}).get(provider_type))
+                is not None
+                and quote.available >= t.amount
+                for t in token_amounts
+            ):
+                return self.providers[provider_type]
+        self.stats["misses"] += 1
+        return None
+
+    def estimate_costs(self, token_address: str, amount: Decimal) -> Dict[str, Decimal]:
+        """
+        Get the fee for borrowing an amount from each provider.
+
+        Args:
+            token_address: Address of the token to borrow
+            amount: Amount to borrow
+
+        Returns:
+            Dictionary mapping provider names to fee costs
+        """
+        return {
+            self.providers[quote.provider_type].name: quote.fee_for(amount)
+            for quote in self.quotes(token_address)
+            if quote.provider_type in self.providers
+        }
+
+    def fallback_providers(
+        self, token_address: str, amount: Decimal, exclude: Optional[FlashLoanProvider] = None
+    ) -> List[FlashLoanProvider]:
+        """
+        Get every provider able to lend the amount, cheapest first.
+
+        Args:
+            token_address: Address of the token to borrow
+            amount: Amount to borrow
+            exclude: Provider to leave out (e.g. one that just failed)
+
+        Returns:
+            List of provider instances
+        """
+        return [
+            self.providers[quote.provider_type]
+            for quote in self.quotes(token_address)
+            if quote.available >= amount
+            and self.providers.get(quote.provider_type) not in (None, exclude)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get service statistics."""
+        return {
+            **self.stats,
+            "block_number": self.block_number,
+            "providers": list(self.providers),
+            "tokens": len(self._tokens),
+        }
+
+    def _rank(self, quote: LiquidityQuote) -> Tuple[Decimal, int]:
+        order = self._provider_order()
+        priority = order.index(quote.provider_type) if quote.provider_type in order else len(order)
+        return quote.fee_percentage, priority
+
+    def _provider_order(self) -> List[str]:
+        return [p for p in PROVIDER_PRIORITY if p in self.providers] + [
+            p for p in self.providers if p not in PROVIDER_PRIORITY
+        ]
+
+    async def _head(self) -> Optional[int]:
+        """Latest block number, or None if it cannot be read."""
+        try:
+            block = await self.web3_client.get_block("latest")
+            return int(block["number"])
+        except Exception as e:
+            logger.debug(f"Could not read block number: {e}")
+            return None
+
+    async def _run(self) -> None:
+        """Refresh the snapshot whenever the chain head advances, or on a timer without one."""
+        try:
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    block_number = await self._head()
+                    if block_number is not None:
+                        await self.on_block(block_number)
+                    elif time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                        await self.refresh(None)
+                except Exception as e:
+                    logger.error(f"Error refreshing flash loan liquidity: {e}")
+        except asyncio.CancelledError:
+            pass
@@ -8,6 +8,19 @@
 - Block monitoring
 """
 
-from .flashbots_provider import FlashbotsProvider, create_flashbots_provider
+from typing import TYPE_CHECKING
+
+from ...utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .flashbots_provider import FlashbotsProvider, create_flashbots_provider
 
 __all__ = ["FlashbotsProvider", "create_flashbots_provider"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "FlashbotsProvider": ".flashbots_provider",
+        "create_flashbots_provider": ".flashbots_provider",
+    },
+)
@@ -14,6 +14,11 @@
 from eth_typing import ChecksumAddress
 
 from .manager import FlashbotsManager
+from .simulation_service import (
+    BundleCandidate,
+    RelaySimulationBackend,
+    SimulationService,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +40,7 @@ def __init__(
         min_profit: Decimal,
         max_gas_price: Decimal,
         max_priority_fee: Decimal,
+        simulation_service: Optional[SimulationService] = None,
     ) -> None:
         """
         Initialize the bundle manager.
@@ -44,11 +50,15 @@ def __init__(
             min_profit: Minimum profit threshold in ETH
             max_gas_price: Maximum gas price in gwei
             max_priority_fee: Maximum priority fee in gwei
+            simulation_service: Shared simulation service (relay-backed by default)
         """
         self.flashbots = flashbots_manager
         self.min_profit = min_profit
         self.max_gas_price = max_gas_price
         self.max_priority_fee = max_priority_fee
+        self.simulation_service = simulation_service or SimulationService(
+            RelaySimulationBackend(flashbots_manager._make_request)
+        )
         self._lock = asyncio.Lock()
 
         logger.info(
@@ -189,6 +199,32 @@ async def submit_bundle(
             logger.error(f"Failed to submit bundle: {e}")
             raise
 
+    def build_candidate(self, bundle: Dict[str, Any]) -> BundleCandidate:
+        """
+        Build a simulation candidate from a bundle.
+
+        Unsigned transactions are signed with the Flashbots account. Optional
+        ``route`` and ``amount_in`` bundle keys let local backends simulate the
+        swaps without a relay.
+
+        Args:
+            bundle: Bundle parameters
+
+        Returns:
+            BundleCandidate: Candidate for the simulation service
+        """
+        signed = [
+            self.flashbots.account.sign_transaction(tx) if isinstance(tx, dict) else tx
+            for tx in bundle["transactions"]
+        ]
+        return BundleCandidate.from_signed(
+            signed,
+            bundle["target_block"],
+            priority_fee=bundle.get("priority_fee", 0),
+            amount_in=bundle.get("amount_in", 0),
+            route=bundle.get("route", []),
+        )
+
     async def _get_base_fee(self) -> int:
         """Get current base fee from latest block."""
         try:
@@ -356,25 +392,20 @@ async def _simulate_bundle(self, bundle: Dict[str, Any]) -> bool:
             bool: True if simulation successful
         """
         try:
-            params = [
-                {
-                    "transactions": [
-                        tx.rawTransaction.hex() for tx in bundle["transactions"]
-                    ],
-                    "block_number": bundle["target_block"],
-                    "state_block_number": "latest",
-                }
-            ]
-
-            response = await self.flashbots._make_request("eth_callBundle", params)
+            # Identical bundles for the same block are simulated only once
+            candidate = self.build_candidate(bundle)
+            outcome = await self.simulation_service.simulate(candidate)
 
-            success = response["result"]["success"]
+            success = outcome.success
 
             if success:
-                logger.info("Bundle simulation successful")
+                logger.info(
+                    "Bundle simulation successful%s",
+                    " (cached)" if outcome.cached else "",
+                )
 
                 # Extract and store simulation results for profit verification
-                bundle["simulation_results"] = response["result"]
+                bundle["simulation_results"] = outcome.raw
 
                 # Verify profit from simulation
                 profit_verified = await self._verify_profit_from_simulation(
@@ -387,9 +418,7 @@ async def _simulate_bundle(self, bundle: Dict[str, Any]) -> bool:
                     )
                     return False
             else:
-                logger.warning(
-                    f"Bundle simulation failed: {response['result'].get('error')}"
-                )
+                logger.warning(f"Bundle simulation failed: {outcome.error}")
 
             return success
 
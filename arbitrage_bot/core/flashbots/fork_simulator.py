@@ -0,0 +1,450 @@
+"""
+In-process fork simulation for pre-trade validation.
+
+This module executes our swap routes against a locally cached snapshot of
+chain state instead of asking a relay to run ``eth_callBundle``:
+- ``ForkState`` lazily fetches the storage slots and balances a simulation
+  touches, caching them per block for the last few blocks; concurrent
+  readers of the same slot share one fetch
+- ``ForkOverlay`` applies a simulation's writes copy-on-write, so candidates
+  never see each other's effects, and renders them as an ``eth_callBundle``
+  style ``stateDiff``
+- ``ForkSimulationBackend`` plugs into ``SimulationService`` and falls back to
+  another backend (normally the relay) when state is not available
+
+Snapshots can be exported and reloaded as fixtures, so validation can run in
+tests without a node.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from web3 import Web3
+
+from .simulation_service import (
+    BundleCandidate,
+    LocalSimulationBackend,
+    RelaySimulationBackend,
+    SimulationBackend,
+    SimulationOutcome,
+    SimulationService,
+)
+
+logger = logging.getLogger(__name__)
+
+# UniswapV2Pair packs reserve0 (112 bits), reserve1 (112 bits) and
+# blockTimestampLast (32 bits) into storage slot 8
+V2_RESERVES_SLOT = 8
+RESERVE_BITS = 112
+RESERVE_MASK = (1 << RESERVE_BITS) - 1
+
+StorageKey = Tuple[str, int]
+
+
+class StateUnavailable(Exception):
+    """Raised when state is not cached and cannot be fetched."""
+
+
+class ForkState:
+    """
+    Lazily fetched, per-block cache of account balances and storage slots.
+
+    Reads are served from the cache of the block they ask for; misses are
+    fetched from the node at that block. The snapshot block set with
+    ``set_block`` is the default for reads, and the caches of the most
+    recent ``keep_blocks`` blocks are retained, so simulations for
+    different target blocks can run concurrently without evicting each
+    other. Without a web3 instance (fixture mode) a miss raises
+    ``StateUnavailable``.
+    """
+
+    def __init__(self, w3: Any = None, block_number: Optional[int] = None, keep_blocks: int = 4):
+        """
+        Initialize the state cache.
+
+        Args:
+            w3: Async web3 instance used to fetch missing state (None for fixtures)
+            block_number: Block the snapshot is taken at
+            keep_blocks: Number of most recent blocks whose caches are kept
+        """
+        self.w3 = w3
+        self.block_number = block_number
+        self.keep_blocks = max(1, keep_blocks)
+        # Block -> cached values at that block
+        self._storage: Dict[Optional[int], Dict[StorageKey, int]] = {block_number: {}}
+        self._balances: Dict[Optional[int], Dict[str, int]] = {block_number: {}}
+        self._pending: Dict[Any, asyncio.Future] = {}
+
+        # Statistics
+        self.hits = 0
+        self.fetches = 0
+        self.discarded = 0
+
+    def set_block(self, block_number: int) -> None:
+        """Move the snapshot to a block, dropping caches of blocks no longer retained."""
+        if block_number == self.block_number:
+            return
+        if self.w3 is None and self.block_number is not None:
+            # Fixtures are pinned to the block they were recorded at
+            raise StateUnavailable(
+                f"Fixture recorded at block {self.block_number}, not {block_number}"
+            )
+        self.block_number = block_number
+        self._storage.setdefault(block_number, {})
+        self._balances.setdefault(block_number, {})
+
+        retained = sorted(
+            (block for block in self._storage if block is not None), reverse=True
+        )[: self.keep_blocks]
+        for cache in (self._storage, self._balances):
+            for block in [b for b in cache if b not in retained and b != block_number]:
+                del cache[block]
+
+    async def get_storage(self, address: str, slot: int, block_number: Optional[int] = None) -> int:
+        """Read a storage slot at a block (default: the snapshot block)."""
+        block = self.block_number if block_number is None else block_number
+        key = (address.lower(), slot)
+        cache = self._storage.get(block)
+        if cache is not None and key in cache:
+            self.hits += 1
+            return cache[key]
+        value = await self._fetch(
+            ("storage", block, key),
+            lambda: self.w3.eth.get_storage_at(
+                Web3.to_checksum_address(address), slot, block
+            ),
+        )
+        value = int.from_bytes(bytes(value), "big") if not isinstance(value, int) else value
+        self._remember(self._storage, block, key, value)
+        return value
+
+    async def get_balance(self, address: str, block_number: Optional[int] = None) -> int:
+        """Read an account balance at a block (default: the snapshot block)."""
+        block = self.block_number if block_number is None else block_number
+        key = address.lower()
+        cache = self._balances.get(block)
+        if cache is not None and key in cache:
+            self.hits += 1
+            return cache[key]
+        value = int(
+            await self._fetch(
+                ("balance", block, key),
+                lambda: self.w3.eth.get_balance(Web3.to_checksum_address(address), block),
+            )
+        )
+        self._remember(self._balances, block, key, value)
+        return value
+
+    def _remember(
+        self, caches: Dict[Optional[int], Dict[Any, int]], block: Optional[int], key: Any, value: int
+    ) -> None:
+        """Cache a fetched value, unless its block was dropped while it was in flight."""
+        cache = caches.get(block)
+        if cache is None:
+            self.discarded += 1
+            return
+        cache[key] = value
+
+    async def _fetch(self, key: Any, request) -> Any:
+        """Fetch a value once, sharing the request with concurrent readers."""
+        if self.w3 is None:
+            raise StateUnavailable(f"No cached state for {key[0]} {key[2]}")
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.fetches += 1
+        future = asyncio.ensure_future(request())
+        self._pending[key] = future
+        try:
+            return await future
+        except Exception as e:
+            raise StateUnavailable(f"Failed to fetch {key[0]} {key[2]} at block {key[1]}: {e}") from e
+        finally:
+            self._pending.pop(key, None)
+
+    async def prefetch_pools(self, pools, slot: int = V2_RESERVES_SLOT) -> None:
+        """Warm the snapshot block's cache with the reserves of several pools concurrently."""
+        await asyncio.gather(*(self.get_storage(pool, slot) for pool in pools))
+
+    def to_fixture(self) -> Dict[str, Any]:
+        """Export the state cached for the snapshot block as a JSON-serializable fixture."""
+        return {
+            "block_number": self.block_number,
+            "storage": {
+                f"{address}:{slot}": hex(value)
+                for (address, slot), value in self._storage[self.block_number].items()
+            },
+            "balances": {
+                address: hex(value)
+                for address, value in self._balances[self.block_number].items()
+            },
+        }
+
+    @classmethod
+    def from_fixture(cls, fixture: Dict[str, Any], w3: Any = None) -> "ForkState":
+        """Load state recorded with :meth:`to_fixture`."""
+        state = cls(w3, fixture.get("block_number"))
+        storage = state._storage[state.block_number]
+        balances = state._balances[state.block_number]
+        for key, value in fixture.get("storage", {}).items():
+            address, slot = key.rsplit(":", 1)
+            storage[(address.lower(), int(slot))] = int(value, 16)
+        for address, value in fixture.get("balances", {}).items():
+            balances[address.lower()] = int(value, 16)
+        return state
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "block_number": self.block_number,
+            "cached_blocks": len(self._storage),
+            "storage_slots": sum(len(cache) for cache in self._storage.values()),
+            "balances": sum(len(cache) for cache in self._balances.values()),
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "discarded": self.discarded,
+        }
+
+
+class ForkOverlay:
+    """Copy-on-write view of a ``ForkState`` at one block, for a single simulation."""
+
+    def __init__(self, state: ForkState, block_number: Optional[int] = None):
+        """
+        Initialize the overlay.
+
+        Args:
+            state: Underlying state snapshot
+            block_number: Block to read at (default: the state's current snapshot block)
+        """
+        self.state = state
+        self.block_number = state.block_number if block_number is None else block_number
+        self._storage: Dict[StorageKey, Tuple[int, int]] = {}  # key -> (original, current)
+        self._balances: Dict[str, Tuple[int, int]] = {}
+
+    async def get_storage(self, address: str, slot: int) -> int:
+        """Read a slot, including this simulation's writes."""
+        key = (address.lower(), slot)
+        if key in self._storage:
+            return self._storage[key][1]
+        return await self.state.get_storage(address, slot, self.block_number)
+
+    async def set_storage(self, address: str, slot: int, value: int) -> None:
+        """Write a slot without touching the shared snapshot."""
+        key = (address.lower(), slot)
+        original = (
+            self._storage[key][0]
+            if key in self._storage
+            else await self.state.get_storage(address, slot, self.block_number)
+        )
+        self._storage[key] = (original, value)
+
+    async def add_balance(self, address: str, delta: int) -> None:
+        """Adjust an account balance without touching the shared snapshot."""
+        key = address.lower()
+        if key in self._balances:
+            original, current = self._balances[key]
+        else:
+            original = current = await self.state.get_balance(address, self.block_number)
+        self._balances[key] = (original, current + delta)
+
+    async def get_reserves(self, pool: str, slot: int = V2_RESERVES_SLOT) -> Tuple[int, int, int]:
+        """Decode V2 pair reserves and timestamp from packed storage."""
+        packed = await self.get_storage(pool, slot)
+        return (
+            packed & RESERVE_MASK,
+            (packed >> RESERVE_BITS) & RESERVE_MASK,
+            packed >> (2 * RESERVE_BITS),
+        )
+
+    async def set_reserves(
+        self, pool: str, reserve0: int, reserve1: int, timestamp: int, slot: int = V2_RESERVES_SLOT
+    ) -> None:
+        """Encode V2 pair reserves back into packed storage."""
+        packed = (timestamp << (2 * RESERVE_BITS)) | (reserve1 << RESERVE_BITS) | reserve0
+        await self.set_storage(pool, slot, packed)
+
+    def state_diff(self) -> Dict[str, Any]:
+        """Render writes in the ``eth_callBundle`` stateDiff format."""
+        diff: Dict[str, Dict[str, Any]] = {}
+        for (address, slot), (original, current) in self._storage.items():
+            if original == current:
+                continue
+            entry = diff.setdefault(Web3.to_checksum_address(address), {})
+            entry.setdefault("storage", {})[hex(slot)] = {
+                "from": hex(original),
+                "to": hex(current),
+            }
+        for address, (original, current) in self._balances.items():
+            if original == current:
+                continue
+            entry = diff.setdefault(Web3.to_checksum_address(address), {})
+            entry["balance"] = {"from": hex(original), "to": hex(current)}
+        return diff
+
+
+class ForkSimulationBackend(LocalSimulationBackend):
+    """
+    Simulates swap routes against a cached fork of chain state.
+
+    Route hops name a V2 pool (``pool``) and direction (``zero_for_one``)
+    instead of carrying reserves; reserves are read from the pool's storage
+    at the block before the target and updated as each hop executes, so a
+    route that crosses the same pool twice sees its own price impact. Hops
+    that already carry ``reserve_in``/``reserve_out`` are used as-is.
+    Candidates without a route, or whose state cannot be read, go to the
+    fallback backend.
+    """
+
+    name = "fork"
+
+    def __init__(
+        self,
+        state: ForkState,
+        fallback: Optional[SimulationBackend] = None,
+        base_fee: int = 0,
+        default_gas: int = 250_000,
+        searcher: Optional[str] = None,
+    ):
+        """
+        Initialize the fork backend.
+
+        Args:
+            state: State snapshot to simulate against
+            fallback: Backend used when local simulation is not possible
+            base_fee: Base fee in wei used for gas cost
+            default_gas: Gas assumed when a candidate has no gas limit
+            searcher: Our account, whose balance change is included in the state diff
+        """
+        super().__init__(base_fee=base_fee, default_gas=default_gas)
+        self.state = state
+        self.fallback = fallback
+        self.searcher = searcher
+
+        # Statistics
+        self.local_runs = 0
+        self.fallback_runs = 0
+
+    async def simulate(self, candidate: BundleCandidate) -> SimulationOutcome:
+        """Simulate locally, falling back when state is unavailable."""
+        if not candidate.route:
+            return await self._fall_back(candidate, "No route to simulate")
+
+        try:
+            # Pin the overlay to its block: concurrent candidates for a later
+            # target may move the shared snapshot while this one is in flight
+            block_number = candidate.target_block - 1
+            self.state.set_block(block_number)
+            overlay = ForkOverlay(self.state, block_number)
+
+            amount = candidate.amount_in
+            for hop in candidate.route:
+                amount = await self._execute_hop(overlay, hop, amount)
+
+            outcome = self._settle(candidate, amount, {})
+            if self.searcher and outcome.searcher_profit:
+                await overlay.add_balance(self.searcher, outcome.searcher_profit)
+        except StateUnavailable as e:
+            return await self._fall_back(candidate, str(e))
+        except ValueError as e:
+            return SimulationOutcome(
+                success=False,
+                coinbase_profit=0,
+                gas_used=0,
+                error=f"Bundle would revert: {e}",
+                backend=self.name,
+            )
+
+        self.local_runs += 1
+        per_tx_gas = outcome.gas_used // max(1, len(candidate.signed_transactions))
+        outcome.raw = {
+            "amount_out": amount,
+            "coinbaseDiff": hex(outcome.coinbase_profit),
+            "totalGasUsed": outcome.gas_used,
+            "results": [
+                {"txHash": tx_hash, "gasUsed": per_tx_gas}
+                for tx_hash in candidate.tx_hashes
+            ],
+            "stateDiff": overlay.state_diff(),
+            "stateBlockNumber": overlay.block_number,
+        }
+        return outcome
+
+    async def _execute_hop(self, overlay: ForkOverlay, hop: Dict[str, Any], amount_in: int) -> int:
+        """Execute one swap hop, updating pool reserves in the overlay."""
+        if "pool" not in hop:
+            return self.get_amount_out(
+                amount_in, hop["reserve_in"], hop["reserve_out"], hop.get("fee", 30)
+            )
+
+        slot = hop.get("reserves_slot", V2_RESERVES_SLOT)
+        reserve0, reserve1, timestamp = await overlay.get_reserves(hop["pool"], slot)
+        zero_for_one = hop.get("zero_for_one", True)
+        reserve_in, reserve_out = (reserve0, reserve1) if zero_for_one else (reserve1, reserve0)
+
+        amount_out = self.get_amount_out(amount_in, reserve_in, reserve_out, hop.get("fee", 30))
+        if amount_out <= 0 or amount_out >= reserve_out:
+            raise ValueError(f"Insufficient liquidity in {hop['pool']}")
+
+        reserve_in += amount_in
+        reserve_out -= amount_out
+        if zero_for_one:
+            await overlay.set_reserves(hop["pool"], reserve_in, reserve_out, timestamp, slot)
+        else:
+            await overlay.set_reserves(hop["pool"], reserve_out, reserve_in, timestamp, slot)
+        return amount_out
+
+    async def _fall_back(self, candidate: BundleCandidate, reason: str) -> SimulationOutcome:
+        """Delegate to the fallback backend, if any."""
+        if self.fallback is None:
+            return SimulationOutcome(
+                success=False,
+                coinbase_profit=0,
+                gas_used=0,
+                error=reason,
+                backend=self.name,
+            )
+        logger.debug(f"Fork simulation falling back to {self.fallback.name}: {reason}")
+        self.fallback_runs += 1
+        return await self.fallback.simulate(candidate)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backend statistics."""
+        return {
+            "local_runs": self.local_runs,
+            "fallback_runs": self.fallback_runs,
+            "state": self.state.get_stats(),
+        }
+
+
+def create_fork_simulation_service(
+    w3: Any,
+    make_request: Optional[Any] = None,
+    searcher: Optional[str] = None,
+    base_fee: int = 0,
+    max_concurrency: int = 4,
+    timeout: float = 5.0,
+) -> SimulationService:
+    """
+    Create a simulation service backed by the fork simulator.
+
+    Args:
+        w3: Async web3 instance used to fetch state
+        make_request: Relay request coroutine for the ``eth_callBundle`` fallback
+        searcher: Our account address
+        base_fee: Base fee in wei used for gas cost
+        max_concurrency: Maximum simulations in flight
+        timeout: Per-simulation timeout in seconds
+
+    Returns:
+        SimulationService using local simulation with a relay fallback
+    """
+    fallback = RelaySimulationBackend(make_request) if make_request else None
+    backend = ForkSimulationBackend(
+        ForkState(w3), fallback=fallback, base_fee=base_fee, searcher=searcher
+    )
+    return SimulationService(backend, max_concurrency=max_concurrency, timeout=timeout)
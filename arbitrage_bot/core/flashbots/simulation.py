@@ -5,7 +5,6 @@
 and validating expected profits before submission.
 """
 
-import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from decimal import Decimal
@@ -15,6 +14,7 @@
 
 from .manager import FlashbotsManager
 from .bundle import BundleManager
+from .simulation_service import SimulationOutcome, SimulationService
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +36,7 @@ def __init__(
         bundle_manager: BundleManager,
         max_simulations: int = 3,
         simulation_timeout: float = 5.0,
+        simulation_service: Optional[SimulationService] = None,
     ) -> None:
         """
         Initialize the simulation manager.
@@ -45,12 +46,13 @@ def __init__(
             bundle_manager: BundleManager instance
             max_simulations: Maximum number of simulation attempts
             simulation_timeout: Simulation timeout in seconds
+            simulation_service: Simulation service (shared with the bundle manager by default)
         """
         self.flashbots = flashbots_manager
         self.bundle_manager = bundle_manager
         self.max_simulations = max_simulations
         self.simulation_timeout = simulation_timeout
-        self._lock = asyncio.Lock()
+        self.simulation_service = simulation_service or bundle_manager.simulation_service
 
         logger.info(
             f"Initialized SimulationManager with max_simulations={max_simulations}, "
@@ -74,60 +76,44 @@ async def simulate_bundle(
             Exception: If simulation fails
         """
         try:
-            async with self._lock:
-                # Prepare simulation parameters
-                params = [
-                    {
-                        "transactions": [
-                            tx.rawTransaction.hex() for tx in bundle["transactions"]
-                        ],
-                        "block_number": bundle["target_block"],
-                        "state_block_number": state_block,
-                        "simulation_kind": "full",  # Request full simulation
-                    }
-                ]
-
-                # Run simulation
-                for attempt in range(self.max_simulations):
-                    try:
-                        async with asyncio.timeout(self.simulation_timeout):
-                            response = await self.flashbots._make_request(
-                                "eth_callBundle", params
-                            )
-
-                            result = response["result"]
-
-                            if result["success"]:
-                                # Parse and validate results
-                                simulation_results = (
-                                    await self._parse_simulation_results(result, bundle)
-                                )
-
-                                if simulation_results["profitable"]:
-                                    logger.info(
-                                        f"Bundle simulation successful with profit "
-                                        f"{simulation_results['profit']:.6f} ETH"
-                                    )
-                                    return True, simulation_results
-                                else:
-                                    logger.warning(
-                                        f"Bundle simulation showed insufficient profit: "
-                                        f"{simulation_results['profit']} ETH"
-                                    )
-                            else:
-                                logger.error(
-                                    f"Bundle simulation failed: {result.get('error')}"
-                                )
-
-                    except asyncio.TimeoutError:
-                        logger.warning(f"Simulation timeout on attempt {attempt + 1}")
-                        continue
-
-                    except Exception as e:
-                        logger.error(f"Simulation error on attempt {attempt + 1}: {e}")
-                        continue
-
-                return False, {"error": "All simulation attempts failed"}
+            candidate = self.bundle_manager.build_candidate(bundle)
+
+            # Run simulation; results are shared with any identical bundle
+            # for the same block, so retries only repeat transport failures
+            for attempt in range(self.max_simulations):
+                outcome = await self.simulation_service.simulate(
+                    candidate, timeout=self.simulation_timeout
+                )
+
+                if outcome.success:
+                    # Parse and validate results
+                    simulation_results = await self._parse_simulation_results(
+                        outcome.raw, bundle
+                    )
+
+                    if simulation_results["profitable"]:
+                        logger.info(
+                            f"Bundle simulation successful with profit "
+                            f"{simulation_results['profit']:.6f} ETH"
+                        )
+                        return True, simulation_results
+
+                    logger.warning(
+                        f"Bundle simulation showed insufficient profit: "
+                        f"{simulation_results['profit']} ETH"
+                    )
+                    break
+
+                if outcome.raw:
+                    # Definitive failure from the backend; retrying won't help
+                    logger.error(f"Bundle simulation failed: {outcome.error}")
+                    break
+
+                logger.warning(
+                    f"Simulation error on attempt {attempt + 1}: {outcome.error}"
+                )
+
+            return False, {"error": "All simulation attempts failed"}
 
         except Exception as e:
             logger.error(f"Failed to simulate bundle: {e}")
@@ -326,10 +312,10 @@ async def optimize_bundle_gas(
                 # Create a copy of the transaction
                 updated_tx = tx.copy()
 
-                # Update gas parameters
+                # EIP-1559 fields only; signing rejects gasPrice alongside them
+                updated_tx.pop("gasPrice", None)
                 updated_tx.update(
                     {
-                        "gasPrice": gas_price,
                         "maxPriorityFeePerGas": priority_fee,
                         "maxFeePerGas": gas_price + priority_fee,
                     }
@@ -347,3 +333,54 @@ async def optimize_bundle_gas(
         except Exception as e:
             logger.error(f"Failed to optimize bundle gas: {e}")
             return bundle  # Return original bundle if optimization fails
+
+    async def select_best_gas_variant(
+        self,
+        bundle: Dict[str, Any],
+        base_fee: int,
+        priority_multipliers: Tuple[float, ...] = (1.0, 1.1, 1.25, 1.5, 2.0),
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[SimulationOutcome]]:
+        """
+        Pick the best gas setting for a bundle in one concurrent round.
+
+        Rather than tweaking gas and re-simulating sequentially, every
+        priority-fee variant is signed and simulated concurrently and the
+        variant with the highest simulated coinbase profit is returned.
+
+        Args:
+            bundle: Bundle with unsigned transactions
+            base_fee: Current base fee
+            priority_multipliers: Priority fee multipliers to try
+
+        Returns:
+            Tuple of (best bundle, its simulation outcome), or (None, None)
+        """
+        try:
+            variants = [
+                await self.optimize_bundle_gas(bundle, base_fee, multiplier)
+                for multiplier in priority_multipliers
+            ]
+
+            candidates = []
+            for multiplier, variant in zip(priority_multipliers, variants):
+                candidate = self.bundle_manager.build_candidate(variant)
+                candidate.label = f"priority_x{multiplier}"
+                candidates.append(candidate)
+
+            best = await self.simulation_service.best_candidate(
+                candidates, timeout=self.simulation_timeout
+            )
+            if best is None:
+                logger.warning("No gas variant simulated successfully")
+                return None, None
+
+            candidate, outcome = best
+            logger.info(
+                f"Selected gas variant {candidate.label} with coinbase profit "
+                f"{outcome.coinbase_profit} wei"
+            )
+            return variants[candidates.index(candidate)], outcome
+
+        except Exception as e:
+            logger.error(f"Failed to select gas variant: {e}")
+            return None, None
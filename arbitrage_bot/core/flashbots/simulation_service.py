@@ -0,0 +1,438 @@
+"""
+Flashbots bundle simulation service.
+
+This module provides a single entry point for bundle simulation shared by the
+simulation and bundle managers:
+- Identical bundles are simulated once per block (keyed by signed tx hashes
+  and target block), including concurrent duplicate requests
+- Several candidate bundles (sizes, gas tips, path variants) are simulated
+  concurrently under a bounded semaphore
+- The best candidate is selected by simulated coinbase profit
+- Backends are pluggable: the relay (``eth_callBundle``) or a local backend
+  over our constant-product pool math, which needs no relay
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from eth_utils import keccak
+
+logger = logging.getLogger(__name__)
+
+RequestFn = Callable[[str, List[Any]], Awaitable[Dict[str, Any]]]
+
+
+def _to_int(value: Any) -> int:
+    """Convert a relay quantity (int, decimal string or hex string) to int."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    text = str(value)
+    return int(text, 16) if text.startswith("0x") else int(text)
+
+
+def _raw_hex(tx: Any) -> str:
+    """Get the 0x-prefixed raw hex of a signed transaction."""
+    raw = getattr(tx, "rawTransaction", None) or getattr(tx, "raw_transaction", None)
+    if raw is None:
+        raw = tx
+    if isinstance(raw, (bytes, bytearray)):
+        return "0x" + bytes(raw).hex()
+    if hasattr(raw, "hex") and not isinstance(raw, str):
+        text = raw.hex()
+        return text if text.startswith("0x") else "0x" + text
+    return raw if str(raw).startswith("0x") else "0x" + str(raw)
+
+
+@dataclass
+class BundleCandidate:
+    """A signed bundle variant to simulate against a target block."""
+
+    signed_transactions: List[str]
+    target_block: int
+    label: str = ""
+    priority_fee: int = 0  # wei per gas
+    gas_limit: int = 0
+    amount_in: int = 0  # wei, for local simulation
+    route: List[Dict[str, int]] = field(default_factory=list)  # hops for local simulation
+    coinbase_payment: int = 0  # direct builder payment in wei
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_signed(
+        cls, transactions: List[Any], target_block: int, **kwargs: Any
+    ) -> "BundleCandidate":
+        """Build a candidate from signed transaction objects or raw hex strings."""
+        return cls(
+            signed_transactions=[_raw_hex(tx) for tx in transactions],
+            target_block=target_block,
+            **kwargs,
+        )
+
+    @property
+    def tx_hashes(self) -> Tuple[str, ...]:
+        """Hashes of the signed transactions, in bundle order."""
+        return tuple(
+            "0x" + keccak(hexstr=raw).hex() for raw in self.signed_transactions
+        )
+
+    @property
+    def cache_key(self) -> Tuple[int, Tuple[str, ...]]:
+        """Deduplication key: target block plus signed tx hashes."""
+        return (self.target_block, self.tx_hashes)
+
+
+@dataclass
+class SimulationOutcome:
+    """Normalized result of a bundle simulation."""
+
+    success: bool
+    coinbase_profit: int  # wei paid to the block builder
+    gas_used: int
+    searcher_profit: Optional[int] = None  # wei kept by us, if the backend knows it
+    error: Optional[str] = None
+    backend: str = ""
+    cached: bool = False
+    duration: float = 0.0
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+
+class SimulationBackend(ABC):
+    """Interface for bundle simulation backends."""
+
+    name = "backend"
+
+    @abstractmethod
+    async def simulate(self, candidate: BundleCandidate) -> SimulationOutcome:
+        """Simulate a candidate bundle."""
+        pass
+
+
+class RelaySimulationBackend(SimulationBackend):
+    """Simulates bundles with ``eth_callBundle`` on a relay or builder."""
+
+    name = "relay"
+
+    def __init__(self, make_request: RequestFn, state_block: Union[str, int] = "latest"):
+        """
+        Initialize the relay backend.
+
+        Args:
+            make_request: Coroutine issuing a JSON-RPC request (method, params)
+            state_block: Block whose state the simulation starts from
+        """
+        self.make_request = make_request
+        self.state_block = state_block
+
+    async def simulate(self, candidate: BundleCandidate) -> SimulationOutcome:
+        """Simulate a candidate bundle on the relay."""
+        state_block = self.state_block
+        params = [
+            {
+                "txs": candidate.signed_transactions,
+                "blockNumber": hex(candidate.target_block),
+                "stateBlockNumber": (
+                    hex(state_block) if isinstance(state_block, int) else state_block
+                ),
+            }
+        ]
+        response = await self.make_request("eth_callBundle", params)
+
+        if "error" in response:
+            # Relay errors carry no raw result so the service never caches them
+            error = response["error"]
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            logger.warning(f"Relay simulation error: {message}")
+            return SimulationOutcome(
+                success=False,
+                coinbase_profit=0,
+                gas_used=0,
+                error=message,
+                backend=self.name,
+            )
+
+        result = response.get("result", {})
+        tx_results = result.get("results", [])
+        failed = next(
+            (r for r in tx_results if r.get("error") or r.get("revert")), None
+        )
+        gas_used = _to_int(result.get("totalGasUsed")) or sum(
+            _to_int(r.get("gasUsed")) for r in tx_results
+        )
+
+        return SimulationOutcome(
+            success=failed is None and result.get("success", True) is not False,
+            coinbase_profit=_to_int(result.get("coinbaseDiff")),
+            gas_used=gas_used,
+            error=(failed.get("error") or failed.get("revert")) if failed else None,
+            backend=self.name,
+            raw=result,
+        )
+
+
+class LocalSimulationBackend(SimulationBackend):
+    """
+    Simulates bundles against in-memory pool reserves.
+
+    Each hop of ``candidate.route`` is a dict with ``reserve_in``,
+    ``reserve_out`` and ``fee`` (basis points, as in ``BaseDEXV2``). The
+    bundle succeeds when the route output covers the input, gas and builder
+    payment; the builder receives ``priority_fee * gas_used`` plus any direct
+    ``coinbase_payment``.
+    """
+
+    name = "local"
+
+    def __init__(self, base_fee: int = 0, default_gas: int = 250_000):
+        """
+        Initialize the local backend.
+
+        Args:
+            base_fee: Base fee in wei used for gas cost
+            default_gas: Gas assumed when a candidate has no gas limit
+        """
+        self.base_fee = base_fee
+        self.default_gas = default_gas
+
+    @staticmethod
+    def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee: int) -> int:
+        """Constant-product output for a V2 pool (fee in basis points)."""
+        amount_in_with_fee = amount_in * (10000 - fee)
+        numerator = amount_in_with_fee * reserve_out
+        denominator = reserve_in * 10000 + amount_in_with_fee
+        return numerator // denominator
+
+    async def simulate(self, candidate: BundleCandidate) -> SimulationOutcome:
+        """Simulate a candidate bundle locally."""
+        if not candidate.route:
+            return SimulationOutcome(
+                success=False,
+                coinbase_profit=0,
+                gas_used=0,
+                error="No route to simulate",
+                backend=self.name,
+            )
+
+        amount = candidate.amount_in
+        for hop in candidate.route:
+            amount = self.get_amount_out(
+                amount, hop["reserve_in"], hop["reserve_out"], hop.get("fee", 30)
+            )
+
+        return self._settle(candidate, amount, {"amount_out": amount})
+
+    def _settle(
+        self, candidate: BundleCandidate, amount_out: int, raw: Dict[str, Any]
+    ) -> SimulationOutcome:
+        """Turn a route output into an outcome after gas and builder payment."""
+        gas_used = candidate.gas_limit or self.default_gas
+        builder_tip = candidate.priority_fee * gas_used + candidate.coinbase_payment
+        gas_cost = (self.base_fee + candidate.priority_fee) * gas_used
+        searcher_profit = (
+            amount_out - candidate.amount_in - gas_cost - candidate.coinbase_payment
+        )
+        success = searcher_profit >= 0
+
+        return SimulationOutcome(
+            success=success,
+            coinbase_profit=builder_tip if success else 0,
+            gas_used=gas_used,
+            searcher_profit=searcher_profit,
+            error=None if success else "Bundle would revert: insufficient output",
+            backend=self.name,
+            raw=raw,
+        )
+
+
+class SimulationService:
+    """
+    Deduplicating, concurrent bundle simulation front end.
+
+    Results are cached per (target block, signed tx hashes); entries for
+    blocks older than the latest target seen are dropped automatically.
+    """
+
+    def __init__(
+        self,
+        backend: SimulationBackend,
+        max_concurrency: int = 4,
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize the simulation service.
+
+        Args:
+            backend: Simulation backend to use
+            max_concurrency: Maximum simulations in flight
+            timeout: Per-simulation timeout in seconds
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache: Dict[Tuple[int, Tuple[str, ...]], SimulationOutcome] = {}
+        self._in_flight: Dict[Tuple[int, Tuple[str, ...]], asyncio.Future] = {}
+        self._latest_block = 0
+
+        # Statistics
+        self.cache_hits = 0
+        self.backend_calls = 0
+
+    async def simulate(
+        self, candidate: BundleCandidate, timeout: Optional[float] = None
+    ) -> SimulationOutcome:
+        """
+        Simulate a candidate, reusing any result for the same bundle and block.
+
+        Args:
+            candidate: Bundle candidate
+            timeout: Per-simulation timeout in seconds (default: the service's)
+
+        Returns:
+            Simulation outcome
+        """
+        self._advance(candidate.target_block)
+        key = candidate.cache_key
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return self._as_cached(cached)
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.cache_hits += 1
+            return self._as_cached(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            outcome = await self._run_backend(candidate, timeout)
+            # Only cache answers the backend actually produced (raw result);
+            # timeouts, transport and relay errors are retried next time
+            if outcome.success or outcome.raw:
+                self._cache[key] = outcome
+            future.set_result(outcome)
+            return outcome
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Avoid "exception never retrieved" when nobody else awaited it
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _run_backend(
+        self, candidate: BundleCandidate, timeout: Optional[float] = None
+    ) -> SimulationOutcome:
+        """Run one backend simulation under the concurrency limit."""
+        async with self._semaphore:
+            self.backend_calls += 1
+            start = time.perf_counter()
+            try:
+                outcome = await asyncio.wait_for(
+                    self.backend.simulate(candidate),
+                    timeout=self.timeout if timeout is None else timeout,
+                )
+            except asyncio.TimeoutError:
+                outcome = SimulationOutcome(
+                    success=False,
+                    coinbase_profit=0,
+                    gas_used=0,
+                    error="Simulation timed out",
+                    backend=self.backend.name,
+                )
+            except Exception as e:
+                logger.error(f"Simulation backend error: {e}")
+                outcome = SimulationOutcome(
+                    success=False,
+                    coinbase_profit=0,
+                    gas_used=0,
+                    error=str(e),
+                    backend=self.backend.name,
+                )
+            outcome.duration = time.perf_counter() - start
+            return outcome
+
+    async def simulate_many(
+        self, candidates: List[BundleCandidate], timeout: Optional[float] = None
+    ) -> List[SimulationOutcome]:
+        """Simulate candidates concurrently, preserving order."""
+        return list(
+            await asyncio.gather(*(self.simulate(c, timeout) for c in candidates))
+        )
+
+    async def best_candidate(
+        self,
+        candidates: List[BundleCandidate],
+        min_searcher_profit: int = 0,
+        timeout: Optional[float] = None,
+    ) -> Optional[Tuple[BundleCandidate, SimulationOutcome]]:
+        """
+        Simulate candidates concurrently and pick the best one.
+
+        Successful candidates are ranked by coinbase profit (what makes a
+        builder include the bundle), then by searcher profit when known.
+
+        Args:
+            candidates: Bundle variants to compare
+            min_searcher_profit: Minimum profit we must keep, in wei (applied
+                only when the backend reports searcher profit)
+            timeout: Per-simulation timeout in seconds (default: the service's)
+
+        Returns:
+            (candidate, outcome) of the best bundle, or None if none succeeded
+        """
+        if not candidates:
+            return None
+
+        outcomes = await self.simulate_many(candidates, timeout)
+        viable = [
+            (candidate, outcome)
+            for candidate, outcome in zip(candidates, outcomes)
+            if outcome.success
+            and (
+                outcome.searcher_profit is None
+                or outcome.searcher_profit >= min_searcher_profit
+            )
+        ]
+        if not viable:
+            return None
+
+        return max(
+            viable,
+            key=lambda item: (item[1].coinbase_profit, item[1].searcher_profit or 0),
+        )
+
+    def _advance(self, target_block: int) -> None:
+        """Drop cached results for blocks that can no longer be targeted."""
+        if target_block <= self._latest_block:
+            return
+        self._latest_block = target_block
+        stale = [key for key in self._cache if key[0] < target_block - 1]
+        for key in stale:
+            del self._cache[key]
+
+    @staticmethod
+    def _as_cached(outcome: SimulationOutcome) -> SimulationOutcome:
+        """Return a copy of an outcome flagged as served from cache."""
+        copy = SimulationOutcome(**{**outcome.__dict__})
+        copy.cached = True
+        return copy
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get simulation statistics."""
+        return {
+            "backend": self.backend.name,
+            "backend_calls": self.backend_calls,
+            "cache_hits": self.cache_hits,
+            "cached_results": len(self._cache),
+            "in_flight": len(self._in_flight),
+        }
@@ -1,41 +1,31 @@
 """
 Log Parser Bridge
 
-Bridges the gap between log files and the dashboard's data stores by parsing logs
-and updating the OpportunityTracker in near real-time.
+Bridges the bot's telemetry channel and the dashboard's data stores by
+forwarding opportunity and execution records to the OpportunityTracker as
+they are published.
 """
 
 import asyncio
 import logging
-import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Pattern, Any
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileModifiedEvent
+from typing import Any, Dict, Optional
 
 from arbitrage_bot.core.opportunity_tracker import OpportunityTracker
+from arbitrage_bot.utils.telemetry import RecordType, TelemetryRecord, TelemetrySubscriber
 
 logger = logging.getLogger(__name__)
 
-
-class LogFileHandler(FileSystemEventHandler):
-    """Handles file system events for log files."""
-
-    def __init__(self, callback):
-        """Initialize the handler with a callback function."""
-        self.callback = callback
-
-    def on_modified(self, event):
-        """Handle file modification events."""
-        if isinstance(event, FileModifiedEvent):
-            self.callback(event.src_path)
+TELEMETRY_SOCKET_NAME = "telemetry.sock"
 
 
 class LogParserBridge:
     """
-    Bridges log files to OpportunityTracker by parsing logs and updating the tracker.
-    Uses file system events for efficient monitoring and updates.
+    Bridges telemetry to OpportunityTracker.
+
+    Records arrive already structured over the bot's telemetry socket, so
+    there are no log files to poll or parse.
     """
 
     def __init__(
@@ -43,42 +33,24 @@ def __init__(
         log_dir: Path,
         opportunity_tracker: OpportunityTracker,
         update_frequency: float = 1.0,
-        max_batch_size: int = 1000,
+        socket_path: Optional[Path] = None,
     ):
         """
         Initialize the Log Parser Bridge.
 
         Args:
-            log_dir: Directory containing log files
+            log_dir: Bot log directory, where the telemetry socket lives
             opportunity_tracker: OpportunityTracker instance to update
-            update_frequency: How often to check for updates (seconds)
-            max_batch_size: Maximum number of entries to process in one batch
+            update_frequency: Seconds between reconnection attempts
+            socket_path: Telemetry socket (default: log_dir/telemetry.sock)
         """
         self.log_dir = Path(log_dir)
         self.opportunity_tracker = opportunity_tracker
         self.update_frequency = update_frequency
-        self.max_batch_size = max_batch_size
+        self.socket_path = Path(socket_path or self.log_dir / TELEMETRY_SOCKET_NAME)
 
-        # File position tracking
-        self.file_positions: Dict[str, int] = {}
-
-        # Compile regex patterns for different log types
-        self.patterns = {
-            "opportunity": re.compile(
-                r"Found opportunity.*DEX: (.*) -> (.*), Token: (.*), "
-                r"Price diff: ([\d.]+)%, Amount: ([\d.]+) ETH, "
-                r"Expected profit: \$([\d.]+)"
-            ),
-            "execution": re.compile(
-                r"Trade execution.*Hash: (0x[a-fA-F0-9]+), "
-                r"Status: (\w+), Profit: \$([\d.]+), "
-                r"Gas cost: \$([\d.]+)"
-            ),
-        }
-
-        # Initialize file watcher
-        self.observer = Observer()
-        self.event_handler = LogFileHandler(self._handle_file_update)
+        self.subscriber: Optional[TelemetrySubscriber] = None
+        self.records_processed = 0
 
         # Track active status
         self.is_running = False
@@ -91,23 +63,15 @@ async def start(self):
             return
 
         try:
-            # Ensure log directory exists
-            self.log_dir.mkdir(exist_ok=True)
-
-            # Start file system observer
-            self.observer.schedule(
-                self.event_handler, str(self.log_dir), recursive=False
+            self.subscriber = TelemetrySubscriber(
+                self.socket_path,
+                kinds=[RecordType.OPPORTUNITY, RecordType.EXECUTION],
+                reconnect_delay=self.update_frequency,
             )
-            self.observer.start()
-
-            # Initialize file positions
-            await self._initialize_file_positions()
-
-            # Start update loop
             self.is_running = True
-            self.update_task = asyncio.create_task(self._update_loop())
+            self.update_task = asyncio.create_task(self.subscriber.run(self._handle_record))
 
-            logger.info("Log Parser Bridge started successfully")
+            logger.info(f"Log Parser Bridge subscribed to {self.socket_path}")
 
         except Exception as e:
             logger.error(f"Failed to start Log Parser Bridge: {e}")
@@ -118,6 +82,9 @@ async def stop(self):
         """Stop the log parser bridge."""
         self.is_running = False
 
+        if self.subscriber:
+            self.subscriber.close()
+
         if self.update_task:
             self.update_task.cancel()
             try:
@@ -126,138 +93,47 @@ async def stop(self):
                 pass
             self.update_task = None
 
-        if self.observer.is_alive():
-            self.observer.stop()
-            self.observer.join()
-
         logger.info("Log Parser Bridge stopped")
 
-    async def _initialize_file_positions(self):
-        """Initialize file positions for all existing log files."""
-        for pattern in ["opportunities_*.log", "execution_*.log"]:
-            for log_file in self.log_dir.glob(pattern):
-                if log_file.is_file():
-                    self.file_positions[str(log_file)] = log_file.stat().st_size
-
-    def _handle_file_update(self, file_path: str):
-        """Handle file update events from the file system observer."""
-        if not self.is_running:
+    def _handle_record(self, record: TelemetryRecord):
+        """Forward a telemetry record to the OpportunityTracker."""
+        if not isinstance(record.data, dict):
             return
 
-        # File position will be checked in the update loop
-        logger.debug(f"Received update notification for {file_path}")
-
-    async def _update_loop(self):
-        """Main update loop that processes log files periodically."""
-        while self.is_running:
-            try:
-                await self._process_log_updates()
-                await asyncio.sleep(self.update_frequency)
-
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in update loop: {e}")
-                await asyncio.sleep(self.update_frequency * 2)  # Back off on error
-
-    async def _process_log_updates(self):
-        """Process updates from all log files."""
-        for pattern in ["opportunities_*.log", "execution_*.log"]:
-            for log_file in self.log_dir.glob(pattern):
-                await self._process_single_file(log_file)
+        timestamp = datetime.fromtimestamp(record.timestamp).isoformat()
+        if record.kind == RecordType.OPPORTUNITY:
+            self._handle_opportunity(record.data, timestamp)
+        elif record.kind == RecordType.EXECUTION:
+            self._handle_execution(record.data, timestamp)
+        self.records_processed += 1
 
-    async def _process_single_file(self, file_path: Path):
-        """Process updates from a single log file."""
-        try:
-            current_size = file_path.stat().st_size
-            last_position = self.file_positions.get(str(file_path), 0)
-
-            if current_size == last_position:
-                return  # No new content
-
-            if current_size < last_position:
-                # File was truncated
-                logger.warning(
-                    f"Log file {file_path} was truncated, resetting position"
-                )
-                last_position = 0
-
-            # Read new content
-            with open(file_path, "r") as f:
-                f.seek(last_position)
-                new_lines = f.readlines(self.max_batch_size)
-
-            # Process new lines
-            for line in new_lines:
-                await self._process_log_line(line.strip())
-
-            # Update position
-            self.file_positions[str(file_path)] = current_size
-
-        except Exception as e:
-            logger.error(f"Error processing file {file_path}: {e}")
-
-    async def _process_log_line(self, line: str):
-        """Process a single log line and update OpportunityTracker if relevant."""
-        try:
-            # Try opportunity pattern first
-            match = self.patterns["opportunity"].search(line)
-            if match:
-                dex_from, dex_to, token, price_diff, amount, profit = match.groups()
-                await self._handle_opportunity(
-                    dex_from.strip(),
-                    dex_to.strip(),
-                    token.strip(),
-                    float(price_diff),
-                    float(amount),
-                    float(profit),
-                )
-                return
-
-            # Try execution pattern
-            match = self.patterns["execution"].search(line)
-            if match:
-                tx_hash, status, profit, gas_cost = match.groups()
-                await self._handle_execution(
-                    tx_hash, status, float(profit), float(gas_cost)
-                )
-
-        except Exception as e:
-            logger.error(f"Error processing log line: {e}\nLine: {line}")
-
-    async def _handle_opportunity(
-        self,
-        dex_from: str,
-        dex_to: str,
-        token: str,
-        price_diff: float,
-        amount: float,
-        profit: float,
-    ):
-        """Handle an opportunity log entry."""
+    def _handle_opportunity(self, data: Dict[str, Any], timestamp: str):
+        """Handle an opportunity record."""
+        price_diff = data.get("price_diff")
         opportunity_data = {
-            "timestamp": datetime.now().isoformat(),
-            "source_dex": dex_from,
-            "target_dex": dex_to,
-            "token": token,
-            "price_diff_pct": price_diff,
-            "amount": amount,
-            "profit_usd": profit,
-            "executed": False,  # Will be updated if execution log is found
+            "timestamp": data.get("timestamp", timestamp),
+            "source_dex": data.get("dex_from", data.get("source_dex")),
+            "target_dex": data.get("dex_to", data.get("target_dex")),
+            "token": data.get("token", data.get("token_pair")),
+            "price_diff_pct": price_diff * 100 if price_diff is not None else None,
+            "amount": data.get("amount_in", data.get("amount")),
+            "profit_usd": float(data.get("profit_usd", 0.0)),
+            "executed": False,  # Updated when the execution record arrives
         }
         self.opportunity_tracker.add_opportunity(opportunity_data)
 
-    async def _handle_execution(
-        self, tx_hash: str, status: str, profit: float, gas_cost: float
-    ):
-        """Handle an execution log entry."""
+    def _handle_execution(self, data: Dict[str, Any], timestamp: str):
+        """Handle an execution record."""
+        status = str(data.get("status", ""))
+        profit = float(data.get("profit_usd", 0.0))
+        gas_cost = float(data.get("gas_cost_usd", 0.0))
         execution_data = {
-            "timestamp": datetime.now().isoformat(),
-            "tx_hash": tx_hash,
+            "timestamp": data.get("timestamp", timestamp),
+            "tx_hash": data.get("tx_hash"),
             "status": status,
             "profit_usd": profit,
             "gas_cost_usd": gas_cost,
             "net_profit_usd": profit - gas_cost,
-            "executed": status.lower() == "success",
+            "executed": status.lower() in ("success", "successful"),
         }
         self.opportunity_tracker.add_opportunity(execution_data)
@@ -1,4 +1,17 @@
-from .enhanced_market_analyzer import EnhancedMarketAnalyzer
-from .market_data_provider import EnhancedMarketDataProvider
+from typing import TYPE_CHECKING
+
+from ...utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .enhanced_market_analyzer import EnhancedMarketAnalyzer
+    from .market_data_provider import EnhancedMarketDataProvider
 
 __all__ = ["EnhancedMarketAnalyzer", "EnhancedMarketDataProvider"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "EnhancedMarketAnalyzer": ".enhanced_market_analyzer",
+        "EnhancedMarketDataProvider": ".market_data_provider",
+    },
+)
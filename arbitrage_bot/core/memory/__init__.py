@@ -6,10 +6,27 @@
 - State management
 - Trade history
 - Metrics tracking
+- Warm-start snapshots
 """
 
-from .memory_bank import MemoryBank
-from .memory_manager import MemoryManager
-from .file_manager import FileManager
+from typing import TYPE_CHECKING
 
-__all__ = ["MemoryBank", "MemoryManager", "FileManager"]
+from ...utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .memory_bank import MemoryBank
+    from .memory_manager import MemoryManager
+    from .file_manager import FileManager
+    from .warm_start import WarmStartManager
+
+__all__ = ["MemoryBank", "MemoryManager", "FileManager", "WarmStartManager"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "MemoryBank": ".memory_bank",
+        "MemoryManager": ".memory_manager",
+        "FileManager": ".file_manager",
+        "WarmStartManager": ".warm_start",
+    },
+)
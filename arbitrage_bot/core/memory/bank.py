@@ -1,4 +1,16 @@
-"""Memory bank for storing and retrieving arbitrage opportunities and trade results."""
+"""Memory bank for storing and retrieving arbitrage opportunities and trade results.
+
+Keyed values are kept in three tiers:
+- Pending writes: the latest value per key since the last flush, so
+  repeated stores of a key cost one disk write per flush interval
+- A bounded LRU cache (entry count and approximate bytes) of recently used
+  values
+- One append-only segment file per category (see ``segment_store``), whose
+  index is the only thing loaded at startup; values are faulted in on demand
+
+TTL expiry is driven by a hashed timing wheel swept by the background
+flush loop, and checked on every read.
+"""
 
 import logging
 import time
@@ -6,14 +18,15 @@
 import json
 import zlib
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import asdict
 from concurrent.futures import ThreadPoolExecutor
-from collections import namedtuple, defaultdict
+from collections import namedtuple
 import lru
 
 from ..models.opportunity import Opportunity
-from .file_manager import FileManager
+from .segment_store import DATA_FILENAME, SegmentStore
+from .time_wheel import TimeWheel
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +45,11 @@ async def create_memory_bank(config: Optional[Dict[str, Any]] = None) -> "Memory
 BATCH_SIZE = 50  # Process 50 items at a time
 COMPRESSION_THRESHOLD = 1024  # Minimum size in bytes for compression
 CACHE_SIZE = 1000  # Maximum number of items in LRU cache
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Approximate byte budget of the LRU cache
+FLUSH_INTERVAL = 1.0  # Seconds between background flushes
+
+OPPORTUNITIES_FILE = os.path.join("market_data", "opportunities.json")
+TRADE_RESULTS_FILE = os.path.join("transactions", "trade_results.json")
 
 MemoryStats = namedtuple(
     "MemoryStats",
@@ -64,20 +82,37 @@ def __init__(self, base_path: Optional[str] = None):
             "storage",
             "cache",
         ]
-        self.storage = {category: {} for category in self._categories}
-        self.stats = {"cache_hits": 0, "cache_misses": 0}
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "flushes": 0, "expired": 0}
 
-        # Thread pool for CPU-bound operations
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Single I/O thread so segment reads never race appends or compaction
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-bank")
 
         # Locks for thread safety
         self._storage_locks = {}
         for category in self._categories:
             self._storage_locks[category] = asyncio.Lock()
         self._stats_lock = asyncio.Lock()
-
-        # LRU caches for frequently accessed data
-        self._data_cache = lru.LRU(CACHE_SIZE)
+        self._flush_lock = asyncio.Lock()
+
+        # On-disk segments and write coalescing (None marks a delete)
+        self._stores: Dict[str, SegmentStore] = {}
+        self._pending: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {
+            category: {} for category in self._categories
+        }
+        self._flushing: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {
+            category: {} for category in self._categories
+        }
+        self._opportunities_dirty = False
+        self._trade_results_dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # TTL expiry, keyed by (category, key)
+        self._wheel = TimeWheel()
+
+        # LRU cache of (data_obj, size) for frequently accessed data
+        self._data_cache = lru.LRU(CACHE_SIZE, callback=self._on_cache_evict)
+        self._cache_bytes = 0
+        self._cache_max_bytes = CACHE_MAX_BYTES
 
         # Set up base path and ensure directories exist
         if base_path:
@@ -89,9 +124,6 @@ def __init__(self, base_path: Optional[str] = None):
             )
             self.base_path = os.path.join(project_root, "data", "memory")
 
-        # Initialize file manager
-        self.file_manager = FileManager(self.base_path)
-
         logger.debug("Memory bank instance created with base path: %s", self.base_path)
 
     async def initialize(self, config: Optional[Dict[str, Any]] = None) -> bool:
@@ -105,18 +137,15 @@ async def initialize(self, config: Optional[Dict[str, Any]] = None) -> bool:
 
             # Store configuration
             self.config = config or {}
-
-            # Create category directories
-            for category in self._categories:
-                if not await self.file_manager.ensure_directory(category):
-                    logger.error(
-                        "Failed to create directory for category: %s", category
-                    )
-                    return False
+            self._flush_interval = self.config.get("flush_interval", FLUSH_INTERVAL)
+            self._cache_max_bytes = self.config.get("cache_max_bytes", CACHE_MAX_BYTES)
+            self._data_cache.set_size(self.config.get("cache_size", CACHE_SIZE))
 
             # Load historical data
             await self._load_historical_data()
 
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
             self.initialized = True
             logger.debug("Memory bank initialization complete")
             return True
@@ -126,92 +155,99 @@ async def initialize(self, config: Optional[Dict[str, Any]] = None) -> bool:
             return False
 
     async def _load_historical_data(self) -> None:
-        """Load historical data from disk."""
-        try:
-            # Load opportunities
-            opportunities = await self.file_manager.read_json(
-                os.path.join("market_data", "opportunities.json")
-            )
-            if opportunities:
-                self.opportunities = opportunities
-                logger.debug(
-                    "Loaded %d historical opportunities", len(self.opportunities)
-                )
-
-            # Load trade results
-            trade_results = await self.file_manager.read_json(
-                os.path.join("transactions", "trade_results.json")
+        """Load segment indexes and the opportunity and trade result lists from disk."""
+        loop = asyncio.get_running_loop()
+        for category in self._categories:
+            store = SegmentStore(
+                os.path.join(self.base_path, category),
+                min_compact_bytes=self.config.get("min_compact_bytes", 1 << 20),
             )
-            if trade_results:
-                self.trade_results = trade_results
-                logger.debug(
-                    "Loaded %d historical trade results", len(self.trade_results)
-                )
-
-            # Load other categories
-            for category in self._categories:
-                if category not in ["market_data", "transactions"]:
-                    category_path = os.path.join(self.base_path, category)
-                    if os.path.exists(category_path):
-                        for filename in os.listdir(category_path):
-                            if filename.endswith(".json"):
-                                key = filename[:-5]  # Remove .json extension
-                                file_path = os.path.join(category, filename)
-                                try:
-                                    data_obj = await self.file_manager.read_json(
-                                        file_path
-                                    )
-                                    if data_obj:
-                                        # Check TTL
-                                        if (
-                                            "ttl" in data_obj
-                                            and data_obj["ttl"] is not None
-                                        ):
-                                            if (
-                                                time.time() - data_obj["timestamp"]
-                                                > data_obj["ttl"]
-                                            ):
-                                                await self.file_manager.delete_file(
-                                                    file_path
-                                                )
-                                                continue
-
-                                        # Store in memory
-                                        async with self._storage_locks[category]:
-                                            self.storage[category][key] = data_obj
-                                except Exception as e:
-                                    logger.error(
-                                        "Failed to load %s: %s", file_path, str(e)
-                                    )
-                                    continue
-
-            logger.debug("Historical data loading complete")
+            await loop.run_in_executor(self.executor, self._open_store, store)
+            self._stores[category] = store
+
+            for key, (_, _, timestamp, ttl) in store.index.items():
+                if ttl is not None:
+                    self._wheel.schedule((category, key), timestamp + ttl)
+
+        opportunities = await loop.run_in_executor(
+            self.executor, self._read_json, OPPORTUNITIES_FILE
+        )
+        if opportunities:
+            self.opportunities = opportunities
+            logger.debug("Loaded %d historical opportunities", len(self.opportunities))
+
+        trade_results = await loop.run_in_executor(
+            self.executor, self._read_json, TRADE_RESULTS_FILE
+        )
+        if trade_results:
+            self.trade_results = trade_results
+            logger.debug("Loaded %d historical trade results", len(self.trade_results))
+
+        logger.debug("Historical data loading complete")
+
+    def _open_store(self, store: SegmentStore) -> None:
+        """Open a segment, migrating legacy per-key JSON files into it once."""
+        is_new = not os.path.exists(os.path.join(store.directory, DATA_FILENAME))
+        store.open()
+        if not is_new:
+            return
 
-        except Exception as e:
-            logger.error("Failed to load historical data: %s", str(e))
+        legacy = []
+        now = time.time()
+        for filename in sorted(os.listdir(store.directory)):
+            path = os.path.join(store.directory, filename)
+            if not filename.endswith(".json") or filename in (
+                os.path.basename(OPPORTUNITIES_FILE),
+                os.path.basename(TRADE_RESULTS_FILE),
+            ):
+                continue
+            try:
+                with open(path, "r") as f:
+                    data_obj = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error("Failed to load %s: %s", path, str(e))
+                continue
+
+            ttl = data_obj.get("ttl")
+            if ttl is None or now - data_obj["timestamp"] <= ttl:
+                legacy.append((path, filename[:-5], data_obj))
+            else:
+                os.remove(path)
+
+        if legacy:
+            store.write((key, data_obj) for _, key, data_obj in legacy)
+            store.save_snapshot()
+            for path, _, _ in legacy:
+                os.remove(path)
+            logger.info("Migrated %d legacy entries into %s", len(legacy), store.data_path)
 
     async def store(
         self, key: str, data: Any, category: str, ttl: Optional[int] = None
     ) -> None:
-        """Store data in specified category."""
+        """
+        Store data in specified category.
+
+        The value is visible to ``retrieve`` immediately and written to disk
+        by the next flush; only the latest value per key is written.
+        """
         if not self.initialized:
             logger.warning("Memory bank not initialized")
             return
 
         try:
-            if category not in self.storage:
+            if category not in self._stores:
                 logger.error("Invalid category: %s", category)
                 return
 
-            # Store in memory
             data_obj = {"data": data, "timestamp": time.time(), "ttl": ttl}
             async with self._storage_locks[category]:
-                self.storage[category][key] = data_obj
+                self._pending[category][key] = data_obj
+                self._drop_cached(category + ":" + key)
 
-            # Store to disk
-            file_path = os.path.join(category, key + ".json")
-            if not await self.file_manager.write_json(file_path, data_obj):
-                logger.error("Failed to write data to %s", file_path)
+            if ttl is None:
+                self._wheel.cancel((category, key))
+            else:
+                self._wheel.schedule((category, key), data_obj["timestamp"] + ttl)
 
         except Exception as e:
             logger.error("Error storing data: %s", str(e))
@@ -224,53 +260,192 @@ async def retrieve(self, key: str, category: str) -> Optional[Any]:
             return None
 
         try:
+            if category not in self._stores:
+                return None
+
+            # Expired values are never returned, even before the wheel sweeps them
+            if self._wheel.deadline((category, key)) <= time.time():
+                await self._expire([(category, key)])
+                return None
+
             # Check cache first
             cache_key = category + ":" + key
-            if cache_key in self._data_cache:
+            cached = self._data_cache.get(cache_key)
+            if cached is not None:
                 async with self._stats_lock:
                     self.stats["cache_hits"] += 1
-                    return self._data_cache[cache_key]["data"]
+                return cached[0]["data"]
 
             async with self._stats_lock:
                 self.stats["cache_misses"] += 1
 
-            # Check memory storage
+            # Then writes not yet on disk
             async with self._storage_locks[category]:
-                if key in self.storage[category]:
-                    data_obj = self.storage[category][key]
-
-                    # Check TTL
-                    if "ttl" in data_obj and data_obj["ttl"] is not None:
-                        if time.time() - data_obj["timestamp"] > data_obj["ttl"]:
-                            del self.storage[category][key]
-                            return None
-
-                    # Update cache
-                    self._data_cache[cache_key] = data_obj
-                    return data_obj["data"]
-
-            # If not in memory, try to load from disk
-            file_path = os.path.join(category, key + ".json")
-            data_obj = await self.file_manager.read_json(file_path)
-            if data_obj:
-                # Check TTL
-                if "ttl" in data_obj and data_obj["ttl"] is not None:
-                    if time.time() - data_obj["timestamp"] > data_obj["ttl"]:
-                        await self.file_manager.delete_file(file_path)
-                        return None
-
-                # Store in memory and cache
-                async with self._storage_locks[category]:
-                    self.storage[category][key] = data_obj
-                self._data_cache[cache_key] = data_obj
-                return data_obj["data"]
+                for pending in (self._pending[category], self._flushing[category]):
+                    if key in pending:
+                        data_obj = pending[key]
+                        return None if data_obj is None else data_obj["data"]
+
+            # Fault in from the segment
+            store = self._stores[category]
+            entry = store.index.get(key)
+            if entry is None:
+                return None
+            data_obj = await asyncio.get_running_loop().run_in_executor(
+                self.executor, store.read, key
+            )
 
-            return None
+            # A store() or flush during the read supersedes what was read
+            async with self._storage_locks[category]:
+                for pending in (self._pending[category], self._flushing[category]):
+                    if key in pending:
+                        newer = pending[key]
+                        return None if newer is None else newer["data"]
+                if store.index.get(key) != entry:
+                    cached = self._data_cache.get(cache_key)
+                    if cached is not None:
+                        return cached[0]["data"]
+                    return None if data_obj is None else data_obj["data"]
+                if data_obj is None:
+                    return None
+                self._cache_put(cache_key, data_obj, entry[1])
+            return data_obj["data"]
 
         except Exception as e:
             logger.error("Error retrieving data: %s", str(e))
             return None
 
+    async def flush(self) -> None:
+        """Write pending values, expire TTLs and compact segments that need it."""
+        async with self._flush_lock:
+            loop = asyncio.get_running_loop()
+
+            expired = self._wheel.advance(time.time())
+            if expired:
+                await self._expire(expired)
+
+            for category, store in self._stores.items():
+                async with self._storage_locks[category]:
+                    batch = self._pending[category]
+                    if not batch:
+                        continue
+                    self._pending[category] = {}
+                    self._flushing[category] = batch
+
+                try:
+                    await loop.run_in_executor(
+                        self.executor, self._write_batch, store, batch
+                    )
+                finally:
+                    async with self._storage_locks[category]:
+                        self._flushing[category] = {}
+
+                # Flushed values stay hot unless they were stored again meanwhile
+                for key, data_obj in batch.items():
+                    entry = store.index.get(key)
+                    if data_obj is not None and entry is not None:
+                        if key not in self._pending[category]:
+                            self._cache_put(category + ":" + key, data_obj, entry[1])
+
+                if store.needs_compaction():
+                    await loop.run_in_executor(self.executor, store.compact)
+
+            if self._opportunities_dirty:
+                self._opportunities_dirty = False
+                await loop.run_in_executor(
+                    self.executor, self._write_json, OPPORTUNITIES_FILE, list(self.opportunities)
+                )
+            if self._trade_results_dirty:
+                self._trade_results_dirty = False
+                await loop.run_in_executor(
+                    self.executor, self._write_json, TRADE_RESULTS_FILE, list(self.trade_results)
+                )
+
+            self.stats["flushes"] += 1
+
+    async def close(self) -> None:
+        """Stop the flush loop, flush everything and close the segments."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        if self.initialized:
+            await self.flush()
+            loop = asyncio.get_running_loop()
+            for store in self._stores.values():
+                await loop.run_in_executor(self.executor, store.close)
+            self.initialized = False
+
+        self.executor.shutdown(wait=True)
+
+    async def _flush_loop(self) -> None:
+        """Flush pending writes every flush interval."""
+        while True:
+            try:
+                await asyncio.sleep(self._flush_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Error flushing memory bank: %s", str(e))
+
+    async def _expire(self, keys) -> None:
+        """Delete expired (category, key) pairs from every tier."""
+        for category, key in keys:
+            self._wheel.cancel((category, key))
+            async with self._storage_locks[category]:
+                self._drop_cached(category + ":" + key)
+                self._pending[category][key] = None
+            self.stats["expired"] += 1
+
+    def _write_batch(
+        self, store: SegmentStore, batch: Dict[str, Optional[Dict[str, Any]]]
+    ) -> None:
+        """Append a coalesced batch to a segment (runs on the I/O thread)."""
+        items = [(key, data_obj) for key, data_obj in batch.items() if data_obj is not None]
+        deletes = [key for key, data_obj in batch.items() if data_obj is None]
+        store.write(items, deletes)
+
+    def _cache_put(self, cache_key: str, data_obj: Dict[str, Any], size: int) -> None:
+        """Insert into the LRU cache, evicting until within the byte budget."""
+        self._drop_cached(cache_key)
+        self._data_cache[cache_key] = (data_obj, size)
+        self._cache_bytes += size
+        while self._cache_bytes > self._cache_max_bytes and len(self._data_cache) > 1:
+            _, (_, evicted_size) = self._data_cache.popitem()
+            self._cache_bytes -= evicted_size
+
+    def _drop_cached(self, cache_key: str) -> None:
+        cached = self._data_cache.pop(cache_key, None)
+        if cached is not None:
+            self._cache_bytes -= cached[1]
+
+    def _on_cache_evict(self, cache_key: str, cached: Tuple[Dict[str, Any], int]) -> None:
+        self._cache_bytes -= cached[1]
+
+    def _read_json(self, relative_path: str) -> Optional[Any]:
+        path = os.path.join(self.base_path, relative_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load %s: %s", path, str(e))
+            return None
+
+    def _write_json(self, relative_path: str, data: Any) -> None:
+        path = os.path.join(self.base_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(temp_path, path)
+
     async def store_opportunities(self, opportunities: List[Opportunity]) -> None:
         """Store arbitrage opportunities."""
         if not self.initialized:
@@ -290,15 +465,11 @@ async def store_opportunities(self, opportunities: List[Opportunity]) -> None:
                     opp_dict = {**asdict(opp), "timestamp": current_time}
                 opp_dicts.append(opp_dict)
 
-            # Add new opportunities
+            # Add new opportunities; the flush loop writes them to disk
             self.opportunities.extend(opp_dicts)
+            self._opportunities_dirty = True
             logger.debug("Added %d opportunities to memory", len(opp_dicts))
 
-            # Store to disk
-            file_path = os.path.join("market_data", "opportunities.json")
-            if not await self.file_manager.write_json(file_path, self.opportunities):
-                logger.error("Failed to write opportunities to disk")
-
         except Exception as e:
             logger.error("Error storing opportunities: %s", str(e), exc_info=True)
 
@@ -328,11 +499,7 @@ async def store_trade_result(
             }
 
             self.trade_results.append(result)
-
-            # Store to disk
-            file_path = os.path.join("transactions", "trade_results.json")
-            if not await self.file_manager.write_json(file_path, self.trade_results):
-                logger.error("Failed to write trade results to disk")
+            self._trade_results_dirty = True
 
         except Exception as e:
             logger.error("Error storing trade result: %s", str(e))
@@ -370,19 +537,11 @@ async def get_trade_history(
     async def get_compression_stats(self) -> Dict[str, Any]:
         """Get compression statistics."""
         try:
-            total_size = 0
-            compressed_size = 0
+            await self.flush()
+            total_size, compressed_size = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._compression_totals
+            )
             compression_ratio = 0
-
-            # Calculate sizes for all stored data
-            for category in self.storage:
-                for key, value in self.storage[category].items():
-                    if isinstance(value, dict) and "data" in value:
-                        data_str = json.dumps(value["data"])
-                        uncompressed_size = len(data_str.encode("utf-8"))
-                        compressed_size += len(zlib.compress(data_str.encode("utf-8")))
-                        total_size += uncompressed_size
-
             if total_size > 0:
                 compression_ratio = (total_size - compressed_size) / total_size
 
@@ -401,6 +560,16 @@ async def get_compression_stats(self) -> Dict[str, Any]:
                 "compression_savings": 0,
             }
 
+    def _compression_totals(self) -> Tuple[int, int]:
+        """Sum raw and zlib-compressed value sizes across segments (I/O thread)."""
+        total_size = 0
+        compressed_size = 0
+        for store in self._stores.values():
+            for _, value in store.iter_raw():
+                total_size += len(value)
+                compressed_size += len(zlib.compress(value))
+        return total_size, compressed_size
+
     async def get_recent_opportunities(
         self, max_age: Optional[int] = None
     ) -> List[Dict[str, Any]]:
@@ -444,26 +613,25 @@ async def get_memory_stats(self) -> MemoryStats:
                 "items": ["trade_%d" % i for i in range(len(self.trade_results))],
             }
 
-            # Add storage categories
-            for category, data in self.storage.items():
-                if category not in ["market_data", "transactions"]:
-                    category_size = 0
-                    category_items = []
-
-                    for key, value in data.items():
-                        if isinstance(value, dict) and "data" in value:
-                            size = len(str(value["data"]))
+            # Add storage categories from the segment indexes and pending writes
+            for category, store in self._stores.items():
+                if category in ["market_data", "transactions"]:
+                    continue
+                sizes = {key: entry[1] for key, entry in store.index.items()}
+                for pending in (self._flushing[category], self._pending[category]):
+                    for key, data_obj in pending.items():
+                        if data_obj is None:
+                            sizes.pop(key, None)
                         else:
-                            size = len(str(value))
-                        category_size += size
-                        total_size += size
-                        item_count += 1
-                        category_items.append(key)
-
-                    categories[category] = {
-                        "size": category_size,
-                        "items": category_items,
-                    }
+                            sizes[key] = len(str(data_obj["data"]))
+
+                category_size = sum(sizes.values())
+                total_size += category_size
+                item_count += len(sizes)
+                categories[category] = {
+                    "size": category_size,
+                    "items": list(sizes),
+                }
 
             return MemoryStats(
                 cache_size=len(self._data_cache),
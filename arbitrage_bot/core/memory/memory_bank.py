@@ -12,6 +12,7 @@
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Deque
 from .file_manager import FileManager
+from ...utils.telemetry import RecordType, publish
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +124,7 @@ async def add_trade(self, trade: Dict[str, Any]) -> None:
                 )
                 await self._file_manager.write_json(file_path, trade)
                 logger.debug(f"Persisted trade {trade_id} to {file_path}")
+                publish(RecordType.TRADE, trade)
             except Exception as e:
                 logger.error(f"Failed to persist trade {trade_id}: {e}")
                 raise
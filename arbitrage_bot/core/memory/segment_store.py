@@ -0,0 +1,258 @@
+"""
+Segment Store
+
+Append-only key/value file for one memory bank category.
+
+Every write appends a record (header, key, JSON value) to ``segment.dat``;
+deletes append a tombstone. An in-memory index maps each key to the offset,
+length, timestamp and TTL of its latest value, so values are read lazily
+with a single seek. ``segment.idx`` snapshots the index together with the
+data offset it covers; at startup the snapshot is loaded and only records
+appended after it are scanned. Superseded records are reclaimed by
+compaction once they outweigh the live ones.
+"""
+
+import json
+import logging
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_FILENAME = "segment.dat"
+INDEX_FILENAME = "segment.idx"
+
+# Record header: flags, key length, value length, timestamp, ttl (-1 = none)
+_HEADER = struct.Struct("<BHIdd")
+_TOMBSTONE = 1
+
+# Index entry: value offset, value length, timestamp, ttl
+IndexEntry = Tuple[int, int, float, Optional[float]]
+
+
+class SegmentStore:
+    """Append-only, indexed key/value file for one category."""
+
+    def __init__(self, directory: str, min_compact_bytes: int = 1 << 20):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Category directory
+            min_compact_bytes: Dead bytes below which compaction never runs
+        """
+        self.directory = directory
+        self.min_compact_bytes = min_compact_bytes
+        self.data_path = os.path.join(directory, DATA_FILENAME)
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+
+        self.index: Dict[str, IndexEntry] = {}
+        self._dead_bytes = 0
+        self._end = 0
+        self._file = None
+
+    def open(self) -> Dict[str, IndexEntry]:
+        """
+        Load the index and open the data file for appending.
+
+        Returns:
+            The index (key -> (offset, length, timestamp, ttl))
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        covered = self._load_snapshot()
+        self._end = self._scan(covered)
+
+        if os.path.exists(self.data_path) and os.path.getsize(self.data_path) > self._end:
+            logger.warning(f"Truncating torn tail of {self.data_path} to {self._end} bytes")
+            os.truncate(self.data_path, self._end)
+
+        self._file = open(self.data_path, "ab")
+        return self.index
+
+    def write(
+        self,
+        items: Iterable[Tuple[str, Dict[str, Any]]],
+        deletes: Iterable[str] = (),
+    ) -> int:
+        """
+        Append values and tombstones in one write.
+
+        Args:
+            items: (key, {"data", "timestamp", "ttl"}) pairs
+            deletes: Keys to delete
+
+        Returns:
+            Bytes written
+        """
+        chunks: List[bytes] = []
+        updates: Dict[str, Optional[IndexEntry]] = {}
+        position = self._end
+
+        for key, data_obj in items:
+            key_bytes = key.encode()
+            value = json.dumps(data_obj["data"], default=str).encode()
+            ttl = data_obj.get("ttl")
+            timestamp = data_obj["timestamp"]
+            header = _HEADER.pack(
+                0, len(key_bytes), len(value), timestamp, -1.0 if ttl is None else ttl
+            )
+            chunks.extend((header, key_bytes, value))
+            value_offset = position + _HEADER.size + len(key_bytes)
+            updates[key] = (value_offset, len(value), timestamp, ttl)
+            position = value_offset + len(value)
+
+        for key in deletes:
+            if key not in self.index and key not in updates:
+                continue
+            key_bytes = key.encode()
+            chunks.extend((_HEADER.pack(_TOMBSTONE, len(key_bytes), 0, 0.0, -1.0), key_bytes))
+            position += _HEADER.size + len(key_bytes)
+            updates[key] = None
+
+        if not chunks:
+            return 0
+
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+        written = position - self._end
+        self._end = position
+
+        for key, entry in updates.items():
+            self._apply(key, entry)
+        return written
+
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the latest value of a key.
+
+        Returns:
+            {"data", "timestamp", "ttl"} or None if the key is not stored
+        """
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        offset, length, timestamp, ttl = entry
+        with open(self.data_path, "rb") as f:
+            f.seek(offset)
+            value = f.read(length)
+        return {"data": json.loads(value), "timestamp": timestamp, "ttl": ttl}
+
+    def iter_raw(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield (key, serialized value) for every live key in file order."""
+        entries = sorted(self.index.items(), key=lambda item: item[1][0])
+        with open(self.data_path, "rb") as f:
+            for key, (offset, length, _, _) in entries:
+                f.seek(offset)
+                yield key, f.read(length)
+
+    def needs_compaction(self) -> bool:
+        """Whether superseded records outweigh live ones."""
+        live = self._end - self._dead_bytes
+        return self._dead_bytes >= self.min_compact_bytes and self._dead_bytes > live
+
+    def compact(self) -> None:
+        """Rewrite the data file with live records only and snapshot the index."""
+        items = []
+        for key in list(self.index):
+            items.append((key, self.read(key)))
+
+        self._file.close()
+        temp_path = self.data_path + ".compact"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        self.index = {}
+        self._dead_bytes = 0
+        self._end = 0
+        self._file = open(temp_path, "ab")
+        self.write(items)
+        self._file.close()
+
+        os.replace(temp_path, self.data_path)
+        self._file = open(self.data_path, "ab")
+        self.save_snapshot()
+
+    def save_snapshot(self) -> None:
+        """Write the index snapshot covering everything appended so far."""
+        snapshot = {"end": self._end, "dead": self._dead_bytes, "entries": self.index}
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temp_path, self.index_path)
+
+    def close(self) -> None:
+        """Snapshot the index and close the data file."""
+        if self._file is None:
+            return
+        self.save_snapshot()
+        self._file.close()
+        self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            "keys": len(self.index),
+            "data_bytes": self._end,
+            "dead_bytes": self._dead_bytes,
+        }
+
+    def _apply(self, key: str, entry: Optional[IndexEntry]) -> None:
+        """Update the index, counting the bytes of the replaced value as dead."""
+        previous = self.index.pop(key, None)
+        if previous is not None:
+            self._dead_bytes += _HEADER.size + len(key.encode()) + previous[1]
+        if entry is None:
+            self._dead_bytes += _HEADER.size + len(key.encode())
+        else:
+            self.index[key] = entry
+
+    def _load_snapshot(self) -> int:
+        """Load the index snapshot; returns the data offset it covers."""
+        if not os.path.exists(self.index_path):
+            return 0
+        try:
+            with open(self.index_path, "r") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading {self.index_path}, rebuilding: {e}")
+            return 0
+
+        if not os.path.exists(self.data_path) or os.path.getsize(self.data_path) < snapshot["end"]:
+            return 0
+        self.index = {key: tuple(entry) for key, entry in snapshot["entries"].items()}
+        self._dead_bytes = snapshot["dead"]
+        return snapshot["end"]
+
+    def _scan(self, start: int) -> int:
+        """Apply records appended after ``start``; returns the end of the last whole record."""
+        if start == 0:
+            self.index = {}
+            self._dead_bytes = 0
+        if not os.path.exists(self.data_path):
+            return 0
+
+        position = start
+        size = os.path.getsize(self.data_path)
+        with open(self.data_path, "rb") as f:
+            f.seek(start)
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                flags, key_length, value_length, timestamp, ttl = _HEADER.unpack(header)
+                key = f.read(key_length)
+                if len(key) < key_length:
+                    break
+                value_offset = position + _HEADER.size + key_length
+                if value_offset + value_length > size:
+                    break
+                f.seek(value_length, os.SEEK_CUR)
+
+                if flags & _TOMBSTONE:
+                    self._apply(key.decode(), None)
+                else:
+                    entry = (value_offset, value_length, timestamp, None if ttl < 0 else ttl)
+                    self._apply(key.decode(), entry)
+                position = value_offset + value_length
+        return position
@@ -0,0 +1,85 @@
+"""
+Time Wheel
+
+Hashed timing wheel for TTL expiry.
+
+Deadlines are bucketed into fixed-width slots on a ring. Advancing the
+wheel only visits the slots whose time has passed, so expiring keys costs
+time proportional to the number of due entries rather than the number of
+keys with a TTL. Deadlines further out than one rotation stay in their
+slot until their round comes up.
+"""
+
+import math
+from typing import Dict, Hashable, List, Set
+
+
+class TimeWheel:
+    """Hashed timing wheel mapping deadlines to keys."""
+
+    def __init__(self, resolution: float = 1.0, slots: int = 3600):
+        """
+        Initialize the wheel.
+
+        Args:
+            resolution: Slot width in seconds
+            slots: Number of slots in one rotation
+        """
+        self.resolution = resolution
+        self.slots = slots
+        self._wheel: List[Dict[Hashable, float]] = [{} for _ in range(slots)]
+        self._deadlines: Dict[Hashable, float] = {}
+        self._slot_of: Dict[Hashable, int] = {}
+        self._cursor: int = -1  # Last tick processed
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Schedule a key to expire at a deadline, replacing any earlier schedule."""
+        self.cancel(key)
+        tick = self._tick(deadline)
+        if self._cursor >= 0 and tick <= self._cursor:
+            tick = self._cursor + 1  # Already-due deadlines go in the next slot
+        slot = tick % self.slots
+        self._wheel[slot][key] = deadline
+        self._deadlines[key] = deadline
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> None:
+        """Remove a key's schedule, if any."""
+        if self._deadlines.pop(key, None) is not None:
+            del self._wheel[self._slot_of.pop(key)][key]
+
+    def deadline(self, key: Hashable) -> float:
+        """Get a key's deadline (infinity if none)."""
+        return self._deadlines.get(key, math.inf)
+
+    def advance(self, now: float) -> Set[Hashable]:
+        """
+        Advance the wheel to ``now`` and pop every expired key.
+
+        Returns:
+            Keys whose deadline is at or before ``now``
+        """
+        target = self._tick(now)
+        if self._cursor < 0:
+            self._cursor = target - self.slots
+        expired: Set[Hashable] = set()
+
+        # Visiting more than one rotation would revisit the same slots
+        start = max(self._cursor, target - self.slots)
+        for tick in range(start + 1, target + 1):
+            slot = self._wheel[tick % self.slots]
+            due = [key for key, deadline in slot.items() if deadline <= now]
+            for key in due:
+                del slot[key]
+                del self._deadlines[key]
+                del self._slot_of[key]
+            expired.update(due)
+
+        self._cursor = target
+        return expired
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
@@ -0,0 +1,507 @@
+"""
+Warm Start
+
+Versioned on-disk snapshot of in-memory state (pool graph, pool states,
+token metadata, statistical histories) so a restarted bot does not have to
+rebuild everything from the chain before finding its first opportunity.
+
+File layout (little endian)::
+
+    header    magic, format version, block number, created at, section count
+    sections  per section: name, offset, length, crc32
+    payloads  one msgpack document per section
+
+The file is memory-mapped when loaded and each section is only decoded, and
+checksum-verified, when asked for. Snapshots are written to a temporary file
+and renamed into place, so a crash mid-write leaves the previous snapshot.
+
+State comes from participants registered with a ``WarmStartManager``:
+
+- ``snapshot_state() -> Any``: msgpack-serializable state
+- ``restore_state(state, block_number) -> None``: load it back (also
+  called with the participant's own pre-restore state and ``None`` when
+  a failed catch-up rolls the restore back)
+- ``log_addresses() -> List[str]`` and ``apply_logs(logs) -> None``
+  (optional): contracts whose logs bring the restored state up to date,
+  and the handler for logs emitted since the snapshot block
+- ``state_block() -> Optional[int]`` (optional): block the participant's
+  state reflects; a snapshot is stamped with the oldest reported block so
+  the next catch-up replays everything any participant has not seen
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LBWS"
+FORMAT_VERSION = 1
+
+# Header: magic, format version, block number, created at, section count
+_HEADER = struct.Struct("<4sHqdI")
+# Section table entry: name, payload offset, payload length, crc32
+_SECTION = struct.Struct("<32sQQI")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or of another version."""
+
+
+class CatchUpError(Exception):
+    """Raised when the logs since a snapshot cannot all be fetched."""
+
+
+def write_snapshot(path: str, block_number: int, sections: Dict[str, Any]) -> int:
+    """
+    Write a snapshot atomically.
+
+    Args:
+        path: Snapshot file path
+        block_number: Block the state corresponds to
+        sections: Section name -> msgpack-serializable state
+
+    Returns:
+        Number of bytes written
+    """
+    return _write_payloads(
+        path,
+        block_number,
+        {name: msgpack.packb(state, use_bin_type=True) for name, state in sections.items()},
+    )
+
+
+def _write_payloads(path: str, block_number: int, encoded: Dict[str, bytes]) -> int:
+    """Write already encoded section payloads to a temporary file and rename it."""
+    payloads = []
+    for name, payload in encoded.items():
+        encoded_name = name.encode()
+        if len(encoded_name) > 32:
+            raise ValueError(f"Section name too long: {name}")
+        payloads.append((encoded_name, payload))
+
+    offset = _HEADER.size + _SECTION.size * len(payloads)
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, block_number, time.time(), len(payloads))]
+    for encoded_name, payload in payloads:
+        parts.append(_SECTION.pack(encoded_name, offset, len(payload), zlib.crc32(payload)))
+        offset += len(payload)
+    parts.extend(payload for _, payload in payloads)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for part in parts:
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return offset
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str):
+        """
+        Open and validate a snapshot.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            SnapshotError: If the file is missing, truncated or of another
+                format version
+        """
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {e}") from e
+
+        try:
+            self._sections = self._read_table()
+        except SnapshotError:
+            self._map.close()
+            raise
+
+    def _read_table(self) -> Dict[str, tuple]:
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError(f"Snapshot {self.path} is truncated")
+        magic, version, block_number, created_at, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a snapshot file")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(
+                f"Snapshot {self.path} has format version {version}, expected {FORMAT_VERSION}"
+            )
+        self.version = version
+        self.block_number = block_number
+        self.created_at = created_at
+
+        sections = {}
+        for i in range(count):
+            name, offset, length, crc = _SECTION.unpack_from(
+                self._map, _HEADER.size + i * _SECTION.size
+            )
+            if offset + length > len(self._map):
+                raise SnapshotError(f"Snapshot {self.path} is truncated")
+            sections[name.rstrip(b"\0").decode()] = (offset, length, crc)
+        return sections
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def get(self, name: str) -> Any:
+        """
+        Decode one section.
+
+        Args:
+            name: Section name
+
+        Returns:
+            The section's state
+
+        Raises:
+            KeyError: If there is no such section
+            SnapshotError: If the section fails its checksum
+        """
+        offset, length, crc = self._sections[name]
+        payload = memoryview(self._map)[offset : offset + length]
+        try:
+            if zlib.crc32(payload) != crc:
+                raise SnapshotError(f"Section {name} of {self.path} is corrupt")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        finally:
+            payload.release()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+
+class WarmStartManager:
+    """
+    Saves participant state periodically and on shutdown, and restores it
+    at startup followed by a log catch-up from the snapshot block.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        web3_client: Any = None,
+        interval: float = 300.0,
+        max_catch_up_blocks: int = 10_000,
+        log_chunk_size: int = 2_000,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            path: Snapshot file path
+            web3_client: Web3 client for the head block and logs (optional;
+                without one, restored state is used as-is)
+            interval: Seconds between periodic saves
+            max_catch_up_blocks: Snapshots further behind the head than
+                this are discarded instead of caught up
+            log_chunk_size: Blocks per ``eth_getLogs`` request
+        """
+        self.path = path
+        self.web3_client = web3_client
+        self.interval = interval
+        self.max_catch_up_blocks = max_catch_up_blocks
+        self.log_chunk_size = log_chunk_size
+
+        self._participants: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+        self._restored = False
+        self._closed = False
+        self.block_number: Optional[int] = None
+
+        self.stats: Dict[str, Any] = {
+            "saves": 0,
+            "save_errors": 0,
+            "last_save_ms": 0.0,
+            "last_save_bytes": 0,
+            "restored_block": None,
+            "restored_sections": 0,
+            "caught_up_logs": 0,
+            "catch_up_failures": 0,
+            "last_restore_ms": 0.0,
+        }
+
+    def register(self, name: str, participant: Any) -> None:
+        """
+        Include a component's state in snapshots.
+
+        Args:
+            name: Section name (at most 32 bytes, stable across versions)
+            participant: Object implementing ``snapshot_state`` and
+                ``restore_state``
+        """
+        self._participants[name] = participant
+
+    async def start(self) -> None:
+        """Start saving periodically."""
+        if self._closed:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop periodic saves and write a final snapshot (once)."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
+
+    async def save(self, block_number: Optional[int] = None) -> bool:
+        """
+        Snapshot every participant.
+
+        A participant that fails to snapshot is left out of the file rather
+        than failing the whole save.
+
+        Args:
+            block_number: Block the state corresponds to (default: the
+                oldest block reported by participants, else the block the
+                state was last restored or saved at; never the chain head,
+                which the state may not have caught up with)
+
+        Returns:
+            True if a snapshot was written
+        """
+        async with self._save_lock:
+            start = time.perf_counter()
+            if block_number is None:
+                block_number = self._state_block()
+            if block_number is None:
+                logger.warning("Skipping warm start snapshot: block number unknown")
+                return False
+
+            payloads = {}
+            for name, participant in self._participants.items():
+                try:
+                    payloads[name] = msgpack.packb(participant.snapshot_state(), use_bin_type=True)
+                except Exception as e:
+                    self.stats["save_errors"] += 1
+                    logger.error(f"Error snapshotting {name} state: {e}")
+
+            try:
+                size = await asyncio.to_thread(
+                    _write_payloads, self.path, block_number, payloads
+                )
+            except Exception as e:
+                self.stats["save_errors"] += 1
+                logger.error(f"Error writing warm start snapshot: {e}")
+                return False
+
+            self.block_number = block_number
+            self.stats["saves"] += 1
+            self.stats["last_save_bytes"] = size
+            self.stats["last_save_ms"] = (time.perf_counter() - start) * 1000
+            logger.debug(f"Saved warm start snapshot at block {block_number} ({size} bytes)")
+            return True
+
+    async def restore(self) -> Optional[int]:
+        """
+        Restore participant state from the snapshot and catch up via logs.
+
+        Only the first call restores; later calls (e.g. from components
+        sharing this manager) return the block restored to.
+
+        Returns:
+            Block number the state is current to, or None if nothing was
+            restored (no snapshot, unreadable, too far behind, or the
+            catch-up failed)
+        """
+        if self._restored:
+            return self.stats["restored_block"]
+        self._restored = True
+
+        start = time.perf_counter()
+        try:
+            snapshot = Snapshot(self.path)
+        except SnapshotError as e:
+            logger.info(f"No usable warm start snapshot: {e}")
+            return None
+
+        with snapshot:
+            head = await self._head()
+            if head is not None and head - snapshot.block_number > self.max_catch_up_blocks:
+                logger.info(
+                    f"Warm start snapshot is {head - snapshot.block_number} blocks old, "
+                    "starting cold"
+                )
+                return None
+
+            # Keep the cold state, to go back to if the catch-up fails
+            previous: Dict[str, Any] = {}
+            restored = 0
+            for name, participant in self._participants.items():
+                if name not in snapshot:
+                    continue
+                try:
+                    previous[name] = participant.snapshot_state()
+                    participant.restore_state(snapshot.get(name), snapshot.block_number)
+                    restored += 1
+                except Exception as e:
+                    logger.error(f"Error restoring {name} state: {e}")
+            block_number = snapshot.block_number
+
+        if head is not None and head > block_number:
+            try:
+                await self.catch_up(block_number + 1, head)
+            except CatchUpError as e:
+                # A gap in the replayed logs would leave stale reserves behind
+                self.stats["catch_up_failures"] += 1
+                logger.error(f"Warm start catch-up failed, starting cold: {e}")
+                self._rollback(previous)
+                return None
+            block_number = head
+
+        self.block_number = block_number
+        self.stats["restored_block"] = block_number
+        self.stats["restored_sections"] = restored
+        self.stats["last_restore_ms"] = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Restored {restored} warm start sections, current to block {block_number}"
+        )
+        return block_number
+
+    async def catch_up(self, from_block: int, to_block: int) -> int:
+        """
+        Replay logs emitted since the snapshot into participants.
+
+        All chunks are fetched before any is applied, so a failure leaves
+        participants untouched.
+
+        Args:
+            from_block: First block to fetch
+            to_block: Last block to fetch
+
+        Returns:
+            Number of logs applied
+
+        Raises:
+            CatchUpError: If any chunk of logs cannot be fetched
+        """
+        followers = [
+            (name, participant)
+            for name, participant in self._participants.items()
+            if hasattr(participant, "apply_logs")
+        ]
+        if not followers or self.web3_client is None:
+            return 0
+
+        addresses = sorted(
+            {
+                address
+                for _, participant in followers
+                for address in participant.log_addresses()
+            }
+        )
+        if not addresses:
+            return 0
+
+        chunks = []
+        for chunk_start in range(from_block, to_block + 1, self.log_chunk_size):
+            chunk_end = min(chunk_start + self.log_chunk_size - 1, to_block)
+            try:
+                chunks.append(
+                    await self.web3_client.eth.get_logs(
+                        {"fromBlock": chunk_start, "toBlock": chunk_end, "address": addresses}
+                    )
+                )
+            except Exception as e:
+                raise CatchUpError(
+                    f"Error fetching logs {chunk_start}-{chunk_end}: {e}"
+                ) from e
+
+        applied = 0
+        for logs in chunks:
+            for name, participant in followers:
+                try:
+                    participant.apply_logs(logs)
+                except Exception as e:
+                    logger.error(f"Error applying logs to {name}: {e}")
+            applied += len(logs)
+
+        self.stats["caught_up_logs"] += applied
+        return applied
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get warm start statistics."""
+        return {
+            **self.stats,
+            "block_number": self.block_number,
+            "participants": list(self._participants),
+        }
+
+    def _state_block(self) -> Optional[int]:
+        """Oldest block reported by participants, else the last restored or saved block."""
+        blocks = []
+        for name, participant in self._participants.items():
+            if not hasattr(participant, "state_block"):
+                continue
+            try:
+                block = participant.state_block()
+            except Exception as e:
+                logger.error(f"Error reading {name} state block: {e}")
+                continue
+            if block is not None:
+                blocks.append(block)
+        return min(blocks) if blocks else self.block_number
+
+    def _rollback(self, previous: Dict[str, Any]) -> None:
+        """Put participants back into the state they had before a restore."""
+        for name, state in previous.items():
+            try:
+                self._participants[name].restore_state(state, None)
+            except Exception as e:
+                logger.error(f"Error rolling back {name} state: {e}")
+
+    async def _head(self) -> Optional[int]:
+        """Latest block number, or None if it cannot be read."""
+        if self.web3_client is None:
+            return None
+        try:
+            return await self.web3_client.eth.block_number
+        except Exception as e:
+            logger.debug(f"Could not read block number: {e}")
+            return None
+
+    async def _run(self) -> None:
+        """Save a snapshot every interval."""
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                await self.save()
+        except asyncio.CancelledError:
+            pass
@@ -5,7 +5,7 @@
 from typing import List # Removed Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Opportunity:
     """Represents an arbitrage opportunity."""
 
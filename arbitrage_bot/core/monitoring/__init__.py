@@ -1,5 +1,11 @@
 """Monitoring package initialization."""
 
 from .tracker import PerformanceTracker, create_performance_tracker
+from .block_ingester import BlockIngester, BlockRecord
 
-__all__ = ["PerformanceTracker", "create_performance_tracker"]
+__all__ = [
+    "PerformanceTracker",
+    "create_performance_tracker",
+    "BlockIngester",
+    "BlockRecord",
+]
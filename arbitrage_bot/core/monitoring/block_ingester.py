@@ -0,0 +1,397 @@
+"""Gap-free block ingestion for transaction monitoring.
+
+Walks block numbers sequentially instead of re-polling ``"latest"``, so every
+block is processed exactly once even when several are produced between two
+polls. Each range of blocks is fetched in one JSON-RPC batch request (when
+the web3 version and provider support batching) and receipts with one
+``eth_getBlockReceipts`` call per block; relevant transactions are selected in a single pass against a prebuilt
+address/selector set, and each block is published as a :class:`BlockRecord`
+to any number of subscribers.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ...utils.latency import span
+
+logger = logging.getLogger(__name__)
+
+# Ingestion settings
+POLL_INTERVAL = 0.5  # seconds between head checks (Base produces a block every 2s)
+MAX_BLOCKS_PER_POLL = 20  # Upper bound on blocks fetched in one batch
+REORG_WINDOW = 64  # Number of canonical hashes remembered for reorg detection
+SUBSCRIBER_QUEUE_SIZE = 256
+METHOD_NOT_FOUND = -32601  # JSON-RPC error code for unknown methods
+
+
+def _to_hex(value: Any) -> str:
+    """Normalize bytes/HexBytes/str hashes to a lowercase 0x-prefixed string."""
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if hasattr(value, "hex") and not isinstance(value, str):
+        text = value.hex()
+        return text if text.startswith("0x") else "0x" + text
+    text = str(value).lower()
+    return text if text.startswith("0x") else "0x" + text
+
+
+def _is_method_not_found(error: Any) -> bool:
+    """Whether a JSON-RPC error (dict or exception) means the method is unsupported."""
+    if isinstance(error, Exception) and error.args:
+        error = error.args[0]
+    if isinstance(error, dict):
+        if error.get("code") == METHOD_NOT_FOUND:
+            return True
+        error = error.get("message", "")
+    text = str(error).lower()
+    return any(
+        phrase in text
+        for phrase in ("method not found", "does not exist", "not supported", "unsupported")
+    )
+
+
+def _to_int(value: Any) -> int:
+    """Convert an RPC quantity (int or hex string) to int."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if str(value).startswith("0x") else int(value)
+
+
+@dataclass
+class BlockRecord:
+    """Structured, per-block output of the ingester."""
+
+    number: int
+    hash: str
+    parent_hash: str
+    timestamp: int
+    block_interval: Optional[int]  # Seconds since parent block, None if unknown
+    base_fee: int
+    gas_used: int
+    transaction_count: int
+    relevant_transactions: List[Dict[str, Any]] = field(default_factory=list)
+    receipts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    reorg: Optional[Dict[str, Any]] = None
+    ingested_at: float = field(default_factory=time.time)
+
+    def transaction_success(self, tx_hash: str) -> bool:
+        """Return whether a relevant transaction succeeded in this block."""
+        receipt = self.receipts.get(tx_hash)
+        return bool(receipt) and _to_int(receipt.get("status")) == 1
+
+
+class BlockIngester:
+    """Sequential block-number ingester with batch-request fetching."""
+
+    def __init__(
+        self,
+        web3_manager: Any,
+        relevant_addresses: Optional[Iterable[str]] = None,
+        relevant_selectors: Optional[Iterable[str]] = None,
+        start_block: Optional[int] = None,
+        poll_interval: float = POLL_INTERVAL,
+        max_blocks_per_poll: int = MAX_BLOCKS_PER_POLL,
+        reorg_window: int = REORG_WINDOW,
+    ):
+        """
+        Initialize the block ingester.
+
+        Args:
+            web3_manager: Web3 manager exposing an async ``w3`` instance
+            relevant_addresses: Contract addresses whose transactions are relevant
+            relevant_selectors: 4-byte method selectors (``0x``-prefixed) that are relevant
+            start_block: First block to ingest (defaults to the current head)
+            poll_interval: Seconds to wait when no new block is available
+            max_blocks_per_poll: Maximum number of blocks fetched per batch request
+            reorg_window: Number of recent canonical hashes kept for reorg checks
+        """
+        self.web3_manager = web3_manager
+        self.poll_interval = poll_interval
+        self.max_blocks_per_poll = max_blocks_per_poll
+        self.reorg_window = reorg_window
+
+        self._addresses: Set[str] = set()
+        self._selectors: Set[str] = set()
+        self.set_filters(relevant_addresses or (), relevant_selectors or ())
+
+        self._next_block = start_block
+        self._canonical: Dict[int, str] = {}
+        self._timestamps: Dict[int, int] = {}
+        self._subscribers: List[asyncio.Queue] = []
+        self._supports_block_receipts = True
+        self._supports_batch = True
+        self._reorg_depth = 0
+        self._running = False
+
+        # Stats
+        self.blocks_ingested = 0
+        self.reorgs_detected = 0
+        self.rpc_calls = 0
+
+    def set_filters(
+        self, addresses: Iterable[str], selectors: Iterable[str]
+    ) -> None:
+        """Rebuild the relevance sets used by :meth:`filter_relevant`."""
+        self._addresses = {str(a).lower() for a in addresses if a}
+        self._selectors = {str(s).lower()[:10] for s in selectors if s}
+
+    def filter_relevant(self, transactions: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Select relevant transactions in a single pass."""
+        addresses = self._addresses
+        selectors = self._selectors
+        relevant = []
+        for tx in transactions:
+            if not isinstance(tx, dict) and not hasattr(tx, "get"):
+                continue  # Hash-only block, nothing to filter on
+            to = tx.get("to")
+            if to is not None and str(to).lower() in addresses:
+                relevant.append(tx)
+                continue
+            data = tx.get("input") or tx.get("data") or ""
+            if _to_hex(data)[:10] in selectors:
+                relevant.append(tx)
+        return relevant
+
+    def subscribe(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> asyncio.Queue:
+        """Register a consumer and return the queue it will receive records on."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a consumer queue."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    async def run(self) -> None:
+        """Ingest blocks until cancelled."""
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    records = await self.poll_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error ingesting blocks: {e}")
+                    records = []
+
+                if not records:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            self._running = False
+
+    def stop(self) -> None:
+        """Stop the ingestion loop after the current poll."""
+        self._running = False
+
+    async def poll_once(self) -> List[BlockRecord]:
+        """Ingest every block between the last processed one and the head."""
+        w3 = self.web3_manager.w3
+        head = await w3.eth.block_number
+        self.rpc_calls += 1
+
+        if self._next_block is None:
+            self._next_block = head
+        if self._next_block > head:
+            return []
+
+        last = min(head, self._next_block + self.max_blocks_per_poll - 1)
+        numbers = list(range(self._next_block, last + 1))
+        with span("block_ingester.fetch_blocks"):
+            blocks = await self._fetch_blocks(numbers)
+
+        records = []
+        for block in blocks:
+            reorg = self._check_reorg(block)
+            if reorg is not None:
+                # Rewind to the fork point; those blocks are re-ingested next poll
+                self.reorgs_detected += 1
+                self._next_block = reorg["fork_block"]
+                record = await self._build_record(block, reorg)
+                records.append(record)
+                await self._publish(record)
+                break
+
+            record = await self._build_record(block, None)
+            records.append(record)
+            await self._publish(record)
+            self._next_block = record.number + 1
+
+        return records
+
+    async def _fetch_blocks(self, numbers: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch a contiguous range of blocks with full transactions.
+
+        Sends one JSON-RPC batch request when ``w3.batch_requests`` is
+        available (web3 7+) and the provider accepts batches; otherwise one
+        concurrent ``eth_getBlockByNumber`` call per block.
+        """
+        w3 = self.web3_manager.w3
+        blocks = None
+        if self._supports_batch and len(numbers) > 1 and hasattr(w3, "batch_requests"):
+            try:
+                async with w3.batch_requests() as batch:
+                    for n in numbers:
+                        batch.add(w3.eth.get_block(n, True))
+                    blocks = await batch.async_execute()
+                self.rpc_calls += 1
+            except (asyncio.TimeoutError, OSError) as e:
+                # Network trouble: retry the batch next poll
+                logger.debug(f"Batch block request failed, fetching one by one: {e}")
+                blocks = None
+            except Exception as e:
+                logger.info(f"Batch requests unavailable, fetching blocks one by one: {e}")
+                self._supports_batch = False
+                blocks = None
+
+        if blocks is None:
+            self.rpc_calls += len(numbers)
+            blocks = await asyncio.gather(*(w3.eth.get_block(n, True) for n in numbers))
+
+        # Stop at the first missing block so the range stays gap-free
+        fetched = []
+        for block in blocks:
+            if not block:
+                break
+            fetched.append(block)
+        return fetched
+
+    async def _fetch_receipts(
+        self, block_number: int, tx_hashes: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch receipts for the relevant transactions of a block."""
+        if not tx_hashes:
+            return {}
+
+        w3 = self.web3_manager.w3
+        wanted = set(tx_hashes)
+
+        if self._supports_block_receipts:
+            try:
+                self.rpc_calls += 1
+                response = await w3.provider.make_request(
+                    "eth_getBlockReceipts", [hex(block_number)]
+                )
+                result = response.get("result") if isinstance(response, dict) else None
+                if result is not None:
+                    receipts = {}
+                    for receipt in result:
+                        tx_hash = _to_hex(receipt.get("transactionHash"))
+                        if tx_hash in wanted:
+                            receipts[tx_hash] = receipt
+                    return receipts
+                error = response.get("error") if isinstance(response, dict) else None
+                if _is_method_not_found(error):
+                    logger.info("eth_getBlockReceipts not supported, fetching receipts per hash")
+                    self._supports_block_receipts = False
+                else:
+                    logger.debug(f"eth_getBlockReceipts failed for block {block_number}: {error}")
+            except Exception as e:
+                # Transient failures fall back for this block only
+                logger.debug(f"eth_getBlockReceipts failed for block {block_number}: {e}")
+                if _is_method_not_found(e):
+                    self._supports_block_receipts = False
+
+        self.rpc_calls += len(tx_hashes)
+        results = await asyncio.gather(
+            *(w3.eth.get_transaction_receipt(h) for h in tx_hashes),
+            return_exceptions=True,
+        )
+        return {
+            h: r
+            for h, r in zip(tx_hashes, results)
+            if r and not isinstance(r, Exception)
+        }
+
+    def _check_reorg(self, block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Compare the block's parent hash with the stored canonical chain."""
+        number = _to_int(block["number"])
+        parent_hash = _to_hex(block.get("parentHash"))
+        known_parent = self._canonical.get(number - 1)
+        if known_parent is None or known_parent == parent_hash:
+            self._reorg_depth = 0
+            return None
+
+        # The stored parent was orphaned. Rewind one block; if the re-fetched
+        # block disagrees with its own stored parent the next poll rewinds
+        # again, so deeper reorgs are unwound one step at a time.
+        fork_block = number - 1
+        self._reorg_depth += 1
+        for n in [n for n in self._canonical if n >= fork_block]:
+            self._canonical.pop(n, None)
+            self._timestamps.pop(n, None)
+
+        return {
+            "block_number": number - 1,
+            "old_hash": known_parent,
+            "new_hash": parent_hash,
+            "fork_block": fork_block,
+            "depth": self._reorg_depth,
+            "timestamp": time.time(),
+        }
+
+    async def _build_record(
+        self, block: Dict[str, Any], reorg: Optional[Dict[str, Any]]
+    ) -> BlockRecord:
+        """Turn a raw block into a :class:`BlockRecord`."""
+        number = _to_int(block["number"])
+        timestamp = _to_int(block.get("timestamp"))
+        transactions = block.get("transactions") or []
+
+        relevant = self.filter_relevant(transactions) if reorg is None else []
+        tx_hashes = [_to_hex(tx.get("hash")) for tx in relevant]
+        receipts = await self._fetch_receipts(number, tx_hashes)
+
+        parent_ts = self._timestamps.get(number - 1)
+        if reorg is None:
+            self._canonical[number] = _to_hex(block.get("hash"))
+            self._timestamps[number] = timestamp
+            stale = number - self.reorg_window
+            self._canonical.pop(stale, None)
+            self._timestamps.pop(stale, None)
+            self.blocks_ingested += 1
+
+        return BlockRecord(
+            number=number,
+            hash=_to_hex(block.get("hash")),
+            parent_hash=_to_hex(block.get("parentHash")),
+            timestamp=timestamp,
+            block_interval=timestamp - parent_ts if parent_ts is not None else None,
+            base_fee=_to_int(block.get("baseFeePerGas")),
+            gas_used=_to_int(block.get("gasUsed")),
+            transaction_count=len(transactions),
+            relevant_transactions=relevant,
+            receipts=receipts,
+            reorg=reorg,
+        )
+
+    async def _publish(self, record: BlockRecord) -> None:
+        """Deliver a record to every subscriber, dropping the oldest on overflow."""
+        for queue in self._subscribers:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(record)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion statistics."""
+        return {
+            "next_block": self._next_block,
+            "blocks_ingested": self.blocks_ingested,
+            "reorgs_detected": self.reorgs_detected,
+            "rpc_calls": self.rpc_calls,
+            "subscribers": len(self._subscribers),
+            "block_receipts_supported": self._supports_block_receipts,
+            "batch_supported": self._supports_batch,
+        }
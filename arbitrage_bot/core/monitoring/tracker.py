@@ -80,10 +80,11 @@ async def track_trade(self, trade_data: Dict[str, Any]) -> bool:
 
             async with self._batch_lock:
                 self._trade_batch.append(trade_data)
+                batch_full = len(self._trade_batch) >= self.batch_size
 
-                # Flush if batch is full
-                if len(self._trade_batch) >= self.batch_size:
-                    await self._flush_trade_batch()
+            # Flush if batch is full
+            if batch_full:
+                await self._flush_trade_batch()
 
             logger.debug("Trade queued for tracking: %s", trade_data)
             return True
@@ -98,7 +99,7 @@ async def _flush_trade_batch(self) -> None:
                 if not self._trade_batch:
                     return
 
-                # Save batch to database
+                # Save batch to database in one transaction
                 await self.db.save_trades(self._trade_batch)
 
                 # Clear batch
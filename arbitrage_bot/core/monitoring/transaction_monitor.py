@@ -4,12 +4,12 @@
 import time
 # from typing import Optional # Redundant import
 import asyncio
-from typing import Dict, List, Any, Optional, Set, Tuple # Added Tuple back
+from typing import Deque, Dict, List, Any, Optional, Set, Tuple # Added Tuple back
 from datetime import datetime # Removed timedelta
 import json # Removed JSONEncoder
 # from json import JSONEncoder # Removed unused import
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 
@@ -19,12 +19,14 @@
 from ..dex.dex_manager import DexManager # Corrected import path
 # from ..dex.utils import COMMON_TOKENS # Removed unused import
 from ...utils.database import DateTimeEncoder
+from .block_ingester import BlockIngester, BlockRecord
 
 logger = logging.getLogger(__name__)
 
 # Cache settings
 CACHE_TTL = 60  # 60 seconds
 BATCH_SIZE = 50  # Process 50 items at a time
+MAX_SENDER_TXS = 500  # Most recent transactions kept per sender
 
 
 class TransactionMonitor:
@@ -88,6 +90,14 @@ def __init__(
         self._cache_lock = asyncio.Lock()
         self._file_lock = asyncio.Lock()
 
+        # Sequential block ingestion shared by block, competitor and reorg analysis
+        self.block_ingester = BlockIngester(web3_manager)
+        self._block_queue = self.block_ingester.subscribe()
+        self._competitor_queue = self.block_ingester.subscribe()
+        self._reorg_queue = self.block_ingester.subscribe()
+        self._sender_txs: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last_grouped_block = 0
+
         # Alert thresholds
         self.min_success_rate = 0.95  # 95% success rate required
         self.max_execution_time = 3.0  # seconds
@@ -103,9 +113,16 @@ async def start_monitoring(self) -> None:
             ]
             await asyncio.gather(*init_tasks)
 
+            # Build the relevance sets once instead of per transaction
+            self.block_ingester.set_filters(
+                getattr(self.dex_manager, "known_contracts", ()),
+                getattr(self.dex_manager, "known_methods", ()),
+            )
+
             # Start monitoring tasks
             self._tasks = [
                 asyncio.create_task(self._monitor_mempool()),
+                asyncio.create_task(self.block_ingester.run()),
                 asyncio.create_task(self._monitor_blocks()),
                 asyncio.create_task(self._analyze_competitors()),
                 asyncio.create_task(self._detect_reorgs()),
@@ -226,195 +243,119 @@ def _is_relevant_transaction_sync(self, tx: Dict[str, Any]) -> bool:
         except Exception:
             return False
 
-    async def _is_relevant_transaction(self, tx: Dict[str, Any]) -> bool:
-        """Check if transaction is relevant."""
-        try:
-            # Check for common DEX methods
-            method_id = tx.get("input", "")[:10]
-            return (
-                method_id in self.dex_manager.known_methods
-                or tx["to"] in self.dex_manager.known_contracts
-            )
-        except Exception:
-            return False
-
     async def _monitor_blocks(self) -> None:
-        """Monitor new blocks for relevant transactions."""
+        """Record relevant transactions from the block ingestion stream."""
         try:
             while True:
-                # Get latest block with caching
-                block = await self._get_cached_block("latest")
-                if not block:
-                    await asyncio.sleep(1)
+                record: BlockRecord = await self._block_queue.get()
+                if record.reorg is not None:
                     continue
 
-                # Process transactions in batches concurrently
-                txs = [
-                    tx
-                    for tx in block["transactions"]
-                    if await self._is_relevant_transaction(tx)
-                ]
-
-                for i in range(0, len(txs), self.batch_size):
-                    batch = txs[i : i + self.batch_size]
-
-                    # Process batch in thread pool
-                    loop = asyncio.get_event_loop()
-                    batch_tasks = [
-                        loop.run_in_executor(
-                            self.executor,
-                            self._process_block_batch,
-                            batch[j : j + 10],  # Sub-batch of 10 transactions
-                            block,
-                        )
-                        for j in range(0, len(batch), 10)
-                    ]
-
-                    # Wait for all sub-batches
-                    await asyncio.gather(*batch_tasks)
+                self._process_block_record(record)
+                self.last_update = datetime.now().timestamp()
 
                 # Trim old transactions
                 await self._trim_transactions()
 
-                await asyncio.sleep(1)  # Check each block
-
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error monitoring blocks: {e}")
 
-    async def _get_cached_block(
-        self, block_identifier: str
-    ) -> Optional[Dict[str, Any]]:
-        """Get block from cache or fetch if needed."""
-        try:
-            current_time = time.time()
-            cache_key = str(block_identifier)
-
-            async with self._cache_lock:
-                # Check cache with TTL
-                if cache_key in self._block_cache:
-                    last_update = self._block_cache_times.get(cache_key, 0)
-                    if current_time - last_update < self.cache_ttl:
-                        return self._block_cache[cache_key]
-
-                # Fetch new block
-                block = await self.web3_manager.w3.eth.get_block(block_identifier, True)
-
-                # Update cache
-                self._block_cache[cache_key] = block
-                self._block_cache_times[cache_key] = current_time
+    def _process_block_record(self, record: BlockRecord) -> None:
+        """Process the relevant transactions of an ingested block."""
+        timestamp = datetime.fromtimestamp(record.timestamp)
+        for tx in record.relevant_transactions:
+            try:
+                tx_hash = self._tx_hash_hex(tx)
+                receipt = record.receipts.get(tx_hash)
+
+                # Record transaction
+                transaction_data = {
+                    "transaction": tx,
+                    "block_number": record.number,
+                    "timestamp": timestamp,
+                    "success": record.transaction_success(tx_hash),
+                    "block_interval": record.block_interval,
+                }
 
-                return block
+                self.recent_transactions.append(transaction_data)
 
-        except Exception as e:
-            logger.error(f"Error getting cached block: {e}")
-            return None
+                # Update competitor metrics if known
+                if receipt and tx["from"] in self.known_competitors:
+                    self._update_competitor_metrics(tx, receipt, record.block_interval)
 
-    def _process_block_batch(
-        self, txs: List[Dict[str, Any]], block: Dict[str, Any]
+            except Exception as e:
+                logger.error(f"Error processing block transaction: {e}")
+
+    @staticmethod
+    def _tx_hash_hex(tx: Dict[str, Any]) -> str:
+        """Normalize a transaction hash to a lowercase 0x-prefixed string."""
+        tx_hash = tx.get("hash")
+        if isinstance(tx_hash, str):
+            return tx_hash.lower()
+        text = tx_hash.hex()
+        return text if text.startswith("0x") else "0x" + text
+
+    def _update_competitor_metrics(
+        self,
+        tx: Dict[str, Any],
+        receipt: Dict[str, Any],
+        block_interval: Optional[int],
     ) -> None:
-        """Process a batch of block transactions (CPU-bound)."""
+        """Update competitor metrics from an already-fetched receipt."""
         try:
-            for tx in txs:
-                try:
-                    # Check transaction success
-                    success = self._check_transaction_success_sync(tx)
-
-                    # Record transaction
-                    transaction_data = {
-                        "transaction": tx,
-                        "block_number": block["number"],
-                        "timestamp": datetime.fromtimestamp(block["timestamp"]),
-                        "success": success,
-                    }
-
-                    # Update state synchronously
-                    self._update_transaction_state(transaction_data, tx)
+            sender = tx["from"]
 
-                except Exception as e:
-                    logger.error(f"Error processing block transaction: {e}")
-
-        except Exception as e:
-            logger.error(f"Error processing block batch: {e}")
-
-    def _update_competitor_metrics_sync(self, tx: Dict[str, Any]) -> None:
-        """Update competitor metrics (CPU-bound)."""
-        try:
-            # Get transaction receipt
-            receipt = self.web3_manager.w3.eth.get_transaction_receipt(tx["hash"])
-            if not receipt:
-                return
-
-            # Update metrics
-            with self._metrics_lock:
-                # Update success rate
-                self.success_rates[tx["from"]].append(receipt["status"] == 1)
-                if len(self.success_rates[tx["from"]]) > 100:  # Keep last 100
-                    self.success_rates[tx["from"]] = self.success_rates[tx["from"]][
-                        -100:
-                    ]
+            # Update success rate
+            status = receipt["status"]
+            self.success_rates[sender].append(
+                (int(status, 16) if isinstance(status, str) else status) == 1
+            )
+            if len(self.success_rates[sender]) > 100:  # Keep last 100
+                self.success_rates[sender] = self.success_rates[sender][-100:]
 
-                # Update gas usage
-                self.gas_usage[tx["from"]].append(receipt["gasUsed"])
-                if len(self.gas_usage[tx["from"]]) > 100:  # Keep last 100
-                    self.gas_usage[tx["from"]] = self.gas_usage[tx["from"]][-100:]
+            # Update gas usage
+            gas_used = receipt["gasUsed"]
+            self.gas_usage[sender].append(
+                int(gas_used, 16) if isinstance(gas_used, str) else gas_used
+            )
+            if len(self.gas_usage[sender]) > 100:  # Keep last 100
+                self.gas_usage[sender] = self.gas_usage[sender][-100:]
 
-                # Update execution time if we have block timestamps
-                try:
-                    block = self.web3_manager.w3.eth.get_block(receipt["blockNumber"])
-                    prev_block = self.web3_manager.w3.eth.get_block(
-                        receipt["blockNumber"] - 1
-                    )
-                    execution_time = block["timestamp"] - prev_block["timestamp"]
-
-                    self.execution_times[tx["from"]].append(execution_time)
-                    if len(self.execution_times[tx["from"]]) > 100:  # Keep last 100
-                        self.execution_times[tx["from"]] = self.execution_times[
-                            tx["from"]
-                        ][-100:]
-                except Exception:
-                    pass
+            # Update execution time from the ingested block interval
+            if block_interval is not None:
+                self.execution_times[sender].append(block_interval)
+                if len(self.execution_times[sender]) > 100:  # Keep last 100
+                    self.execution_times[sender] = self.execution_times[sender][-100:]
 
         except Exception as e:
             logger.error(f"Error updating competitor metrics: {e}")
 
-    def _update_transaction_state(
-        self, transaction_data: Dict[str, Any], tx: Dict[str, Any]
-    ) -> None:
-        """Update transaction state (CPU-bound)."""
-        try:
-            # Update recent transactions
-            with self._state_lock:
-                self.recent_transactions.append(transaction_data)
-
-            # Update competitor metrics if known
-            if tx["from"] in self.known_competitors:
-                self._update_competitor_metrics_sync(tx)
-
-        except Exception as e:
-            logger.error(f"Error updating transaction state: {e}")
-
-    def _check_transaction_success_sync(self, tx: Dict[str, Any]) -> bool:
-        """Check transaction success (CPU-bound)."""
-        try:
-            receipt = self.web3_manager.w3.eth.get_transaction_receipt(tx["hash"])
-            return receipt["status"] == 1
-        except Exception:
-            return False
-
     async def _analyze_competitors(self) -> None:
-        """Analyze competitor behavior patterns concurrently."""
+        """Analyze competitor behavior patterns from the block stream."""
         try:
+            last_analysis = time.time()
             while True:
-                # Group transactions by sender
-                sender_txs = defaultdict(list)
-                async with self._state_lock:
-                    for tx in self.recent_transactions:
-                        sender_txs[tx["transaction"]["from"]].append(tx)
+                # Group transactions by sender as blocks arrive
+                try:
+                    record: BlockRecord = await asyncio.wait_for(
+                        self._competitor_queue.get(), timeout=1.0
+                    )
+                    if record.reorg is None:
+                        self._group_block_by_sender(record)
+                except asyncio.TimeoutError:
+                    pass
+
+                if time.time() - last_analysis < 60:  # Update every minute
+                    continue
+                last_analysis = time.time()
+                self._evict_idle_senders()
 
                 # Process senders in batches
                 senders = [
                     sender
-                    for sender, txs in sender_txs.items()
+                    for sender, txs in self._sender_txs.items()
                     if len(txs) >= 10  # Need minimum sample size
                 ]
 
@@ -427,7 +368,7 @@ async def _analyze_competitors(self) -> None:
                         loop.run_in_executor(
                             self.executor,
                             self._analyze_competitor_batch,
-                            [sender_txs[sender] for sender in batch[j : j + 10]],
+                            [list(self._sender_txs[sender]) for sender in batch[j : j + 10]],
                         )
                         for j in range(0, len(batch), 10)
                     ]
@@ -437,23 +378,58 @@ async def _analyze_competitors(self) -> None:
 
                     # Update competitor patterns
                     async with self._state_lock:
-                        for sender, pattern in results:
-                            if pattern:
-                                self.competitor_patterns[sender] = pattern
-
-                                # Add to known competitors if pattern suggests arbitrage bot
-                                if (
-                                    pattern["success_rate"] > 0.8
-                                    and pattern["avg_execution_time"] < 2.0
-                                    and pattern["transaction_count"] > 50
-                                ):
-                                    self.known_competitors.add(sender)
-
-                await asyncio.sleep(60)  # Update every minute
-
+                        for batch_results in results:
+                            for sender, pattern in batch_results:
+                                if pattern:
+                                    self.competitor_patterns[sender] = pattern
+
+                                    # Add to known competitors if pattern suggests arbitrage bot
+                                    if (
+                                        pattern["success_rate"] > 0.8
+                                        and pattern["avg_execution_time"] < 2.0
+                                        and pattern["transaction_count"] > 50
+                                    ):
+                                        self.known_competitors.add(sender)
+
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing competitors: {e}")
 
+    def _group_block_by_sender(self, record: BlockRecord) -> None:
+        """Append a block's relevant transactions to the per-sender history."""
+        timestamp = datetime.fromtimestamp(record.timestamp)
+        self._last_grouped_block = max(self._last_grouped_block, record.number)
+        for tx in record.relevant_transactions:
+            sender_txs = self._sender_txs.get(tx["from"])
+            if sender_txs is None:
+                sender_txs = self._sender_txs[tx["from"]] = deque(maxlen=MAX_SENDER_TXS)
+            sender_txs.append(
+                {
+                    "transaction": tx,
+                    "block_number": record.number,
+                    "timestamp": timestamp,
+                    "success": record.transaction_success(self._tx_hash_hex(tx)),
+                    "block_interval": record.block_interval,
+                }
+            )
+            # Keep the same horizon as recent_transactions
+            while sender_txs and (
+                record.number - sender_txs[0]["block_number"] >= self.max_blocks_history
+            ):
+                sender_txs.popleft()
+
+    def _evict_idle_senders(self) -> None:
+        """Forget senders with no transaction inside the block history horizon."""
+        horizon = self._last_grouped_block - self.max_blocks_history
+        idle = [
+            sender
+            for sender, txs in self._sender_txs.items()
+            if not txs or txs[-1]["block_number"] <= horizon
+        ]
+        for sender in idle:
+            del self._sender_txs[sender]
+
     def _analyze_competitor_batch(
         self, sender_txs_list: List[List[Dict[str, Any]]]
     ) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
@@ -469,18 +445,12 @@ def _analyze_competitor_batch(
                 success_rate = sum(1 for tx in txs if tx["success"]) / len(txs)
                 avg_gas = np.mean([tx["transaction"]["gas"] for tx in txs])
 
-                # Calculate execution times
-                execution_times = []
-                for tx in txs:
-                    try:
-                        block = self.web3_manager.w3.eth.get_block(tx["block_number"])
-                        prev_block = self.web3_manager.w3.eth.get_block(
-                            tx["block_number"] - 1
-                        )
-                        execution_time = block["timestamp"] - prev_block["timestamp"]
-                        execution_times.append(execution_time)
-                    except Exception:
-                        continue
+                # Execution times come from the ingested block intervals
+                execution_times = [
+                    tx["block_interval"]
+                    for tx in txs
+                    if tx.get("block_interval") is not None
+                ]
 
                 avg_time = np.mean(execution_times) if execution_times else float("inf")
 
@@ -668,51 +638,29 @@ def _calculate_metrics(self) -> Dict[str, Any]:
             }
 
     async def _detect_reorgs(self) -> None:
-        """Detect and record blockchain reorganizations."""
+        """Record blockchain reorganizations reported by the block ingester."""
         try:
             while True:
-                # Get latest block
-                latest_block = await self.web3_manager.w3.eth.get_block("latest")
-                if not latest_block:
-                    await asyncio.sleep(1)
+                record: BlockRecord = await self._reorg_queue.get()
+                if record.reorg is None:
                     continue
 
-                # Check previous blocks for reorgs
-                for i in range(1, 6):  # Check last 5 blocks
-                    block_number = latest_block["number"] - i
-
-                    # Get block by number
-                    block = await self.web3_manager.w3.eth.get_block(block_number)
-                    if not block:
-                        continue
-
-                    # Get cached block
-                    cache_key = str(block_number)
-                    cached_block = self._block_cache.get(cache_key)
-
-                    # Compare block hashes
-                    if cached_block and block["hash"] != cached_block["hash"]:
-                        # Record reorg
-                        reorg = {
-                            "block_number": block_number,
-                            "old_hash": cached_block["hash"].hex(),
-                            "new_hash": block["hash"].hex(),
-                            "timestamp": datetime.now().timestamp(),
-                            "depth": i,
-                        }
-
-                        async with self._state_lock:
-                            self.block_reorgs.append(reorg)
-                            # Keep only last 1000 reorgs
-                            if len(self.block_reorgs) > 1000:
-                                self.block_reorgs = self.block_reorgs[-1000:]
-
-                    # Update cache
-                    self._block_cache[cache_key] = block
-                    self._block_cache_times[cache_key] = time.time()
+                reorg = {
+                    "block_number": record.reorg["block_number"],
+                    "old_hash": record.reorg["old_hash"],
+                    "new_hash": record.reorg["new_hash"],
+                    "timestamp": record.reorg["timestamp"],
+                    "depth": record.reorg["depth"],
+                }
 
-                await asyncio.sleep(1)  # Check every second
+                async with self._state_lock:
+                    self.block_reorgs.append(reorg)
+                    # Keep only last 1000 reorgs
+                    if len(self.block_reorgs) > 1000:
+                        self.block_reorgs = self.block_reorgs[-1000:]
 
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error detecting reorgs: {e}")
 
@@ -759,6 +707,7 @@ async def cleanup(self) -> None:
         """Cleanup resources."""
         try:
             # Cancel any ongoing tasks
+            self.block_ingester.stop()
             if hasattr(self, "_tasks"):
                 for task in self._tasks:
                     task.cancel()
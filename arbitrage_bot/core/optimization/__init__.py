@@ -3,6 +3,7 @@
 
 This package provides performance optimization components for the Listonian Arbitrage Bot:
 - Memory-Mapped Files
+- Seqlocked Shared Memory Rings and Tables
 - WebSocket Optimization
 - Resource Management
 """
@@ -22,6 +23,8 @@
     SharedMemoryError,
 )
 
+from .shm_ring import SCHEMAS, SchemaRegistry, SeqlockRing, SeqlockTable
+
 from .websocket_optimization import (
     OptimizedWebSocketClient,
     WebSocketConnectionPool,
@@ -46,6 +49,10 @@
     "CorruptDataError",
     "LockAcquisitionError",
     "SharedMemoryError",
+    "SCHEMAS",
+    "SchemaRegistry",
+    "SeqlockRing",
+    "SeqlockTable",
     # WebSocket Optimization
     "OptimizedWebSocketClient",
     "WebSocketConnectionPool",
@@ -0,0 +1,31 @@
+"""Shared memory error classes."""
+
+
+class SharedMemoryError(Exception):
+    """Base exception for shared memory errors."""
+
+    pass
+
+
+class SchemaValidationError(SharedMemoryError):
+    """Exception raised when data doesn't match schema."""
+
+    pass
+
+
+class MemoryRegionNotFoundError(SharedMemoryError):
+    """Exception raised when a memory region is not found."""
+
+    pass
+
+
+class LockAcquisitionError(SharedMemoryError):
+    """Exception raised when a lock cannot be acquired."""
+
+    pass
+
+
+class CorruptDataError(SharedMemoryError):
+    """Exception raised when data is corrupted."""
+
+    pass
@@ -37,6 +37,15 @@
 from filelock import FileLock
 from concurrent.futures import ThreadPoolExecutor
 
+from .errors import (
+    CorruptDataError,
+    LockAcquisitionError,
+    MemoryRegionNotFoundError,
+    SchemaValidationError,
+    SharedMemoryError,
+)
+from .shm_ring import SCHEMAS, SeqlockRing, SeqlockTable
+
 logger = logging.getLogger(__name__)
 
 # Type definitions
@@ -107,36 +116,6 @@ def from_dict(cls, data: Dict[str, Any]) -> "MemoryRegionInfo":
         )
 
 
-class SharedMemoryError(Exception):
-    """Base exception for shared memory errors."""
-
-    pass
-
-
-class SchemaValidationError(SharedMemoryError):
-    """Exception raised when data doesn't match schema."""
-
-    pass
-
-
-class MemoryRegionNotFoundError(SharedMemoryError):
-    """Exception raised when a memory region is not found."""
-
-    pass
-
-
-class LockAcquisitionError(SharedMemoryError):
-    """Exception raised when a lock cannot be acquired."""
-
-    pass
-
-
-class CorruptDataError(SharedMemoryError):
-    """Exception raised when data is corrupted."""
-
-    pass
-
-
 class SharedMemoryManager:
     """
     Manager for memory-mapped files with proper locking mechanisms.
@@ -186,6 +165,9 @@ def __init__(self, base_dir: Optional[str] = None, executor_workers: int = 4):
         # Set of open memory maps
         self._open_maps: Dict[str, Tuple[mmap.mmap, FileLock]] = {}
 
+        # Seqlocked rings and tables opened through this manager
+        self._arrays: Dict[str, Any] = {}
+
         # Register cleanup on process exit
         atexit.register(self._cleanup)
 
@@ -513,6 +495,53 @@ async def update_data(
             # Write updated data
             return await self.write_data(name, updated_data, offset, validate)
 
+    def create_ring(self, name: str, schema: str, capacity: int) -> SeqlockRing:
+        """
+        Create a seqlocked ring of fixed-schema records in shared memory.
+
+        Unlike pickled regions, rings are read by other processes without
+        locks or deserialization (see ``shm_ring``).
+
+        Args:
+            name: Shared memory name
+            schema: Schema name registered in ``shm_ring.SCHEMAS``
+            capacity: Number of records kept
+
+        Returns:
+            The SeqlockRing, unlinked on cleanup
+        """
+        ring = SeqlockRing.create(name, schema, capacity)
+        self._arrays[ring.name] = ring
+        return ring
+
+    def attach_ring(self, name: str) -> SeqlockRing:
+        """Attach to a ring created by another process."""
+        ring = SeqlockRing.attach(name)
+        self._arrays[ring.name] = ring
+        return ring
+
+    def create_table(self, name: Optional[str], schema: str, capacity: int) -> SeqlockTable:
+        """
+        Create a seqlocked table of fixed-schema rows in shared memory.
+
+        Args:
+            name: Shared memory name (None for a generated one)
+            schema: Schema name registered in ``shm_ring.SCHEMAS``
+            capacity: Number of rows
+
+        Returns:
+            The SeqlockTable, unlinked on cleanup
+        """
+        table = SeqlockTable.create(name, schema, capacity)
+        self._arrays[table.name] = table
+        return table
+
+    def attach_table(self, name: str) -> SeqlockTable:
+        """Attach to a table created by another process."""
+        table = SeqlockTable.attach(name)
+        self._arrays[table.name] = table
+        return table
+
     async def _load_registry(self) -> Dict[str, Any]:
         """Load the registry file."""
         try:
@@ -592,37 +621,221 @@ def _cleanup(self) -> None:
             except Exception as e:
                 logger.error(f"Error closing memory map '{name}': {e}")
 
+        # Close seqlocked arrays, destroying the ones this process created
+        for name, array in self._arrays.items():
+            try:
+                if array.owner:
+                    array.unlink()
+                else:
+                    array.close()
+            except Exception as e:
+                logger.error(f"Error closing shared array '{name}': {e}")
+        self._arrays.clear()
+
         # Shutdown executor
         self._executor.shutdown(wait=False)
 
         logger.debug("SharedMemoryManager cleaned up")
 
 
+class _EntryTable:
+    """
+    Keyed, pickled entries in one seqlocked shared memory table.
+
+    Each key owns a row holding its timestamp, version, TTL and pickled
+    value. Rows are claimed in order by the creating process, the table's
+    only writer; other processes attach by table name, find rows by
+    scanning the key column of rows claimed since their last scan and copy
+    them under the row's seqlock without taking a lock.
+
+    Every row reserves ``entry_size`` bytes up front, so the table takes
+    about ``entry_size * capacity`` bytes of shared memory.
+    """
+
+    def __init__(
+        self,
+        memory_manager: SharedMemoryManager,
+        kind: str,
+        entry_size: int,
+        capacity: int,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize the table.
+
+        Args:
+            memory_manager: Shared memory manager owning the table
+            kind: Entry kind, used in the schema name
+            entry_size: Largest pickled value in bytes
+            capacity: Number of keys
+            name: Shared memory name to attach to or create (None for a generated one)
+        """
+        self.memory_manager = memory_manager
+        self.entry_size = entry_size
+        self.capacity = capacity
+        self.name = name
+        self.schema = f"{kind}_entry_{entry_size}"
+        SCHEMAS.register(
+            self.schema,
+            [
+                ("key", "S64"),
+                ("timestamp", "<f8"),
+                ("version", "<u8"),
+                ("ttl", "<f8"),
+                ("length", "<u4"),
+                ("value", f"S{entry_size}"),
+            ],
+        )
+        self.table: Optional[SeqlockTable] = None
+        self._rows: Dict[str, int] = {}
+
+    def open(self) -> None:
+        """Attach to the named table, or create it."""
+        if self.table is not None:
+            return
+        if self.name is not None:
+            try:
+                self.table = self.memory_manager.attach_table(self.name)
+                self.capacity = self.table.capacity
+                return
+            except FileNotFoundError:
+                pass
+        self.table = self.memory_manager.create_table(self.name, self.schema, self.capacity)
+        self.name = self.table.name
+
+    def row(self, key: str, create: bool = False) -> Optional[int]:
+        """
+        Find the row of a key.
+
+        Args:
+            key: Entry key
+            create: Claim a free row if the key has none
+
+        Returns:
+            Row index, or None if the key has no row
+
+        Raises:
+            SharedMemoryError: If a row is needed and the table is full
+        """
+        if key not in self._rows:
+            self._scan()
+        index = self._rows.get(key)
+        if index is None and create:
+            if len(self._rows) >= self.capacity:
+                raise SharedMemoryError(f"Table '{self.name}' is full ({self.capacity} keys)")
+            index = len(self._rows)
+            self._rows[key] = index
+        return index
+
+    def keys(self) -> List[str]:
+        """Keys with a row, including ones written by other processes."""
+        self._scan()
+        return list(self._rows)
+
+    def read(self, key: str) -> Optional[Any]:
+        """Copy a key's row, or None if it has never been written."""
+        index = self.row(key)
+        if index is None:
+            return None
+        record = self.table.read(index)
+        if record is None:
+            raise CorruptDataError(f"Row for '{key}' in '{self.name}' kept changing")
+        return record
+
+    def value(self, record: Any) -> Any:
+        """Unpickle a row's value."""
+        try:
+            return pickle.loads(bytes(record["value"])[: int(record["length"])])
+        except (pickle.PickleError, EOFError) as e:
+            raise CorruptDataError(f"Corrupt entry in '{self.name}': {e}")
+
+    def write(self, key: str, value: Any, version: int, ttl: float = 0.0) -> None:
+        """
+        Publish a key's value (single writer per table).
+
+        Raises:
+            SharedMemoryError: If this process did not create the table, or
+                the pickled value does not fit a row
+        """
+        self._check_owner()
+        encoded_key = key.encode()
+        if len(encoded_key) > 64:
+            raise ValueError(f"Key '{key}' is longer than 64 bytes")
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.entry_size:
+            raise SharedMemoryError(
+                f"Entry '{key}' is {len(payload)} bytes; rows of '{self.name}' hold {self.entry_size}"
+            )
+        index = self.row(key, create=True)
+        self.table.write(
+            index, (encoded_key, time.time(), version, ttl, len(payload), payload)
+        )
+
+    def rewrite(self, key: str, record: Any) -> None:
+        """
+        Overwrite an existing row's record in place (e.g. to change its TTL).
+
+        Raises:
+            SharedMemoryError: If this process did not create the table
+        """
+        self._check_owner()
+        self.table.write(self.row(key), record)
+
+    def _check_owner(self) -> None:
+        """Raise unless this process is the table's writer."""
+        if not self.table.owner:
+            raise SharedMemoryError(f"Only the creating process may write to '{self.name}'")
+
+    def _scan(self) -> None:
+        """Pick up rows claimed since the last scan, reading only their keys."""
+        # Rows are claimed in order, so everything below len(self._rows) is known
+        start = len(self._rows)
+        if start >= self.capacity:
+            return
+        keys, written = self.table.column("key", start)
+        for offset, key in enumerate(keys):
+            if not written[offset]:
+                break  # Not claimed yet (or mid-write); picked up by a later scan
+            self._rows.setdefault(key.decode(), start + offset)
+
+
 class SharedMetricsStore:
     """
-    Memory-mapped metrics storage with atomic updates and TTL-based cache invalidation.
+    Seqlocked shared memory metrics storage with TTL-based cache invalidation.
 
     This class provides:
-    - Efficient storage of metrics data in memory-mapped files
+    - Storage of each metric type in a row of one seqlocked table
     - Atomic update operations
-    - Efficient read access with minimal locking
+    - Lock-free reads from any process attached to the table
     - TTL-based cache invalidation
+
+    The creating process is the table's single writer; writes from processes
+    that attached by name raise SharedMemoryError.
     """
 
     def __init__(
-        self, memory_manager: SharedMemoryManager, region_size: int = 1024 * 1024
+        self,
+        memory_manager: SharedMemoryManager,
+        region_size: int = 64 * 1024,
+        capacity: int = 64,
+        name: Optional[str] = None,
     ):
         """
         Initialize the shared metrics store.
 
         Args:
             memory_manager: Shared memory manager
-            region_size: Size of memory regions in bytes
+            region_size: Largest pickled metrics entry in bytes; every row reserves this much
+                shared memory, so the table takes ``region_size * capacity``
+                bytes (64 KB rows keep the default table at 4 MB, where the
+                old per-type regions defaulted to 1 MB each)
+            capacity: Number of metric types
+            name: Shared memory name of the table to attach to or create
         """
         self.memory_manager = memory_manager
         self.region_size = region_size
         self._lock = asyncio.Lock()
-        self._metrics_regions: Dict[str, str] = {}  # Maps metric type to region name
+        self._entries = _EntryTable(memory_manager, "metrics", region_size, capacity, name)
         self._ttl_values: Dict[str, float] = {}  # TTL values for each metric type
 
         # Default TTL values (seconds)
@@ -630,32 +843,16 @@ def __init__(
 
         logger.debug("SharedMetricsStore initialized")
 
+    @property
+    def name(self) -> Optional[str]:
+        """Shared memory name other processes attach to."""
+        return self._entries.name
+
     async def initialize(self) -> None:
         """Initialize the metrics store."""
         async with self._lock:
-            # Create registry region if it doesn't exist
-            try:
-                await self.memory_manager.get_region_info("metrics_registry")
-            except MemoryRegionNotFoundError:
-                await self.memory_manager.create_region(
-                    name="metrics_registry",
-                    size=64 * 1024,  # 64 KB
-                    region_type=MemoryRegionType.METRICS,
-                    schema={"metrics_regions": "object", "ttl_values": "object"},
-                )
-
-                # Initialize registry data
-                await self.memory_manager.write_data(
-                    name="metrics_registry",
-                    data={"metrics_regions": {}, "ttl_values": {}},
-                )
-
-            # Load registry data
-            registry_data = await self.memory_manager.read_data("metrics_registry")
-            self._metrics_regions = registry_data.get("metrics_regions", {})
-            self._ttl_values = registry_data.get("ttl_values", {})
-
-            logger.debug("SharedMetricsStore initialized")
+            self._entries.open()
+            logger.debug(f"SharedMetricsStore using table '{self.name}'")
 
     async def set_ttl(self, metric_type: str, ttl: float) -> None:
         """
@@ -668,10 +865,11 @@ async def set_ttl(self, metric_type: str, ttl: float) -> None:
         async with self._lock:
             self._ttl_values[metric_type] = ttl
 
-            # Update registry
-            registry_data = await self.memory_manager.read_data("metrics_registry")
-            registry_data["ttl_values"] = self._ttl_values
-            await self.memory_manager.write_data("metrics_registry", registry_data)
+            # Stored metrics carry their TTL for other readers
+            record = self._entries.read(metric_type)
+            if record is not None:
+                record["ttl"] = ttl
+                self._entries.rewrite(metric_type, record)
 
     async def get_ttl(self, metric_type: str) -> float:
         """
@@ -683,7 +881,10 @@ async def get_ttl(self, metric_type: str) -> float:
         Returns:
             TTL in seconds
         """
-        return self._ttl_values.get(metric_type, self._default_ttl)
+        if metric_type in self._ttl_values:
+            return self._ttl_values[metric_type]
+        record = self._entries.read(metric_type)
+        return float(record["ttl"]) if record is not None else self._default_ttl
 
     async def store_metrics(self, metric_type: str, metrics: Dict[str, Any]) -> None:
         """
@@ -693,14 +894,8 @@ async def store_metrics(self, metric_type: str, metrics: Dict[str, Any]) -> None
             metric_type: Type of metrics
             metrics: Metrics data
         """
-        # Ensure region exists
-        region_name = await self._ensure_region(metric_type)
-
-        # Add timestamp
-        metrics_with_timestamp = {"data": metrics, "timestamp": time.time()}
-
-        # Write data
-        await self.memory_manager.write_data(region_name, metrics_with_timestamp)
+        async with self._lock:
+            self._write(metric_type, metrics)
 
     async def get_metrics(self, metric_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -712,23 +907,17 @@ async def get_metrics(self, metric_type: str) -> Optional[Dict[str, Any]]:
         Returns:
             Metrics data or None if not found or expired
         """
-        # Check if region exists
-        if metric_type not in self._metrics_regions:
-            return None
-
-        region_name = self._metrics_regions[metric_type]
-
         try:
-            # Read data
-            metrics_with_timestamp = await self.memory_manager.read_data(region_name)
+            record = self._entries.read(metric_type)
+            if record is None:
+                return None
 
             # Check TTL
-            ttl = await self.get_ttl(metric_type)
-            if time.time() - metrics_with_timestamp["timestamp"] > ttl:
+            if time.time() - record["timestamp"] > record["ttl"]:
                 return None
 
-            return metrics_with_timestamp["data"]
-        except (MemoryRegionNotFoundError, CorruptDataError) as e:
+            return self._entries.value(record)
+        except CorruptDataError as e:
             logger.error(f"Error reading metrics for {metric_type}: {e}")
             return None
 
@@ -742,17 +931,10 @@ async def update_metrics(
             metric_type: Type of metrics
             update_func: Function that takes current metrics and returns updated metrics
         """
-        # Ensure region exists
-        region_name = await self._ensure_region(metric_type)
-
-        # Define update function for the entire data structure
-        def update_wrapper(data: Dict[str, Any]) -> Dict[str, Any]:
-            current_metrics = data.get("data", {}) if data else {}
-            updated_metrics = update_func(current_metrics)
-            return {"data": updated_metrics, "timestamp": time.time()}
-
-        # Update data
-        await self.memory_manager.update_data(region_name, update_wrapper)
+        async with self._lock:
+            record = self._entries.read(metric_type)
+            current_metrics = self._entries.value(record) if record is not None else {}
+            self._write(metric_type, update_func(current_metrics))
 
     async def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -762,7 +944,7 @@ async def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
             Dictionary mapping metric types to their data
         """
         result = {}
-        for metric_type in self._metrics_regions:
+        for metric_type in self._entries.keys():
             metrics = await self.get_metrics(metric_type)
             if metrics:
                 result[metric_type] = metrics
@@ -777,57 +959,24 @@ async def clear_expired_metrics(self) -> int:
             Number of cleared metrics
         """
         count = 0
-        for metric_type in list(self._metrics_regions.keys()):
-            region_name = self._metrics_regions[metric_type]
-
-            try:
-                # Read data
-                metrics_with_timestamp = await self.memory_manager.read_data(
-                    region_name
-                )
-
-                # Check TTL
-                ttl = await self.get_ttl(metric_type)
-                if time.time() - metrics_with_timestamp["timestamp"] > ttl:
-                    # Clear data
-                    await self.memory_manager.write_data(
-                        region_name, {"data": {}, "timestamp": time.time()}
-                    )
-                    count += 1
-            except (MemoryRegionNotFoundError, CorruptDataError) as e:
-                logger.error(f"Error clearing expired metrics for {metric_type}: {e}")
-
-        return count
-
-    async def _ensure_region(self, metric_type: str) -> str:
-        """
-        Ensure a memory region exists for the metric type.
-
-        Args:
-            metric_type: Type of metrics
-
-        Returns:
-            Name of the memory region
-        """
         async with self._lock:
-            if metric_type in self._metrics_regions:
-                return self._metrics_regions[metric_type]
-
-            # Create new region
-            region_name = f"metrics_{metric_type}_{uuid.uuid4().hex}"
-            await self.memory_manager.create_region(
-                name=region_name,
-                size=self.region_size,
-                region_type=MemoryRegionType.METRICS,
-            )
+            for metric_type in self._entries.keys():
+                try:
+                    record = self._entries.read(metric_type)
+                    if time.time() - record["timestamp"] > record["ttl"]:
+                        self._write(metric_type, {})
+                        count += 1
+                except CorruptDataError as e:
+                    logger.error(f"Error clearing expired metrics for {metric_type}: {e}")
 
-            # Update registry
-            self._metrics_regions[metric_type] = region_name
-            registry_data = await self.memory_manager.read_data("metrics_registry")
-            registry_data["metrics_regions"] = self._metrics_regions
-            await self.memory_manager.write_data("metrics_registry", registry_data)
+        return count
 
-            return region_name
+    def _write(self, metric_type: str, metrics: Dict[str, Any]) -> None:
+        """Publish metrics with the type's TTL (caller holds the lock)."""
+        ttl = self._ttl_values.get(metric_type, self._default_ttl)
+        record = self._entries.read(metric_type)
+        version = int(record["version"]) + 1 if record is not None else 1
+        self._entries.write(metric_type, metrics, version, ttl)
 
 
 class SharedStateManager:
@@ -835,56 +984,54 @@ class SharedStateManager:
     Process-safe state sharing with change notification and versioning.
 
     This class provides:
-    - Process-safe state sharing
+    - State sharing through one seqlocked table, read without locks
     - Change notification system
     - Versioning for conflict resolution
     - Error handling for corrupt states
+
+    The creating process is the table's single writer; writes from processes
+    that attached by name raise SharedMemoryError.
     """
 
     def __init__(
-        self, memory_manager: SharedMemoryManager, region_size: int = 1024 * 1024
+        self,
+        memory_manager: SharedMemoryManager,
+        region_size: int = 64 * 1024,
+        capacity: int = 64,
+        name: Optional[str] = None,
     ):
         """
         Initialize the shared state manager.
 
         Args:
             memory_manager: Shared memory manager
-            region_size: Size of memory regions in bytes
+            region_size: Largest pickled state in bytes; every row reserves this much
+                shared memory, so the table takes ``region_size * capacity``
+                bytes (64 KB rows keep the default table at 4 MB, where the
+                old per-type regions defaulted to 1 MB each)
+            capacity: Number of states
+            name: Shared memory name of the table to attach to or create
         """
         self.memory_manager = memory_manager
         self.region_size = region_size
         self._lock = asyncio.Lock()
-        self._state_regions: Dict[str, str] = {}  # Maps state name to region name
+        self._entries = _EntryTable(memory_manager, "state", region_size, capacity, name)
         self._change_callbacks: Dict[
             str, List[Callable[[Dict[str, Any], int], None]]
         ] = {}
 
         logger.debug("SharedStateManager initialized")
 
+    @property
+    def name(self) -> Optional[str]:
+        """Shared memory name other processes attach to."""
+        return self._entries.name
+
     async def initialize(self) -> None:
         """Initialize the state manager."""
         async with self._lock:
-            # Create registry region if it doesn't exist
-            try:
-                await self.memory_manager.get_region_info("state_registry")
-            except MemoryRegionNotFoundError:
-                await self.memory_manager.create_region(
-                    name="state_registry",
-                    size=64 * 1024,  # 64 KB
-                    region_type=MemoryRegionType.STATE,
-                    schema={"state_regions": "object"},
-                )
-
-                # Initialize registry data
-                await self.memory_manager.write_data(
-                    name="state_registry", data={"state_regions": {}}
-                )
-
-            # Load registry data
-            registry_data = await self.memory_manager.read_data("state_registry")
-            self._state_regions = registry_data.get("state_regions", {})
-
-            logger.debug("SharedStateManager initialized")
+            self._entries.open()
+            logger.debug(f"SharedStateManager using table '{self.name}'")
 
     async def set_state(
         self, state_name: str, state: Dict[str, Any], version: Optional[int] = None
@@ -903,33 +1050,19 @@ async def set_state(
         Raises:
             ValueError: If version doesn't match current version
         """
-        # Ensure region exists
-        region_name = await self._ensure_region(state_name)
-
-        # Define update function
-        def update_wrapper(current_data: Dict[str, Any]) -> Dict[str, Any]:
-            if current_data is None:
-                current_data = {"data": {}, "version": 0}
-
-            current_version = current_data.get("version", 0)
-
-            # Check version if provided
-            if version is not None and version != current_version:
-                raise ValueError(
-                    f"Version mismatch: expected {version}, got {current_version}"
-                )
-
-            # Update data
-            new_version = current_version + 1
-            return {"data": state, "version": new_version, "timestamp": time.time()}
-
         try:
-            # Update data
-            await self.memory_manager.update_data(region_name, update_wrapper)
+            async with self._lock:
+                record = self._entries.read(state_name)
+                current_version = int(record["version"]) if record is not None else 0
+
+                # Check version if provided
+                if version is not None and version != current_version:
+                    raise ValueError(
+                        f"Version mismatch: expected {version}, got {current_version}"
+                    )
 
-            # Get updated data
-            updated_data = await self.memory_manager.read_data(region_name)
-            new_version = updated_data["version"]
+                new_version = current_version + 1
+                self._entries.write(state_name, state, new_version)
 
             # Notify callbacks
             await self._notify_change(state_name, state, new_version)
@@ -952,16 +1085,11 @@ async def get_state(self, state_name: str) -> Tuple[Dict[str, Any], int]:
         Raises:
             MemoryRegionNotFoundError: If the state is not found
         """
-        # Check if region exists
-        if state_name not in self._state_regions:
-            raise MemoryRegionNotFoundError(f"State '{state_name}' not found")
-
-        region_name = self._state_regions[state_name]
-
         try:
-            # Read data
-            state_data = await self.memory_manager.read_data(region_name)
-            return state_data["data"], state_data["version"]
+            record = self._entries.read(state_name)
+            if record is None:
+                raise MemoryRegionNotFoundError(f"State '{state_name}' not found")
+            return self._entries.value(record), int(record["version"])
         except (MemoryRegionNotFoundError, CorruptDataError) as e:
             logger.error(f"Error reading state '{state_name}': {e}")
             raise
@@ -1000,33 +1128,3 @@ async def _notify_change(
                     logger.error(
                         f"Error in state change callback for '{state_name}': {e}"
                     )
-
-    async def _ensure_region(self, state_name: str) -> str:
-        """
-        Ensure a memory region exists for the state.
-
-        Args:
-            state_name: Name of the state
-
-        Returns:
-            Name of the memory region
-        """
-        async with self._lock:
-            if state_name in self._state_regions:
-                return self._state_regions[state_name]
-
-            # Create new region
-            region_name = f"state_{state_name}_{uuid.uuid4().hex}"
-            await self.memory_manager.create_region(
-                name=region_name,
-                size=self.region_size,
-                region_type=MemoryRegionType.STATE,
-            )
-
-            # Update registry
-            self._state_regions[state_name] = region_name
-            registry_data = await self.memory_manager.read_data("state_registry")
-            registry_data["state_regions"] = self._state_regions
-            await self.memory_manager.write_data("state_registry", registry_data)
-
-            return region_name
@@ -0,0 +1,438 @@
+"""
+Seqlock-Protected Shared Memory Arrays
+
+Fixed-schema record arrays in ``multiprocessing.shared_memory`` that other
+processes read without locks or deserialization:
+
+- ``SeqlockRing``: append-only ring of records (metric samples, events)
+- ``SeqlockTable``: fixed array of rows updated in place (pool state)
+
+Every slot carries a sequence number. A writer makes it odd, writes the
+record, then makes it even again; readers copy the slot and retry if the
+sequence changed or was odd. Ring slots are stamped with the position they
+hold, so a reader can also tell when it fell a full lap behind. Each region
+has a single writer; any number of processes may read.
+
+Record layouts are NumPy structured dtypes registered by name in
+``SCHEMAS``. The schema is stored in the region header, so a process can
+attach by region name alone and read records as NumPy arrays.
+"""
+
+import json
+import logging
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .errors import CorruptDataError, SchemaValidationError, SharedMemoryError
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ARBSHM01"
+KIND_RING = 1
+KIND_TABLE = 2
+
+# Fixed header: magic, kind, schema length, capacity, slot size; the ring
+# head (next position to write) lives at HEAD_OFFSET on its own cache line
+_HEADER = struct.Struct("<8sIIQQ")
+HEAD_OFFSET = 64
+DATA_ALIGN = 64
+
+# Readers give up on a slot after this many torn reads
+MAX_READ_RETRIES = 64
+
+FieldsType = Sequence[Tuple[str, str]]
+
+# Blocks created by this process, which its resource tracker already owns
+_CREATED: set = set()
+
+
+class SchemaRegistry:
+    """Named record layouts shared by writers and readers."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._schemas: Dict[str, np.dtype] = {}
+
+    def register(self, name: str, fields: FieldsType) -> np.dtype:
+        """
+        Register a record layout.
+
+        Args:
+            name: Schema name
+            fields: (field name, NumPy dtype string) pairs
+
+        Returns:
+            The structured dtype
+
+        Raises:
+            SchemaValidationError: If the name is registered with different fields
+        """
+        dtype = np.dtype(list(fields))
+        existing = self._schemas.get(name)
+        if existing is not None and existing != dtype:
+            raise SchemaValidationError(f"Schema '{name}' is already registered differently")
+        self._schemas[name] = dtype
+        return dtype
+
+    def get(self, name: str) -> np.dtype:
+        """
+        Get a registered layout.
+
+        Raises:
+            SchemaValidationError: If the schema is not registered
+        """
+        try:
+            return self._schemas[name]
+        except KeyError:
+            raise SchemaValidationError(f"Schema '{name}' is not registered")
+
+    def names(self) -> List[str]:
+        """Get the registered schema names."""
+        return list(self._schemas)
+
+
+SCHEMAS = SchemaRegistry()
+
+SCHEMAS.register(
+    "metric_sample",
+    [("timestamp", "<f8"), ("metric", "<u4"), ("value", "<f8")],
+)
+SCHEMAS.register(
+    "pool_state",
+    [
+        ("timestamp", "<f8"),
+        ("block_number", "<u8"),
+        ("reserve0", "<f8"),
+        ("reserve1", "<f8"),
+        ("price", "<f8"),
+        ("liquidity", "<f8"),
+    ],
+)
+
+
+class _SeqlockRegion:
+    """Shared memory block holding a header, the schema and seqlocked slots."""
+
+    kind = 0
+
+    def __init__(
+        self, shm: shared_memory.SharedMemory, schema_name: str, dtype: np.dtype,
+        capacity: int, owner: bool,
+    ):
+        self._shm = shm
+        self.name = shm.name
+        self.schema_name = schema_name
+        self.dtype = dtype
+        self.capacity = capacity
+        self.owner = owner
+
+        self.slot_dtype = np.dtype([("seq", "<u8"), ("data", dtype)], align=True)
+        offset = self._data_offset(len(self._schema_json(schema_name, dtype)))
+        self._head = np.ndarray((1,), dtype="<u8", buffer=shm.buf, offset=HEAD_OFFSET)
+        self._slots = np.ndarray(
+            (capacity,), dtype=self.slot_dtype, buffer=shm.buf, offset=offset
+        )
+        self._seq = self._slots["seq"]
+        self._data = self._slots["data"]
+
+    @classmethod
+    def create(
+        cls, name: Optional[str], schema: str, capacity: int,
+        registry: SchemaRegistry = SCHEMAS,
+    ) -> "_SeqlockRegion":
+        """
+        Create a region.
+
+        Args:
+            name: Shared memory name (None for a generated one)
+            schema: Registered schema name
+            capacity: Number of slots
+            registry: Schema registry to resolve the name in
+
+        Returns:
+            The region, owned by this process
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        dtype = registry.get(schema)
+        schema_json = cls._schema_json(schema, dtype)
+        slot_dtype = np.dtype([("seq", "<u8"), ("data", dtype)], align=True)
+        size = cls._data_offset(len(schema_json)) + capacity * slot_dtype.itemsize
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _CREATED.add(shm.name)
+        shm.buf[: _HEADER.size] = _HEADER.pack(
+            MAGIC, cls.kind, len(schema_json), capacity, slot_dtype.itemsize
+        )
+        shm.buf[HEAD_OFFSET + 8: HEAD_OFFSET + 8 + len(schema_json)] = schema_json
+        region = cls(shm, schema, dtype, capacity, owner=True)
+        region._seq[:] = 0
+        region._head[0] = 0
+        return region
+
+    @classmethod
+    def attach(cls, name: str, registry: SchemaRegistry = SCHEMAS) -> "_SeqlockRegion":
+        """
+        Attach to a region created by another process.
+
+        Raises:
+            CorruptDataError: If the block is not a region of this kind
+            SchemaValidationError: If the stored schema conflicts with the registry
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        if shm.name not in _CREATED:
+            # Only the creating process may unlink the block at exit
+            resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            magic, kind, schema_length, capacity, slot_size = _HEADER.unpack_from(shm.buf)
+            if magic != MAGIC or kind != cls.kind:
+                raise CorruptDataError(f"Shared memory '{name}' is not a {cls.__name__}")
+            start = HEAD_OFFSET + 8
+            schema = json.loads(bytes(shm.buf[start: start + schema_length]))
+            dtype = np.dtype([tuple(field) for field in schema["fields"]])
+            if schema["name"] in registry.names() and registry.get(schema["name"]) != dtype:
+                raise SchemaValidationError(
+                    f"Shared memory '{name}' has a different '{schema['name']}' layout"
+                )
+            region = cls(shm, schema["name"], dtype, capacity, owner=False)
+            if region.slot_dtype.itemsize != slot_size:
+                raise CorruptDataError(f"Slot size mismatch in shared memory '{name}'")
+            return region
+        except Exception:
+            shm.close()
+            raise
+
+    def view(self) -> np.ndarray:
+        """
+        Live view of every slot's record, without copying.
+
+        Values may change (or be torn) while in use; use the read methods
+        for consistent copies.
+        """
+        return self._data
+
+    def close(self) -> None:
+        """Detach from the block."""
+        if self._shm is None:
+            return
+        # Views must go before the buffer can be released
+        self._head = self._slots = self._seq = self._data = None
+        self._shm.close()
+        self._shm = None
+
+    def unlink(self) -> None:
+        """
+        Detach and destroy the block.
+
+        Raises:
+            SharedMemoryError: If this process did not create the block
+        """
+        if not self.owner:
+            raise SharedMemoryError(f"Only the creating process may unlink '{self.name}'")
+        shm = self._shm
+        self.close()
+        if shm is not None:
+            shm.unlink()
+            _CREATED.discard(self.name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get region statistics."""
+        return {
+            "name": self.name,
+            "schema": self.schema_name,
+            "capacity": self.capacity,
+            "slot_size": self.slot_dtype.itemsize,
+            "owner": self.owner,
+        }
+
+    def _write_slot(self, index: int, seq: int, record: Any) -> None:
+        """Publish a record under the seqlock, ending at even sequence ``seq``."""
+        self._seq[index] = seq - 1
+        self._data[index] = record
+        self._seq[index] = seq
+
+    def _read_slot(self, index: int) -> Tuple[int, Optional[np.void]]:
+        """Copy one slot consistently; returns (sequence, record or None if it never settled)."""
+        for _ in range(MAX_READ_RETRIES):
+            before = int(self._seq[index])
+            if before & 1:
+                continue
+            record = self._data[index].copy()
+            if int(self._seq[index]) == before:
+                return before, record
+        return -1, None
+
+    def _read_slots(
+        self,
+        indexes: np.ndarray,
+        expected: Optional[np.ndarray] = None,
+        field: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copy slots consistently, or only one ``field`` of them.
+
+        Returns:
+            (records, valid mask); a slot is invalid if it never settled or
+            does not hold the expected sequence
+        """
+        source = self._data if field is None else self._data[field]
+        records = np.empty(len(indexes), dtype=source.dtype)
+        valid = np.zeros(len(indexes), dtype=bool)
+        pending = np.arange(len(indexes))
+
+        for _ in range(MAX_READ_RETRIES):
+            slots = indexes[pending]
+            before = self._seq[slots].copy()
+            data = source[slots].copy()
+            after = self._seq[slots]
+
+            settled = (before == after) & (before & 1 == 0)
+            records[pending[settled]] = data[settled]
+            if expected is None:
+                valid[pending[settled]] = True
+            else:
+                valid[pending[settled]] = before[settled] == expected[pending[settled]]
+
+            pending = pending[~settled]
+            if not len(pending):
+                break
+        return records, valid
+
+    @staticmethod
+    def _schema_json(name: str, dtype: np.dtype) -> bytes:
+        return json.dumps({"name": name, "fields": dtype.descr}).encode()
+
+    @staticmethod
+    def _data_offset(schema_length: int) -> int:
+        end = HEAD_OFFSET + 8 + schema_length
+        return -(-end // DATA_ALIGN) * DATA_ALIGN
+
+
+class SeqlockRing(_SeqlockRegion):
+    """Single-writer ring of fixed-schema records in shared memory."""
+
+    kind = KIND_RING
+
+    @property
+    def head(self) -> int:
+        """Position the next record will be written at (total records written)."""
+        return int(self._head[0])
+
+    def append(self, record: Any) -> int:
+        """
+        Append a record.
+
+        Args:
+            record: Tuple in field order, or a structured scalar
+
+        Returns:
+            The record's position
+        """
+        position = int(self._head[0])
+        self._write_slot(position % self.capacity, 2 * position + 2, record)
+        self._head[0] = position + 1
+        return position
+
+    def extend(self, records: np.ndarray) -> int:
+        """
+        Append a structured array of records.
+
+        Returns:
+            The new head position
+        """
+        records = np.asarray(records, dtype=self.dtype)
+        # Records that would be overwritten within this call are skipped
+        skipped = max(0, len(records) - self.capacity)
+        if skipped:
+            self._head[0] = int(self._head[0]) + skipped
+        for record in records[skipped:]:
+            self.append(record)
+        return int(self._head[0])
+
+    def read(self, since: int = 0, limit: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        Read records written at or after a position.
+
+        Records overwritten before they were copied are skipped.
+
+        Args:
+            since: First position wanted (e.g. the previous call's return)
+            limit: Maximum records to return, newest kept
+
+        Returns:
+            (records, position to read from next time)
+        """
+        head = int(self._head[0])
+        start = max(since, head - self.capacity)
+        if limit is not None:
+            start = max(start, head - limit)
+        if start >= head:
+            return np.empty(0, dtype=self.dtype), head
+
+        positions = np.arange(start, head, dtype=np.uint64)
+        records, valid = self._read_slots(
+            (positions % self.capacity).astype(np.intp), 2 * positions + 2
+        )
+        return records[valid], head
+
+    def latest(self, count: int = 1) -> np.ndarray:
+        """Read the newest ``count`` records."""
+        if count == 1:
+            position = int(self._head[0]) - 1
+            if position < 0:
+                return np.empty(0, dtype=self.dtype)
+            seq, record = self._read_slot(position % self.capacity)
+            if seq == 2 * position + 2:
+                return np.array([record], dtype=self.dtype)
+        return self.read(limit=count)[0]
+
+
+class SeqlockTable(_SeqlockRegion):
+    """Fixed array of fixed-schema rows in shared memory, updated in place."""
+
+    kind = KIND_TABLE
+
+    def write(self, index: int, record: Any) -> None:
+        """Overwrite a row (single writer per table)."""
+        self._write_slot(index, int(self._seq[index]) + 2, record)
+
+    def read(self, index: int) -> Optional[np.void]:
+        """
+        Read one row consistently.
+
+        Returns:
+            The row, or None if it was never written or kept changing
+        """
+        seq, record = self._read_slot(index)
+        return record if seq > 0 else None
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copy every row consistently.
+
+        Returns:
+            (rows, mask of rows that have been written)
+        """
+        records, valid = self._read_slots(np.arange(self.capacity, dtype=np.intp))
+        return records, valid & (self._seq != 0)
+
+    def column(self, field: str, start: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copy one field of the rows from ``start`` on consistently.
+
+        Cheaper than :meth:`snapshot` when rows are large and only e.g. their
+        keys are needed.
+
+        Returns:
+            (values, mask of rows that have been written)
+        """
+        indexes = np.arange(start, self.capacity, dtype=np.intp)
+        values, valid = self._read_slots(indexes, field=field)
+        return values, valid & (self._seq[indexes] != 0)
+
+    def version(self, index: int) -> int:
+        """Number of times a row has been written."""
+        return int(self._seq[index]) // 2
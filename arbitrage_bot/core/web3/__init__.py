@@ -8,6 +8,19 @@
 - Gas price estimation
 """
 
-from .web3_manager import Web3Manager, create_web3_manager
+from typing import TYPE_CHECKING
+
+from ...utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .web3_manager import Web3Manager, create_web3_manager
 
 __all__ = ["Web3Manager", "create_web3_manager"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Web3Manager": ".web3_manager",
+        "create_web3_manager": ".web3_manager",
+    },
+)
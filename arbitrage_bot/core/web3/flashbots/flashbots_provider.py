@@ -19,6 +19,7 @@
 # from decimal import Decimal # Unused
 
 from ....utils.async_manager import with_retry, AsyncLock
+from ....utils.latency import TX_BUILT, TX_SIGNED, TX_SUBMITTED, mark
 from ..interfaces import Transaction # Removed TransactionReceipt
 
 logger = logging.getLogger(__name__)
@@ -449,6 +450,8 @@ async def send_bundle(
                 "revertingTxHashes": [],  # Hashes of transactions that are allowed to revert
             }
 
+            mark(TX_BUILT)
+
             # Sign bundle
             message = self.w3.keccak(
                 self.w3.eth.abi.encode_abi(
@@ -460,6 +463,7 @@ async def send_bundle(
             )
 
             signature = self.auth_signer.sign_message(message)
+            mark(TX_SIGNED)
 
             # Make RPC call with enhanced parameters
             response = await self.w3.eth.provider.make_request(
@@ -476,6 +480,8 @@ async def send_bundle(
                 ],
             )
 
+            mark(TX_SUBMITTED)
+
             # Update bundle stats
             bundle_key = self._get_bundle_key(transactions)
             current_stats = self._bundle_stats.get(bundle_key, BundleStats(0, 0, 0))
@@ -0,0 +1,394 @@
+"""
+Receipt Watcher
+
+This module provides a single, block-driven receipt watcher shared by the
+transaction monitors. Instead of one polling task per transaction, the
+watcher fetches all receipts of each new block with one
+``eth_getBlockReceipts`` call, matches them against every pending hash,
+resolves awaiting futures and pushes confirmation updates to listeners.
+Polling cost is one request per block regardless of how many transactions
+are in flight.
+
+Block scanning only sees blocks from the moment the watcher starts polling,
+so every newly watched hash is also looked up once with
+``eth_getTransactionReceipt`` to catch transactions that were mined earlier.
+Hashes that never show up are dropped after ``watch_timeout`` seconds.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from ...utils.latency import TX_INCLUDED, Trace, current_trace
+
+logger = logging.getLogger(__name__)
+
+ReceiptListener = Callable[["ReceiptUpdate"], Awaitable[None]]
+
+
+def _normalize_hash(value: Any) -> str:
+    """Normalize a transaction hash to a lowercase 0x-prefixed string."""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if hasattr(value, "hex") and not isinstance(value, str):
+        text = value.hex()
+        return (text if text.startswith("0x") else "0x" + text).lower()
+    text = str(value).lower()
+    return text if text.startswith("0x") else "0x" + text
+
+
+def _quantity(value: Any) -> Optional[int]:
+    """Convert an RPC quantity (int or hex string) to int."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if str(value).startswith("0x") else int(value)
+
+
+@dataclass
+class ReceiptUpdate:
+    """Normalized receipt status for a watched transaction."""
+
+    tx_hash: str
+    block_number: int
+    block_hash: str
+    success: bool
+    gas_used: Optional[int]
+    effective_gas_price: Optional[int]
+    confirmations: int
+    block_timestamp: Optional[int] = None
+    receipt: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def reverted(self) -> bool:
+        """Whether the transaction was mined but reverted."""
+        return not self.success
+
+    @classmethod
+    def from_receipt(
+        cls,
+        receipt: Dict[str, Any],
+        head: int,
+        block_timestamp: Optional[int] = None,
+    ) -> "ReceiptUpdate":
+        """Build an update from a raw (hex or decoded) receipt."""
+        block_number = _quantity(receipt.get("blockNumber")) or 0
+        return cls(
+            tx_hash=_normalize_hash(receipt.get("transactionHash")),
+            block_number=block_number,
+            block_hash=_normalize_hash(receipt.get("blockHash") or b""),
+            success=_quantity(receipt.get("status")) == 1,
+            gas_used=_quantity(receipt.get("gasUsed")),
+            effective_gas_price=_quantity(receipt.get("effectiveGasPrice")),
+            confirmations=max(0, head - block_number + 1),
+            block_timestamp=block_timestamp,
+            receipt=dict(receipt),
+        )
+
+
+@dataclass
+class _Watch:
+    """Internal state for one watched transaction."""
+
+    confirmations: int
+    future: asyncio.Future
+    update: Optional[ReceiptUpdate] = None
+    added_at: float = field(default_factory=time.time)
+    trace: Optional[Trace] = None  # Latency trace of the block that led to the transaction
+
+
+class ReceiptWatcher:
+    """
+    Block-driven receipt watcher.
+
+    Callers register hashes with :meth:`watch` and await the returned future;
+    listeners registered with :meth:`add_listener` receive every mined and
+    confirmation update. The watcher stops tracking a transaction once it
+    reaches its required confirmations, or fails its future with
+    ``asyncio.TimeoutError`` if no receipt appears within ``watch_timeout``.
+    """
+
+    def __init__(self, w3: Any, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the receipt watcher.
+
+        Args:
+            w3: Async web3 instance (or any object exposing ``eth`` and ``provider``)
+            config: Configuration dictionary
+        """
+        self.w3 = w3
+        self.config = config or {}
+
+        # Configuration
+        self.poll_interval = float(self.config.get("poll_interval", 0.5))
+        self.max_blocks_per_poll = int(self.config.get("max_blocks_per_poll", 10))
+        self.watch_timeout = float(self.config.get("watch_timeout", 300.0))
+
+        # Watch state
+        self._watches: Dict[str, _Watch] = {}
+        self._listeners: List[ReceiptListener] = []
+        self._last_block: Optional[int] = None
+        self._block_timestamps: Dict[int, int] = {}
+        self._supports_block_receipts = True
+
+        # Control
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._lookups: Set[asyncio.Task] = set()
+
+        # Statistics
+        self.requests = 0
+        self.blocks_processed = 0
+        self.timed_out = 0
+
+    @property
+    def pending_count(self) -> int:
+        """Number of transactions still being watched."""
+        return len(self._watches)
+
+    def add_listener(self, listener: ReceiptListener) -> None:
+        """Register an async callback for receipt updates."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: ReceiptListener) -> None:
+        """Unregister a receipt update callback."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def watch(self, tx_hash: Any, confirmations: int = 1) -> asyncio.Future:
+        """
+        Start watching a transaction.
+
+        Args:
+            tx_hash: Transaction hash
+            confirmations: Confirmations required before the future resolves
+                (0 resolves as soon as the receipt is seen)
+
+        Returns:
+            Future resolving to the final :class:`ReceiptUpdate`
+        """
+        key = _normalize_hash(tx_hash)
+        watch = self._watches.get(key)
+        if watch is not None:
+            # Keep the strictest requirement of all callers
+            watch.confirmations = max(watch.confirmations, confirmations)
+            return watch.future
+
+        future = asyncio.get_running_loop().create_future()
+        self._watches[key] = _Watch(
+            confirmations=confirmations, future=future, trace=current_trace()
+        )
+        self._ensure_running()
+
+        # The block scan starts at the current head; catch already-mined transactions
+        lookup = asyncio.create_task(self._lookup(key))
+        self._lookups.add(lookup)
+        lookup.add_done_callback(self._lookups.discard)
+        return future
+
+    def unwatch(self, tx_hash: Any) -> bool:
+        """Stop watching a transaction, cancelling its future."""
+        watch = self._watches.pop(_normalize_hash(tx_hash), None)
+        if watch is None:
+            return False
+        if not watch.future.done():
+            watch.future.cancel()
+        return True
+
+    def _ensure_running(self) -> None:
+        """Start the polling task on first use."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    async def _lookup(self, key: str) -> None:
+        """Resolve a newly watched hash from its receipt if it is already mined."""
+        try:
+            self.requests += 1
+            receipt = await self.w3.eth.get_transaction_receipt(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Pending transactions raise TransactionNotFound; block scanning takes over
+            logger.debug(f"No receipt yet for {key}: {e}")
+            return
+
+        watch = self._watches.get(key)
+        if not receipt or watch is None or watch.update is not None:
+            return
+
+        block_number = _quantity(receipt.get("blockNumber")) or 0
+        head = max(self._last_block or 0, block_number)
+        self._match_receipts([receipt], head)
+        await self._advance(key, watch, head)
+
+    async def _run(self) -> None:
+        """Poll for new blocks while there is something to watch."""
+        try:
+            while True:
+                if not self._watches:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    # Resume from the current head rather than walking idle blocks
+                    self._last_block = None
+                    continue
+
+                try:
+                    await self.poll_once()
+                except Exception as e:
+                    logger.error(f"Error polling receipts: {e}")
+
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            pass
+
+    async def poll_once(self) -> int:
+        """
+        Process every block since the last poll.
+
+        Returns:
+            Number of blocks processed
+        """
+        head_block = await self.w3.eth.get_block("latest")
+        self.requests += 1
+        head = _quantity(head_block["number"])
+        self._block_timestamps[head] = _quantity(head_block.get("timestamp"))
+
+        if self._last_block is None:
+            # Transactions may already have been mined in the previous block
+            self._last_block = head - 1
+        if head <= self._last_block:
+            return 0
+
+        # Walk blocks in order; a backlog larger than one batch continues next poll
+        first = self._last_block + 1
+        last = min(head, self._last_block + self.max_blocks_per_poll)
+        for block_number in range(first, last + 1):
+            if self._awaiting_receipt():
+                receipts = await self._fetch_receipts(block_number)
+                self._match_receipts(receipts, head)
+            self.blocks_processed += 1
+        self._last_block = last
+
+        await self._advance_confirmations(head)
+        self._expire_watches()
+
+        # Timestamps are only needed for recently mined blocks
+        for number in [n for n in self._block_timestamps if n < head - 64]:
+            del self._block_timestamps[number]
+
+        return last - first + 1
+
+    def _awaiting_receipt(self) -> List[str]:
+        """Hashes that have not been seen in a block yet."""
+        return [h for h, w in self._watches.items() if w.update is None]
+
+    async def _fetch_receipts(self, block_number: int) -> List[Dict[str, Any]]:
+        """Fetch all receipts of a block with one request when supported."""
+        if self._supports_block_receipts:
+            try:
+                self.requests += 1
+                response = await self.w3.provider.make_request(
+                    "eth_getBlockReceipts", [hex(block_number)]
+                )
+                result = response.get("result") if isinstance(response, dict) else None
+                if result is not None:
+                    return result
+                self._supports_block_receipts = False
+            except Exception as e:
+                logger.debug(f"eth_getBlockReceipts unavailable, falling back: {e}")
+                self._supports_block_receipts = False
+
+        # Fallback: batch per-hash receipt requests for everything outstanding
+        hashes = self._awaiting_receipt()
+        self.requests += len(hashes)
+        results = await asyncio.gather(
+            *(self.w3.eth.get_transaction_receipt(h) for h in hashes),
+            return_exceptions=True,
+        )
+        return [r for r in results if r and not isinstance(r, Exception)]
+
+    def _match_receipts(self, receipts: List[Dict[str, Any]], head: int) -> None:
+        """Attach receipts to watched transactions."""
+        for receipt in receipts:
+            key = _normalize_hash(receipt.get("transactionHash"))
+            watch = self._watches.get(key)
+            if watch is None or watch.update is not None:
+                continue
+            block_number = _quantity(receipt.get("blockNumber")) or 0
+            watch.update = ReceiptUpdate.from_receipt(
+                receipt, head, self._block_timestamps.get(block_number)
+            )
+            if watch.trace is not None:
+                watch.trace.mark(TX_INCLUDED)
+
+    async def _advance_confirmations(self, head: int) -> None:
+        """Notify listeners and resolve futures for mined transactions."""
+        for key, watch in list(self._watches.items()):
+            if watch.update is not None:
+                await self._advance(key, watch, head)
+
+    async def _advance(self, key: str, watch: _Watch, head: int) -> None:
+        """Update one mined transaction's confirmations and resolve it when done."""
+        watch.update.confirmations = max(0, head - watch.update.block_number + 1)
+        await self._notify(watch.update)
+
+        if watch.update.confirmations >= watch.confirmations:
+            self._watches.pop(key, None)
+            if not watch.future.done():
+                watch.future.set_result(watch.update)
+
+    def _expire_watches(self) -> None:
+        """Drop transactions that have not been mined within the watch timeout."""
+        cutoff = time.time() - self.watch_timeout
+        for key, watch in list(self._watches.items()):
+            if watch.update is None and watch.added_at <= cutoff:
+                self._watches.pop(key, None)
+                self.timed_out += 1
+                if not watch.future.done():
+                    watch.future.set_exception(
+                        asyncio.TimeoutError(f"No receipt for {key} after {self.watch_timeout}s")
+                    )
+
+    async def _notify(self, update: ReceiptUpdate) -> None:
+        """Deliver an update to all listeners."""
+        for listener in list(self._listeners):
+            try:
+                await listener(update)
+            except Exception as e:
+                logger.error(f"Error in receipt listener: {e}")
+
+    async def close(self) -> None:
+        """Stop polling and cancel all outstanding futures."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for lookup in list(self._lookups):
+            lookup.cancel()
+        if self._lookups:
+            await asyncio.gather(*self._lookups, return_exceptions=True)
+
+        for watch in self._watches.values():
+            if not watch.future.done():
+                watch.future.cancel()
+        self._watches.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get watcher statistics."""
+        return {
+            "pending": len(self._watches),
+            "requests": self.requests,
+            "blocks_processed": self.blocks_processed,
+            "timed_out": self.timed_out,
+            "last_block": self._last_block,
+            "block_receipts_supported": self._supports_block_receipts,
+        }
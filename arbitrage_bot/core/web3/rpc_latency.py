@@ -0,0 +1,105 @@
+"""
+RPC Latency Middleware
+
+Web3 middleware that records the round-trip time, encoded sizes and
+failures of every JSON-RPC call per method on the global latency tracer
+(see ``arbitrage_bot.utils.latency``). Calls that are not sampled pass
+straight through.
+
+Web3 hands middleware decoded responses, not the transport bytes, so sizes
+are measured by re-encoding to JSON. That costs more than the call bookkeeping
+for large responses (blocks, receipts, logs), so only every
+``size_sample_every``-th sampled call is encoded and its sizes are scaled up
+to keep the byte counters unbiased totals.
+
+The middleware is class-based, which needs web3 7+. On older versions
+``RPC_LATENCY_SUPPORTED`` is False and callers leave it out.
+"""
+
+import json
+import time
+from typing import Any
+
+from web3.types import RPCEndpoint, RPCResponse
+
+from ...utils.latency import get_tracer
+
+try:
+    from web3.middleware import Web3Middleware
+except ImportError:  # web3 < 7 only has function middleware
+    Web3Middleware = object
+
+RPC_LATENCY_SUPPORTED = Web3Middleware is not object
+
+SIZE_SAMPLE_EVERY = 16  # Encode one in this many sampled calls to measure sizes
+
+
+def _encoded_size(value: Any) -> int:
+    """Size of a value as JSON, as sent or received over HTTP."""
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class RpcLatencyMiddleware(Web3Middleware):
+    """Records per-method RPC latency and traffic."""
+
+    size_sample_every = SIZE_SAMPLE_EVERY
+    _sampled_calls = 0
+
+    def _size_scale(self) -> int:
+        """Weight of this call's encoded sizes, or 0 to skip measuring them."""
+        self._sampled_calls += 1
+        every = max(1, self.size_sample_every)
+        return every if self._sampled_calls % every == 0 else 0
+
+    async def async_wrap_make_request(self, make_request):
+        async def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            tracer = get_tracer()
+            if not tracer.sampled():
+                return await make_request(method, params)
+
+            start = time.perf_counter_ns()
+            try:
+                response = await make_request(method, params)
+            except Exception:
+                tracer.record_rpc(method, time.perf_counter_ns() - start, error=True)
+                raise
+            elapsed = time.perf_counter_ns() - start
+            scale = self._size_scale()
+            tracer.record_rpc(
+                method,
+                elapsed,
+                request_bytes=_encoded_size(params) * scale if scale else 0,
+                response_bytes=_encoded_size(response) * scale if scale else 0,
+                error="error" in response,
+            )
+            return response
+
+        return middleware
+
+    async def async_wrap_make_batch_request(self, make_batch_request):
+        async def middleware(requests_info):
+            tracer = get_tracer()
+            if not tracer.sampled():
+                return await make_batch_request(requests_info)
+
+            start = time.perf_counter_ns()
+            try:
+                response = await make_batch_request(requests_info)
+            except Exception:
+                tracer.record_rpc("batch", time.perf_counter_ns() - start, error=True)
+                raise
+            elapsed = time.perf_counter_ns() - start
+            scale = self._size_scale()
+            tracer.record_rpc(
+                "batch",
+                elapsed,
+                request_bytes=_encoded_size(requests_info) * scale if scale else 0,
+                response_bytes=_encoded_size(response) * scale if scale else 0,
+                error=not isinstance(response, list),
+            )
+            return response
+
+        return middleware
@@ -13,6 +13,8 @@
 from web3.contract import Contract
 from web3.types import RPCEndpoint, RPCResponse
 
+from .rpc_latency import RPC_LATENCY_SUPPORTED, RpcLatencyMiddleware
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,6 +102,12 @@ async def initialize(self) -> None:
                 # Create async Web3 instance with the first provider
                 self._web3 = AsyncWeb3(self._providers[0])
 
+                # Per-method RPC latency and traffic (see utils.latency)
+                if RPC_LATENCY_SUPPORTED:
+                    self._web3.middleware_onion.add(RpcLatencyMiddleware, name="rpc_latency")
+                else:
+                    logger.warning("RPC latency tracing needs web3 7+; not recording RPC calls")
+
                 # Add custom middleware for POA chains
                 # TODO: Confirm if Base (8453) needs POA middleware
                 # if self._chain_id in (56, 97, 137, 80001):  # BSC, Polygon
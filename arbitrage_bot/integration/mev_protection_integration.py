@@ -165,6 +165,20 @@ async def execute_mev_protected_bundle(
 
                     # Simulate bundle
                     if self.simulation_manager:
+                        # Try higher tips concurrently, never below the MEV floor
+                        floor = optimized_bundle.get("priority_fee", 10**9) / 1e9
+                        best_variant, _ = (
+                            await self.simulation_manager.select_best_gas_variant(
+                                optimized_bundle,
+                                base_fee,
+                                priority_multipliers=tuple(
+                                    floor * step for step in (1.0, 1.1, 1.25, 1.5, 2.0)
+                                ),
+                            )
+                        )
+                        if best_variant is not None:
+                            optimized_bundle = best_variant
+
                         success, simulation_results = (
                             await self.simulation_manager.simulate_bundle(
                                 optimized_bundle
@@ -0,0 +1,514 @@
+"""
+Chain fixtures for offline replay.
+
+A fixture captures what the bot sees over a range of blocks: the V2 pools
+it tracks (tokens, fee and reserves before the first block), and per block
+the header fields, the pools' ``Sync`` logs and the pending transactions
+seen while the block was current. Fixtures are plain JSON (gzip-compressed
+when the file name ends in ``.gz``):
+
+    {
+        "version": 1,
+        "chain_id": 8453,
+        "start_block": 20000000,
+        "tokens": {"0xToken": {"symbol": "WETH", "decimals": 18}},
+        "dexes": {"baseswap": {"router": "0xRouter"}},
+        "pools": {"0xPool": {"dex": "baseswap", "token0": "0x..", "token1": "0x..",
+                             "fee": 3000, "reserve0": "0x..", "reserve1": "0x.."}},
+        "blocks": [{"number": 20000000, "timestamp": 1700000000,
+                    "base_fee": 100000000, "logs": [...], "pending": [...]}]
+    }
+
+Fixtures are recorded from a node with ``record_fixture``, generated with
+``synthesize_fixture``, and enlarged with ``scale_fixture`` to benchmark
+how the pipeline scales with the number of pools and pairs.
+"""
+
+import gzip
+import json
+import logging
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+from ..core.flashbots.fork_simulator import RESERVE_MASK, V2_RESERVES_SLOT
+from ..utils.fixed_point import get_amount_out
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+
+# keccak("Sync(uint112,uint112)")
+SYNC_TOPIC = "0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"
+
+# Function selectors served by the replay RPC and used when recording
+SELECTOR_GET_RESERVES = "0x0902f1ac"
+SELECTOR_TOKEN0 = "0x0dfe1681"
+SELECTOR_TOKEN1 = "0xd21220a7"
+SELECTOR_DECIMALS = "0x313ce567"
+SELECTOR_SYMBOL = "0x95d89b41"
+SELECTOR_SWAP_EXACT_TOKENS = "0x38ed1739"  # swapExactTokensForTokens
+
+
+def load_fixture(path: str) -> Dict[str, Any]:
+    """
+    Load a fixture file.
+
+    Args:
+        path: Fixture path (``.json`` or ``.json.gz``)
+
+    Returns:
+        Fixture dict
+
+    Raises:
+        ValueError: If the fixture was written by an unknown format version
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as f:
+        fixture = json.load(f)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(
+            f"Unsupported fixture version {fixture.get('version')} in {path}"
+        )
+    return fixture
+
+
+def save_fixture(fixture: Dict[str, Any], path: str) -> None:
+    """
+    Write a fixture file.
+
+    Args:
+        fixture: Fixture dict
+        path: Destination (gzip-compressed if it ends in ``.gz``)
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt") as f:
+        json.dump(fixture, f, separators=(",", ":"))
+
+
+def encode_sync_data(reserve0: int, reserve1: int) -> str:
+    """ABI-encode the data of a ``Sync(uint112,uint112)`` log."""
+    return "0x" + encode(["uint112", "uint112"], [reserve0, reserve1]).hex()
+
+
+def decode_sync_data(data: Any) -> Tuple[int, int]:
+    """Decode the reserves from the data of a ``Sync`` log."""
+    raw = bytes.fromhex(data[2:]) if isinstance(data, str) else bytes(data)
+    return tuple(decode(["uint112", "uint112"], raw))
+
+
+def pack_reserves(reserve0: int, reserve1: int, timestamp: int = 0) -> int:
+    """Pack reserves the way UniswapV2Pair stores them in slot 8."""
+    return (reserve0 & RESERVE_MASK) | ((reserve1 & RESERVE_MASK) << 112) | (
+        (timestamp & 0xFFFFFFFF) << 224
+    )
+
+
+def fixture_stats(fixture: Dict[str, Any]) -> Dict[str, int]:
+    """Count what a fixture contains."""
+    pairs = {
+        tuple(sorted((pool["token0"].lower(), pool["token1"].lower())))
+        for pool in fixture["pools"].values()
+    }
+    return {
+        "blocks": len(fixture["blocks"]),
+        "tokens": len(fixture["tokens"]),
+        "pools": len(fixture["pools"]),
+        "pairs": len(pairs),
+        "logs": sum(len(block["logs"]) for block in fixture["blocks"]),
+        "pending": sum(len(block["pending"]) for block in fixture["blocks"]),
+    }
+
+
+def _address(*parts: Any) -> str:
+    """Deterministic checksum address derived from ``parts``."""
+    return to_checksum_address(keccak(text=":".join(map(str, parts)))[-20:])
+
+
+def _hash(*parts: Any) -> str:
+    return "0x" + keccak(text=":".join(map(str, parts))).hex()
+
+
+def _swap_calldata(amount_in: int, path: List[str], to: str, deadline: int) -> str:
+    """Calldata for ``swapExactTokensForTokens(amountIn, 0, path, to, deadline)``."""
+    args = encode(
+        ["uint256", "uint256", "address[]", "address", "uint256"],
+        [amount_in, 0, path, to, deadline],
+    )
+    return SELECTOR_SWAP_EXACT_TOKENS + args.hex()
+
+
+def synthesize_fixture(
+    dexes: int = 2,
+    tokens: int = 8,
+    pairs: int = 12,
+    blocks: int = 50,
+    swaps_per_block: int = 6,
+    pending_per_block: int = 20,
+    seed: int = 1,
+    chain_id: int = 8453,
+    start_block: int = 20_000_000,
+) -> Dict[str, Any]:
+    """
+    Generate a deterministic fixture with realistic pool dynamics.
+
+    Every pair is listed on every DEX with a small price skew between them.
+    Each block applies random swaps (exact V2 math) to some pools, emitting
+    ``Sync`` logs, and carries pending router swaps as mempool load.
+
+    Args:
+        dexes: Number of DEXs
+        tokens: Number of tokens
+        pairs: Number of token pairs (each listed on every DEX)
+        blocks: Number of blocks
+        swaps_per_block: Pools touched by a swap per block
+        pending_per_block: Pending transactions per block
+        seed: Random seed
+        chain_id: Chain id reported by the replay RPC
+        start_block: First block number
+
+    Returns:
+        Fixture dict
+    """
+    rng = random.Random(seed)
+
+    token_info: Dict[str, Dict[str, Any]] = {}
+    prices: Dict[str, float] = {}
+    for i in range(tokens):
+        address = _address(seed, "token", i)
+        token_info[address] = {"symbol": f"TKN{i}", "decimals": rng.choice((18, 18, 6, 8))}
+        prices[address] = 10 ** rng.uniform(-2, 3.5)
+
+    dex_info = {
+        f"replay_{d}": {"router": _address(seed, "router", d), "name": f"Replay DEX {d}"}
+        for d in range(dexes)
+    }
+
+    addresses = sorted(token_info, key=str.lower)
+    candidates = [(a, b) for i, a in enumerate(addresses) for b in addresses[i + 1 :]]
+    rng.shuffle(candidates)
+
+    pools: Dict[str, Dict[str, Any]] = {}
+    reserves: Dict[str, List[int]] = {}
+    for token0, token1 in candidates[:pairs]:
+        liquidity = 10 ** rng.uniform(4.5, 6.5)  # in numeraire units per side
+        for dex_id in dex_info:
+            skew = 1 + rng.uniform(-0.004, 0.004)
+            pool = _address(seed, "pool", dex_id, token0, token1)
+            r0 = int(liquidity / prices[token0] * 10 ** token_info[token0]["decimals"])
+            r1 = int(liquidity * skew / prices[token1] * 10 ** token_info[token1]["decimals"])
+            pools[pool] = {
+                "dex": dex_id,
+                "token0": token0,
+                "token1": token1,
+                "fee": 3000,
+                "reserve0": hex(r0),
+                "reserve1": hex(r1),
+            }
+            reserves[pool] = [r0, r1]
+
+    pool_list = sorted(pools)
+    base_fee = 100_000_000  # 0.1 gwei
+    timestamp = 1_700_000_000
+    block_list = []
+    for n in range(blocks):
+        number = start_block + n
+        timestamp += 2
+        base_fee = max(1, int(base_fee * rng.uniform(0.875, 1.125)))
+
+        logs = []
+        for pool in rng.sample(pool_list, min(swaps_per_block, len(pool_list))):
+            r0, r1 = reserves[pool]
+            zero_for_one = rng.random() < 0.5
+            reserve_in = r0 if zero_for_one else r1
+            reserve_out = r1 if zero_for_one else r0
+            amount_in = max(1, int(reserve_in * rng.uniform(0.0005, 0.01)))
+            amount_out = get_amount_out(amount_in, reserve_in, reserve_out, pools[pool]["fee"])
+            if zero_for_one:
+                r0, r1 = r0 + amount_in, r1 - amount_out
+            else:
+                r0, r1 = r0 - amount_out, r1 + amount_in
+            reserves[pool] = [r0, r1]
+            logs.append(
+                {
+                    "address": pool,
+                    "topics": [SYNC_TOPIC],
+                    "data": encode_sync_data(r0, r1),
+                    "logIndex": len(logs),
+                    "transactionHash": _hash(seed, "swap", number, len(logs)),
+                }
+            )
+
+        pending = []
+        for i in range(pending_per_block):
+            pool = pools[rng.choice(pool_list)]
+            path = [pool["token0"], pool["token1"]]
+            if rng.random() < 0.5:
+                path.reverse()
+            sender = _address(seed, "trader", rng.randrange(1000))
+            amount = 10 ** token_info[path[0]]["decimals"] * rng.randint(1, 1000)
+            pending.append(
+                {
+                    "hash": _hash(seed, "pending", number, i),
+                    "from": sender,
+                    "to": dex_info[pool["dex"]]["router"],
+                    "input": _swap_calldata(amount, path, sender, timestamp + 120),
+                    "nonce": rng.randrange(10_000),
+                    "gas": 200_000,
+                    "maxFeePerGas": base_fee * 2 + 10**9,
+                    "maxPriorityFeePerGas": 10**9,
+                    "value": 0,
+                }
+            )
+
+        block_list.append(
+            {
+                "number": number,
+                "timestamp": timestamp,
+                "base_fee": base_fee,
+                "logs": logs,
+                "pending": pending,
+            }
+        )
+
+    return {
+        "version": FIXTURE_VERSION,
+        "chain_id": chain_id,
+        "start_block": start_block,
+        "tokens": token_info,
+        "dexes": dex_info,
+        "pools": pools,
+        "blocks": block_list,
+    }
+
+
+def scale_fixture(fixture: Dict[str, Any], factor: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Enlarge a fixture to ``factor`` times its pools, pairs and traffic.
+
+    Copy ``k`` of every token and pool gets its own address; pool reserves
+    are resized and slightly re-priced, and each block's ``Sync`` logs and
+    pending transactions are replicated for every copy, so the scaled chain
+    has the same per-pool dynamics over ``factor`` times the markets.
+
+    Args:
+        fixture: Fixture to scale
+        factor: Scale factor (1 returns the fixture unchanged)
+        seed: Random seed for the per-copy resizing
+
+    Returns:
+        Scaled fixture
+    """
+    if factor <= 1:
+        return fixture
+    rng = random.Random(seed)
+
+    def token_copy(address: str, k: int) -> str:
+        return address if k == 0 else _address("scaled", address, k)
+
+    tokens = {}
+    for address, info in fixture["tokens"].items():
+        for k in range(factor):
+            symbol = info["symbol"] if k == 0 else f"{info['symbol']}_{k}"
+            tokens[token_copy(address, k)] = {**info, "symbol": symbol}
+
+    pools = {}
+    pool_copies: Dict[str, List[Tuple[str, int, int]]] = {}
+    for address, pool in fixture["pools"].items():
+        copies = []
+        for k in range(factor):
+            new_address = address if k == 0 else _address("scaled", address, k)
+            # Scale reserves by (num0, num1) / 1000: size and a small price change
+            size = rng.randint(500, 2000) if k else 1000
+            num0, num1 = size, int(size * rng.uniform(0.997, 1.003)) if k else size
+            token0, token1 = token_copy(pool["token0"], k), token_copy(pool["token1"], k)
+            pools[new_address] = {
+                **pool,
+                "token0": token0,
+                "token1": token1,
+                "reserve0": hex(int(pool["reserve0"], 16) * num0 // 1000),
+                "reserve1": hex(int(pool["reserve1"], 16) * num1 // 1000),
+            }
+            copies.append((new_address, num0, num1))
+        pool_copies[address.lower()] = copies
+
+    blocks = []
+    for block in fixture["blocks"]:
+        logs = []
+        for log in block["logs"]:
+            copies = pool_copies.get(log["address"].lower())
+            if copies is None:
+                logs.append({**log, "logIndex": len(logs)})
+                continue
+            r0, r1 = decode_sync_data(log["data"])
+            for k, (address, num0, num1) in enumerate(copies):
+                logs.append(
+                    {
+                        **log,
+                        "address": address,
+                        "data": encode_sync_data(
+                            min(r0 * num0 // 1000, RESERVE_MASK), min(r1 * num1 // 1000, RESERVE_MASK)
+                        ),
+                        "logIndex": len(logs),
+                        "transactionHash": log["transactionHash"]
+                        if k == 0
+                        else _hash("scaled", log["transactionHash"], k),
+                    }
+                )
+        pending = [
+            tx if k == 0 else {**tx, "hash": _hash("scaled", tx["hash"], k)}
+            for tx in block["pending"]
+            for k in range(factor)
+        ]
+        blocks.append({**block, "logs": logs, "pending": pending})
+
+    return {**fixture, "tokens": tokens, "pools": pools, "blocks": blocks}
+
+
+async def _call(w3: Any, to: str, selector: str, block: Any = "latest") -> bytes:
+    return bytes(await w3.eth.call({"to": to, "data": selector}, block))
+
+
+async def record_fixture(
+    w3: Any,
+    pools: Dict[str, str],
+    routers: Dict[str, str],
+    from_block: int,
+    to_block: int,
+    fees: Optional[Dict[str, int]] = None,
+    log_chunk_size: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Record a fixture from a node.
+
+    Pool tokens and reserves are read at ``from_block - 1``. The pending
+    transactions of block ``n`` are the router transactions included in
+    block ``n + 1``: historical mempools are not available, and those are
+    the transactions the bot would have seen pending.
+
+    Args:
+        w3: Async web3 instance
+        pools: Pool address -> DEX id
+        routers: DEX id -> router address
+        from_block: First block to record
+        to_block: Last block to record (inclusive)
+        fees: Pool address -> fee in hundredths of a basis point (default 3000)
+        log_chunk_size: Blocks per ``eth_getLogs`` request
+
+    Returns:
+        Fixture dict
+    """
+    fees = {address.lower(): fee for address, fee in (fees or {}).items()}
+    state_block = from_block - 1
+
+    pool_info: Dict[str, Dict[str, Any]] = {}
+    tokens: Dict[str, Dict[str, Any]] = {}
+    for address, dex_id in pools.items():
+        address = to_checksum_address(address)
+        token0 = to_checksum_address(decode(["address"], await _call(w3, address, SELECTOR_TOKEN0, state_block))[0])
+        token1 = to_checksum_address(decode(["address"], await _call(w3, address, SELECTOR_TOKEN1, state_block))[0])
+        packed = int.from_bytes(
+            bytes(await w3.eth.get_storage_at(address, V2_RESERVES_SLOT, state_block)), "big"
+        )
+        pool_info[address] = {
+            "dex": dex_id,
+            "token0": token0,
+            "token1": token1,
+            "fee": fees.get(address.lower(), 3000),
+            "reserve0": hex(packed & RESERVE_MASK),
+            "reserve1": hex((packed >> 112) & RESERVE_MASK),
+        }
+        for token in (token0, token1):
+            if token not in tokens:
+                decimals = decode(["uint8"], await _call(w3, token, SELECTOR_DECIMALS, state_block))[0]
+                try:
+                    symbol = decode(["string"], await _call(w3, token, SELECTOR_SYMBOL, state_block))[0]
+                except Exception:
+                    symbol = token[:8]
+                tokens[token] = {"symbol": symbol, "decimals": decimals}
+
+    logs_by_block: Dict[int, List[Dict[str, Any]]] = {}
+    for start in range(from_block, to_block + 1, log_chunk_size):
+        end = min(start + log_chunk_size - 1, to_block)
+        logs = await w3.eth.get_logs(
+            {
+                "fromBlock": start,
+                "toBlock": end,
+                "address": list(pool_info),
+                "topics": [SYNC_TOPIC],
+            }
+        )
+        for log in logs:
+            logs_by_block.setdefault(log["blockNumber"], []).append(
+                {
+                    "address": to_checksum_address(log["address"]),
+                    "topics": [_hex(topic) for topic in log["topics"]],
+                    "data": _hex(log["data"]),
+                    "logIndex": log["logIndex"],
+                    "transactionHash": _hex(log["transactionHash"]),
+                }
+            )
+
+    router_set = {router.lower() for router in routers.values()}
+    blocks = []
+    included = await w3.eth.get_block(from_block, full_transactions=True)
+    for number in range(from_block, to_block + 1):
+        block = included
+        try:
+            included = await w3.eth.get_block(number + 1, full_transactions=True)
+        except Exception:
+            included = None
+        pending = []
+        for tx in (included or {}).get("transactions", []):
+            if tx.get("to") and tx["to"].lower() in router_set:
+                pending.append(_pending_tx(tx))
+        blocks.append(
+            {
+                "number": number,
+                "timestamp": block["timestamp"],
+                "base_fee": block.get("baseFeePerGas", 0),
+                "logs": logs_by_block.get(number, []),
+                "pending": pending,
+            }
+        )
+        logger.debug(f"Recorded block {number}")
+
+    return {
+        "version": FIXTURE_VERSION,
+        "chain_id": await w3.eth.chain_id,
+        "start_block": from_block,
+        "tokens": tokens,
+        "dexes": {dex_id: {"router": to_checksum_address(router)} for dex_id, router in routers.items()},
+        "pools": pool_info,
+        "blocks": blocks,
+    }
+
+
+def _hex(value: Any) -> str:
+    if isinstance(value, str):
+        return value if value.startswith("0x") else "0x" + value
+    return "0x" + bytes(value).hex()
+
+
+def _pending_tx(tx: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "hash": _hex(tx["hash"]),
+        "from": tx["from"],
+        "to": tx["to"],
+        "input": _hex(tx["input"]),
+        "nonce": tx["nonce"],
+        "gas": tx["gas"],
+        "maxFeePerGas": tx.get("maxFeePerGas", tx.get("gasPrice", 0)),
+        "maxPriorityFeePerGas": tx.get("maxPriorityFeePerGas", 0),
+        "value": tx.get("value", 0),
+    }
+
+
+def iter_pool_logs(block: Dict[str, Any]) -> Iterable[Tuple[str, int, int]]:
+    """Yield (pool, reserve0, reserve1) for each ``Sync`` log in a fixture block."""
+    for log in block["logs"]:
+        if log["topics"] and log["topics"][0].lower() == SYNC_TOPIC:
+            reserve0, reserve1 = decode_sync_data(log["data"])
+            yield log["address"], reserve0, reserve1
@@ -0,0 +1,605 @@
+"""
+Block-replay benchmark.
+
+Replays a chain fixture block by block through the bot's pipeline against a
+``ReplayProvider``, with no node or network:
+
+1. State refresh: ``BlockIngester`` ingests the block, then its ``Sync``
+   logs and the pending block are fetched over RPC and applied to the
+   local pool view
+2. Detection: ``CrossDexDetector`` runs over the replayed DEXs
+3. Evaluation: each candidate pair is re-priced exactly and sized for
+   maximum profit in both route directions
+4. Build and sign: router swap transactions for the profitable routes are
+   signed into candidates by ``BundleManager.build_candidate``
+5. Simulation: bundles are simulated with the fork simulator against the
+   replayed state and successful ones are submitted to the replay node
+
+Not every stage runs production code. The pool graph and path finders
+cannot be imported in this tree and ``BasicValidator`` does not accept the
+detector's opportunities, so applying ``Sync`` logs, evaluation and router
+calldata are harness code. Those stages are listed in ``HARNESS_STAGES``
+and in each report's ``harness_stages``; their latencies measure the
+harness, not the bot.
+
+Stage latencies go through a dedicated ``LatencyTracer`` (the same
+histograms production exports), so reports compare directly with live
+numbers. Each run reports throughput, per-stage latency, RPC traffic and
+memory; ``compare_reports`` flags regressions against a saved baseline.
+"""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import psutil
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import keccak
+from web3 import AsyncWeb3
+
+from ..core.arbitrage.discovery.detectors.cross_dex_detector import CrossDexDetector
+from ..core.flashbots.bundle import BundleManager
+from ..core.flashbots.fork_simulator import ForkSimulationBackend, ForkState
+from ..core.flashbots.simulation_service import SimulationService
+from ..core.monitoring.block_ingester import BlockIngester, BlockRecord
+from ..core.web3.rpc_latency import RPC_LATENCY_SUPPORTED, RpcLatencyMiddleware
+from ..dex.base_dex import BaseDEX
+from ..utils.fixed_point import FEE_DENOMINATOR, get_amount_out
+from ..utils.latency import (
+    CANDIDATES_GENERATED,
+    PATHS_EVALUATED,
+    STATE_REFRESHED,
+    TX_BUILT,
+    TX_SIGNED,
+    TX_SUBMITTED,
+    LatencyTracer,
+    get_tracer,
+    mark,
+    set_tracer,
+    span,
+    start_trace,
+    summarize,
+)
+from .chain_fixtures import SELECTOR_SWAP_EXACT_TOKENS, SYNC_TOPIC, decode_sync_data, fixture_stats
+from .replay_rpc import DEFAULT_PRIORITY_FEE, ReplayChain, ReplayProvider
+
+logger = logging.getLogger(__name__)
+
+SWAP_GAS = 150_000
+SLIPPAGE_BPS = 50
+# Test key for signing replayed bundles; never holds funds
+SEARCHER_KEY = keccak(text="listonian-replay-searcher")
+
+# Stages timed on harness code rather than production components
+HARNESS_STAGES = {
+    STATE_REFRESHED: "Sync logs applied to the harness pool view (pool graph not importable)",
+    PATHS_EVALUATED: "routes sized by best_trade (BasicValidator rejects detector opportunities)",
+    TX_BUILT: "router calldata assembled by the harness",
+}
+
+# Metrics compared by ``compare_reports``: (path, higher is better)
+REGRESSION_METRICS = (
+    (("blocks_per_second",), True),
+    (("block_ms", "p50_ms"), False),
+    (("block_ms", "p99_ms"), False),
+    (("memory", "peak_rss_delta_mb"), False),
+)
+
+
+@dataclass
+class ReplayPair:
+    """Token pair listed on a replayed DEX."""
+
+    token0_address: str
+    token1_address: str
+    pool_address: str
+    reserve0: Decimal
+    reserve1: Decimal
+    fee: Decimal
+    dex_id: str
+    token0_decimals: int = 18
+    token1_decimals: int = 18
+    token0_symbol: str = "TOKEN0"
+    token1_symbol: str = "TOKEN1"
+
+
+class ReplayDex(BaseDEX):
+    """V2 DEX quoting from the benchmark's local view of pool reserves."""
+
+    def __init__(self, web3_manager: Any, config: Dict[str, Any], benchmark: "ReplayBenchmark"):
+        """
+        Initialize the DEX.
+
+        Args:
+            web3_manager: Object exposing the replay web3 instance as ``w3``
+            config: DEX config (``id``, ``name``, ``router``)
+            benchmark: Benchmark holding the pool view
+        """
+        super().__init__(web3_manager, config)
+        self.benchmark = benchmark
+        self.router = config["router"]
+        self.pools = {
+            frozenset((pool["token0"].lower(), pool["token1"].lower())): address
+            for address, pool in benchmark.pools.items()
+            if pool["dex"] == self.id
+        }
+
+    async def initialize(self) -> bool:
+        return True
+
+    async def get_token_pairs(self, max_pairs: int = 200) -> List[ReplayPair]:
+        """Token pairs of this DEX with current reserves."""
+        pairs = []
+        for address in list(self.pools.values())[:max_pairs]:
+            pool = self.benchmark.pools[address]
+            token0 = self.benchmark.tokens[pool["token0"].lower()]
+            token1 = self.benchmark.tokens[pool["token1"].lower()]
+            reserve0, reserve1 = self.benchmark.reserves[address]
+            pairs.append(
+                ReplayPair(
+                    token0_address=pool["token0"],
+                    token1_address=pool["token1"],
+                    pool_address=address,
+                    reserve0=self.from_wei(reserve0, token0["decimals"]),
+                    reserve1=self.from_wei(reserve1, token1["decimals"]),
+                    fee=Decimal(pool["fee"]) / Decimal(10_000),
+                    dex_id=self.id,
+                    token0_decimals=token0["decimals"],
+                    token1_decimals=token1["decimals"],
+                    token0_symbol=token0["symbol"],
+                    token1_symbol=token1["symbol"],
+                )
+            )
+        return pairs
+
+    async def get_pool_address(self, token_a: str, token_b: str, **kwargs) -> str:
+        address = self.pools.get(frozenset((token_a.lower(), token_b.lower())))
+        if address is None:
+            raise ValueError(f"No {self.id} pool for {token_a}/{token_b}")
+        return address
+
+    async def get_reserves(self, pool_address: str) -> Tuple[Decimal, Decimal]:
+        reserve0, reserve1 = self.benchmark.reserves[pool_address.lower()]
+        return Decimal(reserve0), Decimal(reserve1)
+
+    async def get_amounts_out(self, amount_in: Decimal, path: List[str], **kwargs) -> List[Decimal]:
+        """Quote a path (human-readable amounts) with exact V2 math."""
+        amounts = [amount_in]
+        amount = self.to_wei(amount_in, self.benchmark.decimals(path[0]))
+        for token_in, token_out in zip(path, path[1:]):
+            address = await self.get_pool_address(token_in, token_out)
+            reserve_in, reserve_out = self.benchmark.directed_reserves(address, token_in)
+            amount = get_amount_out(amount, reserve_in, reserve_out, self.benchmark.pools[address]["fee"])
+            amounts.append(self.from_wei(amount, self.benchmark.decimals(token_out)))
+        return amounts
+
+    async def get_price_impact(self, amount_in: Decimal, amount_out: Decimal, pool_address: str) -> float:
+        reserve0, _ = self.benchmark.reserves[pool_address.lower()]
+        return float(amount_in / (Decimal(reserve0) + amount_in)) if reserve0 else 1.0
+
+    async def get_pool_fee(self, pool_address: str) -> Decimal:
+        return Decimal(self.benchmark.pools[pool_address.lower()]["fee"]) / Decimal(FEE_DENOMINATOR)
+
+    async def get_pool_info(self, pool_address: str) -> Dict[str, Any]:
+        reserve0, reserve1 = self.benchmark.reserves[pool_address.lower()]
+        return {**self.benchmark.pools[pool_address.lower()], "reserve0": reserve0, "reserve1": reserve1}
+
+    async def validate_pool(self, pool_address: str) -> bool:
+        return pool_address.lower() in self.benchmark.pools
+
+    async def estimate_gas(self, amount_in, amount_out_min, path, to, **kwargs) -> int:
+        return SWAP_GAS * (len(path) - 1)
+
+    async def build_swap_transaction(self, amount_in, amount_out_min, path, to, deadline, **kwargs) -> Dict[str, Any]:
+        return {"to": self.router, "data": swap_calldata(int(amount_in), int(amount_out_min), path, to, deadline)}
+
+    async def decode_swap_error(self, error: Exception) -> str:
+        return str(error)
+
+
+def swap_calldata(amount_in: int, amount_out_min: int, path: List[str], to: str, deadline: int) -> str:
+    """Calldata for ``swapExactTokensForTokens``."""
+    args = encode(
+        ["uint256", "uint256", "address[]", "address", "uint256"],
+        [amount_in, amount_out_min, path, to, deadline],
+    )
+    return SELECTOR_SWAP_EXACT_TOKENS + args.hex()
+
+
+def best_trade(
+    reserves_a: Tuple[int, int], fee_a: int, reserves_b: Tuple[int, int], fee_b: int
+) -> Tuple[int, int]:
+    """
+    Size a two-pool round trip for maximum profit.
+
+    Swaps ``x`` in through pool A and the output back through pool B. The
+    profit is concave in ``x``, so a ternary search over integers finds the
+    exact optimum.
+
+    Args:
+        reserves_a: (reserve_in, reserve_out) of the first pool
+        fee_a: First pool fee (hundredths of a basis point)
+        reserves_b: (reserve_in, reserve_out) of the second pool
+        fee_b: Second pool fee (hundredths of a basis point)
+
+    Returns:
+        Tuple of (amount_in, profit); (0, 0) if no size is profitable
+    """
+
+    def profit(x: int) -> int:
+        middle = get_amount_out(x, reserves_a[0], reserves_a[1], fee_a)
+        if middle <= 0:
+            return -x
+        return get_amount_out(middle, reserves_b[0], reserves_b[1], fee_b) - x
+
+    low, high = 1, reserves_a[0] // 2
+    while high - low > 2:
+        third = (high - low) // 3
+        if profit(low + third) < profit(high - third):
+            low = low + third + 1
+        else:
+            high = high - third
+    amount = max(range(low, high + 1), key=profit)
+    best = profit(amount)
+    return (amount, best) if best > 0 else (0, 0)
+
+
+class ReplayBenchmark:
+    """Drives a fixture through the detection, evaluation and build pipeline."""
+
+    def __init__(
+        self,
+        fixture: Dict[str, Any],
+        latency: float = 0.0,
+        max_candidates: int = 20,
+        min_profit_percentage: str = "0.05",
+    ):
+        """
+        Initialize the benchmark.
+
+        Args:
+            fixture: Chain fixture to replay
+            latency: Emulated RPC round trip in seconds
+            max_candidates: Candidates taken from the detector per block
+            min_profit_percentage: Detector price difference threshold
+        """
+        self.fixture = fixture
+        self.max_candidates = max_candidates
+        self.tokens = {address.lower(): info for address, info in fixture["tokens"].items()}
+        self.pools = {address.lower(): info for address, info in fixture["pools"].items()}
+        self.reserves = {
+            address: [int(pool["reserve0"], 16), int(pool["reserve1"], 16)]
+            for address, pool in self.pools.items()
+        }
+
+        self.chain = ReplayChain(fixture)
+        self.provider = ReplayProvider(self.chain, latency=latency)
+        self.w3 = AsyncWeb3(self.provider)
+        if RPC_LATENCY_SUPPORTED:
+            self.w3.middleware_onion.add(RpcLatencyMiddleware, name="rpc_latency")
+        self.account = Account.from_key(SEARCHER_KEY)
+        self.nonce = 0
+
+        manager = SimpleNamespace(w3=self.w3)
+        self.ingester = BlockIngester(manager, start_block=fixture["start_block"], max_blocks_per_poll=1)
+        self.dexes = {
+            dex_id: ReplayDex(manager, {"id": dex_id, "name": info.get("name", dex_id), **info}, self)
+            for dex_id, info in fixture["dexes"].items()
+        }
+        self.detector = CrossDexDetector(
+            list(self.dexes.values()),
+            {
+                "cache_ttl_seconds": 0,  # state changes every block
+                "max_pairs_per_dex": len(self.pools),
+                "min_profit_percentage": min_profit_percentage,
+            },
+        )
+        self.backend = ForkSimulationBackend(
+            ForkState(self.w3), searcher=self.account.address, default_gas=2 * SWAP_GAS
+        )
+        self.simulator = SimulationService(self.backend, max_concurrency=8)
+        self.bundle_manager = BundleManager(
+            SimpleNamespace(account=self.account),
+            min_profit=Decimal(0),
+            max_gas_price=Decimal(1000),
+            max_priority_fee=Decimal(100),
+            simulation_service=self.simulator,
+        )
+
+        # Statistics
+        self.blocks = 0
+        self.candidates = 0
+        self.profitable = 0
+        self.bundles = 0
+        self.pending_swaps = 0
+
+    def decimals(self, token: str) -> int:
+        return self.tokens[token.lower()]["decimals"]
+
+    def directed_reserves(self, pool: str, token_in: str) -> Tuple[int, int]:
+        """Pool reserves as (reserve_in, reserve_out) for a swap from ``token_in``."""
+        reserve0, reserve1 = self.reserves[pool.lower()]
+        if self.pools[pool.lower()]["token0"].lower() == token_in.lower():
+            return reserve0, reserve1
+        return reserve1, reserve0
+
+    async def process_block(self) -> bool:
+        """
+        Replay the next block through the pipeline.
+
+        Returns:
+            False when the fixture is exhausted
+        """
+        block = self.chain.advance()
+        if block is None:
+            return False
+        start_trace(block["number"])
+
+        record = (await self.ingester.poll_once())[0]
+        number = record.number
+        await self._refresh_state(number)
+        mark(STATE_REFRESHED)
+
+        with span("detector.cross_dex"):
+            opportunities = await self.detector.detect_opportunities(
+                market_condition={"gas_price": record.base_fee, "priority_fee": DEFAULT_PRIORITY_FEE},
+                max_results=self.max_candidates,
+            )
+        self.candidates += len(opportunities)
+        mark(CANDIDATES_GENERATED)
+
+        routes = self._evaluate(opportunities, record.base_fee)
+        mark(PATHS_EVALUATED)
+        if not routes:
+            self.blocks += 1
+            return True
+
+        bundles = [
+            {
+                "transactions": self._build(route, record),
+                "target_block": number + 1,
+                "priority_fee": DEFAULT_PRIORITY_FEE,
+                "amount_in": route["amount_in"],
+                "route": route["hops"],
+            }
+            for route in routes
+        ]
+        mark(TX_BUILT)
+        candidates = [self.bundle_manager.build_candidate(bundle) for bundle in bundles]
+        mark(TX_SIGNED)
+
+        self.backend.base_fee = record.base_fee
+        with span("replay.simulate"):
+            outcomes = await self.simulator.simulate_many(candidates)
+        for candidate, outcome in zip(candidates, outcomes):
+            if outcome.success:
+                await self.w3.manager.coro_request(
+                    "eth_sendBundle",
+                    [{"txs": list(candidate.signed_transactions), "blockNumber": hex(number + 1)}],
+                )
+                self.bundles += 1
+        mark(TX_SUBMITTED)
+        self.blocks += 1
+        return True
+
+    async def _refresh_state(self, number: int) -> None:
+        """
+        Apply the block's ``Sync`` logs and decode pending router swaps.
+
+        Harness-only: production applies logs through the pool graph, which
+        cannot be imported in this tree.
+        """
+        logs, pending = await asyncio.gather(
+            self.w3.eth.get_logs({"fromBlock": number, "toBlock": number, "topics": [SYNC_TOPIC]}),
+            self.w3.eth.get_block("pending", full_transactions=True),
+        )
+        for log in logs:
+            pool = log["address"].lower()
+            if pool in self.reserves:
+                self.reserves[pool] = list(decode_sync_data(log["data"]))
+
+        for tx in pending["transactions"]:
+            data = bytes(tx["input"])
+            if data[:4].hex() == SELECTOR_SWAP_EXACT_TOKENS[2:]:
+                decode(["uint256", "uint256", "address[]", "address", "uint256"], data[4:])
+                self.pending_swaps += 1
+
+    def _evaluate(self, opportunities: List[Any], base_fee: int) -> List[Dict[str, Any]]:
+        """
+        Size each candidate pair exactly; keep routes that pay for their gas.
+
+        Harness-only: the path finders cannot be imported in this tree and
+        ``BasicValidator`` requires opportunity fields the detector does not set.
+        """
+        # Same accounting as the simulator: gas is charged against the route output
+        gas_cost = (base_fee + DEFAULT_PRIORITY_FEE) * 2 * SWAP_GAS
+        routes = []
+        seen = set()
+        for opportunity in opportunities:
+            token = opportunity.token_in
+            other = opportunity.path[0]["output_token_address"]
+            pools = [
+                self.dexes[dex_id].pools.get(frozenset((token.lower(), other.lower())))
+                for dex_id in opportunity.dexes
+            ]
+            key = (token.lower(), frozenset(pools))
+            if None in pools or key in seen:
+                continue
+            seen.add(key)
+
+            # The detector's buy/sell order is a hint; price both directions
+            best = None
+            for first, second in (pools, pools[::-1]):
+                amount_in, profit = best_trade(
+                    self.directed_reserves(first, token),
+                    self.pools[first]["fee"],
+                    self.directed_reserves(second, other),
+                    self.pools[second]["fee"],
+                )
+                if profit > gas_cost and (best is None or profit > best["profit"]):
+                    best = {"pools": (first, second), "amount_in": amount_in, "profit": profit}
+            if best is None:
+                continue
+
+            first, second = best["pools"]
+            middle = get_amount_out(best["amount_in"], *self.directed_reserves(first, token), self.pools[first]["fee"])
+            best.update(
+                tokens=(token, other),
+                middle=middle,
+                hops=[
+                    {
+                        "pool": pool,
+                        "zero_for_one": self.pools[pool]["token0"].lower() == token_in.lower(),
+                        "fee": self.pools[pool]["fee"] // 100,  # basis points
+                    }
+                    for pool, token_in in ((first, token), (second, other))
+                ],
+            )
+            routes.append(best)
+        self.profitable += len(routes)
+        return routes
+
+    def _build(self, route: Dict[str, Any], record: BlockRecord) -> List[Dict[str, Any]]:
+        """Unsigned router transactions for a two-pool round trip (harness-only)."""
+        token, other = route["tokens"]
+        first, second = route["pools"]
+        deadline = record.timestamp + 120
+        legs = (
+            (first, route["amount_in"], route["middle"], [token, other]),
+            (second, route["middle"], route["amount_in"] + route["profit"], [other, token]),
+        )
+        transactions = []
+        for pool, amount_in, amount_out, path in legs:
+            router = self.dexes[self.pools[pool]["dex"]].router
+            transactions.append(
+                {
+                    "chainId": self.chain.chain_id,
+                    "nonce": self.nonce,
+                    "to": router,
+                    "data": swap_calldata(
+                        amount_in, amount_out * (10_000 - SLIPPAGE_BPS) // 10_000,
+                        path, self.account.address, deadline,
+                    ),
+                    "gas": SWAP_GAS,
+                    "maxFeePerGas": record.base_fee * 2 + DEFAULT_PRIORITY_FEE,
+                    "maxPriorityFeePerGas": DEFAULT_PRIORITY_FEE,
+                    "value": 0,
+                    "type": 2,
+                }
+            )
+            self.nonce += 1
+        return transactions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pipeline counters."""
+        return {
+            "blocks": self.blocks,
+            "candidates": self.candidates,
+            "profitable": self.profitable,
+            "bundles": self.bundles,
+            "pending_swaps": self.pending_swaps,
+        }
+
+
+async def run_replay_benchmark(
+    fixture: Dict[str, Any],
+    latency: float = 0.0,
+    max_candidates: int = 20,
+    trace_memory: bool = False,
+) -> Dict[str, Any]:
+    """
+    Replay every block of a fixture and report throughput, latency and memory.
+
+    The global latency tracer is swapped for a fresh one during the run, so
+    the report contains only replayed blocks.
+
+    Args:
+        fixture: Chain fixture to replay
+        latency: Emulated RPC round trip in seconds
+        max_candidates: Candidates taken from the detector per block
+        trace_memory: Also report the Python heap peak (slows the run)
+
+    Returns:
+        Benchmark report
+    """
+    previous = get_tracer()
+    tracer = LatencyTracer()
+    set_tracer(tracer)
+    process = psutil.Process()
+    rss_start = peak_rss = process.memory_info().rss
+    if trace_memory:
+        tracemalloc.start()
+
+    benchmark = ReplayBenchmark(fixture, latency=latency, max_candidates=max_candidates)
+    try:
+        started = time.perf_counter()
+        while True:
+            block_started = time.perf_counter()
+            if not await benchmark.process_block():
+                break
+            tracer.record_span("replay.block", time.perf_counter() - block_started)
+            peak_rss = max(peak_rss, process.memory_info().rss)
+        duration = time.perf_counter() - started
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        set_tracer(previous)
+
+    latency_summary = summarize(tracer.snapshot())
+    memory = {
+        "rss_start_mb": rss_start / 2**20,
+        "peak_rss_mb": peak_rss / 2**20,
+        "peak_rss_delta_mb": (peak_rss - rss_start) / 2**20,
+    }
+    if traced_peak is not None:
+        memory["traced_peak_mb"] = traced_peak / 2**20
+
+    return {
+        "fixture": fixture_stats(fixture),
+        **benchmark.get_stats(),
+        "duration_s": duration,
+        "blocks_per_second": benchmark.blocks / duration if duration > 0 else 0.0,
+        "block_ms": latency_summary["spans"].pop("replay.block", {}),
+        "stages": latency_summary["stages"],
+        "spans": latency_summary["spans"],
+        "rpc": latency_summary["rpc"],
+        "rpc_requests": dict(benchmark.provider.requests),
+        "simulation": benchmark.simulator.get_stats(),
+        "ingester": benchmark.ingester.get_stats(),
+        "harness_stages": dict(HARNESS_STAGES),
+        "memory": memory,
+    }
+
+
+def compare_reports(
+    current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float = 0.2
+) -> List[str]:
+    """
+    Compare a report with a baseline.
+
+    Args:
+        current: Report from this run
+        baseline: Report to compare with (same fixture and scale)
+        max_regression: Allowed relative change in the bad direction
+
+    Returns:
+        Descriptions of metrics that regressed by more than ``max_regression``
+    """
+    regressions = []
+    for path, higher_is_better in REGRESSION_METRICS:
+        now, before = current, baseline
+        for key in path:
+            now, before = (now or {}).get(key), (before or {}).get(key)
+        if not isinstance(now, (int, float)) or not isinstance(before, (int, float)) or before <= 0:
+            continue
+        change = (now - before) / before
+        if (-change if higher_is_better else change) > max_regression:
+            regressions.append(f"{'.'.join(path)}: {before:.3f} -> {now:.3f} ({change:+.1%})")
+    return regressions
@@ -0,0 +1,403 @@
+"""
+Stand-in JSON-RPC node that replays a chain fixture.
+
+``ReplayChain`` walks the blocks of a fixture (see ``chain_fixtures``),
+applying each block's ``Sync`` logs to the pool reserves and keeping their
+history, so state can be read at any block up to the head. ``ReplayProvider``
+serves it to web3 as an async provider: blocks, logs, V2 reserve storage,
+the ``eth_call`` getters the bot uses, and the pending block, while
+recording submitted transactions and bundles. Nothing leaves the process,
+so the bot's RPC paths (middleware, formatters, retries) run unchanged
+against recorded data without a node or network.
+"""
+
+import asyncio
+import bisect
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from eth_abi import encode
+from eth_utils import keccak
+from web3.providers.async_base import AsyncBaseProvider
+
+from ..core.flashbots.fork_simulator import V2_RESERVES_SLOT
+from .chain_fixtures import (
+    SELECTOR_DECIMALS,
+    SELECTOR_GET_RESERVES,
+    SELECTOR_SYMBOL,
+    SELECTOR_TOKEN0,
+    SELECTOR_TOKEN1,
+    iter_pool_logs,
+    pack_reserves,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIORITY_FEE = 10**9  # 1 gwei
+BLOCK_GAS_LIMIT = 30_000_000
+ZERO_WORD = "0x" + "00" * 32
+
+
+class ReplayError(Exception):
+    """JSON-RPC error returned by the replay node."""
+
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+
+class ReplayChain:
+    """Block cursor over a fixture with per-pool reserve history."""
+
+    def __init__(self, fixture: Dict[str, Any]):
+        """
+        Initialize the chain at the state before the fixture's first block.
+
+        Args:
+            fixture: Chain fixture
+        """
+        self.fixture = fixture
+        self.chain_id = fixture.get("chain_id", 1)
+        self.start_block = fixture["start_block"]
+        self.blocks: List[Dict[str, Any]] = fixture["blocks"]
+        self.position = -1  # index of the head in ``blocks``; -1 is the initial state
+
+        self.tokens = {address.lower(): info for address, info in fixture["tokens"].items()}
+        self.pools = {address.lower(): info for address, info in fixture["pools"].items()}
+
+        # Per pool: block numbers of reserve updates and (reserve0, reserve1, timestamp)
+        genesis = self.start_block - 1
+        timestamp = self.blocks[0]["timestamp"] - 2 if self.blocks else 0
+        self._updates: Dict[str, List[int]] = {}
+        self._reserves: Dict[str, List[tuple]] = {}
+        for address, pool in self.pools.items():
+            self._updates[address] = [genesis]
+            self._reserves[address] = [
+                (int(pool["reserve0"], 16), int(pool["reserve1"], 16), timestamp)
+            ]
+
+    @property
+    def head_number(self) -> int:
+        """Number of the current head block."""
+        return self.start_block + self.position
+
+    @property
+    def head(self) -> Optional[Dict[str, Any]]:
+        """Fixture record of the head block (None before the first block)."""
+        return self.blocks[self.position] if self.position >= 0 else None
+
+    @property
+    def finished(self) -> bool:
+        """Whether every block has been replayed."""
+        return self.position + 1 >= len(self.blocks)
+
+    def advance(self) -> Optional[Dict[str, Any]]:
+        """
+        Make the next fixture block the head and apply its ``Sync`` logs.
+
+        Returns:
+            The new head block, or None when the fixture is exhausted
+        """
+        if self.finished:
+            return None
+        self.position += 1
+        block = self.blocks[self.position]
+        for pool, reserve0, reserve1 in iter_pool_logs(block):
+            key = pool.lower()
+            if key not in self._updates:
+                continue
+            if self._updates[key][-1] == block["number"]:
+                self._reserves[key][-1] = (reserve0, reserve1, block["timestamp"])
+            else:
+                self._updates[key].append(block["number"])
+                self._reserves[key].append((reserve0, reserve1, block["timestamp"]))
+        return block
+
+    def block(self, number: int) -> Optional[Dict[str, Any]]:
+        """Fixture record of a block at or below the head."""
+        index = number - self.start_block
+        if index < 0 or index > self.position:
+            return None
+        return self.blocks[index]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Transactions pending while the head is current."""
+        head = self.head
+        return head["pending"] if head is not None else []
+
+    def reserves(self, pool: str, number: Optional[int] = None) -> tuple:
+        """
+        Reserves of a pool at a block.
+
+        Args:
+            pool: Pool address
+            number: Block number (default: head)
+
+        Returns:
+            Tuple of (reserve0, reserve1, last update timestamp)
+
+        Raises:
+            ReplayError: If the block is after the head or the pool is unknown
+        """
+        number = self.head_number if number is None else number
+        if number > self.head_number:
+            raise ReplayError(f"Block {number} is after the head {self.head_number}")
+        key = pool.lower()
+        if key not in self._updates:
+            raise ReplayError(f"Unknown pool {pool}")
+        index = bisect.bisect_right(self._updates[key], number) - 1
+        if index < 0:
+            raise ReplayError(f"State for {pool} at block {number} predates the fixture")
+        return self._reserves[key][index]
+
+    def logs(
+        self,
+        from_block: int,
+        to_block: int,
+        addresses: Optional[set] = None,
+        topics: Optional[List[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Logs of blocks in ``[from_block, to_block]`` (capped at the head)."""
+        results = []
+        for number in range(max(from_block, self.start_block), min(to_block, self.head_number) + 1):
+            block = self.blocks[number - self.start_block]
+            for log in block["logs"]:
+                if addresses and log["address"].lower() not in addresses:
+                    continue
+                if topics and not _topics_match(log["topics"], topics):
+                    continue
+                results.append((block, log))
+        return [_format_log(block, log) for block, log in results]
+
+
+class ReplayProvider(AsyncBaseProvider):
+    """Async web3 provider serving a ``ReplayChain``."""
+
+    def __init__(self, chain: ReplayChain, latency: float = 0.0):
+        """
+        Initialize the provider.
+
+        Args:
+            chain: Chain to serve
+            latency: Seconds each request takes, to emulate a remote node
+        """
+        super().__init__()
+        self.chain = chain
+        self.latency = latency
+
+        self.transactions: List[str] = []
+        self.bundles: List[Dict[str, Any]] = []
+        self.requests: Counter = Counter()
+        self._handlers = {
+            "eth_chainId": lambda: hex(self.chain.chain_id),
+            "net_version": lambda: str(self.chain.chain_id),
+            "web3_clientVersion": lambda: "replay/1.0",
+            "eth_blockNumber": lambda: hex(self.chain.head_number),
+            "eth_getBlockByNumber": self._get_block_by_number,
+            "eth_getLogs": self._get_logs,
+            "eth_getStorageAt": self._get_storage_at,
+            "eth_call": self._call,
+            "eth_gasPrice": self._gas_price,
+            "eth_maxPriorityFeePerGas": lambda: hex(DEFAULT_PRIORITY_FEE),
+            "eth_getBalance": lambda address, block="latest": "0x0",
+            "eth_getTransactionCount": lambda address, block="latest": "0x0",
+            "eth_sendRawTransaction": self._send_raw_transaction,
+            "eth_sendBundle": self._send_bundle,
+        }
+
+    async def make_request(self, method: str, params: Any) -> Dict[str, Any]:
+        """Serve one JSON-RPC request."""
+        self.requests[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        handler = self._handlers.get(method)
+        if handler is None:
+            return _error(f"Method {method} is not supported by the replay node", -32601)
+        try:
+            return {"jsonrpc": "2.0", "id": self.requests[method], "result": handler(*(params or ()))}
+        except ReplayError as e:
+            return _error(str(e), e.code)
+        except (KeyError, TypeError, ValueError) as e:
+            return _error(f"Invalid params for {method}: {e}", -32602)
+
+    async def make_batch_request(self, requests: List[Any]) -> List[Dict[str, Any]]:
+        """Serve a batch of (method, params) requests."""
+        return [await self.make_request(method, params) for method, params in requests]
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request counts and submissions."""
+        return {
+            "head": self.chain.head_number,
+            "requests": dict(self.requests),
+            "transactions": len(self.transactions),
+            "bundles": len(self.bundles),
+        }
+
+    def _block_number(self, tag: Any) -> int:
+        if tag in ("latest", "safe", "finalized", None):
+            return self.chain.head_number
+        if tag == "earliest":
+            return self.chain.start_block - 1
+        if tag == "pending":
+            return self.chain.head_number + 1
+        return int(tag, 16) if isinstance(tag, str) else int(tag)
+
+    def _get_block_by_number(self, tag: Any, full_transactions: bool = False) -> Optional[Dict[str, Any]]:
+        head = self.chain.head
+        if tag == "pending":
+            if head is None:
+                return None
+            number = head["number"] + 1
+            header = {**head, "number": number, "timestamp": head["timestamp"] + 2}
+            return _format_block(header, self.chain.pending(), full_transactions, self.chain.chain_id, pending=True)
+
+        number = self._block_number(tag)
+        block = self.chain.block(number)
+        if block is None:
+            return None
+        # Transactions pending at the previous block are the ones it includes
+        previous = self.chain.block(number - 1)
+        included = previous["pending"] if previous is not None else []
+        return _format_block(block, included, full_transactions, self.chain.chain_id)
+
+    def _get_logs(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        address = params.get("address")
+        if isinstance(address, str):
+            address = [address]
+        return self.chain.logs(
+            self._block_number(params.get("fromBlock", "latest")),
+            self._block_number(params.get("toBlock", "latest")),
+            {a.lower() for a in address} if address else None,
+            params.get("topics"),
+        )
+
+    def _get_storage_at(self, address: str, slot: Any, tag: Any = "latest") -> str:
+        slot = int(slot, 16) if isinstance(slot, str) else int(slot)
+        if address.lower() not in self.chain.pools or slot != V2_RESERVES_SLOT:
+            return ZERO_WORD
+        reserve0, reserve1, timestamp = self.chain.reserves(address, self._block_number(tag))
+        return "0x" + pack_reserves(reserve0, reserve1, timestamp).to_bytes(32, "big").hex()
+
+    def _call(self, transaction: Dict[str, Any], tag: Any = "latest") -> str:
+        to = transaction["to"].lower()
+        data = transaction.get("data") or transaction.get("input") or "0x"
+        selector = data[:10].lower()
+
+        pool = self.chain.pools.get(to)
+        if pool is not None:
+            if selector == SELECTOR_GET_RESERVES:
+                reserve0, reserve1, timestamp = self.chain.reserves(to, self._block_number(tag))
+                return _encode(["uint112", "uint112", "uint32"], [reserve0, reserve1, timestamp])
+            if selector == SELECTOR_TOKEN0:
+                return _encode(["address"], [pool["token0"]])
+            if selector == SELECTOR_TOKEN1:
+                return _encode(["address"], [pool["token1"]])
+
+        token = self.chain.tokens.get(to)
+        if token is not None:
+            if selector == SELECTOR_DECIMALS:
+                return _encode(["uint8"], [token["decimals"]])
+            if selector == SELECTOR_SYMBOL:
+                return _encode(["string"], [token["symbol"]])
+
+        raise ReplayError("execution reverted", 3)
+
+    def _gas_price(self) -> str:
+        head = self.chain.head or (self.chain.blocks[0] if self.chain.blocks else {"base_fee": 0})
+        return hex(head["base_fee"] + DEFAULT_PRIORITY_FEE)
+
+    def _send_raw_transaction(self, raw: str) -> str:
+        self.transactions.append(raw)
+        return "0x" + keccak(hexstr=raw).hex()
+
+    def _send_bundle(self, bundle: Dict[str, Any]) -> Dict[str, str]:
+        self.bundles.append(bundle)
+        return {"bundleHash": "0x" + keccak(text="".join(bundle.get("txs", []))).hex()}
+
+
+def _error(message: str, code: int) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": 0, "error": {"code": code, "message": message}}
+
+
+def _encode(types: List[str], values: List[Any]) -> str:
+    return "0x" + encode(types, values).hex()
+
+
+def _block_hash(number: int) -> str:
+    return "0x" + keccak(text=f"replay-block:{number}").hex()
+
+
+def _topics_match(log_topics: List[str], topics: List[Any]) -> bool:
+    for i, wanted in enumerate(topics):
+        if wanted is None:
+            continue
+        if i >= len(log_topics):
+            return False
+        options = wanted if isinstance(wanted, list) else [wanted]
+        if log_topics[i].lower() not in {option.lower() for option in options}:
+            return False
+    return True
+
+
+def _format_log(block: Dict[str, Any], log: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "address": log["address"],
+        "topics": log["topics"],
+        "data": log["data"],
+        "blockNumber": hex(block["number"]),
+        "blockHash": _block_hash(block["number"]),
+        "transactionHash": log["transactionHash"],
+        "transactionIndex": "0x0",
+        "logIndex": hex(log["logIndex"]),
+        "removed": False,
+    }
+
+
+def _format_transaction(
+    tx: Dict[str, Any], index: int, block_number: int, chain_id: int, pending: bool
+) -> Dict[str, Any]:
+    return {
+        "hash": tx["hash"],
+        "from": tx["from"],
+        "to": tx["to"],
+        "input": tx["input"],
+        "nonce": hex(tx["nonce"]),
+        "gas": hex(tx["gas"]),
+        "maxFeePerGas": hex(tx["maxFeePerGas"]),
+        "maxPriorityFeePerGas": hex(tx["maxPriorityFeePerGas"]),
+        "value": hex(tx["value"]),
+        "type": "0x2",
+        "chainId": hex(chain_id),
+        "blockNumber": None if pending else hex(block_number),
+        "blockHash": None if pending else _block_hash(block_number),
+        "transactionIndex": None if pending else hex(index),
+    }
+
+
+def _format_block(
+    block: Dict[str, Any],
+    transactions: List[Dict[str, Any]],
+    full_transactions: bool,
+    chain_id: int,
+    pending: bool = False,
+) -> Dict[str, Any]:
+    number = block["number"]
+    return {
+        "number": hex(number),
+        "hash": None if pending else _block_hash(number),
+        "parentHash": _block_hash(number - 1),
+        "timestamp": hex(block["timestamp"]),
+        "baseFeePerGas": hex(block["base_fee"]),
+        "gasLimit": hex(BLOCK_GAS_LIMIT),
+        "gasUsed": hex(sum(tx["gas"] for tx in transactions)),
+        "miner": "0x" + "00" * 20,
+        "transactions": [
+            _format_transaction(tx, i, number, chain_id, pending) if full_transactions else tx["hash"]
+            for i, tx in enumerate(transactions)
+        ],
+    }
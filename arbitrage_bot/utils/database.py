@@ -1,11 +1,20 @@
 """Database utilities."""
 
+import asyncio
 import os
 import json
 import logging
+import sqlite3
+import threading
 from json import JSONEncoder
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .sqlite_writer import SQLiteWriter
+
+logger = logging.getLogger(__name__)
 
 
 class DateTimeEncoder(JSONEncoder):
@@ -21,12 +30,214 @@ def default(self, obj):
         return super().default(obj)
 
 
-import sqlite3
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from pathlib import Path
+DEFAULT_DB_PATH = "data/trades.db"
+
+# Schema version stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Query field -> indexed column, per table
+TRADE_COLUMNS = {
+    "timestamp": "ts",
+    "token": "token",
+    "token_pair": "token_pair",
+    "dex": "dex",
+    "status": "status",
+    "profit": "profit",
+    "gas_cost": "gas_cost",
+}
+METRIC_COLUMNS = {"timestamp": "ts"}
+
+TRADE_COLUMN_TYPES = {
+    "ts": "REAL",
+    "token": "TEXT",
+    "token_pair": "TEXT",
+    "dex": "TEXT",
+    "status": "TEXT",
+    "profit": "REAL",
+    "gas_cost": "REAL",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades (ts);
+CREATE INDEX IF NOT EXISTS idx_trades_token_ts ON trades (token, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_pair_ts ON trades (token_pair, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_dex_ts ON trades (dex, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_status_ts ON trades (status, ts);
+CREATE INDEX IF NOT EXISTS idx_metrics_ts ON metrics (ts);
+"""
+
+INSERT_TRADE = (
+    f"INSERT INTO trades (data, timestamp, {', '.join(TRADE_COLUMN_TYPES)}) "
+    f"VALUES ({', '.join('?' * (2 + len(TRADE_COLUMN_TYPES)))})"
+)
+
+# Query operators -> SQL comparison
+OPERATORS = {"$gte": ">=", "$lte": "<=", "$gt": ">", "$lt": "<", "$ne": "!="}
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Convert a datetime (naive values are UTC), ISO string or number to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Best-effort numeric conversion for REAL columns."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _trade_columns(trade: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Indexed column values for a trade, in TRADE_COLUMN_TYPES order."""
+    token_pair = trade.get("token_pair")
+    if not token_pair and trade.get("token_in") and trade.get("token_out"):
+        token_pair = f"{trade['token_in']}_{trade['token_out']}"
+    return (
+        _to_epoch(trade.get("timestamp")),
+        trade.get("token"),
+        token_pair,
+        trade.get("dex"),
+        trade.get("status"),
+        _as_float(trade.get("profit")),
+        _as_float(trade.get("gas_cost")),
+    )
+
+
+def _compare(actual: Any, op: str, expected: Any) -> bool:
+    """Apply one query operator in Python."""
+    if op == "$in":
+        return actual in expected
+    if op == "$ne":
+        return actual != expected
+    if actual is None or expected is None:
+        return False
+    if op == "$gte":
+        return actual >= expected
+    if op == "$lte":
+        return actual <= expected
+    if op == "$gt":
+        return actual > expected
+    if op == "$lt":
+        return actual < expected
+    raise ValueError(f"Unsupported query operator: {op}")
+
+
+def _matches(
+    record: Dict[str, Any], query: Dict[str, Any], missing_ok: bool = False
+) -> bool:
+    """
+    Check a record against a query in Python.
+
+    Args:
+        record: Decoded record
+        query: Field -> value or {operator: value} query
+        missing_ok: Whether fields absent from the record pass equality filters
+    """
+    for key, condition in query.items():
+        if missing_ok and key not in record:
+            continue
+        actual = record.get(key)
+        if isinstance(condition, dict) and condition and all(
+            op.startswith("$") for op in condition
+        ):
+            for op, expected in condition.items():
+                actual_value = actual
+                if key == "timestamp":
+                    actual_value = _to_epoch(actual)
+                    expected = (
+                        [_to_epoch(v) for v in expected]
+                        if op == "$in"
+                        else _to_epoch(expected)
+                    )
+                if not _compare(actual_value, op, expected):
+                    return False
+        elif actual != condition:
+            return False
+    return True
+
+
+def _build_where(
+    query: Optional[Dict[str, Any]], columns: Dict[str, str]
+) -> Tuple[str, List[Any], Dict[str, Any]]:
+    """
+    Translate a query into a SQL WHERE clause over indexed columns.
+
+    Supports equality and the $gte/$lte/$gt/$lt/$ne/$in operators. Fields
+    without a column, or with other operators, are returned as a residual
+    query to be matched in Python.
+
+    Returns:
+        (where clause, parameters, residual query)
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    residual: Dict[str, Any] = {}
+
+    for key, condition in (query or {}).items():
+        column = columns.get(key)
+        if column is None:
+            residual[key] = condition
+            continue
+
+        convert = _to_epoch if column == "ts" else (lambda v: v)
+        if isinstance(condition, dict) and condition and all(
+            op.startswith("$") for op in condition
+        ):
+            if not set(condition) <= set(OPERATORS) | {"$in"}:
+                residual[key] = condition
+                continue
+            for op, expected in condition.items():
+                if op == "$in":
+                    values = [convert(v) for v in expected]
+                    if not values:
+                        clauses.append("0")
+                        continue
+                    clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                    params.extend(values)
+                elif expected is None:
+                    clauses.append(
+                        f"{column} IS NOT NULL" if op == "$ne" else "0"
+                    )
+                else:
+                    clauses.append(f"{column} {OPERATORS[op]} ?")
+                    params.append(convert(expected))
+        elif condition is None:
+            clauses.append(f"{column} IS NULL")
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(convert(condition))
 
-logger = logging.getLogger(__name__)
+    where = " AND ".join(clauses) if clauses else "1"
+    return where, params, residual
 
 
 def init_db(testing: bool = False) -> "Database":
@@ -37,14 +248,23 @@ def init_db(testing: bool = False) -> "Database":
 class Database:
     """Database connection and operations."""
 
-    def __init__(self, testing: bool = None):
-        """Initialize database connection."""
+    def __init__(self, testing: bool = None, db_path: str = DEFAULT_DB_PATH):
+        """
+        Initialize database connection.
+
+        Args:
+            testing: Use in-memory storage instead of SQLite
+            db_path: Path of the SQLite database file
+        """
         self.testing = (
             testing
             if testing is not None
             else os.getenv("TESTING", "").lower() == "true"
         )
+        self.db_path = db_path
         self._conn = None
+        self._writer: Optional[SQLiteWriter] = None
+        self._read_lock = threading.Lock()  # Reads run on executor threads
         self._trades = []  # In-memory storage for testing
         if not self.testing:
             self.connect()
@@ -55,32 +275,21 @@ def connect(self):
         if not self.testing:
             try:
                 # Create data directory if it doesn't exist
-                Path("data").mkdir(exist_ok=True)
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
                 # Connect to SQLite database
-                self._conn = sqlite3.connect("data/trades.db")
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
                 self._conn.row_factory = sqlite3.Row
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
 
                 # Create tables if they don't exist
-                self._conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS trades (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        data TEXT NOT NULL,
-                        timestamp TEXT NOT NULL
-                    )
-                """
-                )
-                self._conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        data TEXT NOT NULL,
-                        timestamp TEXT NOT NULL
-                    )
-                """
-                )
+                self._conn.executescript(SCHEMA)
+                self._migrate()
                 self._conn.commit()
+
+                # All further writes go through the writer thread
+                self._writer = SQLiteWriter(self.db_path).start()
                 logger.info("Connected to SQLite database")
             except Exception as e:
                 logger.warning(
@@ -89,6 +298,84 @@ def connect(self):
                 self.testing = True
                 self._conn = None
 
+    def _migrate(self) -> None:
+        """Add indexed columns and backfill them for rows written by older versions."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+        existing = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(trades)")
+        }
+        for column, column_type in TRADE_COLUMN_TYPES.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE trades ADD COLUMN {column} {column_type}")
+
+        existing = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(metrics)")
+        }
+        if "ts" not in existing:
+            self._conn.execute("ALTER TABLE metrics ADD COLUMN ts REAL")
+
+        self._conn.executescript(INDEXES)
+
+        if version < SCHEMA_VERSION:
+            rows = self._conn.execute(
+                "SELECT id, data, timestamp FROM trades WHERE ts IS NULL"
+            ).fetchall()
+            updates = []
+            for row in rows:
+                try:
+                    trade = json.loads(row["data"])
+                except ValueError:
+                    trade = {}
+                trade.setdefault("timestamp", row["timestamp"])
+                updates.append((*_trade_columns(trade), row["id"]))
+            self._conn.executemany(
+                f"UPDATE trades SET {', '.join(f'{c} = ?' for c in TRADE_COLUMN_TYPES)} "
+                "WHERE id = ?",
+                updates,
+            )
+
+            metric_rows = self._conn.execute(
+                "SELECT id, timestamp FROM metrics WHERE ts IS NULL"
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE metrics SET ts = ? WHERE id = ?",
+                [(_to_epoch(row["timestamp"]), row["id"]) for row in metric_rows],
+            )
+
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            if updates or metric_rows:
+                logger.info(
+                    f"Migrated {len(updates)} trades and {len(metric_rows)} metrics to indexed columns"
+                )
+
+    def _select_data(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Run a SELECT of the ``data`` column and decode its rows (executor thread)."""
+        with self._read_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    async def _read(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Commit queued writes, then run a ``data`` SELECT off the event loop."""
+        await self._writer.flush_async()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._select_data, sql, params
+        )
+
+    @staticmethod
+    def _trade_row(trade_data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Row values for inserting a trade."""
+        # Add timestamp if not present
+        if "timestamp" not in trade_data:
+            trade_data["timestamp"] = datetime.utcnow().isoformat()
+
+        timestamp = trade_data["timestamp"]
+        return (
+            json.dumps(trade_data, cls=DateTimeEncoder),
+            timestamp if isinstance(timestamp, str) else timestamp.isoformat(),
+            *_trade_columns(trade_data),
+        )
+
     async def save_trade(self, trade_data: Dict[str, Any]) -> str:
         """Save trade record."""
         if self.testing:
@@ -99,48 +386,65 @@ async def save_trade(self, trade_data: Dict[str, Any]) -> str:
             if not self._conn:
                 self.connect()
 
-            # Add timestamp if not present
-            if "timestamp" not in trade_data:
-                trade_data["timestamp"] = datetime.utcnow().isoformat()
+            result = await self._writer.write(INSERT_TRADE, self._trade_row(trade_data))
+            return str(result.lastrowid)
 
-            # Convert dict to JSON string
-            data_json = json.dumps(trade_data, cls=DateTimeEncoder)
+        except Exception as e:
+            logger.error(f"Failed to save trade: {e}")
+            raise
 
-            cursor = self._conn.execute(
-                "INSERT INTO trades (data, timestamp) VALUES (?, ?)",
-                (
-                    data_json,
-                    (
-                        trade_data["timestamp"]
-                        if isinstance(trade_data["timestamp"], str)
-                        else trade_data["timestamp"].isoformat()
-                    ),
-                ),
+    async def save_trades(self, trades: Sequence[Dict[str, Any]]) -> List[str]:
+        """
+        Save several trade records in one transaction.
+
+        Args:
+            trades: Trade records
+
+        Returns:
+            Ids of the saved trades, in order
+        """
+        if self.testing:
+            self._trades.extend(trades)
+            first = len(self._trades) - len(trades) + 1
+            return [str(first + i) for i in range(len(trades))]
+
+        try:
+            if not self._conn:
+                self.connect()
+
+            results = await self._writer.write_batch(
+                [(INSERT_TRADE, self._trade_row(trade)) for trade in trades]
             )
-            self._conn.commit()
-            return str(cursor.lastrowid)
+            return [str(result.lastrowid) for result in results]
 
         except Exception as e:
-            logger.error(f"Failed to save trade: {e}")
+            logger.error(f"Failed to save trades: {e}")
             raise
 
     async def get_trades(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Get trade records."""
+        """
+        Get trade records.
+
+        Indexed fields (timestamp, token, token_pair, dex, status, profit,
+        gas_cost) are filtered in SQL; other fields are matched on the
+        decoded records.
+
+        Args:
+            query: Field -> value or {"$gte"/"$lte"/"$gt"/"$lt"/"$ne"/"$in": value}
+        """
         if self.testing:
-            return [
-                t for t in self._trades if all(t.get(k) == v for k, v in query.items())
-            ]
+            return [t for t in self._trades if _matches(t, query or {})]
 
         try:
             if not self._conn:
                 self.connect()
 
-            cursor = self._conn.execute("SELECT data FROM trades")
-            trades = []
-            for row in cursor:
-                trade = json.loads(row["data"])
-                if all(trade.get(k) == v for k, v in query.items()):
-                    trades.append(trade)
+            where, params, residual = _build_where(query, TRADE_COLUMNS)
+            trades = await self._read(
+                f"SELECT data FROM trades WHERE {where} ORDER BY id", params
+            )
+            if residual:
+                trades = [t for t in trades if _matches(t, residual)]
             return trades
 
         except Exception as e:
@@ -163,24 +467,22 @@ async def update_trade(self, trade_id: str, update_data: Dict[str, Any]) -> bool
             if not self._conn:
                 self.connect()
 
-            # Get existing trade
-            cursor = self._conn.execute(
-                "SELECT data FROM trades WHERE id = ?", (trade_id,)
-            )
-            row = cursor.fetchone()
-            if not row:
+            # Get existing trade, including writes still queued
+            rows = await self._read("SELECT data FROM trades WHERE id = ?", (trade_id,))
+            if not rows:
                 return False
 
             # Update trade data
-            trade_data = json.loads(row["data"])
+            trade_data = rows[0]
             trade_data.update(update_data)
             data_json = json.dumps(trade_data, cls=DateTimeEncoder)
 
-            # Save updated trade
-            self._conn.execute(
-                "UPDATE trades SET data = ? WHERE id = ?", (data_json, trade_id)
+            # Save updated trade and its indexed columns
+            await self._writer.write(
+                f"UPDATE trades SET data = ?, "
+                f"{', '.join(f'{c} = ?' for c in TRADE_COLUMN_TYPES)} WHERE id = ?",
+                (data_json, *_trade_columns(trade_data), trade_id),
             )
-            self._conn.commit()
             return True
 
         except Exception as e:
@@ -203,9 +505,8 @@ async def delete_trade(self, trade_id: str) -> bool:
             if not self._conn:
                 self.connect()
 
-            cursor = self._conn.execute("DELETE FROM trades WHERE id = ?", (trade_id,))
-            self._conn.commit()
-            return cursor.rowcount > 0
+            result = await self._writer.write("DELETE FROM trades WHERE id = ?", (trade_id,))
+            return result.rowcount > 0
 
         except Exception as e:
             logger.error(f"Failed to delete trade: {e}")
@@ -214,7 +515,12 @@ async def delete_trade(self, trade_id: str) -> bool:
     async def get_metrics(
         self, query: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Get historical metrics."""
+        """
+        Get historical metrics.
+
+        The timestamp range is filtered in SQL; other fields are matched on
+        the decoded snapshots, where missing fields pass.
+        """
         if self.testing:
             return []
 
@@ -222,53 +528,27 @@ async def get_metrics(
             if not self._conn:
                 self.connect()
 
-            if query and "timestamp" in query:
-                # Convert datetime objects to ISO format strings
-                if isinstance(query["timestamp"], dict):
-                    if "$gte" in query["timestamp"]:
-                        query["timestamp"]["$gte"] = query["timestamp"][
-                            "$gte"
-                        ].isoformat()
-                    if "$lte" in query["timestamp"]:
-                        query["timestamp"]["$lte"] = query["timestamp"][
-                            "$lte"
-                        ].isoformat()
-
-            cursor = self._conn.execute("SELECT data FROM metrics")
-            metrics = []
-            for row in cursor:
-                metric = json.loads(row["data"])
-                if query:
-                    # Apply query filters
-                    if all(
-                        k not in metric or metric[k] == v
-                        for k, v in query.items()
-                        if k != "timestamp"
-                    ):
-                        if "timestamp" in query:
-                            ts = metric.get("timestamp")
-                            if ts:
-                                if (
-                                    "$gte" in query["timestamp"]
-                                    and ts < query["timestamp"]["$gte"]
-                                ):
-                                    continue
-                                if (
-                                    "$lte" in query["timestamp"]
-                                    and ts > query["timestamp"]["$lte"]
-                                ):
-                                    continue
-                        metrics.append(metric)
-                else:
-                    metrics.append(metric)
+            # Queued snapshots are committed before the read
+            where, params, residual = _build_where(query, METRIC_COLUMNS)
+            metrics = await self._read(
+                f"SELECT data FROM metrics WHERE {where} ORDER BY id", params
+            )
+            if residual:
+                metrics = [m for m in metrics if _matches(m, residual, missing_ok=True)]
             return metrics
 
         except Exception as e:
             logger.error(f"Failed to get metrics: {e}")
             return []
 
-    async def save_metrics(self, metrics_data: Dict[str, Any]) -> bool:
-        """Save metrics snapshot."""
+    async def save_metrics(self, metrics_data: Dict[str, Any], wait: bool = False) -> bool:
+        """
+        Save metrics snapshot.
+
+        Args:
+            metrics_data: Metrics snapshot
+            wait: Wait until the snapshot is committed instead of only queued
+        """
         if self.testing:
             return True
 
@@ -304,11 +584,17 @@ def convert_datetime(obj):
                 metrics_data = convert_datetime(metrics_data)
                 data_json = json.dumps(metrics_data)
 
-            self._conn.execute(
-                "INSERT INTO metrics (data, timestamp) VALUES (?, ?)",
-                (data_json, metrics_data["timestamp"]),
+            timestamp = metrics_data["timestamp"]
+            future = await self._writer.enqueue(
+                "INSERT INTO metrics (data, timestamp, ts) VALUES (?, ?, ?)",
+                (
+                    data_json,
+                    timestamp if isinstance(timestamp, str) else timestamp.isoformat(),
+                    _to_epoch(timestamp),
+                ),
             )
-            self._conn.commit()
+            if wait:
+                await asyncio.wrap_future(future)
             return True
 
         except Exception as e:
@@ -316,8 +602,12 @@ def convert_datetime(obj):
             return False
 
     async def close(self):
-        """Close database connection."""
+        """Commit queued writes and close the database connection."""
+        if self._writer:
+            await asyncio.get_event_loop().run_in_executor(None, self._writer.close)
+            self._writer = None
         if self._conn:
-            self._conn.close()
+            with self._read_lock:
+                self._conn.close()
             self._conn = None
             logger.info("Closed database connection")
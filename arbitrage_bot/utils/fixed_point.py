@@ -0,0 +1,319 @@
+"""
+Fixed-Point Math
+
+Integer pricing and swap math matching the on-chain implementations:
+- Amounts are integer wei (raw token units)
+- Prices are Q64.96 (``price * 2**96``) or WAD (``value * 10**18``)
+  integers
+- Uniswap V2 getAmountOut/getAmountIn and the Uniswap V3 FullMath,
+  SqrtPriceMath and SwapMath rounding are reproduced exactly, so simulated
+  outputs are bit-identical to chain results
+
+Convert to Decimal or float only at API and reporting boundaries.
+"""
+
+from decimal import Decimal
+from typing import Any, Tuple
+
+Q96 = 1 << 96
+Q128 = 1 << 128
+Q192 = 1 << 192
+WAD = 10**18
+
+# Fees are in hundredths of a basis point (3000 = 0.3%)
+FEE_DENOMINATOR = 1_000_000
+
+# Uniswap V3 TickMath bounds
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+_UINT160_MAX = (1 << 160) - 1
+_UINT256_MAX = (1 << 256) - 1
+
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    """floor(a * b / denominator) with full precision."""
+    return a * b // denominator
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """ceil(a * b / denominator) with full precision."""
+    return -(-a * b // denominator)
+
+
+def div_rounding_up(a: int, b: int) -> int:
+    """ceil(a / b)."""
+    return -(-a // b)
+
+
+def to_wad(value: Any) -> int:
+    """Convert a number to a WAD-scaled integer."""
+    if isinstance(value, int):
+        return value * WAD
+    return int(Decimal(str(value)) * WAD)
+
+
+def from_wad(value: int) -> Decimal:
+    """Convert a WAD-scaled integer to a Decimal."""
+    return Decimal(value) / WAD
+
+
+def to_wei(amount: Any, decimals: int = 18) -> int:
+    """Convert a human-readable token amount to raw units."""
+    return int(Decimal(str(amount)).scaleb(decimals))
+
+
+def from_wei(amount: int, decimals: int = 18) -> Decimal:
+    """Convert raw token units to a human-readable Decimal."""
+    return Decimal(amount).scaleb(-decimals)
+
+
+def price_x96(amount_in: int, amount_out: int) -> int:
+    """Q64.96 price of the input token in output token units."""
+    return (abs(amount_out) << 96) // abs(amount_in) if amount_in else 0
+
+
+def sqrt_price_x96_to_price_x96(sqrt_price_x96: int) -> int:
+    """Convert a pool's sqrtPriceX96 to a Q64.96 token0 price."""
+    return mul_div(sqrt_price_x96, sqrt_price_x96, Q96)
+
+
+def price_x96_to_decimal(value: int, decimals0: int = 0, decimals1: int = 0) -> Decimal:
+    """Convert a Q64.96 raw-unit price to a Decimal human-readable price."""
+    return (Decimal(value) / Q96).scaleb(decimals0 - decimals1)
+
+
+# --- Uniswap V2 ---
+
+
+def get_amount_out(
+    amount_in: int, reserve_in: int, reserve_out: int, fee: int = 3000
+) -> int:
+    """
+    Output of a constant-product swap (UniswapV2Library.getAmountOut).
+
+    Args:
+        amount_in: Input amount in raw units
+        reserve_in: Input token reserve
+        reserve_out: Output token reserve
+        fee: Pool fee in hundredths of a basis point
+
+    Returns:
+        Output amount in raw units
+
+    Raises:
+        ValueError: If the input amount or a reserve is not positive
+    """
+    if amount_in <= 0:
+        raise ValueError("Insufficient input amount")
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise ValueError("Insufficient liquidity")
+    amount_in_with_fee = amount_in * (FEE_DENOMINATOR - fee)
+    return (amount_in_with_fee * reserve_out) // (
+        reserve_in * FEE_DENOMINATOR + amount_in_with_fee
+    )
+
+
+def get_amount_in(
+    amount_out: int, reserve_in: int, reserve_out: int, fee: int = 3000
+) -> int:
+    """
+    Input required for a constant-product swap output (UniswapV2Library.getAmountIn).
+
+    Raises:
+        ValueError: If the output amount is not positive or exceeds liquidity
+    """
+    if amount_out <= 0:
+        raise ValueError("Insufficient output amount")
+    if reserve_in <= 0 or reserve_out <= amount_out:
+        raise ValueError("Insufficient liquidity")
+    numerator = reserve_in * amount_out * FEE_DENOMINATOR
+    denominator = (reserve_out - amount_out) * (FEE_DENOMINATOR - fee)
+    return numerator // denominator + 1
+
+
+def price_impact_wad(
+    amount_in: int, amount_out: int, reserve_in: int, reserve_out: int
+) -> int:
+    """
+    Liquidity-weighted price impact of a V2 swap, as a WAD ratio.
+
+    The shortfall of ``amount_out`` against the spot-price output, scaled
+    by the share of the input reserve traded (capped at 1).
+    """
+    spot_out = amount_in * reserve_out  # Spot output, times reserve_in
+    shortfall = spot_out - amount_out * reserve_in
+    if amount_in >= reserve_in:
+        return shortfall * WAD // spot_out
+    return shortfall * WAD // (reserve_out * reserve_in)
+
+
+# --- Uniswap V3 ---
+
+
+def get_amount0_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Token0 amount between two sqrt prices (SqrtPriceMath.getAmount0Delta)."""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+    if round_up:
+        return div_rounding_up(
+            mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b_x96),
+            sqrt_ratio_a_x96,
+        )
+    return mul_div(numerator1, numerator2, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Token1 amount between two sqrt prices (SqrtPriceMath.getAmount1Delta)."""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    difference = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+    if round_up:
+        return mul_div_rounding_up(liquidity, difference, Q96)
+    return mul_div(liquidity, difference, Q96)
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    """Sqrt price after adding an input amount (SqrtPriceMath.getNextSqrtPriceFromInput)."""
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("Price and liquidity must be positive")
+
+    if zero_for_one:
+        # getNextSqrtPriceFromAmount0RoundingUp, add = true
+        if amount_in == 0:
+            return sqrt_price_x96
+        numerator1 = liquidity << 96
+        product = amount_in * sqrt_price_x96
+        if product <= _UINT256_MAX:
+            denominator = numerator1 + product
+            if denominator <= _UINT256_MAX:
+                return mul_div_rounding_up(numerator1, sqrt_price_x96, denominator)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount_in)
+
+    # getNextSqrtPriceFromAmount1RoundingDown, add = true
+    if amount_in <= _UINT160_MAX:
+        quotient = (amount_in << 96) // liquidity
+    else:
+        quotient = mul_div(amount_in, Q96, liquidity)
+    return sqrt_price_x96 + quotient
+
+
+def compute_swap_step(
+    sqrt_price_current_x96: int,
+    sqrt_price_target_x96: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee: int,
+) -> Tuple[int, int, int, int]:
+    """
+    One exact-input swap step within a tick range (SwapMath.computeSwapStep).
+
+    Args:
+        sqrt_price_current_x96: Current pool sqrt price
+        sqrt_price_target_x96: Price that cannot be exceeded (next tick or limit)
+        liquidity: Active liquidity
+        amount_remaining: Input still to be swapped, in raw units
+        fee: Pool fee in hundredths of a basis point
+
+    Returns:
+        (next sqrt price, amount in, amount out, fee amount)
+    """
+    zero_for_one = sqrt_price_current_x96 >= sqrt_price_target_x96
+    amount_remaining_less_fee = mul_div(
+        amount_remaining, FEE_DENOMINATOR - fee, FEE_DENOMINATOR
+    )
+
+    if zero_for_one:
+        amount_in = get_amount0_delta(
+            sqrt_price_target_x96, sqrt_price_current_x96, liquidity, True
+        )
+    else:
+        amount_in = get_amount1_delta(
+            sqrt_price_current_x96, sqrt_price_target_x96, liquidity, True
+        )
+
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_price_next_x96 = sqrt_price_target_x96
+    else:
+        sqrt_price_next_x96 = get_next_sqrt_price_from_input(
+            sqrt_price_current_x96, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_price_next_x96 == sqrt_price_target_x96
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(
+                sqrt_price_next_x96, sqrt_price_current_x96, liquidity, True
+            )
+        amount_out = get_amount1_delta(
+            sqrt_price_next_x96, sqrt_price_current_x96, liquidity, False
+        )
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(
+                sqrt_price_current_x96, sqrt_price_next_x96, liquidity, True
+            )
+        amount_out = get_amount0_delta(
+            sqrt_price_current_x96, sqrt_price_next_x96, liquidity, False
+        )
+
+    if reached_target:
+        fee_amount = mul_div_rounding_up(amount_in, fee, FEE_DENOMINATOR - fee)
+    else:
+        fee_amount = amount_remaining - amount_in
+
+    return sqrt_price_next_x96, amount_in, amount_out, fee_amount
+
+
+def v3_amount_out(
+    sqrt_price_x96: int,
+    liquidity: int,
+    amount_in: int,
+    zero_for_one: bool,
+    fee: int,
+    sqrt_price_limit_x96: int = 0,
+) -> Tuple[int, int]:
+    """
+    Output of an exact-input V3 swap that stays within the current tick range.
+
+    Args:
+        sqrt_price_x96: Current pool sqrt price
+        liquidity: Active liquidity
+        amount_in: Input amount in raw units
+        zero_for_one: Whether token0 is the input
+        fee: Pool fee in hundredths of a basis point
+        sqrt_price_limit_x96: Price limit (0 for none), usually the next
+            initialized tick
+
+    Returns:
+        (amount out, sqrt price after the swap)
+    """
+    if not sqrt_price_limit_x96:
+        sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+    sqrt_price_next, _, amount_out, _ = compute_swap_step(
+        sqrt_price_x96, sqrt_price_limit_x96, liquidity, amount_in, fee
+    )
+    return amount_out, sqrt_price_next
+
+
+def v3_price_impact_wad(
+    amount_in: int, amount_out: int, sqrt_price_x96: int, liquidity: int
+) -> int:
+    """
+    Liquidity-weighted price impact of a V3 token0 -> token1 swap, as a WAD ratio.
+
+    The shortfall of ``amount_out`` against the spot-price output, scaled
+    by the spot output's share of active liquidity (capped at 1).
+    """
+    spot_out = amount_in * sqrt_price_x96 * sqrt_price_x96  # Spot output, times 2**192
+    impact = (spot_out - amount_out * Q192) * WAD // spot_out
+    factor = min(WAD, spot_out * WAD // (Q192 * liquidity))
+    return impact * factor // WAD
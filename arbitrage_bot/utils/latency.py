@@ -0,0 +1,556 @@
+"""
+Latency Tracing
+
+Lightweight instrumentation for the hot path:
+- ``LatencyHistogram``: HDR-style log-linear histogram of nanosecond
+  latencies (under 1% relative error, constant memory, O(1) record)
+- ``LatencyTracer``: per-block pipeline traces (time from block received to
+  each stage), named spans, and per-RPC-method latency and size counters
+- ``render_prometheus``: Prometheus text exposition of a tracer snapshot
+
+Pipeline code uses the module-level helpers against the global tracer::
+
+    trace = start_trace(block_number)   # block received
+    ...
+    mark(STATE_REFRESHED)               # anywhere below, incl. spawned tasks
+    with span("dex.get_reserves"):
+        ...
+
+The current trace is held in a context variable, so tasks created while a
+trace is active inherit it. With ``sample_rate=0`` every helper returns
+after a single check.
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, in order; latencies are measured from BLOCK_RECEIVED
+BLOCK_RECEIVED = "block_received"
+STATE_REFRESHED = "state_refreshed"
+CANDIDATES_GENERATED = "candidates_generated"
+PATHS_EVALUATED = "paths_evaluated"
+TX_BUILT = "tx_built"
+TX_SIGNED = "tx_signed"
+TX_SUBMITTED = "tx_submitted"
+TX_INCLUDED = "tx_included"
+STAGES = (
+    BLOCK_RECEIVED,
+    STATE_REFRESHED,
+    CANDIDATES_GENERATED,
+    PATHS_EVALUATED,
+    TX_BUILT,
+    TX_SIGNED,
+    TX_SUBMITTED,
+    TX_INCLUDED,
+)
+
+# Quantiles exported per histogram
+EXPORT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Histogram layout: values below 2**SUB_BUCKET_BITS are exact; above, each
+# power of two is split into 2**(SUB_BUCKET_BITS - 1) linear buckets
+SUB_BUCKET_BITS = 7
+MAX_VALUE_BITS = 40  # ~18 minutes in nanoseconds; larger values are clamped
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+_BUCKETS = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1) * _HALF + (1 << SUB_BUCKET_BITS)
+_MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+
+def _bucket_index(value: int) -> int:
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return shift * _HALF + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value counted in a bucket."""
+    if index < (1 << SUB_BUCKET_BITS):
+        return index
+    shift = index // _HALF - 1
+    return ((index - shift * _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in nanoseconds."""
+
+    __slots__ = ("count", "total", "min", "max", "_counts")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self._counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, nanoseconds: int) -> None:
+        """Record one latency."""
+        value = min(max(nanoseconds, 0), _MAX_VALUE)
+        self._counts[_bucket_index(value)] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile (0-1)
+
+        Returns:
+            Latency in seconds (upper edge of the bucket holding the
+            quantile, capped at the maximum), or 0.0 if empty
+        """
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(_bucket_upper(index), self.max) / 1e9
+        return self.max / 1e9
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count / 1e9 if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples to this one."""
+        if other.count == 0:
+            return
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._counts = [0] * _BUCKETS
+        self.count = self.total = self.min = self.max = 0
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state (non-empty buckets as [index, count] pairs)."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": [[i, c] for i, c in enumerate(self._counts) if c],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram from ``to_state()`` output."""
+        histogram = cls()
+        for index, count in state["buckets"]:
+            histogram._counts[index] = count
+        histogram.count = state["count"]
+        histogram.total = state["total"]
+        histogram.min = state["min"]
+        histogram.max = state["max"]
+        return histogram
+
+
+class RpcStats:
+    """Latency and traffic counters for one RPC method."""
+
+    __slots__ = ("latency", "errors", "request_bytes", "response_bytes")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency.to_state(),
+            "errors": self.errors,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class _NoopSpan:
+    """Span returned when the tracer is off or the span is not sampled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+class _Span:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self._histogram = histogram
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.record(time.perf_counter_ns() - self._start)
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Timeline of one block through the pipeline."""
+
+    __slots__ = ("tracer", "block_number", "started", "_token")
+
+    def __init__(self, tracer: "LatencyTracer", block_number: Optional[int], started: int):
+        self.tracer = tracer
+        self.block_number = block_number
+        self.started = started
+        self._token = None
+
+    def mark(self, stage: str) -> None:
+        """Record the time from block received to ``stage``."""
+        self.tracer._stage(stage).record(time.perf_counter_ns() - self.started)
+
+    def __enter__(self) -> "Trace":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._token is not None:
+            _current_trace.reset(self._token)
+            self._token = None
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "latency_trace", default=None
+)
+
+
+class LatencyTracer:
+    """Collects stage, span and RPC latencies."""
+
+    def __init__(self, sample_rate: float = 1.0):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of traces, spans and RPC calls recorded
+                (0 disables tracing)
+        """
+        self.sample_rate = sample_rate
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._spans: Dict[str, LatencyHistogram] = {}
+        self._rpc: Dict[str, RpcStats] = {}
+        self.started_at = time.time()
+
+    def sampled(self) -> bool:
+        """Decide whether to record the next trace, span or call."""
+        rate = self.sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def start_trace(
+        self, block_number: Optional[int] = None, received_ns: Optional[int] = None
+    ) -> Optional[Trace]:
+        """
+        Start a block trace and make it current for this context.
+
+        Args:
+            block_number: Block being processed
+            received_ns: ``time.perf_counter_ns()`` when the block arrived
+                (default: now)
+
+        Returns:
+            The trace (usable as a context manager that ends it), or None if
+            this block is not sampled
+        """
+        if not self.sampled():
+            _current_trace.set(None)
+            return None
+        now = time.perf_counter_ns()
+        trace = Trace(self, block_number, received_ns or now)
+        self._stage(BLOCK_RECEIVED).record(now - trace.started)
+        trace._token = _current_trace.set(trace)
+        return trace
+
+    def span(self, name: str):
+        """
+        Time a block of code.
+
+        Args:
+            name: Span name
+
+        Returns:
+            Context manager recording the block's duration
+        """
+        if not self.sampled():
+            return _NOOP_SPAN
+        histogram = self._spans.get(name)
+        if histogram is None:
+            histogram = self._spans[name] = LatencyHistogram()
+        return _Span(histogram)
+
+    def record_span(self, name: str, seconds: float) -> None:
+        """Record an externally measured duration under a span name."""
+        histogram = self._spans.get(name)
+        if histogram is None:
+            histogram = self._spans[name] = LatencyHistogram()
+        histogram.record(int(seconds * 1e9))
+
+    def record_rpc(
+        self,
+        method: str,
+        nanoseconds: int,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error: bool = False,
+    ) -> None:
+        """
+        Record one RPC call.
+
+        Args:
+            method: JSON-RPC method
+            nanoseconds: Round-trip time
+            request_bytes: Encoded request size
+            response_bytes: Encoded response size
+            error: Whether the call failed
+        """
+        stats = self._rpc.get(method)
+        if stats is None:
+            stats = self._rpc[method] = RpcStats()
+        stats.latency.record(nanoseconds)
+        stats.request_bytes += request_bytes
+        stats.response_bytes += response_bytes
+        if error:
+            stats.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable copy of all histograms and counters."""
+        return {
+            "started_at": self.started_at,
+            "stages": {name: h.to_state() for name, h in self._stages.items()},
+            "spans": {name: h.to_state() for name, h in self._spans.items()},
+            "rpc": {method: s.to_state() for method, s in self._rpc.items()},
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get latency summaries (milliseconds) per stage, span and RPC method."""
+        return summarize(self.snapshot())
+
+    def render_prometheus(self) -> str:
+        """Get the tracer's metrics in Prometheus text format."""
+        return render_prometheus(self.snapshot())
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._stages.clear()
+        self._spans.clear()
+        self._rpc.clear()
+        self.started_at = time.time()
+
+    def _stage(self, stage: str) -> LatencyHistogram:
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            histogram = self._stages[stage] = LatencyHistogram()
+        return histogram
+
+
+def _summary(state: Dict[str, Any]) -> Dict[str, float]:
+    histogram = LatencyHistogram.from_state(state)
+    return {
+        "count": histogram.count,
+        "mean_ms": histogram.mean * 1000,
+        **{f"p{q * 100:g}_ms": histogram.quantile(q) * 1000 for q in EXPORT_QUANTILES},
+        "max_ms": histogram.max / 1e6,
+    }
+
+
+def summarize(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize a tracer snapshot for dashboards.
+
+    Args:
+        snapshot: Output of ``LatencyTracer.snapshot``
+
+    Returns:
+        Count, mean, quantiles and max (milliseconds) per stage (in
+        pipeline order), span and RPC method, with RPC error and byte
+        counts, plus event loop lag when the snapshot includes it
+    """
+    stages = snapshot.get("stages", {})
+    ordered = [s for s in STAGES if s in stages] + sorted(s for s in stages if s not in STAGES)
+    summary = {
+        "stages": {stage: _summary(stages[stage]) for stage in ordered},
+        "spans": {name: _summary(state) for name, state in sorted(snapshot.get("spans", {}).items())},
+        "rpc": {
+            method: {
+                **_summary(state["latency"]),
+                "errors": state["errors"],
+                "request_bytes": state["request_bytes"],
+                "response_bytes": state["response_bytes"],
+            }
+            for method, state in sorted(snapshot.get("rpc", {}).items())
+        },
+    }
+    event_loop = snapshot.get("event_loop")
+    if event_loop:
+        summary["event_loop"] = {**_summary(event_loop["lag"]), "blocked": event_loop["blocked"]}
+    return summary
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_summary(
+    lines: List[str], metric: str, label: str, histograms: Iterable[tuple]
+) -> None:
+    for name, state in histograms:
+        histogram = LatencyHistogram.from_state(state)
+        labels = f'{label}="{_escape(name)}"'
+        for q in EXPORT_QUANTILES:
+            lines.append(f'{metric}{{{labels},quantile="{q:g}"}} {histogram.quantile(q):.9f}')
+        lines.append(f"{metric}_sum{{{labels}}} {histogram.total / 1e9:.9f}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+
+def render_prometheus(snapshot: Dict[str, Any], prefix: str = "arbitrage") -> str:
+    """
+    Render a tracer snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Output of ``LatencyTracer.snapshot``
+        prefix: Metric name prefix
+
+    Returns:
+        Exposition text
+    """
+    lines: List[str] = []
+    stage_metric = f"{prefix}_stage_latency_seconds"
+    lines.append(f"# HELP {stage_metric} Time from block received to pipeline stage.")
+    lines.append(f"# TYPE {stage_metric} summary")
+    _render_summary(lines, stage_metric, "stage", snapshot.get("stages", {}).items())
+
+    span_metric = f"{prefix}_span_seconds"
+    lines.append(f"# HELP {span_metric} Duration of instrumented code spans.")
+    lines.append(f"# TYPE {span_metric} summary")
+    _render_summary(lines, span_metric, "span", sorted(snapshot.get("spans", {}).items()))
+
+    rpc = sorted(snapshot.get("rpc", {}).items())
+    rpc_metric = f"{prefix}_rpc_latency_seconds"
+    lines.append(f"# HELP {rpc_metric} JSON-RPC round-trip time by method.")
+    lines.append(f"# TYPE {rpc_metric} summary")
+    _render_summary(lines, rpc_metric, "method", ((m, s["latency"]) for m, s in rpc))
+
+    for field, help_text in (
+        ("errors", "Failed JSON-RPC calls by method."),
+        ("request_bytes", "Encoded JSON-RPC request bytes by method."),
+        ("response_bytes", "Encoded JSON-RPC response bytes by method."),
+    ):
+        metric = f"{prefix}_rpc_{field}_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for method, state in rpc:
+            lines.append(f'{metric}{{method="{_escape(method)}"}} {state[field]}')
+
+    event_loop = snapshot.get("event_loop")
+    if event_loop:
+        lag = LatencyHistogram.from_state(event_loop["lag"])
+        lag_metric = f"{prefix}_event_loop_lag_seconds"
+        lines.append(f"# HELP {lag_metric} Event loop scheduling delay.")
+        lines.append(f"# TYPE {lag_metric} summary")
+        for q in EXPORT_QUANTILES:
+            lines.append(f'{lag_metric}{{quantile="{q:g}"}} {lag.quantile(q):.9f}')
+        lines.append(f"{lag_metric}_sum {lag.total / 1e9:.9f}")
+        lines.append(f"{lag_metric}_count {lag.count}")
+
+        blocked_metric = f"{prefix}_event_loop_blocked_total"
+        lines.append(f"# HELP {blocked_metric} Lag measurements over the blocking threshold.")
+        lines.append(f"# TYPE {blocked_metric} counter")
+        lines.append(f"{blocked_metric} {event_loop['blocked']}")
+    return "\n".join(lines) + "\n"
+
+
+# Global tracer used by the module-level helpers
+_tracer = LatencyTracer()
+
+
+def get_tracer() -> LatencyTracer:
+    """Get the global tracer."""
+    return _tracer
+
+
+def set_tracer(tracer: LatencyTracer) -> None:
+    """Replace the global tracer (e.g. with a configured sample rate)."""
+    global _tracer
+    _tracer = tracer
+
+
+def start_trace(
+    block_number: Optional[int] = None, received_ns: Optional[int] = None
+) -> Optional[Trace]:
+    """Start a block trace on the global tracer. See ``LatencyTracer.start_trace``."""
+    return _tracer.start_trace(block_number, received_ns)
+
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace active in this context, if any."""
+    return _current_trace.get()
+
+
+def mark(stage: str) -> None:
+    """Record ``stage`` on the current trace, if there is one."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark(stage)
+
+
+def span(name: str):
+    """Time a block of code on the global tracer."""
+    if _tracer.sample_rate <= 0.0:
+        return _NOOP_SPAN
+    return _tracer.span(name)
+
+
+async def report_latency(interval: float = 5.0, loop_monitor=None) -> None:
+    """
+    Publish the global tracer's snapshot over telemetry every interval.
+
+    Args:
+        interval: Seconds between snapshots
+        loop_monitor: ``LoopMonitor`` whose event loop lag is included
+    """
+    from .telemetry import RecordType, publish
+
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                snapshot = _tracer.snapshot()
+                if loop_monitor is not None:
+                    snapshot["event_loop"] = loop_monitor.to_state()
+                publish(RecordType.LATENCY, snapshot)
+            except Exception as e:
+                logger.error(f"Error publishing latency snapshot: {e}")
+    except asyncio.CancelledError:
+        pass
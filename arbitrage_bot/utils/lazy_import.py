@@ -0,0 +1,51 @@
+"""
+Lazy Imports
+
+Helpers for package ``__init__`` modules that re-export names from heavy
+submodules (web3, networkx, aiohttp, ...). Names are resolved on first
+attribute access through a module-level ``__getattr__`` (PEP 562), so
+importing a package, or any light submodule below it, does not import its
+heavy siblings.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a package.
+
+    Usage in a package ``__init__``::
+
+        __getattr__, __dir__ = lazy_exports(__name__, {
+            "Web3Manager": ".web3_manager",
+        })
+
+    Args:
+        package: The package's ``__name__``
+        exports: Exported name -> module it is defined in (relative to the
+            package, or absolute), optionally as ``"module:attribute"``
+            when the name differs from the attribute
+
+    Returns:
+        The module-level ``__getattr__`` and ``__dir__`` functions
+    """
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, _, attribute = target.partition(":")
+        value = getattr(importlib.import_module(module_name, package), attribute or name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
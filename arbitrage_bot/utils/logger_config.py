@@ -6,6 +6,8 @@
 from datetime import datetime
 from pathlib import Path
 
+from arbitrage_bot.utils.telemetry import RecordType, publish
+
 
 def setup_logging(log_level=logging.DEBUG):  # Changed default to DEBUG
     """Set up logging configuration."""
@@ -84,6 +86,7 @@ def log_metric(name: str, value: float, **tags):
     metrics_logger = logging.getLogger("metrics")
     tag_str = " ".join(f"{k}={v}" for k, v in tags.items())
     metrics_logger.info(f"{name}={value} {tag_str}")
+    publish(RecordType.METRIC, {"name": name, "value": value, "tags": tags})
 
 
 def log_opportunity(opportunity: dict):
@@ -98,6 +101,7 @@ def log_opportunity(opportunity: dict):
         f"  Expected profit: ${opportunity['profit_usd']:.2f}\n"
         f"  Path: {' -> '.join(opportunity['token_path'])}"
     )
+    publish(RecordType.OPPORTUNITY, opportunity)
 
 
 def log_execution(tx_hash: str, status: str, profit: float, gas_cost: float):
@@ -111,6 +115,10 @@ def log_execution(tx_hash: str, status: str, profit: float, gas_cost: float):
         f"  Gas cost: ${gas_cost:.2f}\n"
         f"  Net profit: ${profit - gas_cost:.2f}"
     )
+    publish(
+        RecordType.EXECUTION,
+        {"tx_hash": tx_hash, "status": status, "profit_usd": profit, "gas_cost_usd": gas_cost},
+    )
 
 
 def log_system_metrics(
@@ -125,3 +133,16 @@ def log_system_metrics(
         f"  Thread count: {thread_count}\n"
         f"  Active approvals: {active_approvals}"
     )
+    publish(
+        RecordType.METRIC,
+        {
+            "name": "system",
+            "value": {
+                "memory_usage_mb": memory_usage,
+                "cpu_usage": cpu_usage,
+                "thread_count": thread_count,
+                "active_approvals": active_approvals,
+            },
+            "tags": {},
+        },
+    )
@@ -0,0 +1,194 @@
+"""
+Event Loop Monitor
+
+Measures event-loop scheduling delay continuously and, in debug mode,
+reports code that blocks the loop:
+- A task sleeps for ``interval`` and records how late it wakes up. Any
+  blocking call on the loop (synchronous file I/O, sqlite commits, lock
+  acquisition) shows up as lag
+- In debug mode a watchdog thread notices when the loop is overdue by
+  more than ``block_threshold`` and captures the loop thread's stack while
+  it is still blocked, so the report points at the offending call rather
+  than at whatever ran next
+
+Lag is published with the latency snapshot (see ``report_latency``) and
+exported as ``arbitrage_event_loop_lag_seconds`` on ``/metrics``.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from .latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Tracks event loop lag and detects blocking callbacks."""
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.1,
+        debug: bool = False,
+        max_events: int = 20,
+        max_stack_depth: int = 40,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag measurements
+            block_threshold: Lag (seconds) counted as the loop being blocked
+            debug: Capture the stack of the loop thread when it blocks
+            max_events: Blocking events kept for ``get_stats``
+            max_stack_depth: Frames kept per captured stack
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.debug = debug
+        self.max_stack_depth = max_stack_depth
+
+        self.lag = LatencyHistogram()
+        self.last_lag = 0.0
+        self.blocked = 0
+        self.events: deque = deque(maxlen=max_events)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._deadline = float("inf")
+        self._stalled: Optional[Dict[str, Any]] = None
+
+    async def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.create_task(self._measure())
+
+        if self.debug:
+            self._stop_event.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval {self.interval * 1000:.0f}ms, "
+            f"debug {'on' if self.debug else 'off'})"
+        )
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._watchdog is not None:
+            self._stop_event.set()
+            self._watchdog.join()
+            self._watchdog = None
+        self._deadline = float("inf")
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable lag histogram and blocked count, for telemetry."""
+        return {
+            "lag": self.lag.to_state(),
+            "blocked": self.blocked,
+            "block_threshold": self.block_threshold,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lag statistics (milliseconds) and recent blocking events."""
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.lag.count,
+            "last_lag_ms": self.last_lag * 1000,
+            "mean_lag_ms": self.lag.mean * 1000,
+            "p50_lag_ms": self.lag.quantile(0.5) * 1000,
+            "p99_lag_ms": self.lag.quantile(0.99) * 1000,
+            "max_lag_ms": self.lag.max / 1e6,
+            "blocked": self.blocked,
+            "block_threshold_ms": self.block_threshold * 1000,
+            "events": list(self.events),
+        }
+
+    async def _measure(self) -> None:
+        """Sleep for ``interval`` and record how late the wakeup is."""
+        loop = self._loop
+        try:
+            while True:
+                expected = loop.time() + self.interval
+                self._deadline = expected
+                await asyncio.sleep(self.interval)
+                self._record(max(0.0, loop.time() - expected))
+        except asyncio.CancelledError:
+            pass
+
+    def _record(self, lag: float) -> None:
+        """Record one lag measurement."""
+        self.lag.record(int(lag * 1e9))
+        self.last_lag = lag
+        if lag > self.block_threshold:
+            self.blocked += 1
+
+        event = self._stalled
+        if event is not None:
+            # The watchdog saw this stall; now we know how long it lasted
+            self._stalled = None
+            event["blocked_ms"] = lag * 1000
+            logger.warning(
+                f"Event loop was blocked for {lag * 1000:.0f}ms in {event['task']}:\n"
+                + "".join(event["stack"])
+            )
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop's stack once it is overdue."""
+        period = max(self.block_threshold / 2, 0.005)
+        while not self._stop_event.wait(period):
+            # loop.time() is time.monotonic(), so the deadline compares directly
+            overdue = time.monotonic() - self._deadline
+            if overdue > self.block_threshold and self._stalled is None:
+                try:
+                    self._capture(overdue)
+                except Exception as e:
+                    logger.error(f"Error capturing blocked loop stack: {e}")
+
+    def _capture(self, overdue: float) -> None:
+        """Record a blocking event with the loop thread's current stack."""
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        task = asyncio.current_task(self._loop)
+        event = {
+            "time": time.time(),
+            "blocked_ms": overdue * 1000,
+            "task": _task_name(task) if task is not None else "<callback>",
+            "stack": self._format_stack(frame),
+        }
+        self.events.append(event)
+        self._stalled = event
+
+    def _format_stack(self, frame) -> List[str]:
+        """Format a stack, outermost frame first."""
+        entries = traceback.extract_stack(frame, limit=self.max_stack_depth)
+        return traceback.format_list(entries)
+
+
+def _task_name(task: asyncio.Task) -> str:
+    """Task name with the coroutine it runs, e.g. ``Task-7 (Tracker.persist)``."""
+    coro = getattr(task.get_coro(), "__qualname__", None)
+    return f"{task.get_name()} ({coro})" if coro else task.get_name()
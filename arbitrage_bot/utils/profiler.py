@@ -0,0 +1,403 @@
+"""
+Sampling Profiler
+
+In-process stack sampler for diagnosing slow detection under live load
+without restarting the bot:
+- ``SamplingProfiler``: a daemon thread that periodically snapshots the
+  stacks of every thread (``sys._current_frames``) and tags samples taken
+  on the event loop thread with the asyncio task that was running
+- ``Profile``: the result of a capture, exported as collapsed stacks
+  (flamegraph.pl / speedscope input), a self-contained SVG flamegraph or a
+  JSON summary with per-task attribution
+
+Sampling from a thread rather than a ``SIGPROF`` timer keeps the event
+loop untouched: signal handlers only run on the main thread, interrupt
+system calls in flight, and would see only that thread's stack. The
+sampler never blocks the profiled threads beyond holding the GIL while it
+walks their frames.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Label for samples taken on the loop thread while no task was running
+NO_TASK = "task:<none>"
+
+
+class Profile:
+    """Stack samples collected by one capture."""
+
+    def __init__(
+        self,
+        stacks: Counter,
+        tasks: Counter,
+        samples: int,
+        duration: float,
+        interval: float,
+        missed: int,
+        sampler_time: float,
+    ):
+        """Initialize a profile.
+
+        Args:
+            stacks: Sample count per collapsed stack (root first, ``;``-joined)
+            tasks: Sample count per asyncio task on the event loop thread
+            samples: Number of sampling passes
+            duration: Wall-clock length of the capture in seconds
+            interval: Requested seconds between samples
+            missed: Sample periods the sampler was late for (folded into
+                the weight of the next sample)
+            sampler_time: Seconds spent walking stacks
+        """
+        self.stacks = stacks
+        self.tasks = tasks
+        self.samples = samples
+        self.duration = duration
+        self.interval = interval
+        self.missed = missed
+        self.sampler_time = sampler_time
+
+    def collapsed(self) -> str:
+        """Render in the collapsed stack format (one ``stack count`` per line)."""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        """Summarize the capture by thread, task and function.
+
+        Args:
+            top: Number of entries to keep in each ranking
+
+        Returns:
+            Dict with capture stats, per-thread and per-task sample shares,
+            and the functions with the most self and inclusive samples
+        """
+        threads: Counter = Counter()
+        self_time: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            threads[frames[0]] += count
+            self_time[frames[-1]] += count
+            for frame in set(frames[1:]):
+                inclusive[frame] += count
+
+        total = sum(self.stacks.values()) or 1
+        task_total = sum(self.tasks.values()) or 1
+
+        def ranked(counter: Counter, denominator: int) -> List[Dict[str, Any]]:
+            return [
+                {"name": name, "samples": count, "percent": 100.0 * count / denominator}
+                for name, count in counter.most_common(top)
+            ]
+
+        return {
+            "samples": self.samples,
+            "stack_samples": sum(self.stacks.values()),
+            "duration": self.duration,
+            "interval": self.interval,
+            "missed_samples": self.missed,
+            "sampler_overhead": self.sampler_time / self.duration if self.duration else 0.0,
+            "threads": ranked(threads, total),
+            "tasks": ranked(self.tasks, task_total),
+            "self": ranked(self_time, total),
+            "inclusive": ranked(inclusive, total),
+        }
+
+    def to_svg(self, title: str = "Arbitrage Bot Profile", width: int = 1200) -> str:
+        """Render a self-contained flamegraph SVG.
+
+        Args:
+            title: Heading drawn above the graph
+            width: Image width in pixels
+
+        Returns:
+            SVG document; hovering a frame shows its sample count
+        """
+        # Build the call tree: name -> [count, children]
+        root: List[Any] = [0, {}]
+        for stack, count in self.stacks.items():
+            root[0] += count
+            node = root
+            for frame in stack.split(";"):
+                node = node[1].setdefault(frame, [0, {}])
+                node[0] += count
+
+        total = root[0] or 1
+        row, header, min_width = 16, 30, 0.5
+        rects: List[Any] = []
+        depth = 0
+        pending = [("all", root, 0.0, 0)]
+        while pending:
+            name, node, x, level = pending.pop()
+            w = (width - 20) * node[0] / total
+            if w < min_width:
+                continue
+            depth = max(depth, level)
+            rects.append((name, node[0], 10 + x, level, w))
+            child_x = x
+            for child_name, child in sorted(node[1].items()):
+                pending.append((child_name, child, child_x, level + 1))
+                child_x += (width - 20) * child[0] / total
+
+        height = header + (depth + 1) * row + 10
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'font-family="monospace" font-size="11">',
+            '<rect width="100%" height="100%" fill="#f8f8f8"/>',
+            f'<text x="{width // 2}" y="20" text-anchor="middle" font-size="15">'
+            f"{escape(title)} ({total} samples)</text>",
+        ]
+        for name, count, x, level, w in rects:
+            y = height - 10 - (level + 1) * row
+            label = escape(name[: max(0, int(w / 7) - 1)]) if w > 21 else ""
+            tooltip = escape(f"{name} ({count} samples, {100.0 * count / total:.2f}%)")
+            parts.append(
+                f'<g><title>{tooltip}</title><rect x="{x:.1f}" y="{y}" width="{w:.1f}" '
+                f'height="{row - 1}" fill="{_color(name)}" rx="2"/>'
+                f'<text x="{x + 3:.1f}" y="{y + row - 4}">{label}</text></g>'
+            )
+        parts.append("</svg>")
+        return "\n".join(parts) + "\n"
+
+
+def _color(name: str) -> str:
+    """Stable warm flamegraph color for a frame name."""
+    digest = hashlib.md5(name.encode()).digest()
+    return f"rgb({205 + digest[0] % 50},{digest[1] % 200},{digest[2] % 55})"
+
+
+class SamplingProfiler:
+    """Samples all thread stacks from a background thread."""
+
+    def __init__(
+        self, interval: float = 0.01, max_depth: int = 128, max_duration: float = 60.0
+    ):
+        """Initialize the profiler.
+
+        Args:
+            interval: Default seconds between samples
+            max_depth: Frames kept per stack, innermost first (the outermost
+                are dropped)
+            max_duration: Upper bound on a single capture in seconds
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_duration = max_duration
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._labels: Dict[Any, str] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._paths = sorted(
+            {os.path.abspath(p) for p in sys.path if p}, key=len, reverse=True
+        )
+
+        self._reset_capture(interval)
+        self.last_profile: Optional[Profile] = None
+        self.captures = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether a capture is in progress."""
+        return self._thread is not None
+
+    def start(
+        self,
+        interval: Optional[float] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        loop_thread: Optional[int] = None,
+    ):
+        """Start sampling in the background.
+
+        Args:
+            interval: Seconds between samples (defaults to the profiler's)
+            loop: Event loop whose running task is attributed to samples
+            loop_thread: Thread ident running ``loop`` (defaults to caller's)
+
+        Raises:
+            RuntimeError: If a capture is already running
+        """
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("A profile capture is already running")
+            self._reset_capture(max(interval or self.interval, 0.001))
+            self._loop = loop
+            self._loop_thread = loop_thread if loop_thread is not None else threading.get_ident()
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="sampling-profiler", daemon=True
+            )
+            self._started = time.perf_counter()
+            self._thread.start()
+        logger.info(f"Profiler started (interval {self._interval * 1000:.1f}ms)")
+
+    def stop(self) -> Profile:
+        """Stop sampling and return the captured profile.
+
+        Raises:
+            RuntimeError: If no capture is running
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                raise RuntimeError("No profile capture is running")
+            self._stop_event.set()
+            thread.join()
+            self._thread = None
+
+            profile = Profile(
+                stacks=self._stacks,
+                tasks=self._tasks,
+                samples=self._samples,
+                duration=time.perf_counter() - self._started,
+                interval=self._interval,
+                missed=self._missed,
+                sampler_time=self._sampler_time,
+            )
+            self._loop = None
+            self._labels.clear()
+            self.last_profile = profile
+            self.captures += 1
+
+        logger.info(
+            f"Profiler captured {profile.samples} samples in {profile.duration:.1f}s "
+            f"({profile.sampler_time / max(profile.duration, 1e-9):.2%} sampler overhead)"
+        )
+        return profile
+
+    async def capture(self, duration: float, interval: Optional[float] = None) -> Profile:
+        """Profile the process for ``duration`` seconds without blocking the loop.
+
+        Samples are attributed to tasks of the running event loop.
+
+        Args:
+            duration: Seconds to sample (capped at ``max_duration``)
+            interval: Seconds between samples
+
+        Returns:
+            Captured profile
+
+        Raises:
+            RuntimeError: If a capture is already running
+        """
+        duration = min(max(duration, 0.0), self.max_duration)
+        self.start(interval, loop=asyncio.get_running_loop())
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profile = self.stop()
+        return profile
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get profiler statistics."""
+        stats = {
+            "running": self.running,
+            "captures": self.captures,
+            "interval": self.interval,
+            "max_duration": self.max_duration,
+        }
+        if self.last_profile is not None:
+            stats["last_capture"] = {
+                "samples": self.last_profile.samples,
+                "duration": self.last_profile.duration,
+                "missed_samples": self.last_profile.missed,
+            }
+        return stats
+
+    def _reset_capture(self, interval: float):
+        """Clear per-capture counters."""
+        self._interval = interval
+        self._stacks: Counter = Counter()
+        self._tasks: Counter = Counter()
+        self._samples = 0
+        self._missed = 0
+        self._sampler_time = 0.0
+        self._started = 0.0
+
+    def _run(self):
+        """Sampler thread: sample on a fixed schedule until stopped."""
+        own = threading.get_ident()
+        last = time.perf_counter() - self._interval
+        while not self._stop_event.is_set():
+            # The sampler only runs once it holds the GIL, which it gets
+            # sooner when the loop releases it (select, I/O) than from a
+            # busy thread. Weighting each sample by the time it stands for
+            # keeps CPU-bound code from being under-represented.
+            began = time.perf_counter()
+            weight = max(1, round((began - last) / self._interval))
+            last = began
+            try:
+                self._sample(own, weight)
+            except Exception as e:
+                logger.error(f"Profiler sample failed: {e}")
+            now = time.perf_counter()
+            self._sampler_time += now - began
+            self._missed += weight - 1
+            self._stop_event.wait(max(0.0, began + self._interval - now))
+
+    def _sample(self, own: int, weight: int):
+        """Record one stack per thread, counted ``weight`` times."""
+        frames = sys._current_frames()
+        task = None
+        if self._loop is not None:
+            task = asyncio.current_task(self._loop)
+
+        self._samples += 1
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = self._label(code)
+                stack.append(label)
+                frame = frame.f_back
+
+            if ident == self._loop_thread:
+                stack.append(self._task_label(task) if task is not None else NO_TASK)
+                self._tasks[stack[-1]] += weight
+            stack.append(self._thread_name(ident))
+            stack.reverse()
+            self._stacks[";".join(stack)] += weight
+
+    def _label(self, code) -> str:
+        """Frame label: qualified function name and shortened source path."""
+        filename = code.co_filename
+        for prefix in self._paths:
+            if filename.startswith(prefix + os.sep):
+                filename = filename[len(prefix) + 1 :]
+                break
+        name = getattr(code, "co_qualname", code.co_name)
+        return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+    @staticmethod
+    def _task_label(task: asyncio.Task) -> str:
+        """Task label: the coroutine's qualified name (stable across tasks)."""
+        coro = task.get_coro()
+        name = getattr(coro, "__qualname__", None) or task.get_name()
+        return f"task:{name}".replace(";", ",")
+
+    def _thread_name(self, ident: int) -> str:
+        """Thread name for an ident, refreshing the cache on unknown idents."""
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._thread_names.setdefault(ident, f"thread-{ident}")
+        return f"thread:{name}".replace(";", ",")
@@ -0,0 +1,362 @@
+"""
+SQLite Writer
+
+Moves SQLite writes off the event loop onto a dedicated writer thread.
+
+Writes are queued on a bounded queue and committed in groups: the writer
+takes everything already queued (up to ``max_batch`` operations) and
+commits it in one transaction, so many rows share one fsync. Each
+operation runs in its own savepoint, so one failing statement does not
+fail the rest of its group.
+
+- ``submit``/``submit_batch`` return a concurrent Future resolved once the
+  operation is committed; ``write``/``write_batch`` are awaitable versions
+- A full queue is backpressure: async writers wait without blocking the
+  event loop, sync writers block, and ``congested`` reports a nearly full
+  queue
+- ``close`` flushes everything queued before stopping and runs at
+  interpreter exit
+- An operation whose future is cancelled before the writer reaches it
+  (e.g. its awaiting task was cancelled) is skipped
+"""
+
+import asyncio
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Statement = Tuple[str, Sequence[Any]]
+
+
+class WriteQueueFull(Exception):
+    """Raised when a non-blocking write finds the queue full."""
+
+
+@dataclass
+class WriteResult:
+    """Outcome of one committed statement."""
+
+    lastrowid: Optional[int]
+    rowcount: int
+
+
+@dataclass
+class _WriteOp:
+    """Queued operation: statements committed atomically, or a flush marker."""
+
+    statements: List[Statement]
+    future: Future = field(default_factory=Future)
+    many: bool = False
+    batch: bool = False
+
+
+_STOP = object()
+
+
+class SQLiteWriter:
+    """
+    Dedicated writer thread for one SQLite database.
+
+    Args:
+        path: Database file path
+        max_queue: Maximum queued operations before writers are held back
+        max_batch: Maximum operations committed in one transaction
+        max_delay: Seconds to wait for more operations before committing
+        high_water: Queue fill ratio reported as congested
+        setup: Optional callable run on the writer connection at start
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10000,
+        max_batch: int = 512,
+        max_delay: float = 0.0,
+        high_water: float = 0.8,
+        setup: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.high_water = high_water
+        self._setup = setup
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_error: Optional[BaseException] = None
+        self._closed = False
+
+        self.stats = {
+            "operations": 0,
+            "statements": 0,
+            "commits": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "backpressure_waits": 0,
+            "max_group": 0,
+        }
+
+    def start(self) -> "SQLiteWriter":
+        """Start the writer thread and open its connection."""
+        if self._thread is not None:
+            return self
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"sqlite-writer:{self.path}", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            self._thread = None
+            raise self._start_error
+
+        atexit.register(self.close)
+        return self
+
+    @property
+    def congested(self) -> bool:
+        """Whether the queue is above the high-water mark."""
+        return self._queue.qsize() >= self.high_water * self._queue.maxsize
+
+    def submit(
+        self,
+        sql: str,
+        params: Sequence[Any] = (),
+        many: bool = False,
+        block: bool = True,
+    ) -> Future:
+        """
+        Queue one statement.
+
+        Args:
+            sql: SQL statement
+            params: Parameters, or a sequence of parameter rows when ``many``
+            many: Run with executemany
+            block: Wait for queue space instead of raising WriteQueueFull
+
+        Returns:
+            Future resolved with a WriteResult once committed
+        """
+        op = _WriteOp([(sql, params)], many=many)
+        self._put(op, block)
+        return op.future
+
+    def submit_batch(self, statements: Sequence[Statement], block: bool = True) -> Future:
+        """
+        Queue statements that commit or fail together.
+
+        Returns:
+            Future resolved with a list of WriteResults once committed
+        """
+        op = _WriteOp(list(statements), batch=True)
+        self._put(op, block)
+        return op.future
+
+    async def write(self, sql: str, params: Sequence[Any] = (), many: bool = False) -> WriteResult:
+        """Queue one statement and wait for its commit without blocking the loop."""
+        op = _WriteOp([(sql, params)], many=many)
+        await self._put_async(op)
+        return await asyncio.wrap_future(op.future)
+
+    async def write_batch(self, statements: Sequence[Statement]) -> List[WriteResult]:
+        """Queue statements that commit together and wait for the commit."""
+        op = _WriteOp(list(statements), batch=True)
+        await self._put_async(op)
+        return await asyncio.wrap_future(op.future)
+
+    async def enqueue(
+        self, sql: str, params: Sequence[Any] = (), many: bool = False
+    ) -> Future:
+        """
+        Queue one statement without waiting for its commit.
+
+        Waits (without blocking the loop) only while the queue is full.
+
+        Returns:
+            Future resolved with a WriteResult once committed
+        """
+        op = _WriteOp([(sql, params)], many=many)
+        await self._put_async(op)
+        return op.future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything queued so far is committed."""
+        if self._thread is None:
+            return
+        op = _WriteOp([])
+        self._put(op, True)
+        op.future.result(timeout)
+
+    async def flush_async(self) -> None:
+        """Wait until everything queued so far is committed."""
+        if self._thread is None:
+            return
+        op = _WriteOp([])
+        await self._put_async(op)
+        await asyncio.wrap_future(op.future)
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Commit everything queued, then stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._thread is None:
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(f"SQLite writer for {self.path} did not stop within {timeout}s")
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        return {**self.stats, "queued": self._queue.qsize(), "congested": self.congested}
+
+    def _put(self, op: _WriteOp, block: bool) -> None:
+        """Queue an operation from a synchronous caller."""
+        self._check_open()
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            if not block:
+                raise WriteQueueFull(f"SQLite write queue for {self.path} is full")
+            self.stats["backpressure_waits"] += 1
+            logger.warning(f"SQLite write queue for {self.path} is full, waiting")
+            self._queue.put(op)
+
+    async def _put_async(self, op: _WriteOp) -> None:
+        """Queue an operation, yielding to the event loop while the queue is full."""
+        self._check_open()
+        delay = 0.001
+        waited = False
+        while True:
+            try:
+                self._queue.put_nowait(op)
+                return
+            except queue.Full:
+                if not waited:
+                    waited = True
+                    self.stats["backpressure_waits"] += 1
+                    logger.warning(f"SQLite write queue for {self.path} is full, waiting")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+    def _check_open(self) -> None:
+        if self._closed or self._thread is None:
+            raise RuntimeError(f"SQLite writer for {self.path} is not running")
+
+    def _run(self) -> None:
+        """Writer thread: collect groups of operations and commit each group once."""
+        try:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if self._setup:
+                self._setup(conn)
+        except BaseException as e:
+            self._start_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        stopping = False
+        try:
+            while not stopping:
+                group = [self._queue.get()]
+                deadline = time.monotonic() + self.max_delay
+                while len(group) < self.max_batch:
+                    try:
+                        timeout = deadline - time.monotonic()
+                        item = (
+                            self._queue.get(timeout=timeout)
+                            if timeout > 0
+                            else self._queue.get_nowait()
+                        )
+                    except queue.Empty:
+                        break
+                    group.append(item)
+
+                if any(item is _STOP for item in group):
+                    stopping = True
+                    group = [item for item in group if item is not _STOP]
+                    # Drain anything queued before the stop request
+                    while True:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is not _STOP:
+                            group.append(item)
+
+                for start in range(0, len(group), self.max_batch):
+                    self._commit_group(conn, group[start : start + self.max_batch])
+        finally:
+            conn.close()
+
+    def _commit_group(self, conn: sqlite3.Connection, group: List[_WriteOp]) -> None:
+        """Run a group of operations in one transaction and resolve their futures."""
+        # Claim each future so it can no longer be cancelled; drop cancelled ones
+        live = [op for op in group if op.future.set_running_or_notify_cancel()]
+        self.stats["cancelled"] += len(group) - len(live)
+        group = live
+        if not group:
+            return
+
+        results: List[Tuple[_WriteOp, Any, Optional[BaseException]]] = []
+        try:
+            conn.execute("BEGIN")
+            for op in group:
+                if not op.statements:
+                    results.append((op, None, None))
+                    continue
+                conn.execute("SAVEPOINT op")
+                try:
+                    op_results = []
+                    for sql, params in op.statements:
+                        if op.many:
+                            cursor = conn.executemany(sql, params)
+                        else:
+                            cursor = conn.execute(sql, params)
+                        op_results.append(WriteResult(cursor.lastrowid, cursor.rowcount))
+                    conn.execute("RELEASE op")
+                    results.append((op, op_results if op.batch else op_results[0], None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    logger.error(f"SQLite write to {self.path} failed: {e}")
+                    results.append((op, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"SQLite group commit to {self.path} failed: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+            results = [(op, None, e) for op in group]
+
+        self.stats["commits"] += 1
+        self.stats["max_group"] = max(self.stats["max_group"], len(group))
+        for op, value, error in results:
+            if op.statements:
+                self.stats["operations"] += 1
+                self.stats["statements"] += len(op.statements)
+                if error is not None:
+                    self.stats["failed"] += 1
+            try:
+                if error is not None:
+                    op.future.set_exception(error)
+                else:
+                    op.future.set_result(value)
+            except Exception as e:
+                # A failed callback must not stop the writer thread
+                logger.error(f"Error resolving SQLite write future for {self.path}: {e}")
@@ -0,0 +1,454 @@
+"""
+Streaming Statistics
+
+Constant-time, constant-memory estimators for hot-path histories:
+- ``P2Quantile``: P-square quantile estimate (Jain & Chlamtac) from five
+  markers, without storing samples
+- ``WindowedQuantile``: quantile over roughly the last ``window`` samples,
+  from two staggered P-square estimators
+- ``EWMA``: exponentially weighted mean and variance
+- ``RingBuffer``: preallocated float ring
+- ``RollingTrend``: least-squares line over the last ``window`` points,
+  kept as running sums
+
+Every update and query is O(1) and reuses preallocated state. Each
+estimator round-trips through ``to_state()`` / ``from_state()`` (plain
+lists and numbers) so histories survive restarts.
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class P2Quantile:
+    """P-square streaming estimate of one quantile."""
+
+    __slots__ = ("p", "count", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, p: float):
+        """
+        Initialize the estimator.
+
+        Args:
+            p: Quantile to estimate (0-1)
+        """
+        if not 0 < p < 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        self.p = p
+        self.count = 0
+        self._heights = [0.0] * 5
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        heights = self._heights
+        count = self.count
+        self.count = count + 1
+
+        if count < 5:
+            # Keep the first five samples sorted in place
+            i = count
+            while i > 0 and heights[i - 1] > value:
+                heights[i] = heights[i - 1]
+                i -= 1
+            heights[i] = value
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        desired = self._desired
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            offset = desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i]
+                    )
+                heights[i] = height
+                positions[i] += step
+
+    def value(self) -> Optional[float]:
+        """
+        Current estimate.
+
+        Returns:
+            The quantile (exact, interpolated like ``np.percentile``, for
+            fewer than five samples), or None if there are no samples
+        """
+        count = self.count
+        if count == 0:
+            return None
+        if count < 5:
+            rank = self.p * (count - 1)
+            low = int(rank)
+            high = min(low + 1, count - 1)
+            return self._heights[low] + (rank - low) * (self._heights[high] - self._heights[low])
+        return self._heights[2]
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self.count = 0
+        p = self.p
+        self._positions[:] = (0, 1, 2, 3, 4)
+        self._desired[:] = (0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable estimator state."""
+        return {
+            "p": self.p,
+            "count": self.count,
+            "heights": list(self._heights),
+            "positions": list(self._positions),
+            "desired": list(self._desired),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "P2Quantile":
+        """Rebuild an estimator from ``to_state()`` output."""
+        estimator = cls(state["p"])
+        estimator.count = state["count"]
+        estimator._heights[:] = state["heights"]
+        estimator._positions[:] = state["positions"]
+        estimator._desired[:] = state["desired"]
+        return estimator
+
+    def _parabolic(self, i: int, step: int) -> float:
+        heights = self._heights
+        positions = self._positions
+        below = positions[i] - positions[i - 1]
+        above = positions[i + 1] - positions[i]
+        return heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+            (below + step) * (heights[i + 1] - heights[i]) / above
+            + (above - step) * (heights[i] - heights[i - 1]) / below
+        )
+
+
+class WindowedQuantile:
+    """
+    Quantile over recent samples.
+
+    Two P-square estimators are restarted alternately every ``window / 2``
+    samples; queries use the older one, so estimates cover between the last
+    ``window / 2`` and ``window`` samples (all samples until ``window / 2``
+    have been seen).
+    """
+
+    __slots__ = ("count", "_half", "_estimators")
+
+    def __init__(self, p: float, window: int):
+        """
+        Initialize the estimator.
+
+        Args:
+            p: Quantile to estimate (0-1)
+            window: Number of recent samples to cover
+        """
+        self.count = 0
+        self._half = max(1, window // 2)
+        self._estimators = (P2Quantile(p), P2Quantile(p))
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        first, second = self._estimators
+        first.add(value)
+        second.add(value)
+        self.count += 1
+        if self.count % self._half == 0:
+            (first if first.count >= second.count else second).reset()
+
+    def value(self) -> Optional[float]:
+        """Current estimate, or None if there are no samples."""
+        first, second = self._estimators
+        return (first if first.count >= second.count else second).value()
+
+    def __len__(self) -> int:
+        return max(estimator.count for estimator in self._estimators)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable estimator state."""
+        return {
+            "count": self.count,
+            "half": self._half,
+            "estimators": [estimator.to_state() for estimator in self._estimators],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "WindowedQuantile":
+        """Rebuild an estimator from ``to_state()`` output."""
+        first, second = state["estimators"]
+        estimator = cls(first["p"], state["half"] * 2)
+        estimator.count = state["count"]
+        estimator._estimators = (P2Quantile.from_state(first), P2Quantile.from_state(second))
+        return estimator
+
+
+class EWMA:
+    """Exponentially weighted moving mean and variance."""
+
+    __slots__ = ("alpha", "count", "mean", "variance")
+
+    def __init__(self, alpha: Optional[float] = None, span: Optional[int] = None):
+        """
+        Initialize the average.
+
+        Args:
+            alpha: Smoothing factor (0-1)
+            span: Alternatively, the span in samples (alpha = 2 / (span + 1))
+        """
+        if alpha is None:
+            if span is None:
+                raise ValueError("Either alpha or span is required")
+            alpha = 2.0 / (span + 1)
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+    @property
+    def std(self) -> float:
+        """Weighted standard deviation."""
+        return math.sqrt(self.variance)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable average state."""
+        return {
+            "alpha": self.alpha,
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "EWMA":
+        """Rebuild an average from ``to_state()`` output."""
+        average = cls(alpha=state["alpha"])
+        average.count = state["count"]
+        average.mean = state["mean"]
+        average.variance = state["variance"]
+        return average
+
+
+class RingBuffer:
+    """Fixed-capacity ring of floats."""
+
+    __slots__ = ("capacity", "_values", "_start", "_size")
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the ring.
+
+        Args:
+            capacity: Maximum number of values kept
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self._values = np.zeros(capacity)
+        self._start = 0
+        self._size = 0
+
+    def append(self, value: float) -> Optional[float]:
+        """
+        Append a value.
+
+        Returns:
+            The value evicted to make room, if the ring was full
+        """
+        evicted = None
+        if self._size == self.capacity:
+            evicted = float(self._values[self._start])
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._values[(self._start + self._size) % self.capacity] = value
+            self._size += 1
+        return evicted
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> float:
+        """Value by age order (0 is the oldest, -1 the newest)."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        return float(self._values[(self._start + index) % self.capacity])
+
+    def values(self) -> np.ndarray:
+        """Copy of the values, oldest first."""
+        return np.roll(self._values, -self._start)[: self._size]
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._start = 0
+        self._size = 0
+
+
+class RollingTrend:
+    """
+    Ordinary least-squares line over the last ``window`` (x, y) points.
+
+    Sums are kept relative to the first x seen, and rebuilt from the rings
+    once per ``window`` evictions so subtraction error does not accumulate.
+    """
+
+    __slots__ = (
+        "window", "_xs", "_ys", "_origin", "_sx", "_sy", "_sxx", "_sxy", "_syy", "_evictions",
+    )
+
+    def __init__(self, window: int):
+        """
+        Initialize the trend.
+
+        Args:
+            window: Number of recent points to fit
+        """
+        self.window = window
+        self._xs = RingBuffer(window)
+        self._ys = RingBuffer(window)
+        self._origin: Optional[float] = None
+        self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.0
+        self._evictions = 0
+
+    def add(self, x: float, y: float) -> None:
+        """Add a point."""
+        if self._origin is None:
+            self._origin = x
+        x -= self._origin
+        old_x = self._xs.append(x)
+        old_y = self._ys.append(y)
+        self._accumulate(x, y, 1)
+
+        if old_x is not None:
+            self._evictions += 1
+            if self._evictions >= self.window:
+                self._rebuild()
+            else:
+                self._accumulate(old_x, old_y, -1)
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def fit(self) -> Optional[Tuple[float, float]]:
+        """
+        Fit the line.
+
+        Returns:
+            (slope, intercept) with x in the caller's units, or None with
+            fewer than two distinct x values
+        """
+        n = len(self._xs)
+        if n < 2:
+            return None
+        denominator = n * self._sxx - self._sx * self._sx
+        if denominator <= 0:
+            return None
+        slope = (n * self._sxy - self._sx * self._sy) / denominator
+        intercept = (self._sy - slope * self._sx) / n
+        return slope, intercept - slope * self._origin
+
+    def predict(self, x: float) -> Optional[float]:
+        """Predict y at x, or None if there is no fit."""
+        fit = self.fit()
+        if fit is None:
+            return None
+        return fit[0] * x + fit[1]
+
+    @property
+    def last_x(self) -> Optional[float]:
+        """Newest x, in the caller's units."""
+        return self._xs[-1] + self._origin if len(self._xs) else None
+
+    @property
+    def y_mean(self) -> float:
+        """Mean of the y values in the window."""
+        return self._sy / len(self._ys) if len(self._ys) else 0.0
+
+    @property
+    def y_std(self) -> float:
+        """Population standard deviation of the y values in the window."""
+        n = len(self._ys)
+        if n < 2:
+            return 0.0
+        return math.sqrt(max(0.0, self._syy / n - (self._sy / n) ** 2))
+
+    def clear(self) -> None:
+        """Remove all points."""
+        self._xs.clear()
+        self._ys.clear()
+        self._origin = None
+        self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.0
+        self._evictions = 0
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable trend state: the window's points in the caller's units."""
+        origin = self._origin or 0.0
+        return {
+            "window": self.window,
+            "xs": [float(x) + origin for x in self._xs.values()],
+            "ys": [float(y) for y in self._ys.values()],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RollingTrend":
+        """Rebuild a trend from ``to_state()`` output."""
+        trend = cls(state["window"])
+        for x, y in zip(state["xs"], state["ys"]):
+            trend.add(x, y)
+        return trend
+
+    def _accumulate(self, x: float, y: float, sign: int) -> None:
+        self._sx += sign * x
+        self._sy += sign * y
+        self._sxx += sign * x * x
+        self._sxy += sign * x * y
+        self._syy += sign * y * y
+
+    def _rebuild(self) -> None:
+        """Recompute the sums from the window, re-basing x on the oldest point."""
+        xs = self._xs.values()
+        ys = self._ys.values()
+        shift = xs[0]
+        self._origin += shift
+        xs -= shift
+        self._xs.clear()
+        self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.0
+        for x, y in zip(xs, ys):
+            self._xs.append(x)
+            self._accumulate(x, y, 1)
+        self._evictions = 0
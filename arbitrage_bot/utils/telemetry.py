@@ -0,0 +1,443 @@
+"""
+Telemetry Channel
+
+Structured telemetry from the bot to local consumers (dashboard bridge, API
+server) over a Unix domain socket, or loopback TCP where Unix sockets are
+unavailable (Windows) or a ``tcp://host:port`` address is given:
+- Frames are a fixed header (payload length, record type, timestamp)
+  followed by a msgpack payload; each record is encoded once for all
+  subscribers
+- Subscribers send one SUBSCRIBE frame listing the record types they want
+- A subscriber whose socket buffer is full has records dropped rather than
+  slowing the bot down
+- ``publish()`` is a no-op until a publisher is installed, so emission
+  points cost nothing when telemetry is off
+"""
+
+import asyncio
+import dataclasses
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from enum import IntEnum
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+# Loopback port used when Unix sockets are unavailable
+DEFAULT_TCP_PORT = int(os.environ.get("TELEMETRY_PORT", "8766"))
+
+DEFAULT_SOCKET_PATH = os.environ.get(
+    "TELEMETRY_SOCKET",
+    "logs/telemetry.sock" if HAS_UNIX_SOCKETS else f"tcp://127.0.0.1:{DEFAULT_TCP_PORT}",
+)
+
+# Payload length, record type, publish timestamp
+HEADER = struct.Struct("<IBd")
+MAX_PAYLOAD = 16 * 1024 * 1024
+
+# Per-subscriber socket buffer above which records are dropped
+DEFAULT_MAX_BUFFER = 1024 * 1024
+
+
+class RecordType(IntEnum):
+    """Telemetry record types."""
+
+    SUBSCRIBE = 0
+    OPPORTUNITY = 1
+    EXECUTION = 2
+    POOL_UPDATE = 3
+    METRIC = 4
+    TRADE = 5
+    LATENCY = 6
+
+
+class TelemetryRecord(NamedTuple):
+    """A decoded telemetry record."""
+
+    kind: RecordType
+    timestamp: float
+    data: Any
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def encode_frame(kind: int, data: Any, timestamp: Optional[float] = None) -> bytes:
+    """
+    Encode a record as a frame.
+
+    Args:
+        kind: Record type
+        data: msgpack-serializable payload (Decimals, datetimes and
+            dataclasses are converted)
+        timestamp: Publish time (default: now)
+
+    Returns:
+        Frame bytes
+    """
+    payload = msgpack.packb(data, use_bin_type=True, default=_encode_default)
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Telemetry payload too large: {len(payload)} bytes")
+    return HEADER.pack(len(payload), kind, timestamp or time.time()) + payload
+
+
+def tcp_address(socket_path: str) -> Optional[Tuple[str, int]]:
+    """
+    Resolve the TCP endpoint for a telemetry address.
+
+    Args:
+        socket_path: Unix socket path or ``tcp://host:port``
+
+    Returns:
+        (host, port) to use instead of a Unix socket, or None
+    """
+    if socket_path.startswith("tcp://"):
+        host, _, port = socket_path[len("tcp://"):].rpartition(":")
+        return host or "127.0.0.1", int(port)
+    if not HAS_UNIX_SOCKETS:
+        return "127.0.0.1", DEFAULT_TCP_PORT
+    return None
+
+
+class FrameDecoder:
+    """Incremental decoder for a stream of frames."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[TelemetryRecord]:
+        """
+        Add received bytes.
+
+        Returns:
+            Records completed by the new bytes
+        """
+        buffer = self._buffer
+        buffer.extend(data)
+        records = []
+        offset = 0
+        while len(buffer) - offset >= HEADER.size:
+            length, kind, timestamp = HEADER.unpack_from(buffer, offset)
+            if length > MAX_PAYLOAD:
+                raise ValueError(f"Telemetry frame too large: {length} bytes")
+            end = offset + HEADER.size + length
+            if len(buffer) < end:
+                break
+            data = msgpack.unpackb(buffer[offset + HEADER.size : end], raw=False)
+            records.append(TelemetryRecord(RecordType(kind), timestamp, data))
+            offset = end
+        if offset:
+            del buffer[:offset]
+        return records
+
+
+class TelemetryPublisher:
+    """Socket server that fans telemetry records out to subscribers."""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_buffer: int = DEFAULT_MAX_BUFFER,
+    ):
+        """
+        Initialize the publisher.
+
+        Args:
+            socket_path: Unix socket path or ``tcp://host:port`` to listen on
+            max_buffer: Per-subscriber buffered bytes above which records
+                are dropped
+        """
+        self.socket_path = str(socket_path)
+        self.tcp_address = tcp_address(self.socket_path)
+        self.max_buffer = max_buffer
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        # Writer -> record types it wants (empty = all)
+        self._subscribers: Dict[asyncio.StreamWriter, Set[int]] = {}
+        self._published = 0
+        self._dropped = 0
+
+    async def start(self) -> None:
+        """Start listening; a stale socket file is replaced."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        if self.tcp_address:
+            host, port = self.tcp_address
+            self._server = await asyncio.start_server(self._on_connect, host, port)
+            # Port 0 picks a free port; report the one actually bound
+            host, port = self._server.sockets[0].getsockname()[:2]
+            self.tcp_address = (host, port)
+            self.socket_path = f"tcp://{host}:{port}"
+            logger.info(f"Telemetry publisher listening on {host}:{port}")
+            return
+
+        path = Path(self.socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        self._server = await asyncio.start_unix_server(self._on_connect, path=self.socket_path)
+        logger.info(f"Telemetry publisher listening on {self.socket_path}")
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect subscribers."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._subscribers):
+            writer.close()
+        self._subscribers.clear()
+        if self.tcp_address:
+            return
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def publish(self, kind: int, data: Any) -> None:
+        """
+        Publish a record to subscribers. Safe to call from any thread.
+
+        Args:
+            kind: Record type
+            data: Record payload
+        """
+        if not self._subscribers:
+            return
+        if self._loop is not None and threading.get_ident() != self._loop_thread:
+            self._loop.call_soon_threadsafe(self.publish, kind, data)
+            return
+
+        try:
+            frame = encode_frame(kind, data)
+        except Exception as e:
+            logger.error(f"Error encoding telemetry record: {e}")
+            return
+
+        self._published += 1
+        for writer, kinds in list(self._subscribers.items()):
+            if kinds and kind not in kinds:
+                continue
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._dropped += 1
+                continue
+            writer.write(frame)
+
+    def attach(self, event_emitter, topics: Optional[Dict[str, int]] = None) -> None:
+        """
+        Forward events from an EventEmitter's bus. Must be called from the loop.
+
+        Args:
+            event_emitter: EventEmitter to forward from
+            topics: Event name -> record type (default: opportunities,
+                executions, swaps and liquidity changes)
+        """
+        from arbitrage_bot.core.events.event_bus import OverflowPolicy
+
+        topics = topics or {
+            "arbitrage:opportunity": RecordType.OPPORTUNITY,
+            "arbitrage:execution": RecordType.EXECUTION,
+            "dex:swap": RecordType.POOL_UPDATE,
+            "dex:liquidity": RecordType.POOL_UPDATE,
+        }
+        for topic, kind in topics.items():
+
+            def forward(events, kind=kind):
+                for event in events:
+                    self.publish(kind, {"event": event.name, "data": event.data})
+
+            event_emitter.bus.subscribe(
+                topic, forward, policy=OverflowPolicy.DROP_OLDEST, batch=True
+            )
+
+    async def _on_connect(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._subscribers[writer] = set()
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for record in decoder.feed(data):
+                    if record.kind == RecordType.SUBSCRIBE:
+                        self._subscribers[writer] = set(record.data or ())
+        except Exception as e:
+            logger.error(f"Error reading from telemetry subscriber: {e}")
+        finally:
+            self._subscribers.pop(writer, None)
+            writer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get publisher statistics."""
+        return {
+            "socket_path": self.socket_path,
+            "subscribers": len(self._subscribers),
+            "published": self._published,
+            "dropped": self._dropped,
+        }
+
+
+class TelemetrySubscriber:
+    """Client for a TelemetryPublisher; reconnects until closed."""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        kinds: Optional[Iterable[int]] = None,
+        reconnect_delay: float = 1.0,
+    ):
+        """
+        Initialize the subscriber.
+
+        Args:
+            socket_path: Publisher's Unix socket path or ``tcp://host:port``
+            kinds: Record types to receive (None = all)
+            reconnect_delay: Seconds between connection attempts
+        """
+        self.socket_path = str(socket_path)
+        self.tcp_address = tcp_address(self.socket_path)
+        self.kinds = [int(kind) for kind in kinds] if kinds else []
+        self.reconnect_delay = reconnect_delay
+        self.connected = False
+        self._closed = False
+
+    def close(self) -> None:
+        """Stop after the current record (or connection attempt)."""
+        self._closed = True
+
+    async def records(self) -> AsyncIterator[TelemetryRecord]:
+        """Yield records as they arrive, reconnecting on failure."""
+        while not self._closed:
+            try:
+                if self.tcp_address:
+                    reader, writer = await asyncio.open_connection(*self.tcp_address)
+                else:
+                    reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError:
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            self.connected = True
+            decoder = FrameDecoder()
+            try:
+                writer.write(encode_frame(RecordType.SUBSCRIBE, self.kinds))
+                while not self._closed:
+                    data = await reader.read(65536)
+                    if not data:
+                        break
+                    for record in decoder.feed(data):
+                        yield record
+            except (OSError, ValueError) as e:
+                logger.warning(f"Telemetry connection lost: {e}")
+            finally:
+                self.connected = False
+                writer.close()
+            if not self._closed:
+                await asyncio.sleep(self.reconnect_delay)
+
+    def iter_blocking(self) -> Iterator[TelemetryRecord]:
+        """Blocking variant of records() for threaded consumers."""
+        while not self._closed:
+            try:
+                sock = self._connect_blocking()
+            except OSError:
+                time.sleep(self.reconnect_delay)
+                continue
+
+            self.connected = True
+            decoder = FrameDecoder()
+            try:
+                sock.sendall(encode_frame(RecordType.SUBSCRIBE, self.kinds))
+                while not self._closed:
+                    data = sock.recv(65536)
+                    if not data:
+                        break
+                    yield from decoder.feed(data)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Telemetry connection lost: {e}")
+            finally:
+                self.connected = False
+                sock.close()
+            if not self._closed:
+                time.sleep(self.reconnect_delay)
+
+    def _connect_blocking(self) -> socket.socket:
+        if self.tcp_address:
+            return socket.create_connection(self.tcp_address)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    async def run(self, handler: Callable[[TelemetryRecord], Any]) -> None:
+        """Call a function or coroutine function for every record."""
+        is_async = asyncio.iscoroutinefunction(handler)
+        async for record in self.records():
+            try:
+                if is_async:
+                    await handler(record)
+                else:
+                    handler(record)
+            except Exception as e:
+                logger.error(f"Error in telemetry handler: {e}")
+
+
+_publisher: Optional[TelemetryPublisher] = None
+
+
+def set_publisher(publisher: Optional[TelemetryPublisher]) -> None:
+    """Install (or remove) the process-wide publisher used by publish()."""
+    global _publisher
+    _publisher = publisher
+
+
+def get_publisher() -> Optional[TelemetryPublisher]:
+    """Get the process-wide publisher, if any."""
+    return _publisher
+
+
+def publish(kind: int, data: Any) -> None:
+    """Publish through the process-wide publisher; no-op if none is installed."""
+    publisher = _publisher
+    if publisher is not None:
+        publisher.publish(kind, data)
@@ -19,6 +19,13 @@
 import json
 import urllib.parse
 
+from arbitrage_bot.utils.latency import render_prometheus, summarize
+from arbitrage_bot.utils.telemetry import (
+    DEFAULT_SOCKET_PATH,
+    RecordType,
+    TelemetrySubscriber,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +42,13 @@
 # API port
 API_PORT = 8081
 
+# Trades kept in the cache
+MAX_CACHED_TRADES = 100
+
+# Seconds between re-reads of the state and metrics files; trades arrive over
+# the telemetry channel while the bot is running
+FILE_REFRESH_INTERVAL = 30
+
 # Cache for data
 data_cache = {
     "state": {},
@@ -43,9 +57,14 @@
     "dex_stats": {},
     "performance": {},
     "trades": [],
+    "live_metrics": {},
     "last_updated": None
 }
 
+# Latest latency histograms from the bot; kept out of data_cache so that
+# /api/data stays small
+latency_snapshot = {}
+
 # Lock for thread safety
 cache_lock = threading.Lock()
 
@@ -139,7 +158,7 @@ def read_recent_trades():
         return trades_data.get("trades", [])
 
     @staticmethod
-    def read_all_data():
+    def read_all_data(include_trades=True):
         """Read all data from the bot's memory bank."""
         try:
             # Read state
@@ -158,10 +177,10 @@ def read_all_data():
             performance = DataReader.read_performance()
 
             # Read trades - try individual files first as they're more reliable
-            trades = DataReader.read_trades()
+            trades = DataReader.read_trades() if include_trades else None
 
             # If no trades from individual files, try the consolidated file
-            if not trades:
+            if include_trades and not trades:
                 logger.warning("No trades found in individual files, trying consolidated file")
                 trades = DataReader.read_recent_trades()
 
@@ -262,6 +281,22 @@ def do_GET(self):
                 self._set_headers()
                 self.wfile.write(response.encode())
 
+            elif path == "/api/latency":
+                # Return per-stage, span and RPC latency summaries
+                with cache_lock:
+                    response = json.dumps(summarize(latency_snapshot))
+
+                self._set_headers()
+                self.wfile.write(response.encode())
+
+            elif path == "/metrics":
+                # Prometheus scrape endpoint
+                with cache_lock:
+                    response = render_prometheus(latency_snapshot)
+
+                self._set_headers("text/plain; version=0.0.4")
+                self.wfile.write(response.encode())
+
             elif path == "/":
                 # Return a simple status page
                 status_html = f"""
@@ -308,6 +343,12 @@ def do_GET(self):
                         <div class="endpoint">
                             <a href="/api/trades">/api/trades</a> - Recent trades
                         </div>
+                        <div class="endpoint">
+                            <a href="/api/latency">/api/latency</a> - Pipeline and RPC latency
+                        </div>
+                        <div class="endpoint">
+                            <a href="/metrics">/metrics</a> - Prometheus metrics
+                        </div>
                     </div>
                 </body>
                 </html>
@@ -336,11 +377,11 @@ class ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     """Handle requests in a separate thread."""
     pass
 
-def update_cache():
+def update_cache(include_trades=True):
     """Update the data cache with fresh data."""
     try:
         # Read all data
-        data = DataReader.read_all_data()
+        data = DataReader.read_all_data(include_trades)
 
         # Update cache
         with cache_lock:
@@ -349,24 +390,54 @@ def update_cache():
             data_cache["token_prices"] = data["token_prices"]
             data_cache["dex_stats"] = data["dex_stats"]
             data_cache["performance"] = data["performance"]
-            data_cache["trades"] = data["trades"]
+            if data["trades"] is not None:
+                data_cache["trades"] = data["trades"]
             data_cache["last_updated"] = data["timestamp"]
 
-        logger.info(f"Data cache updated successfully with {len(data['trades'])} trades")
+        logger.info(f"Data cache updated successfully with {len(data_cache['trades'])} trades")
         return True
     except Exception as e:
         logger.error(f"Error updating data cache: {e}")
         return False
 
-def cache_updater():
-    """Background thread to update the cache periodically."""
+def apply_telemetry(record):
+    """Apply a telemetry record from the bot to the cache."""
+    with cache_lock:
+        if record.kind == RecordType.TRADE:
+            trades = data_cache["trades"]
+            trades.insert(0, record.data)
+            del trades[MAX_CACHED_TRADES:]
+        elif record.kind == RecordType.METRIC:
+            data_cache["live_metrics"][record.data["name"]] = record.data["value"]
+        elif record.kind == RecordType.LATENCY:
+            latency_snapshot.clear()
+            latency_snapshot.update(record.data)
+        data_cache["last_updated"] = datetime.fromtimestamp(record.timestamp).isoformat()
+
+
+def telemetry_listener(subscriber):
+    """Background thread that applies telemetry records as they arrive."""
+    for record in subscriber.iter_blocking():
+        try:
+            apply_telemetry(record)
+        except Exception as e:
+            logger.error(f"Error applying telemetry record: {e}")
+
+
+def cache_updater(subscriber):
+    """Background thread to refresh file-backed data.
+
+    While the telemetry channel is connected only the state and metrics files
+    are re-read; otherwise trade files are re-read too.
+    """
     consecutive_failures = 0
     while True:
         try:
-            success = update_cache()
+            live = subscriber.connected
+            success = update_cache(include_trades=not live)
             if success:
                 consecutive_failures = 0
-                time.sleep(2)  # Update every 2 seconds when successful
+                time.sleep(FILE_REFRESH_INTERVAL if live else 2)
             else:
                 consecutive_failures += 1
                 logger.warning(f"Cache update failed, consecutive failures: {consecutive_failures}")
@@ -401,8 +472,19 @@ def main():
         if not success:
             logger.warning("Initial data collection failed, but continuing anyway")
 
-        # Start cache updater thread
-        updater_thread = threading.Thread(target=cache_updater, daemon=True)
+        # Subscribe to the bot's telemetry and start the file refresh thread
+        subscriber = TelemetrySubscriber(
+            DEFAULT_SOCKET_PATH,
+            kinds=[RecordType.TRADE, RecordType.METRIC, RecordType.LATENCY],
+        )
+        telemetry_thread = threading.Thread(
+            target=telemetry_listener, args=(subscriber,), daemon=True
+        )
+        telemetry_thread.start()
+
+        updater_thread = threading.Thread(
+            target=cache_updater, args=(subscriber,), daemon=True
+        )
         updater_thread.start()
 
         # Start API server with error handling
@@ -59,6 +59,13 @@ document.addEventListener('DOMContentLoaded', function() {
         } else {
             console.error('initInfrastructureSection is not defined');
         }
+
+        console.log('Initializing latency section...');
+        if (typeof initLatencySection === 'function') {
+            initLatencySection();
+        } else {
+            console.error('initLatencySection is not defined');
+        }
     } catch (error) {
         console.error('Error initializing dashboard sections:', error);
     }
@@ -92,6 +99,7 @@ function refreshAllSections() {
         if (typeof fetchBotMetrics === 'function') fetchBotMetrics();
         if (typeof fetchFinancialData === 'function') fetchFinancialData();
         if (typeof fetchInfrastructureData === 'function') fetchInfrastructureData();
+        if (typeof fetchLatencyData === 'function') fetchLatencyData();
     } catch (error) {
         console.error('Error refreshing dashboard sections:', error);
     }
@@ -0,0 +1,235 @@
+/**
+ * Latency Section
+ * Displays per-stage pipeline latency, span and RPC method latency histograms,
+ * and event loop lag
+ */
+
+// Bot API URL for latency data
+const LATENCY_API_URL = "http://localhost:8081";
+
+// Create latency section
+function createLatencySection() {
+    const section = document.createElement('div');
+    section.className = 'card';
+    section.id = 'latencySection';
+
+    section.innerHTML = `
+        <div class="card-header">
+            <h2>Pipeline Latency</h2>
+            <button id="refreshLatencyBtn" class="refresh-btn">Refresh</button>
+        </div>
+
+        <h3 class="subsection-title">Event Loop</h3>
+        <div id="latencyLoopSummary" class="loading-cell">Loading event loop lag...</div>
+
+        <h3 class="subsection-title">Time From Block Received</h3>
+        <div class="table-container">
+            <table class="data-table">
+                <thead>
+                    <tr>
+                        <th>Stage</th>
+                        <th>Count</th>
+                        <th>p50</th>
+                        <th>p90</th>
+                        <th>p99</th>
+                        <th>p99.9</th>
+                        <th>Max</th>
+                    </tr>
+                </thead>
+                <tbody id="latencyStageTableBody">
+                    <tr>
+                        <td colspan="7" class="loading-cell">Loading stage latency...</td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+
+        <h3 class="subsection-title">Spans</h3>
+        <div class="table-container">
+            <table class="data-table">
+                <thead>
+                    <tr>
+                        <th>Span</th>
+                        <th>Count</th>
+                        <th>p50</th>
+                        <th>p90</th>
+                        <th>p99</th>
+                        <th>p99.9</th>
+                        <th>Max</th>
+                    </tr>
+                </thead>
+                <tbody id="latencySpanTableBody">
+                    <tr>
+                        <td colspan="7" class="loading-cell">Loading span latency...</td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+
+        <h3 class="subsection-title">RPC Methods</h3>
+        <div class="table-container">
+            <table class="data-table">
+                <thead>
+                    <tr>
+                        <th>Method</th>
+                        <th>Calls</th>
+                        <th>Errors</th>
+                        <th>p50</th>
+                        <th>p99</th>
+                        <th>Max</th>
+                        <th>Avg Response</th>
+                    </tr>
+                </thead>
+                <tbody id="latencyRpcTableBody">
+                    <tr>
+                        <td colspan="7" class="loading-cell">Loading RPC latency...</td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+
+        <div id="latencyError" class="error"></div>
+    `;
+
+    return section;
+}
+
+// Initialize latency section
+function initLatencySection() {
+    // Add section to the explicit container
+    const sectionContainer = document.getElementById('latencySection');
+    if (sectionContainer) {
+        sectionContainer.innerHTML = ''; // Clear any existing content
+        sectionContainer.appendChild(createLatencySection());
+
+        // Set up refresh button
+        document.getElementById('refreshLatencyBtn').addEventListener('click', fetchLatencyData);
+
+        // Initial data fetch
+        fetchLatencyData();
+
+        // Set up auto-refresh
+        setInterval(fetchLatencyData, 5000); // Every 5 seconds
+    } else {
+        console.error('Latency section container not found');
+    }
+}
+
+// Fetch latency summaries from the bot API
+async function fetchLatencyData() {
+    try {
+        document.getElementById('latencyError').style.display = 'none';
+
+        const response = await fetch(`${LATENCY_API_URL}/api/latency`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const data = await response.json();
+
+        updateLatencyTable('latencyStageTableBody', data.stages, 'No stage latency recorded yet');
+        updateLatencyTable('latencySpanTableBody', data.spans, 'No span latency recorded yet');
+        updateRpcLatencyTable(data.rpc);
+        updateLoopLagSummary(data.event_loop);
+
+        console.log('Latency data updated successfully');
+    } catch (error) {
+        console.error('Error fetching latency data:', error);
+        document.getElementById('latencyError').textContent = `Error: ${error.message}`;
+        document.getElementById('latencyError').style.display = 'block';
+    }
+}
+
+// Format a latency in milliseconds
+function formatLatency(ms) {
+    if (ms === undefined || ms === null) {
+        return '-';
+    }
+    if (ms < 1) {
+        return `${(ms * 1000).toFixed(0)} µs`;
+    }
+    if (ms < 1000) {
+        return `${ms.toFixed(1)} ms`;
+    }
+    return `${(ms / 1000).toFixed(2)} s`;
+}
+
+// Update a stage or span latency table
+function updateLatencyTable(tableBodyId, rows, emptyMessage) {
+    const tableBody = document.getElementById(tableBodyId);
+
+    // Clear existing rows
+    tableBody.innerHTML = '';
+
+    const names = Object.keys(rows || {});
+    if (names.length === 0) {
+        tableBody.innerHTML = `<tr><td colspan="7" class="loading-cell">${emptyMessage}</td></tr>`;
+        return;
+    }
+
+    // Add new rows
+    for (const name of names) {
+        const stats = rows[name];
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${name}</td>
+            <td>${stats.count.toLocaleString()}</td>
+            <td>${formatLatency(stats.p50_ms)}</td>
+            <td>${formatLatency(stats.p90_ms)}</td>
+            <td>${formatLatency(stats.p99_ms)}</td>
+            <td>${formatLatency(stats['p99.9_ms'])}</td>
+            <td>${formatLatency(stats.max_ms)}</td>
+        `;
+        tableBody.appendChild(row);
+    }
+}
+
+// Update event loop lag summary
+function updateLoopLagSummary(stats) {
+    const summary = document.getElementById('latencyLoopSummary');
+    if (!stats) {
+        summary.textContent = 'No event loop lag recorded yet';
+        return;
+    }
+    const blockedClass = stats.blocked > 0 ? 'failure' : '';
+    summary.innerHTML = `
+        Lag p50 ${formatLatency(stats.p50_ms)} &middot;
+        p99 ${formatLatency(stats.p99_ms)} &middot;
+        max ${formatLatency(stats.max_ms)} &middot;
+        <span class="${blockedClass}">${stats.blocked.toLocaleString()} blocked</span>
+    `;
+}
+
+// Update RPC method table
+function updateRpcLatencyTable(rows) {
+    const tableBody = document.getElementById('latencyRpcTableBody');
+
+    // Clear existing rows
+    tableBody.innerHTML = '';
+
+    const methods = Object.keys(rows || {});
+    if (methods.length === 0) {
+        tableBody.innerHTML = '<tr><td colspan="7" class="loading-cell">No RPC calls recorded yet</td></tr>';
+        return;
+    }
+
+    // Slowest methods first
+    methods.sort((a, b) => rows[b].p99_ms - rows[a].p99_ms);
+
+    // Add new rows
+    for (const method of methods) {
+        const stats = rows[method];
+        const errorClass = stats.errors > 0 ? 'failure' : '';
+        const averageResponse = stats.count > 0 ? stats.response_bytes / stats.count : 0;
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${method}</td>
+            <td>${stats.count.toLocaleString()}</td>
+            <td class="${errorClass}">${stats.errors.toLocaleString()}</td>
+            <td>${formatLatency(stats.p50_ms)}</td>
+            <td>${formatLatency(stats.p99_ms)}</td>
+            <td>${formatLatency(stats.max_ms)}</td>
+            <td>${(averageResponse / 1024).toFixed(1)} KB</td>
+        `;
+        tableBody.appendChild(row);
+    }
+}
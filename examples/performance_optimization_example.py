@@ -163,9 +163,7 @@ async def demonstrate_shared_memory():
     logger.info(f"Updated state: {updated_state}")
     logger.info(f"Updated state version: {updated_version}")
     
-    # Clean up
-    await memory_manager.delete_region("metrics_registry")
-    await memory_manager.delete_region("state_registry")
+    # Clean up (the metrics and state tables are unlinked at exit)
     for region in await memory_manager.list_regions():
         await memory_manager.delete_region(region.name)
 
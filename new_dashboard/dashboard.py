@@ -51,7 +51,12 @@
 # Get the directory containing this file
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
-# Mount static files
+# Mount static files; the shared scripts (WebSocketManager) live in the dashboard package
+app.mount(
+    "/static/js",
+    StaticFiles(directory=os.path.join(current_dir, "dashboard", "static", "js")),
+    name="static_js",
+)
 app.mount(
     "/static", StaticFiles(directory=os.path.join(current_dir, "static")), name="static"
 )
@@ -20,6 +20,7 @@
 from ..services.memory_service import MemoryService
 from ..services.market_data_service import MarketDataService
 from ..services.system_service import SystemService
+from ..services.state_stream import StateStream
 
 router = APIRouter()
 logger = get_logger("websocket_routes")
@@ -215,76 +216,72 @@ async def handle_updates(
         logger.error(f"Error in update handler: {e}")
 
 
-@router.websocket("/ws/metrics")
-async def websocket_metrics(
-    websocket: WebSocket,
-    metrics_service: MetricsService = Depends(get_metrics_service),
-    memory_service: MemoryService = Depends(get_memory_service),
-    market_data_service: MarketDataService = Depends(get_market_data_service),
+async def _wait_for_disconnect(websocket: WebSocket):
+    """Read (and discard) client messages until the client disconnects."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def stream_state(
+    websocket: WebSocket, stream: StateStream, path: str, name: str
 ):
-    """WebSocket endpoint for all metrics updates."""
-    metrics_queue = None
+    """Stream a subtree of versioned state to a websocket.
+
+    The client receives a snapshot followed by JSON-patch frames. Frames are
+    serialized once per update and shared by every connection on the same
+    path; a client that falls behind gets a fresh snapshot instead of the
+    backlog. Clients connecting with ``?compress=deflate`` receive large
+    frames as zlib-compressed binary messages.
+    """
+    compress = websocket.query_params.get("compress") == "deflate"
+    subscriber = None
 
     async with manager.connection(websocket):
         try:
-            logger.info("WebSocket client connected to metrics endpoint")
-
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
+            logger.info(f"WebSocket client connected to {name} endpoint")
+            subscriber = stream.subscribe(path)
 
-            # Send initial state
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                logger.info(f"Sending initial metrics state via /ws/metrics")
-                logger.debug(
-                    f"Initial metrics data: {initial_metrics}"
-                )  # Log initial data
-                try:
-                    await websocket.send_json(
-                        {
-                            "type": "initial_state",
-                            "data": initial_metrics,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(f"Error sending initial state: {send_error}")
-                    # If initial send fails, don't proceed
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning("Connection inactive before sending initial state.")
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    lambda x: {**x, "_timestamp": datetime.utcnow().isoformat()},
-                    lambda: manager.is_active(websocket),
-                )
-            )
+            async def send_frames():
+                async for frame in subscriber:
+                    if not manager.is_active(websocket):
+                        break
+                    payload = frame.payload(compress)
+                    if isinstance(payload, bytes):
+                        await websocket.send_bytes(payload)
+                    else:
+                        await websocket.send_text(payload)
 
+            update_task = asyncio.create_task(send_frames())
+            receive_task = asyncio.create_task(_wait_for_disconnect(websocket))
             manager.add_task(websocket, update_task)
+            manager.add_task(websocket, receive_task)
 
-            try:
-                await update_task
-            except asyncio.CancelledError:
-                logger.info("Metrics WebSocket task cancelled")
-            except Exception as e:
-                logger.error(f"Error in metrics WebSocket task: {e}")
+            done, _ = await asyncio.wait(
+                {update_task, receive_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
 
         except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from metrics endpoint")
+            logger.info(f"WebSocket client disconnected from {name} endpoint")
+        except asyncio.CancelledError:
+            logger.info(f"{name} WebSocket task cancelled")
         except Exception as e:
-            logger.error(f"WebSocket error: {e}")
+            logger.error(f"WebSocket error on {name} endpoint: {e}")
         finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+            if subscriber:
+                stream.unsubscribe(subscriber)
+
+
+@router.websocket("/ws/metrics")
+async def websocket_metrics(
+    websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
+):
+    """WebSocket endpoint for all metrics updates."""
+    await stream_state(websocket, metrics_service.stream, "", "metrics")
 
 
 @router.websocket("/ws/profitability")
@@ -292,68 +289,7 @@ async def websocket_profitability(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for profitability metrics."""
-    metrics_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            logger.info("WebSocket client connected to profitability endpoint")
-
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
-
-            # Send initial state
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    await websocket.send_json(
-                        {
-                            "profitability": initial_metrics.get("metrics", {}).get(
-                                "profitability", {}
-                            ),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(
-                        f"Error sending initial profitability state: {send_error}"
-                    )
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial profitability state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "profitability": update.get("metrics", {}).get("profitability", {}),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from profitability endpoint")
-        except Exception as e:
-            logger.error(f"WebSocket error: {e}")
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+    await stream_state(websocket, metrics_service.stream, "/metrics/profitability", "profitability")
 
 
 @router.websocket("/ws/dex-performance")
@@ -361,65 +297,7 @@ async def websocket_dex_performance(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for DEX performance metrics."""
-    metrics_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
-
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    await websocket.send_json(
-                        {
-                            "dex_performance": initial_metrics.get("metrics", {}).get(
-                                "dex_performance", {}
-                            ),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(
-                        f"Error sending initial dex_performance state: {send_error}"
-                    )
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial dex_performance state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "dex_performance": update.get("metrics", {}).get(
-                        "dex_performance", {}
-                    ),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from DEX performance endpoint")
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+    await stream_state(websocket, metrics_service.stream, "/metrics/dex_performance", "DEX performance")
 
 
 @router.websocket("/ws/flash-loans")
@@ -427,63 +305,7 @@ async def websocket_flash_loans(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for flash loan metrics."""
-    metrics_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
-
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    await websocket.send_json(
-                        {
-                            "flash_loans": initial_metrics.get("metrics", {}).get(
-                                "flash_loans", {}
-                            ),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(
-                        f"Error sending initial flash_loans state: {send_error}"
-                    )
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial flash_loans state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "flash_loans": update.get("metrics", {}).get("flash_loans", {}),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from flash loans endpoint")
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+    await stream_state(websocket, metrics_service.stream, "/metrics/flash_loans", "flash loans")
 
 
 @router.websocket("/ws/execution")
@@ -491,63 +313,7 @@ async def websocket_execution(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for execution metrics."""
-    metrics_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
-
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    await websocket.send_json(
-                        {
-                            "execution": initial_metrics.get("metrics", {}).get(
-                                "execution", {}
-                            ),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(
-                        f"Error sending initial execution state: {send_error}"
-                    )
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial execution state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "execution": update.get("metrics", {}).get("execution", {}),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from execution endpoint")
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+    await stream_state(websocket, metrics_service.stream, "/metrics/execution", "execution")
 
 
 @router.websocket("/ws/token-performance")
@@ -555,65 +321,7 @@ async def websocket_token_performance(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for token performance metrics."""
-    metrics_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
-
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    await websocket.send_json(
-                        {
-                            "token_performance": initial_metrics.get("metrics", {}).get(
-                                "token_performance", {}
-                            ),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(
-                        f"Error sending initial token_performance state: {send_error}"
-                    )
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial token_performance state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "token_performance": update.get("metrics", {}).get(
-                        "token_performance", {}
-                    ),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from token performance endpoint")
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+    await stream_state(websocket, metrics_service.stream, "/metrics/token_performance", "token performance")
 
 
 @router.websocket("/ws/system-performance")
@@ -621,127 +329,15 @@ async def websocket_system_performance(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for system performance metrics."""
-    metrics_queue = None
+    await stream_state(websocket, metrics_service.stream, "/metrics/system_performance", "system performance")
 
-    async with manager.connection(websocket):
-        try:
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
 
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    await websocket.send_json(
-                        {
-                            "system_performance": initial_metrics.get(
-                                "metrics", {}
-                            ).get("system_performance", {}),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        }
-                    )
-                except Exception as send_error:
-                    logger.warning(
-                        f"Error sending initial system_performance state: {send_error}"
-                    )
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial system_performance state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "system_performance": update.get("metrics", {}).get(
-                        "system_performance", {}
-                    ),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info(
-                "WebSocket client disconnected from system performance endpoint"
-            )
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
-
-
-# Keep existing endpoints
 @router.websocket("/ws/system")
 async def websocket_system(
     websocket: WebSocket, metrics_service: MetricsService = Depends(get_metrics_service)
 ):
     """WebSocket endpoint for system metrics only."""
-    metrics_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            metrics_queue = await metrics_service.subscribe()
-            manager.add_queue(websocket, metrics_queue)
-
-            initial_metrics = await metrics_service.get_current_metrics()
-            # Check state before sending initial data
-            if manager.is_active(websocket):
-                try:
-                    system_metrics = {
-                        "system": initial_metrics.get("system", {}),
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                    await websocket.send_json(system_metrics)
-                except Exception as send_error:
-                    logger.warning(f"Error sending initial system state: {send_error}")
-                    raise WebSocketDisconnect(
-                        code=1008, reason="Failed to send initial state"
-                    )
-            else:
-                logger.warning(
-                    "Connection inactive before sending initial system state."
-                )
-                raise WebSocketDisconnect(
-                    code=1001, reason="Connection closed before initialization"
-                )
-
-            def process_update(update):
-                return {
-                    "system": update.get("system", {}),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    metrics_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from system endpoint")
-        finally:
-            if metrics_queue:
-                await metrics_service.unsubscribe(metrics_queue)
+    await stream_state(websocket, metrics_service.stream, "/system", "system")
 
 
 @router.websocket("/ws/detailed-system")
@@ -821,44 +417,7 @@ async def websocket_trades(
     websocket: WebSocket, memory_service: MemoryService = Depends(get_memory_service)
 ):
     """WebSocket endpoint for trade history updates only."""
-    memory_queue = None
-
-    async with manager.connection(websocket):
-        try:
-            memory_queue = await memory_service.subscribe()
-            manager.add_queue(websocket, memory_queue)
-
-            initial_state = await memory_service.get_current_state()
-            if manager.is_active(websocket):
-                trade_data = {
-                    "trade_history": initial_state.get("trade_history", []),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-                await websocket.send_json(trade_data)
-
-            def process_update(update):
-                return {
-                    "trade_history": update.get("trade_history", []),
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-
-            update_task = asyncio.create_task(
-                handle_updates(
-                    websocket,
-                    memory_queue,
-                    process_update,
-                    lambda: manager.is_active(websocket),
-                )
-            )
-
-            manager.add_task(websocket, update_task)
-            await update_task
-
-        except WebSocketDisconnect:
-            logger.info("WebSocket client disconnected from trades endpoint")
-        finally:
-            if memory_queue:
-                await memory_service.unsubscribe(memory_queue)
+    await stream_state(websocket, memory_service.stream, "/trade_history", "trades")
 
 
 @router.websocket("/ws/market")
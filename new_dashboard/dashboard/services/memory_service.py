@@ -9,6 +9,7 @@
 
 from ..core.logging import get_logger
 from .file_handler import FileManager
+from .state_stream import StateStream
 
 logger = get_logger("memory_service")
 
@@ -29,6 +30,8 @@ def __init__(self, base_dir: str):
         self.file_manager = FileManager(self.base_dir)
         self._subscribers: List[asyncio.Queue] = []
         self._current_state: Dict[str, Any] = {}
+        # Versioned state for WebSocket clients; trade appends stream as deltas
+        self.stream = StateStream()
         self._lock = asyncio.Lock()
         self._initialized = False
 
@@ -91,6 +94,7 @@ async def _load_state(self):
                 # Load metrics
                 metrics_data = await self.file_manager.read_file("metrics")
                 self._current_state["metrics"] = metrics_data
+                self.stream.update(self._current_state)
 
                 logger.debug(
                     f"Loaded state: {json.dumps(self._current_state, indent=2)}"
@@ -117,6 +121,11 @@ async def _handle_file_change(self, file_key: str, content: Dict[str, Any]):
 
     async def _notify_subscribers(self):
         """Notify subscribers of state changes."""
+        try:
+            self.stream.update(self._current_state)
+        except Exception as e:
+            logger.error(f"Error streaming state update: {e}")
+
         if not self._subscribers:
             return
 
@@ -13,6 +13,7 @@
 
 from ..core.logging import get_logger
 from .memory_service import MemoryService
+from .state_stream import StateStream
 
 logger = get_logger("metrics_service")
 
@@ -32,6 +33,8 @@ def __init__(self, memory_service: MemoryService):
         self.memory_service = memory_service
         self._subscribers: List[asyncio.Queue] = []
         self._current_metrics: Dict[str, Any] = {}
+        # Versioned metrics for WebSocket clients, streamed as deltas
+        self.stream = StateStream()
         # Initialize with default structure
         self._stats = {
             "metrics": {
@@ -404,26 +407,26 @@ async def _update_system_metrics_loop(self):
 
     async def _notify_subscribers(self):
         """Notify subscribers of metrics updates."""
+        try:
+            self.stream.update(self._current_metrics)
+        except Exception as e:
+            logger.error(f"Error streaming metrics update: {e}")
+
         if not self._subscribers:
             return
 
         try:
-            # Create a deep copy to prevent modification issues
+            # One copy shared by all queue subscribers
             metrics_copy = json.loads(json.dumps(self._current_metrics))
 
-            # Send to all subscribers
-            active_subscribers = self._subscribers[:]  # Iterate over a copy
-            for queue in active_subscribers:
-                if queue in self._subscribers:  # Check if still subscribed
-                    try:
-                        # Non-blocking put if queue is full? Or handle differently?
-                        await asyncio.wait_for(queue.put(metrics_copy), timeout=1.0)
-                    except asyncio.TimeoutError:
-                        logger.warning(
-                            "Subscriber queue full or unresponsive, skipping."
-                        )
-                    except Exception as e:
-                        logger.error(f"Error notifying subscriber: {e}")
+            for queue in self._subscribers[:]:
+                try:
+                    # A lagging subscriber only needs the latest state
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(metrics_copy)
+                except Exception as e:
+                    logger.error(f"Error notifying subscriber: {e}")
 
         except Exception as e:
             logger.error(f"Error preparing notification for subscribers: {e}")
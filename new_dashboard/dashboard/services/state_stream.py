@@ -0,0 +1,343 @@
+"""Versioned state streaming with JSON-patch deltas."""
+
+import asyncio
+import json
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from ..core.logging import get_logger
+
+logger = get_logger("state_stream")
+
+# Frames smaller than this are sent uncompressed even if compression is on
+MIN_COMPRESS_SIZE = 512
+
+
+def escape_pointer(key: Any) -> str:
+    """Escape a key for use as a JSON pointer segment."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def split_pointer(path: str) -> List[str]:
+    """Split a JSON pointer into unescaped segments."""
+    if not path:
+        return []
+    return [
+        part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")
+    ]
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Compute JSON-patch operations that turn ``old`` into ``new``.
+
+    Only add, remove and replace are emitted. Lists that grew by appending
+    produce one ``add`` per new item; any other list change replaces the
+    list.
+
+    Args:
+        old: Previous JSON-compatible value
+        new: Current value
+        path: JSON pointer of the values
+
+    Returns:
+        List of patch operations
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, path, ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        matched = 0
+        keys = set()
+        for key, value in new.items():
+            if key.__class__ is not str:
+                key = str(key)
+            keys.add(key)
+            child = f"{path}/{escape_pointer(key)}"
+            if key in old:
+                matched += 1
+                _diff(old[key], value, child, ops)
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        if matched < len(old):
+            for key in old:
+                if key not in keys:
+                    ops.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+        return
+
+    if isinstance(old, list) and isinstance(new, (list, tuple)):
+        count = len(old)
+        if len(new) >= count and list(new[:count]) == old:
+            for value in new[count:]:
+                ops.append({"op": "add", "path": f"{path}/-", "value": value})
+            return
+        ops.append({"op": "replace", "path": path, "value": new})
+        return
+
+    if type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply patch operations in place.
+
+    Args:
+        document: Document to modify
+        ops: Operations from ``diff``
+
+    Returns:
+        The patched document (a new object if the root was replaced)
+    """
+    for op in ops:
+        parts = split_pointer(op["path"])
+        if not parts:
+            document = op.get("value")
+            continue
+
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+
+        last = parts[-1]
+        if isinstance(parent, list):
+            if last == "-":
+                parent.append(op["value"])
+            elif op["op"] == "remove":
+                del parent[int(last)]
+            elif op["op"] == "add":
+                parent.insert(int(last), op["value"])
+            else:
+                parent[int(last)] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return document
+
+
+def resolve_pointer(document: Any, path: str) -> Any:
+    """Get the value at a JSON pointer, or None if it does not exist."""
+    value = document
+    for part in split_pointer(path):
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+    return value
+
+
+class Frame:
+    """A message serialized once and shared by every connection."""
+
+    __slots__ = ("version", "text", "_compressed")
+
+    def __init__(self, message: Dict[str, Any]):
+        self.version = message["version"]
+        self.text = json.dumps(message)
+        self._compressed: Optional[bytes] = None
+
+    @property
+    def compressed(self) -> bytes:
+        """The zlib-compressed message, computed on first use."""
+        if self._compressed is None:
+            self._compressed = zlib.compress(self.text.encode())
+        return self._compressed
+
+    def payload(self, compress: bool) -> Any:
+        """The frame as text, or as compressed bytes if worthwhile."""
+        if compress and len(self.text) >= MIN_COMPRESS_SIZE:
+            return self.compressed
+        return self.text
+
+
+class StreamSubscriber:
+    """A connection's pending frames.
+
+    A subscriber that falls more than ``max_pending`` frames behind drops
+    them and receives one snapshot of the current state instead.
+    """
+
+    def __init__(self, view: "_View", max_pending: int):
+        self.view = view
+        self.max_pending = max_pending
+        self.resyncs = 0
+        self._pending: Deque[Frame] = deque()
+        self._needs_snapshot = True
+        self._ready = asyncio.Event()
+        self._ready.set()
+
+    def push(self, frame: Frame) -> None:
+        """Queue a patch frame."""
+        if self._needs_snapshot:
+            return
+        if len(self._pending) >= self.max_pending:
+            self._pending.clear()
+            self._needs_snapshot = True
+            self.resyncs += 1
+        else:
+            self._pending.append(frame)
+        self._ready.set()
+
+    async def next_frame(self) -> Frame:
+        """Wait for the next frame to send."""
+        while not self._needs_snapshot and not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        if self._needs_snapshot:
+            self._needs_snapshot = False
+            return self.view.snapshot()
+        return self._pending.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Frame:
+        return await self.next_frame()
+
+
+class _View:
+    """Subscribers of one subtree of the state."""
+
+    def __init__(self, stream: "StateStream", path: str):
+        self.stream = stream
+        self.path = path
+        self.version = 0
+        self.subscribers: List[StreamSubscriber] = []
+        self._snapshot: Optional[Frame] = None
+
+    def snapshot(self) -> Frame:
+        """Snapshot frame for the current version, built once per version."""
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = Frame(
+                {
+                    "type": "snapshot",
+                    "path": self.path,
+                    "version": self.version,
+                    "data": resolve_pointer(self.stream.state, self.path),
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            )
+        return self._snapshot
+
+    def publish(self, ops: List[Dict[str, Any]], version: int, timestamp: str) -> None:
+        """Publish the ops that touch this view to its subscribers."""
+        ops = self._select(ops)
+        if not ops:
+            return
+        frame = Frame(
+            {
+                "type": "patch",
+                "path": self.path,
+                "version": version,
+                "base": self.version,
+                "ops": ops,
+                "timestamp": timestamp,
+            }
+        )
+        self.version = version
+        for subscriber in self.subscribers:
+            subscriber.push(frame)
+
+    def _select(self, ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Re-root the ops under this view's path."""
+        path = self.path
+        if not path:
+            return ops
+        prefix = path + "/"
+        selected = []
+        for op in ops:
+            op_path = op["path"]
+            if op_path == path or op_path.startswith(prefix):
+                selected.append({**op, "path": op_path[len(path):]})
+            elif path.startswith(op_path + "/") or not op_path:
+                # An ancestor changed; send the view's whole new value
+                value = resolve_pointer(self.stream.state, path)
+                return [{"op": "replace", "path": "", "value": value}]
+        return selected
+
+
+class StateStream:
+    """Versioned state that streams changes as JSON-patch deltas.
+
+    Each update is diffed against the previous state once; every view
+    (subtree) with subscribers gets one serialized frame, shared by all of
+    its connections.
+    """
+
+    def __init__(self, max_pending: int = 32):
+        """Initialize the stream.
+
+        Args:
+            max_pending: Frames a subscriber may fall behind before it is
+                resynced with a snapshot
+        """
+        self.max_pending = max_pending
+        self.version = 0
+        self.state: Any = None
+        self._views: Dict[str, _View] = {}
+
+    def update(self, new_state: Any) -> int:
+        """Publish a new state.
+
+        Args:
+            new_state: Current JSON-compatible state; only read during the call
+
+        Returns:
+            Number of patch operations
+        """
+        ops = diff(self.state, new_state)
+        if not ops:
+            return 0
+
+        self.version += 1
+        # Round trip the ops so the stored state shares nothing with the caller's
+        self.state = apply_patch(self.state, json.loads(json.dumps(ops)))
+
+        timestamp = datetime.utcnow().isoformat()
+        for view in self._views.values():
+            try:
+                view.publish(ops, self.version, timestamp)
+            except Exception as e:
+                logger.error(f"Error publishing state to view {view.path!r}: {e}")
+        return len(ops)
+
+    def subscribe(self, path: str = "", max_pending: Optional[int] = None) -> StreamSubscriber:
+        """Subscribe to a subtree of the state.
+
+        The first frame is a snapshot; patches follow.
+
+        Args:
+            path: JSON pointer of the subtree ("" for the whole state)
+            max_pending: Override for the stream's max_pending
+
+        Returns:
+            Subscriber to read frames from
+        """
+        view = self._views.get(path)
+        if view is None:
+            view = self._views[path] = _View(self, path)
+            view.version = self.version
+        subscriber = StreamSubscriber(view, max_pending or self.max_pending)
+        view.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        """Remove a subscriber."""
+        view = subscriber.view
+        if subscriber in view.subscribers:
+            view.subscribers.remove(subscriber)
+        if not view.subscribers and self._views.get(view.path) is view:
+            del self._views[view.path]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get stream statistics."""
+        return {
+            "version": self.version,
+            "views": {
+                path or "/": len(view.subscribers) for path, view in self._views.items()
+            },
+        }
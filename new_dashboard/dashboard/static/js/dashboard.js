@@ -21,6 +21,11 @@ let reconnectAttempts = 0;
 const maxReconnectAttempts = 5;
 const reconnectDelay = 1000;
 let lastUpdateTime = new Date();
+const dashboardState = { lastUpdate: null };
+
+// State rebuilt from the server's snapshot/patch frames, and its version
+let streamState = null;
+let streamVersion = null;
 
 // Connect to WebSocket
 function connectWebSocket() {
@@ -34,6 +39,7 @@ function connectWebSocket() {
     // Close existing connection if any
     if (ws && ws.readyState !== WebSocket.CLOSED) {
         console.log('Closing existing WebSocket connection before reconnecting...');
+        ws.onclose = null;
         ws.close();
     }
 
@@ -61,30 +67,30 @@ function connectWebSocket() {
 
     ws.onmessage = (event) => {
         try {
-            console.log('Raw WebSocket message received:', event.data);
-            const data = JSON.parse(event.data);
-            console.log('Parsed WebSocket data:', data);
+            const frame = JSON.parse(event.data);
 
             // Update last update time
             lastUpdateTime = new Date();
-
-            // Handle ping messages
-            if (data.type === 'ping') {
-                // Respond with pong
-                try {
-                    ws.send(JSON.stringify({
-                        type: 'pong',
-                        timestamp: new Date().toISOString(),
-                        ping_timestamp: data.timestamp
-                    }));
-                } catch (error) {
-                    console.error('Error sending pong response:', error);
+            dashboardState.lastUpdate = lastUpdateTime;
+
+            // The server sends a snapshot, then JSON-patch frames against it
+            if (frame.type === 'snapshot') {
+                streamState = frame.data;
+            } else if (frame.type === 'patch') {
+                if (frame.base !== streamVersion) {
+                    // Missed a frame; reconnecting yields a fresh snapshot
+                    console.warn('Version gap on metrics stream, resyncing');
+                    ws.close(4000, 'resync');
+                    return;
                 }
+                streamState = WebSocketManager.applyPatch(streamState, frame.ops);
+            } else {
                 return;
             }
+            streamVersion = frame.version;
 
-            // Update UI with received data
-            updateDashboard(data);
+            // Update UI with the full state (performance metrics live under metrics.metrics)
+            updateDashboard({ ...streamState, metrics: streamState });
 
             // Flash the connection status to indicate activity
             const statusEl = document.getElementById('connection-status');
@@ -331,7 +337,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Connect to WebSockets for real-time updates
-    connectWebSockets();
+    connectWebSocket();
 
     // Also fetch initial data via HTTP as a fallback
     fetchInitialData();
@@ -429,15 +435,19 @@ function checkDataFreshness() {
 
         // If no updates in 30 seconds, try to reconnect
         if (timeSinceUpdate > 30000) {
-            console.warn('Data is stale (30+ seconds old). Reconnecting WebSockets...');
-            window.wsManager.disconnectAll();
-            setTimeout(() => window.wsManager.connectAll(), 1000);
+            console.warn('Data is stale (30+ seconds old). Reconnecting WebSocket...');
+            dashboardState.lastUpdate = null;
+            reconnectAttempts = 0;
+            connectWebSocket();
         }
     }
 }
 
 // Cleanup when page is unloaded
 window.addEventListener('beforeunload', () => {
-    console.log('Closing all WebSocket connections...');
-    window.wsManager.disconnectAll();
+    console.log('Closing WebSocket connection...');
+    if (ws) {
+        ws.onclose = null;
+        ws.close();
+    }
 });
@@ -14,8 +14,14 @@ class WebSocketManager {
         };
         this.reconnectInterval = options.reconnectInterval || 3000;
         this.maxReconnectAttempts = options.maxReconnectAttempts || 10;
+        // Ask the server for zlib-compressed frames (needs DecompressionStream)
+        this.compress = options.compress !== undefined ? options.compress :
+            typeof DecompressionStream !== 'undefined';
         
         this.connections = {};
+        // State rebuilt from snapshot/patch frames, and its version, per endpoint
+        this.states = {};
+        this.versions = {};
         this.listeners = {};
         this.reconnectAttempts = {};
         this.reconnectTimers = {};
@@ -39,13 +45,17 @@ class WebSocketManager {
      */
     connect(endpoint) {
         // Determine the full URL
-        const url = endpoint.startsWith('ws') ? endpoint : 
+        let url = endpoint.startsWith('ws') ? endpoint : 
             `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}${this.endpoints[endpoint] || endpoint}`;
+        if (this.compress) {
+            url += (url.includes('?') ? '&' : '?') + 'compress=deflate';
+        }
         
         if (this.debug) console.log(`[WebSocketManager] Connecting to ${url}`);
         
         // Create WebSocket connection
         const ws = new WebSocket(url);
+        ws.binaryType = 'arraybuffer';
         
         // Store connection
         const key = this.getEndpointKey(endpoint);
@@ -62,20 +72,20 @@ class WebSocketManager {
             this.send(endpoint, { type: 'hello', client: 'dashboard', timestamp: new Date().toISOString() });
         };
         
+        // Decode frames in arrival order (decompression is asynchronous)
+        let pending = Promise.resolve();
         ws.onmessage = (event) => {
             if (this.debug) console.log(`[WebSocketManager] Message from ${url}:`, event.data);
-            try {
-                const data = JSON.parse(event.data);
-                this.triggerListeners(key, 'message', data);
-                
-                // Also trigger specific event type if available
-                if (data.type) {
-                    this.triggerListeners(key, data.type, data);
+            pending = pending.then(async () => {
+                try {
+                    const text = typeof event.data === 'string' ? event.data :
+                        await this.inflate(event.data);
+                    this.handleFrame(key, ws, JSON.parse(text));
+                } catch (error) {
+                    console.error(`[WebSocketManager] Error parsing message from ${url}:`, error);
+                    this.triggerListeners(key, 'error', { error, originalEvent: event });
                 }
-            } catch (error) {
-                console.error(`[WebSocketManager] Error parsing message from ${url}:`, error);
-                this.triggerListeners(key, 'error', { error, originalEvent: event });
-            }
+            });
         };
         
         ws.onerror = (error) => {
@@ -96,6 +106,89 @@ class WebSocketManager {
         return ws;
     }
     
+    /**
+     * Apply a snapshot or patch frame and notify listeners with the full state
+     * @param {string} key - The endpoint key
+     * @param {WebSocket} ws - The connection the frame arrived on
+     * @param {object} frame - The decoded frame
+     */
+    handleFrame(key, ws, frame) {
+        if (frame.type === 'snapshot') {
+            this.states[key] = frame.data;
+            this.versions[key] = frame.version;
+        } else if (frame.type === 'patch') {
+            if (frame.base !== this.versions[key]) {
+                // Missed a frame; reconnecting yields a fresh snapshot
+                console.warn(`[WebSocketManager] Version gap on ${key}, resyncing`);
+                ws.close(4000, 'resync');
+                this.scheduleReconnect(key);
+                return;
+            }
+            this.states[key] = WebSocketManager.applyPatch(this.states[key], frame.ops);
+            this.versions[key] = frame.version;
+        } else {
+            this.triggerListeners(key, 'message', frame);
+            if (frame.type) {
+                this.triggerListeners(key, frame.type, frame);
+            }
+            return;
+        }
+
+        const message = {
+            type: frame.type,
+            version: frame.version,
+            timestamp: frame.timestamp,
+            data: this.states[key]
+        };
+        this.triggerListeners(key, 'message', message);
+        this.triggerListeners(key, frame.type, message);
+    }
+    
+    /**
+     * Decompress a zlib-compressed binary frame
+     * @param {ArrayBuffer} buffer - The compressed frame
+     * @returns {Promise<string>} The decompressed text
+     */
+    async inflate(buffer) {
+        const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('deflate'));
+        return await new Response(stream).text();
+    }
+    
+    /**
+     * Apply JSON-patch operations (add, remove, replace)
+     * @param {*} document - The document to patch
+     * @param {Array} ops - The operations
+     * @returns {*} The patched document
+     */
+    static applyPatch(document, ops) {
+        const unescape = (part) => part.replace(/~1/g, '/').replace(/~0/g, '~');
+        for (const op of ops) {
+            if (!op.path) {
+                document = op.value;
+                continue;
+            }
+            const parts = op.path.slice(1).split('/').map(unescape);
+            const last = parts.pop();
+            const parent = parts.reduce((node, part) => node[Array.isArray(node) ? Number(part) : part], document);
+            if (Array.isArray(parent)) {
+                if (last === '-') {
+                    parent.push(op.value);
+                } else if (op.op === 'remove') {
+                    parent.splice(Number(last), 1);
+                } else if (op.op === 'add') {
+                    parent.splice(Number(last), 0, op.value);
+                } else {
+                    parent[Number(last)] = op.value;
+                }
+            } else if (op.op === 'remove') {
+                delete parent[last];
+            } else {
+                parent[last] = op.value;
+            }
+        }
+        return document;
+    }
+    
     /**
      * Disconnect from a WebSocket endpoint
      * @param {string} endpoint - The endpoint name or full URL
@@ -62,9 +62,14 @@
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
+
+
 async def init_and_run():
     """Initialize and run the bot with proper async handling."""
     bot = None
+    telemetry = None
+    latency_reporter = None
+    loop_monitor = None
     try:
         # Import async manager first
         from arbitrage_bot.utils.async_manager import manager, run_with_async_context, async_init
@@ -92,6 +97,35 @@ async def init_and_run():
             # Load configuration
             config = load_config()
 
+            # Publish structured telemetry for the dashboard and API servers
+            from arbitrage_bot.utils.telemetry import TelemetryPublisher, set_publisher
+            telemetry = TelemetryPublisher()
+            try:
+                await telemetry.start()
+                set_publisher(telemetry)
+            except Exception as e:
+                logger.error(f"Failed to start telemetry publisher, running without telemetry: {e}")
+                telemetry = None
+
+            # Per-stage latency histograms, published for the API server's /metrics
+            from arbitrage_bot.utils.latency import LatencyTracer, report_latency, set_tracer
+            latency_config = config.get("latency", {})
+            set_tracer(LatencyTracer(sample_rate=latency_config.get("sample_rate", 1.0)))
+
+            # Event loop lag, with blocking-call stacks in debug mode
+            from arbitrage_bot.utils.loop_monitor import LoopMonitor
+            loop_config = config.get("event_loop", {})
+            loop_monitor = LoopMonitor(
+                interval=loop_config.get("lag_interval", 0.1),
+                block_threshold=loop_config.get("block_threshold", 0.1),
+                debug=loop_config.get("debug", os.getenv('ENV') == 'development'),
+            )
+            await loop_monitor.start()
+
+            latency_reporter = asyncio.create_task(
+                report_latency(latency_config.get("report_interval", 5.0), loop_monitor)
+            )
+
             # Initialize components
             logger.info("Initializing bot components...")
 
@@ -163,6 +197,17 @@ async def init_and_run():
             except Exception as e:
                 logger.error("Error stopping bot: %s", str(e), exc_info=True)
 
+        if latency_reporter is not None:
+            latency_reporter.cancel()
+
+        if loop_monitor is not None:
+            await loop_monitor.stop()
+
+        if telemetry is not None:
+            from arbitrage_bot.utils.telemetry import set_publisher
+            set_publisher(None)
+            await telemetry.stop()
+
         # Then cleanup async manager
         if 'manager' in locals() and manager is not None:
             try:
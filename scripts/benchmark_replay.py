@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Block-Replay Benchmark
+
+Replays recorded (or synthesized) blocks through the detection, evaluation
+and build pipeline against an in-process stand-in RPC node, and reports
+throughput, per-stage latency, RPC traffic and memory. Runs offline and is
+deterministic for a given fixture, so reports can be compared across
+commits.
+
+Stages marked with ``*`` run harness code rather than the bot's own
+components; see ``HARNESS_STAGES`` in ``arbitrage_bot.testing.replay_benchmark``.
+
+Usage:
+    python scripts/benchmark_replay.py
+    python scripts/benchmark_replay.py --scale 1 10 100 --output replay.json
+    python scripts/benchmark_replay.py --fixture tests/fixtures/base_blocks.json.gz \\
+        --baseline replay.json --max-regression 0.2
+    python scripts/benchmark_replay.py --record base_blocks.json.gz --rpc-url $BASE_RPC_URL \\
+        --pools pools.json --from-block 20000000 --to-block 20000100
+
+``--pools`` for recording is a JSON file with ``pools`` (pool address ->
+DEX id), ``routers`` (DEX id -> router address) and optional ``fees``
+(pool address -> fee in hundredths of a basis point).
+
+Exits with status 1 if a metric regressed past ``--max-regression``.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from arbitrage_bot.testing.chain_fixtures import (  # noqa: E402
+    fixture_stats,
+    load_fixture,
+    record_fixture,
+    save_fixture,
+    scale_fixture,
+    synthesize_fixture,
+)
+from arbitrage_bot.testing.replay_benchmark import (  # noqa: E402
+    compare_reports,
+    run_replay_benchmark,
+)
+
+
+def print_report(scale: int, report: Dict[str, Any]) -> None:
+    """Print one run's report."""
+    fixture = report["fixture"]
+    memory = report["memory"]
+    print(f"\nscale {scale}x: {fixture['blocks']} blocks, {fixture['pools']} pools, "
+          f"{fixture['pairs']} pairs, {fixture['pending']} pending txs")
+    print(f"  {report['blocks_per_second']:.2f} blocks/s, "
+          f"block p50 {report['block_ms'].get('p50_ms', 0):.1f}ms "
+          f"p99 {report['block_ms'].get('p99_ms', 0):.1f}ms")
+    print(f"  candidates {report['candidates']}, profitable {report['profitable']}, "
+          f"bundles {report['bundles']}, pending swaps {report['pending_swaps']}")
+    print(f"  peak RSS {memory['peak_rss_mb']:.1f}MB (+{memory['peak_rss_delta_mb']:.1f}MB)"
+          + (f", Python heap peak {memory['traced_peak_mb']:.1f}MB" if "traced_peak_mb" in memory else ""))
+    harness = report.get("harness_stages", {})
+    print("  Stages (time since block received; * = harness code, not the bot):")
+    for stage, summary in report["stages"].items():
+        label = stage + ("*" if stage in harness else "")
+        print(f"    {label:<24} p50 {summary['p50_ms']:9.2f}ms  p99 {summary['p99_ms']:9.2f}ms")
+    for stage, reason in harness.items():
+        print(f"    * {stage}: {reason}")
+    print("  Spans:")
+    for name, summary in report["spans"].items():
+        print(f"    {name:<24} p50 {summary['p50_ms']:9.2f}ms  p99 {summary['p99_ms']:9.2f}ms")
+    print("  RPC requests: " + ", ".join(f"{m} {n}" for m, n in sorted(report["rpc_requests"].items())))
+
+
+async def record(args: argparse.Namespace) -> int:
+    """Record a fixture from a node."""
+    from web3 import AsyncHTTPProvider, AsyncWeb3
+
+    if not (args.rpc_url and args.pools and args.from_block is not None and args.to_block is not None):
+        print("--record needs --rpc-url, --pools, --from-block and --to-block")
+        return 2
+    with open(args.pools) as f:
+        pools = json.load(f)
+    w3 = AsyncWeb3(AsyncHTTPProvider(args.rpc_url))
+    fixture = await record_fixture(
+        w3, pools["pools"], pools["routers"], args.from_block, args.to_block, pools.get("fees")
+    )
+    save_fixture(fixture, args.record)
+    print(f"Recorded {fixture_stats(fixture)} to {args.record}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay blocks through the bot pipeline.")
+    parser.add_argument("--fixture", help="Fixture to replay (default: synthesized)")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1],
+                        help="Replay the fixture scaled to these multiples of its pools")
+    parser.add_argument("--blocks", type=int, default=50, help="Synthesized blocks")
+    parser.add_argument("--dexes", type=int, default=2, help="Synthesized DEXs")
+    parser.add_argument("--tokens", type=int, default=8, help="Synthesized tokens")
+    parser.add_argument("--pairs", type=int, default=12, help="Synthesized pairs per DEX")
+    parser.add_argument("--seed", type=int, default=1, help="Synthesis seed")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Emulated RPC round trip in milliseconds")
+    parser.add_argument("--max-candidates", type=int, default=20,
+                        help="Detector candidates evaluated per block")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also measure the Python heap peak (slower)")
+    parser.add_argument("--output", help="Write the reports as JSON")
+    parser.add_argument("--baseline", help="Compare with reports written by --output")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed relative regression against the baseline")
+    parser.add_argument("--record", help="Record a fixture to this path instead of replaying")
+    parser.add_argument("--rpc-url", help="Node to record from")
+    parser.add_argument("--pools", help="Pools and routers to record (JSON)")
+    parser.add_argument("--from-block", type=int, help="First block to record")
+    parser.add_argument("--to-block", type=int, help="Last block to record")
+    args = parser.parse_args()
+
+    if args.record:
+        return asyncio.run(record(args))
+
+    if args.fixture:
+        fixture = load_fixture(args.fixture)
+    else:
+        fixture = synthesize_fixture(
+            dexes=args.dexes, tokens=args.tokens, pairs=args.pairs,
+            blocks=args.blocks, seed=args.seed,
+        )
+
+    reports = {}
+    for scale in args.scale:
+        report = asyncio.run(run_replay_benchmark(
+            scale_fixture(fixture, scale),
+            latency=args.latency / 1000,
+            max_candidates=args.max_candidates,
+            trace_memory=args.trace_memory,
+        ))
+        reports[str(scale)] = report
+        print_report(scale, report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+    ok = True
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for scale, report in reports.items():
+            if scale not in baseline:
+                print(f"\nscale {scale}x: not in baseline")
+                continue
+            regressions = compare_reports(report, baseline[scale], args.max_regression)
+            for regression in regressions:
+                print(f"\nscale {scale}x REGRESSION: {regression}")
+            ok = ok and not regressions
+        if ok:
+            print("\nNo regressions against the baseline")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Measures the Python overhead of the bot entry points: the time to import
+everything they need before the first scan, in a fresh interpreter, against
+a target budget. Also prints an import-time profile (from ``python -X
+importtime``) showing which packages the time goes to.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --entry run_bot --runs 5 --top 25
+    python scripts/benchmark_startup.py --module arbitrage_bot.utils.telemetry
+
+Exits with status 1 if any entry point is over budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Target for the imports an entry point needs before it starts scanning
+DEFAULT_BUDGET = 1.0
+
+# Modules each entry point imports before its first scan
+ENTRY_POINTS = {
+    "run_bot": [
+        "scripts.load_env",
+        "arbitrage_bot.utils.async_manager",
+        "arbitrage_bot.utils.config_loader",
+        "arbitrage_bot.core.arbitrage.base_system",
+        "arbitrage_bot.core.arbitrage.discovery_manager",
+        "arbitrage_bot.core.arbitrage.execution_manager",
+        "arbitrage_bot.core.arbitrage.analytics_manager",
+        "arbitrage_bot.core.arbitrage.enhanced_market_data_provider",
+        "arbitrage_bot.utils.telemetry",
+    ],
+    "production": [
+        "arbitrage_bot.utils.config_loader",
+        "arbitrage_bot.core.web3.web3_manager",
+        "arbitrage_bot.core.web3.balance_validator",
+        "arbitrage_bot.core.web3.flashbots.flashbots_provider",
+        "arbitrage_bot.core.web3.wallet_manager",
+        "arbitrage_bot.core.web3.flashbots.risk_analyzer",
+        "arbitrage_bot.core.web3.flashbots.bundle_optimizer",
+        "arbitrage_bot.core.web3.flashbots.attack_detector",
+        "arbitrage_bot.core.unified_flash_loan_manager",
+        "arbitrage_bot.core.dex.dex_manager",
+        "arbitrage_bot.core.path_finder",
+    ],
+}
+
+# Runs in the child interpreter; imports each module and reports timings
+_CHILD = """
+import importlib, json, sys, time
+start = time.perf_counter()
+errors = {}
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except Exception as e:
+        errors[name] = f"{type(e).__name__}: {e}"
+print(json.dumps({"seconds": time.perf_counter() - start, "errors": errors}))
+"""
+
+
+def measure(modules: List[str]) -> Tuple[Dict[str, Any], List[Tuple[str, int, int]]]:
+    """
+    Import modules in a fresh interpreter.
+
+    Args:
+        modules: Modules to import, in order
+
+    Returns:
+        The child's result (seconds, errors) and the import-time profile as
+        (module, self microseconds, cumulative microseconds) rows
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, *modules],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    profile = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile.append((name.strip(), int(self_us), int(cumulative_us)))
+    return json.loads(proc.stdout.strip().splitlines()[-1]), profile
+
+
+def summarize(profile: List[Tuple[str, int, int]], top: int) -> Dict[str, Any]:
+    """
+    Group import self-time by top-level package.
+
+    Args:
+        profile: Rows from measure()
+        top: Number of slowest modules to list
+
+    Returns:
+        Seconds per top-level package and the slowest modules by self time
+    """
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, self_us, _ in profile:
+        by_package[name.split(".")[0]] += self_us / 1e6
+    slowest = sorted(profile, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        "packages": dict(sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)),
+        "slowest": [(name, self_us / 1e6) for name, self_us, _ in slowest],
+    }
+
+
+def benchmark(name: str, modules: List[str], runs: int, budget: float, top: int) -> bool:
+    """Benchmark one entry point and print its report."""
+    timings = []
+    for _ in range(runs):
+        result, profile = measure(modules)
+        timings.append(result["seconds"])
+    median = statistics.median(timings)
+    ok = median <= budget
+
+    print(f"\n{name}: {median:.3f}s median over {runs} runs "
+          f"(budget {budget:.3f}s) {'OK' if ok else 'OVER BUDGET'}")
+    for module, error in result["errors"].items():
+        print(f"  import failed: {module}: {error}")
+
+    summary = summarize(profile, top)
+    print("  By package:")
+    for package, seconds in list(summary["packages"].items())[:10]:
+        print(f"    {package:<30} {seconds:8.3f}s")
+    print("  Slowest modules (self time):")
+    for module, seconds in summary["slowest"]:
+        print(f"    {module:<60} {seconds:8.3f}s")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bot startup imports.")
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), action="append",
+                        help="Entry point to benchmark (default: all)")
+    parser.add_argument("--module", action="append",
+                        help="Benchmark importing this module instead")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per entry point")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="Target seconds per entry point")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    if args.module:
+        targets = {"modules": args.module}
+    else:
+        targets = {name: ENTRY_POINTS[name] for name in args.entry or sorted(ENTRY_POINTS)}
+
+    ok = True
+    for name, modules in targets.items():
+        try:
+            ok = benchmark(name, modules, args.runs, args.budget, args.top) and ok
+        except RuntimeError as e:
+            print(f"\n{name}: failed: {e}")
+            ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 """
 Start Log Parser Bridge
 
-Script to start the Log Parser Bridge that connects log files to the dashboard.
+Script to start the Log Parser Bridge that connects the bot's telemetry to the dashboard.
 """
 
 import asyncio
@@ -35,15 +35,13 @@ async def main():
         parser = LogParserBridge(
             log_dir=Path(config.watch_directory),
             opportunity_tracker=opportunity_tracker,
-            update_frequency=config.update_frequency,
-            max_batch_size=config.max_batch_size
+            update_frequency=config.update_frequency
         )
         
         logger.info(
             f"Starting Log Parser Bridge\n"
-            f"Watching directory: {config.watch_directory}\n"
-            f"Update frequency: {config.update_frequency}s\n"
-            f"Max batch size: {config.max_batch_size}"
+            f"Telemetry socket: {parser.socket_path}\n"
+            f"Reconnect interval: {config.update_frequency}s"
         )
         
         await parser.start()
@@ -0,0 +1,195 @@
+"""
+Tests for the sequential BlockIngester.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from arbitrage_bot.core.monitoring.block_ingester import BlockIngester
+
+ROUTER = "0x2626664c2603336E57B271c5C0b26F421741e481"
+OTHER = "0x000000000000000000000000000000000000dEaD"
+SWAP_SELECTOR = "0x38ed1739"
+
+
+def _block_hash(number: int, fork: str = "a") -> str:
+    return "0x" + f"{fork}{number:063x}"[-64:]
+
+
+class FakeChain:
+    """Minimal async chain stand-in exposing the calls the ingester uses."""
+
+    def __init__(self):
+        self.blocks = {}
+        self.receipt_calls = 0
+        self.block_calls = 0
+        self.batch_calls = 0
+        self.receipt_errors = []  # Errors returned by the next receipt requests
+
+    def add_block(self, number, txs=(), fork="a", parent_fork="a"):
+        self.blocks[number] = {
+            "number": number,
+            "hash": _block_hash(number, fork),
+            "parentHash": _block_hash(number - 1, parent_fork),
+            "timestamp": 1_700_000_000 + 2 * number,
+            "baseFeePerGas": 1_000_000,
+            "gasUsed": 21_000 * len(txs),
+            "transactions": list(txs),
+        }
+
+    @property
+    def block_number(self):
+        async def _head():
+            return max(self.blocks)
+        return _head()
+
+    async def get_block(self, number, full=False):
+        self.block_calls += 1
+        return self.blocks.get(number)
+
+    async def get_transaction_receipt(self, tx_hash):
+        return {"transactionHash": tx_hash, "status": "0x1", "gasUsed": "0x5208"}
+
+    async def make_request(self, method, params):
+        self.receipt_calls += 1
+        if self.receipt_errors:
+            return {"error": self.receipt_errors.pop(0)}
+        number = int(params[0], 16)
+        return {
+            "result": [
+                {"transactionHash": tx["hash"], "status": "0x1", "gasUsed": "0x5208"}
+                for tx in self.blocks[number]["transactions"]
+            ]
+        }
+
+
+class FakeBatch:
+    """Async batch context collecting calls and sending them as one request."""
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def add(self, call):
+        self.calls.append(call)
+
+    async def async_execute(self):
+        self.chain.batch_calls += 1
+        return [await call for call in self.calls]
+
+
+def _tx(index, to, data="0x"):
+    return {"hash": "0x" + f"{index:064x}", "from": OTHER, "to": to, "input": data}
+
+
+class TestBlockIngester(unittest.TestCase):
+    """Tests for the BlockIngester class."""
+
+    def setUp(self):
+        """Set up a fake chain and ingester."""
+        self.chain = FakeChain()
+        w3 = SimpleNamespace(eth=self.chain, provider=self.chain)
+        self.ingester = BlockIngester(
+            SimpleNamespace(w3=w3),
+            relevant_addresses=[ROUTER],
+            relevant_selectors=[SWAP_SELECTOR],
+            start_block=1,
+        )
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        """Close the event loop."""
+        self.loop.close()
+
+    def test_ingests_every_block_once(self):
+        """Blocks produced between polls are all ingested, in order."""
+        queue = self.ingester.subscribe()
+        for n in range(1, 4):
+            self.chain.add_block(n)
+
+        first = self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertEqual([r.number for r in first], [1, 2, 3])
+
+        # No new block: nothing is re-processed
+        self.assertEqual(self.loop.run_until_complete(self.ingester.poll_once()), [])
+
+        for n in range(4, 6):
+            self.chain.add_block(n)
+        second = self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertEqual([r.number for r in second], [4, 5])
+        self.assertEqual(queue.qsize(), 5)
+        self.assertEqual(second[0].block_interval, 2)
+
+    def test_filters_relevant_transactions(self):
+        """Relevant transactions are matched by address or selector."""
+        txs = [
+            _tx(1, ROUTER.lower()),
+            _tx(2, OTHER, SWAP_SELECTOR + "00" * 32),
+            _tx(3, OTHER, "0xa9059cbb" + "00" * 32),
+        ]
+        self.chain.add_block(1, txs)
+
+        (record,) = self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertEqual(
+            [tx["hash"] for tx in record.relevant_transactions],
+            [txs[0]["hash"], txs[1]["hash"]],
+        )
+        self.assertTrue(record.transaction_success(txs[0]["hash"]))
+        self.assertEqual(self.chain.receipt_calls, 1)
+
+    def test_detects_reorg_and_rewinds(self):
+        """A parent hash mismatch emits a reorg record and re-ingests the fork."""
+        for n in range(1, 4):
+            self.chain.add_block(n)
+        self.loop.run_until_complete(self.ingester.poll_once())
+
+        # Block 3 is replaced and block 4 builds on the new block 3
+        self.chain.add_block(3, fork="b")
+        self.chain.add_block(4, fork="b", parent_fork="b")
+
+        records = self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].reorg["block_number"], 3)
+        self.assertEqual(records[0].reorg["depth"], 1)
+
+        records = self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertEqual([r.number for r in records], [3, 4])
+        self.assertTrue(all(r.reorg is None for r in records))
+        self.assertEqual(self.ingester.reorgs_detected, 1)
+
+    def test_fetches_block_range_in_one_batch(self):
+        """A range of new blocks is sent as a single batch request."""
+        self.ingester.web3_manager.w3.batch_requests = lambda: FakeBatch(self.chain)
+        for n in range(1, 5):
+            self.chain.add_block(n)
+
+        records = self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertEqual([r.number for r in records], [1, 2, 3, 4])
+        self.assertEqual(self.chain.batch_calls, 1)
+        self.assertEqual(self.ingester.get_stats()["rpc_calls"], 2)  # Head + batch
+
+    def test_block_receipts_only_disabled_when_unsupported(self):
+        """Transient receipt errors keep eth_getBlockReceipts; method-not-found disables it."""
+        self.chain.receipt_errors = [
+            {"code": -32000, "message": "header not found"},
+            {"code": -32601, "message": "the method eth_getBlockReceipts does not exist"},
+        ]
+        self.chain.add_block(1, [_tx(1, ROUTER)])
+        self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertTrue(self.ingester.get_stats()["block_receipts_supported"])
+
+        self.chain.add_block(2, [_tx(2, ROUTER)])
+        self.loop.run_until_complete(self.ingester.poll_once())
+        self.assertFalse(self.ingester.get_stats()["block_receipts_supported"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the indexed trade and metrics database.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from arbitrage_bot.utils.database import INSERT_TRADE, Database, _build_where
+from arbitrage_bot.utils.sqlite_writer import SQLiteWriter
+
+
+class TestDatabase(unittest.TestCase):
+    """Tests for the Database class."""
+
+    def setUp(self):
+        """Create a database in a temporary directory."""
+        self.loop = asyncio.new_event_loop()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "trades.db")
+        self.now = datetime.utcnow()
+
+    def tearDown(self):
+        """Close the event loop and remove the directory."""
+        self.loop.close()
+        self.temp_dir.cleanup()
+
+    def _trade(self, days_ago, **fields):
+        return {
+            "token": "WETH",
+            "dex": "uniswap",
+            "status": "completed",
+            "profit": 1.0,
+            "timestamp": self.now - timedelta(days=days_ago),
+            **fields,
+        }
+
+    def test_queries_are_pushed_down(self):
+        """Indexed fields and ranges become SQL; other fields filter in Python."""
+        db = Database(testing=False, db_path=self.db_path)
+
+        async def scenario():
+            ids = await db.save_trades(
+                [
+                    self._trade(40),
+                    self._trade(3, dex="sushiswap", route="direct"),
+                    self._trade(1, status="failed", route="direct"),
+                    self._trade(1, token="USDC"),
+                ]
+            )
+            recent = await db.get_trades(
+                {"token": "WETH", "timestamp": {"$gte": self.now - timedelta(days=7)}}
+            )
+            by_dex = await db.get_trades({"dex": {"$in": ["sushiswap"]}})
+            direct_ok = await db.get_trades({"route": "direct", "status": "completed"})
+            return ids, recent, by_dex, direct_ok
+
+        ids, recent, by_dex, direct_ok = self.loop.run_until_complete(scenario())
+        self.loop.run_until_complete(db.close())
+
+        self.assertEqual(ids, ["1", "2", "3", "4"])
+        self.assertEqual(len(recent), 2)
+        self.assertEqual([t["dex"] for t in by_dex], ["sushiswap"])
+        self.assertEqual(len(direct_ok), 1)
+
+        where, params, residual = _build_where(
+            {"status": "completed", "profit": {"$gt": 0}, "route": "direct"},
+            {"status": "status", "profit": "profit"},
+        )
+        self.assertEqual(where, "status = ? AND profit > ?")
+        self.assertEqual(params, ["completed", 0])
+        self.assertEqual(residual, {"route": "direct"})
+
+    def test_reads_see_queued_writes(self):
+        """get_trades and update_trade commit queued writes before reading."""
+        db = Database(testing=False, db_path=self.db_path)
+        gate = threading.Event()
+        db._writer.close()
+        db._writer = SQLiteWriter(
+            self.db_path,
+            setup=lambda conn: conn.create_function("wait_gate", 0, lambda: gate.wait(5)),
+        ).start()
+
+        async def scenario():
+            await db.save_trade(self._trade(1))
+            # Queued behind a stalled writer without waiting for the commit
+            db._writer.submit("SELECT wait_gate()")
+            await db._writer.enqueue(INSERT_TRADE, db._trade_row(self._trade(0, dex="curve")))
+            threading.Timer(0.05, gate.set).start()
+            updated = await db.update_trade("2", {"status": "failed"})
+            trades = await db.get_trades({})
+            return updated, trades
+
+        updated, trades = self.loop.run_until_complete(scenario())
+        self.loop.run_until_complete(db.close())
+
+        self.assertTrue(updated)
+        self.assertEqual([t["dex"] for t in trades], ["uniswap", "curve"])
+        self.assertEqual(trades[1]["status"], "failed")
+
+    def test_migrates_legacy_rows(self):
+        """Rows written before the indexed columns existed are backfilled."""
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(
+            "CREATE TABLE trades (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "data TEXT NOT NULL, timestamp TEXT NOT NULL);"
+            "CREATE TABLE metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "data TEXT NOT NULL, timestamp TEXT NOT NULL);"
+        )
+        timestamp = (self.now - timedelta(hours=2)).isoformat()
+        conn.execute(
+            "INSERT INTO trades (data, timestamp) VALUES (?, ?)",
+            (json.dumps({"token": "WETH", "status": "completed", "timestamp": timestamp}), timestamp),
+        )
+        conn.execute(
+            "INSERT INTO metrics (data, timestamp) VALUES (?, ?)",
+            (json.dumps({"gas": 1, "timestamp": timestamp}), timestamp),
+        )
+        conn.commit()
+        conn.close()
+
+        db = Database(testing=False, db_path=self.db_path)
+        since = {"$gte": self.now - timedelta(hours=3), "$lte": self.now}
+        trades = self.loop.run_until_complete(
+            db.get_trades({"token": "WETH", "timestamp": since})
+        )
+        metrics = self.loop.run_until_complete(db.get_metrics({"timestamp": since}))
+        mode = db._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.loop.run_until_complete(db.close())
+
+        self.assertEqual(len(trades), 1)
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(mode, "wal")
+
+
+if __name__ == "__main__":
+    unittest.main()
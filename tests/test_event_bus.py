@@ -0,0 +1,129 @@
+"""
+Tests for the event bus and the EventEmitter built on it.
+"""
+
+import asyncio
+import unittest
+
+from arbitrage_bot.core.events.event_bus import EventBus, OverflowPolicy, Topic
+from arbitrage_bot.core.events.event_emitter import EventEmitter
+
+
+class TestEventBus(unittest.TestCase):
+    """Tests for EventBus delivery, overflow policies and EventEmitter."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_batch_delivery_without_tasks_per_event(self):
+        """Queued events are drained in batches by one consumer task."""
+
+        async def run():
+            bus = EventBus()
+            batches = []
+            bus.subscribe("dex:swap", batches.append, batch_size=10, batch=True)
+            await asyncio.sleep(0)
+
+            tasks_before = len(asyncio.all_tasks())
+            for i in range(25):
+                await bus.publish("dex:swap", i)
+            self.assertEqual(len(asyncio.all_tasks()), tasks_before)
+
+            self.assertTrue(await bus.drain(timeout=1))
+            await bus.close()
+            return bus, batches
+
+        bus, batches = self.loop.run_until_complete(run())
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual([e.data for batch in batches for e in batch], list(range(25)))
+
+        stats = bus.get_stats()["topics"]["dex:swap"]
+        self.assertEqual((stats["published"], stats["delivered"]), (25, 25))
+        self.assertGreaterEqual(stats["max_lag_ms"], stats["avg_lag_ms"])
+
+    def test_overflow_policies(self):
+        """Full queues block, drop the oldest event or coalesce by key."""
+
+        async def run():
+            bus = EventBus()
+            blocked, dropped, coalesced = [], [], []
+
+            async def slow(event):
+                blocked.append(event.data)
+                await asyncio.sleep(0)
+
+            bus.subscribe("block", slow, max_queue=2)
+            drop = bus.subscribe(
+                "drop", lambda e: dropped.append(e.data), max_queue=3,
+                policy=OverflowPolicy.DROP_OLDEST,
+            )
+            bus.subscribe(
+                "price", lambda e: coalesced.append(e.data), max_queue=10,
+                policy=OverflowPolicy.COALESCE, key=lambda e: e.data["pool"],
+            )
+            with self.assertRaises(ValueError):
+                bus.subscribe("price", print, policy=OverflowPolicy.COALESCE)
+
+            for i in range(10):
+                await bus.publish("block", i)
+                await bus.publish("drop", i)
+                await bus.publish("price", {"pool": i % 2, "price": i})
+
+            await bus.drain(timeout=1)
+            await bus.close()
+            return blocked, dropped, coalesced, drop, bus.get_stats()["topics"]
+
+        blocked, dropped, coalesced, drop, stats = self.loop.run_until_complete(run())
+        self.assertEqual(blocked, list(range(10)))
+        self.assertEqual(dropped[-3:], [7, 8, 9])
+        self.assertEqual(drop.dropped + len(dropped), 10)
+        self.assertEqual(stats["drop"]["dropped"], drop.dropped)
+        # The consumer ran only while the publisher was blocked
+        self.assertEqual(coalesced[-2:], [{"pool": 0, "price": 8}, {"pool": 1, "price": 9}])
+        self.assertEqual(stats["price"]["coalesced"] + len(coalesced), 10)
+
+    def test_emitter_api_and_typed_topics(self):
+        """EventEmitter keeps its API and typed topics check payloads."""
+
+        async def run():
+            emitter = EventEmitter()
+            received = []
+
+            async def failing(event):
+                raise RuntimeError("boom")
+
+            await emitter.on("market:token_price", failing)
+            await emitter.on("market:token_price", received.append)
+            await emitter.on("*", lambda e: received.append(("any", e.name)))
+            self.assertEqual(emitter.get_handler_count(), 3)
+            self.assertEqual(emitter.get_handler_count("market:token_price"), 2)
+
+            waiter = asyncio.ensure_future(emitter.once("arbitrage:execution"))
+            await asyncio.sleep(0)
+            await emitter.emit("market:token_price", 1.5, source="test")
+            await emitter.emit("arbitrage:execution", {"status": "executed"})
+            event = await asyncio.wait_for(waiter, 1)
+            self.assertTrue(await emitter.wait_for_pending_events(timeout=1))
+
+            self.assertEqual(event.data["status"], "executed")
+            self.assertEqual(received[0].data, 1.5)
+            self.assertIn(("any", "arbitrage:execution"), received)
+            self.assertEqual(emitter.get_handler_count("arbitrage:execution"), 0)
+            self.assertTrue(await emitter.off("market:token_price", failing))
+            self.assertFalse(await emitter.off("market:token_price", failing))
+
+            prices = Topic("market:token_price", float)
+            emitter.bus.subscribe(prices, received.append)
+            with self.assertRaises(TypeError):
+                await emitter.bus.publish(prices, "not a price")
+            await emitter.close()
+            self.assertEqual(emitter.get_handler_count(), 0)
+
+        self.loop.run_until_complete(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for the fixed-point pricing and swap math.
+"""
+
+import random
+import unittest
+from decimal import Decimal
+from math import isqrt
+
+from arbitrage_bot.utils.fixed_point import (
+    Q96,
+    WAD,
+    compute_swap_step,
+    get_amount_in,
+    get_amount_out,
+    price_impact_wad,
+    price_x96,
+    price_x96_to_decimal,
+    v3_amount_out,
+)
+
+
+def _encode_price_sqrt(reserve1, reserve0):
+    return isqrt(reserve1 * 2**192 // reserve0)
+
+
+class TestFixedPoint(unittest.TestCase):
+    """Tests for the fixed-point helpers."""
+
+    def test_v2_matches_pair_contract(self):
+        """getAmountOut/getAmountIn reproduce UniswapV2Library's 997/1000 math."""
+        rng = random.Random(3)
+        for _ in range(200):
+            amount_in = rng.randrange(1, 10**24)
+            reserve_in = rng.randrange(10**6, 10**27)
+            reserve_out = rng.randrange(10**6, 10**27)
+
+            amount_in_with_fee = amount_in * 997
+            expected = amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee)
+            self.assertEqual(get_amount_out(amount_in, reserve_in, reserve_out), expected)
+
+            if 0 < expected < reserve_out:
+                required = get_amount_in(expected, reserve_in, reserve_out)
+                self.assertLessEqual(required, amount_in)
+                self.assertGreaterEqual(get_amount_out(required, reserve_in, reserve_out), expected)
+
+        with self.assertRaises(ValueError):
+            get_amount_out(0, 1, 1)
+
+    def test_v3_swap_step_matches_reference_vectors(self):
+        """SwapMath.computeSwapStep results match the Uniswap V3 test vectors."""
+        price = _encode_price_sqrt(1, 1)
+        liquidity = 2 * 10**18
+
+        capped = compute_swap_step(price, _encode_price_sqrt(101, 100), liquidity, 10**18, 600)
+        self.assertEqual(
+            capped,
+            (_encode_price_sqrt(101, 100), 9975124224178055, 9925619580021728, 5988667735148),
+        )
+
+        spent = compute_swap_step(price, _encode_price_sqrt(1000, 100), liquidity, 10**18, 600)
+        self.assertEqual(spent[1:], (999400000000000000, 666399946655997866, 600000000000000))
+
+        amount_out, next_price = v3_amount_out(price, liquidity, 10**18, False, 600)
+        self.assertEqual((amount_out, next_price), (spent[2], spent[0]))
+
+    def test_prices_and_impact(self):
+        """Q64.96 prices and WAD price impact agree with exact rational values."""
+        self.assertEqual(price_x96(-4 * 10**18, 10**18), Q96 // 4)
+        eth_usdc = price_x96_to_decimal(price_x96(10**18, 2000 * 10**6), 18, 6)
+        self.assertEqual(round(eth_usdc, 12), 2000)
+
+        amount_in, reserve_in, reserve_out = 10**18, 50 * 10**18, 100 * 10**18
+        amount_out = get_amount_out(amount_in, reserve_in, reserve_out)
+        spot_out = Decimal(amount_in) * reserve_out / reserve_in
+        expected = (spot_out - amount_out) / spot_out * Decimal(amount_in) / reserve_in
+        self.assertEqual(
+            price_impact_wad(amount_in, amount_out, reserve_in, reserve_out),
+            int(expected * WAD),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
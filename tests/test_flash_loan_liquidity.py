@@ -0,0 +1,139 @@
+"""
+Tests for the per-block flash loan liquidity service.
+"""
+
+import asyncio
+import unittest
+from decimal import Decimal
+
+from arbitrage_bot.core.finance.flash_loans import (
+    FlashLoanLiquidityService,
+    TokenAmount,
+    get_best_provider,
+)
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+DAI = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+
+
+class FakeProvider:
+    """Provider with settable liquidity that counts its reads."""
+
+    def __init__(self, name, fee, liquidity):
+        self.name = name
+        self.fee = Decimal(fee)
+        self.liquidity = {k.lower(): Decimal(v) for k, v in liquidity.items()}
+        self.reads = 0
+
+    @property
+    def supported_tokens(self):
+        return [WETH]
+
+    async def max_flash_loan(self, token_address):
+        self.reads += 1
+        await asyncio.sleep(0)
+        return self.liquidity.get(token_address.lower(), Decimal("0"))
+
+    async def get_flash_loan_fee(self, token_address, amount):
+        return self.fee
+
+    async def check_liquidity(self, token_address, amount):
+        raise AssertionError("selection must not query providers")
+
+    async def close(self):
+        pass
+
+
+class TestFlashLoanLiquidityService(unittest.TestCase):
+    """Tests for cached provider selection and per-block refresh."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.balancer = FakeProvider("Balancer", "0.0001", {WETH: 100, DAI: 1000})
+        self.aave = FakeProvider("Aave", "0.0009", {WETH: 5000, DAI: 10})
+        self.service = FlashLoanLiquidityService(
+            None, tokens=[WETH, DAI], providers={"aave": self.aave, "balancer": self.balancer}
+        )
+        self.loop.run_until_complete(self.service.refresh(1))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.service.close())
+        self.loop.close()
+
+    def test_best_provider_from_memory(self):
+        """The cheapest provider with enough liquidity wins, without RPC reads."""
+        reads = self.balancer.reads + self.aave.reads
+        self.assertIs(self.service.best_provider(WETH.lower(), Decimal("50")), self.balancer)
+        self.assertIs(self.service.best_provider(WETH, Decimal("500")), self.aave)
+        self.assertIsNone(self.service.best_provider(WETH, Decimal("10000")))
+        self.assertIsNone(self.service.best_provider("0xunknown", Decimal("1")))
+        self.assertEqual(self.balancer.reads + self.aave.reads, reads)
+
+        provider = self.loop.run_until_complete(
+            get_best_provider(None, DAI, Decimal("500"), liquidity_service=self.service)
+        )
+        self.assertIs(provider, self.balancer)
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(
+                get_best_provider(None, DAI, Decimal("5000"), liquidity_service=self.service)
+            )
+
+    def test_multi_token_costs_and_fallbacks(self):
+        """Multi-token selection, fee estimates and fallbacks use the snapshot."""
+        both = [TokenAmount(WETH, Decimal("50")), TokenAmount(DAI, Decimal("5"))]
+        self.assertIs(self.service.best_multi_token_provider(both), self.balancer)
+        both[0] = TokenAmount(WETH, Decimal("500"))
+        self.assertIs(self.service.best_multi_token_provider(both), self.aave)
+        both[1] = TokenAmount(DAI, Decimal("500"))
+        self.assertIsNone(self.service.best_multi_token_provider(both))
+
+        costs = self.service.estimate_costs(WETH, Decimal("10"))
+        self.assertEqual(costs, {"Balancer": Decimal("0.0010"), "Aave": Decimal("0.0090")})
+        self.assertEqual(
+            self.service.fallback_providers(WETH, Decimal("50"), exclude=self.balancer),
+            [self.aave],
+        )
+
+    def test_refreshes_once_per_block(self):
+        """New blocks swap in fresh liquidity; repeated blocks are ignored."""
+        reads = self.balancer.reads
+        self.balancer.liquidity[WETH.lower()] = Decimal("1000")
+
+        self.loop.run_until_complete(self.service.on_block(1))
+        self.assertEqual(self.balancer.reads, reads)
+        self.assertIs(self.service.best_provider(WETH, Decimal("500")), self.aave)
+
+        self.loop.run_until_complete(self.service.on_block(2))
+        self.assertEqual(self.balancer.reads, reads + 2)
+        self.assertIs(self.service.best_provider(WETH, Decimal("500")), self.balancer)
+        self.assertEqual(self.service.quotes(WETH)[0].block_number, 2)
+
+        stats = self.service.get_stats()
+        self.assertEqual((stats["block_number"], stats["refreshes"]), (2, 2))
+        self.assertEqual(stats["tokens"], 2)
+
+    def test_timed_refresh_without_head(self):
+        """A client whose head cannot be read still gets periodic refreshes."""
+
+        class NoHeadClient:
+            async def get_block(self, block_identifier):
+                raise ConnectionError("head unavailable")
+
+        service = FlashLoanLiquidityService(
+            NoHeadClient(), tokens=[WETH], providers={"balancer": self.balancer},
+            poll_interval=0.01, refresh_interval=0.02,
+        )
+
+        async def run():
+            await service.start()
+            await asyncio.sleep(0.1)
+            await service.close()
+
+        self.loop.run_until_complete(run())
+        self.assertGreater(service.get_stats()["refreshes"], 1)
+        self.assertIsNone(service.block_number)
+        self.assertEqual(service.estimate_costs(DAI, Decimal("1")), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
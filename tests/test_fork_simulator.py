@@ -0,0 +1,214 @@
+"""
+Tests for the in-process fork simulation backend.
+"""
+
+import asyncio
+import unittest
+
+from arbitrage_bot.core.flashbots.fork_simulator import (
+    ForkSimulationBackend,
+    ForkState,
+)
+from arbitrage_bot.core.flashbots.simulation_service import (
+    BundleCandidate,
+    SimulationBackend,
+    SimulationOutcome,
+)
+
+POOL_A = "0x" + "aa" * 20
+POOL_B = "0x" + "bb" * 20
+SEARCHER = "0x" + "cc" * 20
+
+
+def _packed(reserve0, reserve1, timestamp=1_700_000_000):
+    return (timestamp << 224) | (reserve1 << 112) | reserve0
+
+
+# Recorded at block 99: WETH/USDC priced 2000 on A and 2100 on B
+FIXTURE = {
+    "block_number": 99,
+    "storage": {
+        f"{POOL_A}:8": hex(_packed(1000 * 10**18, 2_000_000 * 10**6)),
+        f"{POOL_B}:8": hex(_packed(1000 * 10**18, 2_100_000 * 10**6)),
+    },
+    "balances": {SEARCHER: hex(5 * 10**18)},
+}
+
+# Sell WETH where it is expensive, buy it back where it is cheap
+ROUTE = [
+    {"pool": POOL_B, "zero_for_one": True, "fee": 30},
+    {"pool": POOL_A, "zero_for_one": False, "fee": 30},
+]
+
+
+class FakeEth:
+    """Node stand-in serving fixture state and counting requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.state = ForkState.from_fixture(FIXTURE)
+
+    async def get_storage_at(self, address, slot, block):
+        self.requests += 1
+        await asyncio.sleep(0)
+        return (await self.state.get_storage(address, slot)).to_bytes(32, "big")
+
+    async def get_balance(self, address, block):
+        self.requests += 1
+        return await self.state.get_balance(address)
+
+
+class BlockEth:
+    """Node stand-in whose pool B matches pool A's price from block 100 on."""
+
+    def __init__(self):
+        self.requests = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def get_storage_at(self, address, slot, block):
+        self.requests.append(block)
+        await self.gate.wait()
+        fixture = FIXTURE["storage"]
+        if block >= 100 and address.lower() == POOL_B:
+            return int(fixture[f"{POOL_A}:8"], 16).to_bytes(32, "big")
+        return int(fixture[f"{address.lower()}:8"], 16).to_bytes(32, "big")
+
+
+class RecordingFallback(SimulationBackend):
+    """Fallback backend recording delegated candidates."""
+
+    name = "relay"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def simulate(self, candidate):
+        self.calls += 1
+        return SimulationOutcome(success=True, coinbase_profit=1, gas_used=1, backend=self.name)
+
+
+def _candidate(block=100, route=ROUTE):
+    return BundleCandidate(
+        signed_transactions=["0x01"],
+        target_block=block,
+        amount_in=10**18,
+        route=route,
+        priority_fee=10**9,
+        gas_limit=200_000,
+    )
+
+
+class TestForkSimulator(unittest.TestCase):
+    """Tests for ForkState and ForkSimulationBackend."""
+
+    def setUp(self):
+        """Create an event loop for the async tests."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        """Close the event loop."""
+        self.loop.close()
+
+    def test_simulates_route_from_fixture(self):
+        """A recorded snapshot is enough to validate a route and build a state diff."""
+        backend = ForkSimulationBackend(
+            ForkState.from_fixture(FIXTURE), base_fee=10**9, searcher=SEARCHER
+        )
+
+        outcome = self.loop.run_until_complete(backend.simulate(_candidate()))
+        self.assertTrue(outcome.success)
+        self.assertEqual(outcome.backend, "fork")
+        self.assertEqual(outcome.coinbase_profit, 10**9 * 200_000)
+        self.assertGreater(outcome.searcher_profit, 0)
+        self.assertEqual(int(outcome.raw["coinbaseDiff"], 16), outcome.coinbase_profit)
+
+        diff = outcome.raw["stateDiff"]
+        self.assertEqual(len(diff), 3)
+        balance = next(d["balance"] for d in diff.values() if "balance" in d)
+        self.assertEqual(
+            int(balance["to"], 16) - int(balance["from"], 16), outcome.searcher_profit
+        )
+
+    def test_round_trip_sees_own_price_impact(self):
+        """Crossing the same pool twice uses reserves updated by the first hop."""
+        backend = ForkSimulationBackend(ForkState.from_fixture(FIXTURE))
+        route = [
+            {"pool": POOL_A, "zero_for_one": True, "fee": 30},
+            {"pool": POOL_A, "zero_for_one": False, "fee": 30},
+        ]
+
+        outcome = self.loop.run_until_complete(backend.simulate(_candidate(route=route)))
+        self.assertFalse(outcome.success)
+        self.assertLess(outcome.raw["amount_out"], 10**18)
+
+    def test_lazy_fetch_cached_per_block(self):
+        """Missing slots are fetched once per block, even for concurrent readers."""
+        eth = FakeEth()
+        state = ForkState(type("W3", (), {"eth": eth})())
+        backend = ForkSimulationBackend(state)
+
+        async def scenario():
+            await asyncio.gather(*(backend.simulate(_candidate()) for _ in range(4)))
+            first = eth.requests
+            await backend.simulate(_candidate(block=101))
+            return first, eth.requests
+
+        first, total = self.loop.run_until_complete(scenario())
+        self.assertEqual(first, 2)
+        self.assertEqual(total, 4)
+        self.assertEqual(state.block_number, 100)
+
+    def test_concurrent_blocks_use_their_own_state(self):
+        """Simulations for different blocks read their own block, and stale fetches are dropped."""
+        eth = BlockEth()
+        state = ForkState(type("W3", (), {"eth": eth})(), keep_blocks=3)
+        backend = ForkSimulationBackend(state)
+
+        async def scenario():
+            # Block 99's fetches are still in flight when later blocks arrive
+            eth.gate.clear()
+            early = asyncio.ensure_future(backend.simulate(_candidate(block=100)))
+            await asyncio.sleep(0)
+            late = asyncio.ensure_future(backend.simulate(_candidate(block=101)))
+            await asyncio.sleep(0)
+            state.set_block(101)
+            state.set_block(102)
+            eth.gate.set()
+            return await early, await late
+
+        early, late = self.loop.run_until_complete(scenario())
+        self.assertEqual(early.raw["stateBlockNumber"], 99)
+        self.assertEqual(late.raw["stateBlockNumber"], 100)
+        self.assertTrue(early.success)
+        self.assertFalse(late.success)
+        self.assertLess(late.raw["amount_out"], early.raw["amount_out"])
+
+        # Block 99 was evicted mid-fetch, so its reads (two per pool) were not cached
+        stats = state.get_stats()
+        self.assertEqual(stats["discarded"], 4)
+        self.assertEqual(stats["cached_blocks"], 3)
+        self.assertEqual(stats["storage_slots"], 2)
+        self.assertEqual(sorted(set(eth.requests)), [99, 100])
+
+    def test_falls_back_for_uncached_state(self):
+        """Candidates outside the snapshot go to the remote backend."""
+        fallback = RecordingFallback()
+        backend = ForkSimulationBackend(ForkState.from_fixture(FIXTURE), fallback=fallback)
+
+        async def scenario():
+            other_block = await backend.simulate(_candidate(block=105))
+            no_route = await backend.simulate(_candidate(route=[]))
+            local = await backend.simulate(_candidate())
+            return other_block, no_route, local
+
+        other_block, no_route, local = self.loop.run_until_complete(scenario())
+        self.assertEqual(other_block.backend, "relay")
+        self.assertEqual(no_route.backend, "relay")
+        self.assertEqual(local.backend, "fork")
+        self.assertEqual(fallback.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for latency histograms, pipeline traces and the Prometheus export.
+"""
+
+import asyncio
+import random
+import unittest
+
+from arbitrage_bot.core.web3.rpc_latency import RPC_LATENCY_SUPPORTED, RpcLatencyMiddleware
+from arbitrage_bot.utils import latency
+from arbitrage_bot.utils.latency import (
+    CANDIDATES_GENERATED,
+    STATE_REFRESHED,
+    TX_INCLUDED,
+    LatencyHistogram,
+    LatencyTracer,
+    render_prometheus,
+    summarize,
+)
+
+
+class TestLatency(unittest.TestCase):
+    """Tests for the latency module."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.previous = latency.get_tracer()
+        self.tracer = LatencyTracer()
+        latency.set_tracer(self.tracer)
+
+    def tearDown(self):
+        latency.set_tracer(self.previous)
+        self.loop.close()
+
+    def test_histogram_quantiles_and_state(self):
+        """Quantiles stay within 1% of exact values and survive serialization."""
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(13, 1.5)) for _ in range(50_000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (0.5, 0.9, 0.99, 0.999):
+            exact = values[int(q * len(values)) - 1] / 1e9
+            self.assertAlmostEqual(histogram.quantile(q) / exact, 1.0, delta=0.01)
+        self.assertEqual(histogram.max, values[-1])
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values) / 1e9)
+
+        restored = LatencyHistogram.from_state(histogram.to_state())
+        self.assertEqual(restored.quantile(0.99), histogram.quantile(0.99))
+        restored.merge(histogram)
+        self.assertEqual(restored.count, 2 * histogram.count)
+        self.assertEqual(LatencyHistogram().quantile(0.5), 0.0)
+
+    def test_traces_follow_tasks_and_sampling(self):
+        """Stage marks reach the current trace, also from spawned tasks."""
+
+        async def pipeline():
+            latency.start_trace(100)
+            latency.mark(STATE_REFRESHED)
+            with latency.span("detector.cross_dex"):
+                await asyncio.sleep(0)
+            await asyncio.create_task(self._included_later())
+
+        self.loop.run_until_complete(pipeline())
+        stats = self.tracer.get_stats()
+        self.assertEqual(
+            list(stats["stages"]), ["block_received", STATE_REFRESHED, TX_INCLUDED]
+        )
+        self.assertEqual(stats["spans"]["detector.cross_dex"]["count"], 1)
+        self.assertGreaterEqual(stats["stages"][TX_INCLUDED]["max_ms"], 1.0)
+
+        # Off: nothing is recorded and no trace is current
+        self.tracer.reset()
+        self.tracer.sample_rate = 0.0
+
+        async def unsampled():
+            self.assertIsNone(latency.start_trace(101))
+            latency.mark(CANDIDATES_GENERATED)
+            with latency.span("detector.cross_dex"):
+                pass
+
+        self.loop.run_until_complete(unsampled())
+        self.assertEqual(self.tracer.snapshot()["stages"], {})
+        self.assertEqual(self.tracer.snapshot()["spans"], {})
+
+    async def _included_later(self):
+        await asyncio.sleep(0.002)
+        latency.mark(TX_INCLUDED)
+
+    @unittest.skipUnless(RPC_LATENCY_SUPPORTED, "class-based middleware needs web3 7+")
+    def test_rpc_middleware_and_prometheus_export(self):
+        """RPC calls are counted per method and exported in text format."""
+
+        async def make_request(method, params):
+            if method == "eth_call":
+                raise ConnectionError("boom")
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x10"}
+
+        async def run():
+            middleware = RpcLatencyMiddleware(None)
+            middleware.size_sample_every = 2  # Sizes from every other call, doubled
+            wrapped = await middleware.async_wrap_make_request(make_request)
+            for _ in range(4):
+                await wrapped("eth_blockNumber", [])
+            with self.assertRaises(ConnectionError):
+                await wrapped("eth_call", [{"to": "0x0"}, "latest"])
+
+        self.loop.run_until_complete(run())
+        snapshot = self.tracer.snapshot()
+        rpc = summarize(snapshot)["rpc"]
+        self.assertEqual(rpc["eth_blockNumber"]["count"], 4)
+        self.assertEqual(rpc["eth_blockNumber"]["errors"], 0)
+        self.assertEqual(rpc["eth_blockNumber"]["request_bytes"], 8)
+        self.assertEqual(
+            rpc["eth_blockNumber"]["response_bytes"],
+            4 * len('{"jsonrpc":"2.0","id":1,"result":"0x10"}'),
+        )
+        self.assertEqual(rpc["eth_call"]["errors"], 1)
+
+        text = render_prometheus(snapshot)
+        self.assertIn("# TYPE arbitrage_rpc_latency_seconds summary", text)
+        self.assertIn('arbitrage_rpc_latency_seconds_count{method="eth_blockNumber"} 4', text)
+        self.assertIn('arbitrage_rpc_errors_total{method="eth_call"} 1', text)
+        self.assertIn(
+            'arbitrage_rpc_latency_seconds{method="eth_blockNumber",quantile="0.99"}', text
+        )
+        self.assertTrue(text.endswith("\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
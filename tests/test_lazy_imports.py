@@ -0,0 +1,68 @@
+"""
+Tests for lazy package exports.
+"""
+
+import subprocess
+import sys
+import types
+import unittest
+from pathlib import Path
+
+from arbitrage_bot.utils.lazy_import import lazy_exports
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class TestLazyImports(unittest.TestCase):
+    """Tests for lazy_exports and the packages that use it."""
+
+    def test_package_import_defers_heavy_subsystems(self):
+        """Importing the package or a utility does not load web3 or logging config."""
+        code = (
+            "import logging, sys\n"
+            "import arbitrage_bot, arbitrage_bot.core, arbitrage_bot.utils.telemetry\n"
+            "heavy = [m for m in ('web3', 'aiohttp', 'arbitrage_bot.core.arbitrage.base_system')"
+            " if m in sys.modules]\n"
+            "print(heavy, logging.getLogger().handlers)\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.strip(), "[] []")
+
+    def test_exports_resolve_on_first_access(self):
+        """Names resolve from their module, are cached and listed by dir()."""
+        package = types.ModuleType("lazy_test_package")
+        sys.modules[package.__name__] = package
+        self.addCleanup(sys.modules.pop, package.__name__)
+        package.__getattr__, package.__dir__ = lazy_exports(
+            package.__name__, {"dumps": "json", "Decoder": "json:JSONDecoder"}
+        )
+
+        import json
+
+        self.assertNotIn("dumps", vars(package))
+        self.assertIs(package.dumps, json.dumps)
+        self.assertIs(vars(package)["dumps"], json.dumps)
+        self.assertIs(package.Decoder, json.JSONDecoder)
+        self.assertIn("Decoder", package.__dir__())
+        with self.assertRaises(AttributeError):
+            package.missing
+
+    def test_existing_exports_still_import(self):
+        """Names exported by the lazy packages keep working with from-imports."""
+        from arbitrage_bot import async_manager, run_with_async_context
+        from arbitrage_bot.core import Web3Error
+        from arbitrage_bot.core.arbitrage.discovery import DEXInfo, DEXProtocolType
+        from arbitrage_bot.utils.async_manager import manager
+
+        self.assertIs(async_manager, manager)
+        self.assertTrue(callable(run_with_async_context))
+        self.assertTrue(issubclass(Web3Error, Exception))
+        self.assertEqual(DEXInfo.__module__, "arbitrage_bot.core.arbitrage.discovery.sources.base")
+        self.assertIsNotNone(DEXProtocolType)
+
+
+if __name__ == "__main__":
+    unittest.main()
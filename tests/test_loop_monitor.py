@@ -0,0 +1,91 @@
+"""
+Tests for the event loop monitor.
+"""
+
+import asyncio
+import time
+import unittest
+
+from arbitrage_bot.utils.latency import render_prometheus, summarize
+from arbitrage_bot.utils.loop_monitor import LoopMonitor
+
+
+def blocking_persist(seconds):
+    """Stand-in for a synchronous write on the event loop."""
+    time.sleep(seconds)
+
+
+class TestLoopMonitor(unittest.TestCase):
+    """Tests for LoopMonitor."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_measures_lag(self):
+        """Blocking the loop shows up as lag; an idle loop has almost none."""
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+
+        async def run():
+            await monitor.start()
+            await asyncio.sleep(0.1)
+            idle_max = monitor.lag.max
+            blocking_persist(0.15)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            return idle_max
+
+        idle_max = self.loop.run_until_complete(run())
+        stats = monitor.get_stats()
+        self.assertGreater(stats["samples"], 5)
+        self.assertLess(idle_max / 1e6, 50.0)
+        self.assertGreaterEqual(stats["max_lag_ms"], 100.0)
+        self.assertEqual(stats["blocked"], 1)
+        self.assertEqual(stats["events"], [])  # stacks only in debug mode
+
+    def test_debug_mode_captures_blocking_stack(self):
+        """The watchdog reports the blocking call while it is still running."""
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.05, debug=True)
+
+        async def persist_opportunities():
+            blocking_persist(0.2)
+
+        async def run():
+            await monitor.start()
+            await asyncio.sleep(0.03)
+            await asyncio.create_task(persist_opportunities(), name="persist")
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        with self.assertLogs("arbitrage_bot.utils.loop_monitor", level="WARNING") as logs:
+            self.loop.run_until_complete(run())
+
+        self.assertEqual(len(monitor.events), 1)
+        event = monitor.events[0]
+        self.assertIn("persist_opportunities", event["task"])
+        self.assertIn("blocking_persist", event["stack"][-1])
+        self.assertGreaterEqual(event["blocked_ms"], 150.0)
+        self.assertIn("Event loop was blocked", logs.output[0])
+
+    def test_lag_in_latency_export(self):
+        """Lag published with the latency snapshot reaches summaries and /metrics."""
+        monitor = LoopMonitor(block_threshold=0.05)
+        for lag in (0.001, 0.002, 0.2):
+            monitor._record(lag)
+
+        snapshot = {"stages": {}, "spans": {}, "rpc": {}, "event_loop": monitor.to_state()}
+        summary = summarize(snapshot)["event_loop"]
+        self.assertEqual((summary["count"], summary["blocked"]), (3, 1))
+        self.assertAlmostEqual(summary["max_ms"], 200.0, places=3)
+
+        text = render_prometheus(snapshot)
+        self.assertIn("# TYPE arbitrage_event_loop_lag_seconds summary", text)
+        self.assertIn("arbitrage_event_loop_lag_seconds_count 3", text)
+        self.assertIn("arbitrage_event_loop_blocked_total 1", text)
+        self.assertNotIn("event_loop", summarize({"stages": {}}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for the segment-backed memory bank.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from arbitrage_bot.core.memory.bank import MemoryBank
+from arbitrage_bot.core.memory.segment_store import SegmentStore
+from arbitrage_bot.core.memory.time_wheel import TimeWheel
+
+
+class TestMemoryBankStore(unittest.TestCase):
+    """Tests for MemoryBank storage, expiry and startup."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.base_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.loop.close()
+        shutil.rmtree(self.base_path, ignore_errors=True)
+
+    def _open_bank(self, **config):
+        bank = MemoryBank(self.base_path)
+        config.setdefault("flush_interval", 3600)
+        self.assertTrue(self.loop.run_until_complete(bank.initialize(config)))
+        return bank
+
+    def test_coalesced_writes_and_lazy_reload(self):
+        """Repeated stores write the latest value once; reopening loads only the index."""
+        bank = self._open_bank()
+
+        async def write():
+            for i in range(100):
+                await bank.store("price", {"value": i}, "analytics")
+            await bank.store("pair", ["WETH", "USDC"], "storage")
+            self.assertEqual(await bank.retrieve("price", "analytics"), {"value": 99})
+            await bank.close()
+
+        self.loop.run_until_complete(write())
+        store = SegmentStore(os.path.join(self.base_path, "analytics"))
+        store.open()
+        self.assertEqual(store.get_stats()["keys"], 1)
+        self.assertEqual(store.get_stats()["dead_bytes"], 0)
+        store.close()
+
+        bank = self._open_bank()
+        self.assertEqual(len(bank._data_cache), 0)
+
+        async def read():
+            self.assertEqual(await bank.retrieve("price", "analytics"), {"value": 99})
+            self.assertEqual(await bank.retrieve("pair", "storage"), ["WETH", "USDC"])
+            self.assertIsNone(await bank.retrieve("missing", "storage"))
+            stats = await bank.get_memory_stats()
+            self.assertEqual(stats.categories["analytics"]["items"], ["price"])
+            await bank.close()
+
+        self.loop.run_until_complete(read())
+
+    def test_store_during_segment_read_wins(self):
+        """A value stored while retrieve() reads the segment is returned and not shadowed by the cache."""
+        bank = self._open_bank()
+        store = bank._stores["analytics"]
+        reading, release = threading.Event(), threading.Event()
+        read = store.read
+
+        def slow_read(key):
+            reading.set()
+            release.wait(2)
+            return read(key)
+
+        async def run():
+            await bank.store("price", {"value": 1}, "analytics")
+            await bank.flush()
+            bank._data_cache.clear()
+
+            store.read = slow_read
+            retrieval = asyncio.ensure_future(bank.retrieve("price", "analytics"))
+            await asyncio.get_running_loop().run_in_executor(None, reading.wait, 2)
+            await bank.store("price", {"value": 2}, "analytics")
+            release.set()
+            first = await retrieval
+
+            store.read = read
+            await bank.flush()
+            second = await bank.retrieve("price", "analytics")
+            await bank.close()
+            return first, second
+
+        self.assertEqual(self.loop.run_until_complete(run()), ({"value": 2}, {"value": 2}))
+        self.assertEqual(bank._data_cache["analytics:price"][0]["data"], {"value": 2})
+
+    def test_ttl_expiry(self):
+        """Expired values are not returned and are tombstoned by the flush sweep."""
+        bank = self._open_bank()
+
+        async def run():
+            await bank.store("quote", 1, "cache", ttl=0.05)
+            await bank.store("keep", 2, "cache")
+            await bank.flush()
+            self.assertEqual(await bank.retrieve("quote", "cache"), 1)
+
+            await asyncio.sleep(0.1)
+            self.assertIsNone(await bank.retrieve("quote", "cache"))
+            await bank.flush()
+            self.assertNotIn("quote", bank._stores["cache"].index)
+            self.assertEqual(await bank.retrieve("keep", "cache"), 2)
+            await bank.close()
+
+        self.loop.run_until_complete(run())
+
+        wheel = TimeWheel(resolution=1.0, slots=8)
+        now = time.time()
+        wheel.schedule("soon", now + 2)
+        wheel.schedule("later", now + 20)  # More than one rotation away
+        self.assertEqual(wheel.advance(now + 3), {"soon"})
+        self.assertEqual(wheel.advance(now + 10), set())
+        self.assertEqual(wheel.advance(now + 21), {"later"})
+
+    def test_legacy_migration_and_torn_tail(self):
+        """Legacy per-key JSON files migrate once and a torn tail is truncated."""
+        legacy_dir = os.path.join(self.base_path, "docs")
+        os.makedirs(legacy_dir)
+        with open(os.path.join(legacy_dir, "readme.json"), "w") as f:
+            json.dump({"data": "hello", "timestamp": time.time(), "ttl": None}, f)
+        with open(os.path.join(legacy_dir, "stale.json"), "w") as f:
+            json.dump({"data": "old", "timestamp": time.time() - 100, "ttl": 10}, f)
+
+        bank = self._open_bank()
+        self.assertFalse(any(name.endswith(".json") for name in os.listdir(legacy_dir)))
+        self.assertEqual(self.loop.run_until_complete(bank.retrieve("readme", "docs")), "hello")
+        self.assertIsNone(self.loop.run_until_complete(bank.retrieve("stale", "docs")))
+        self.loop.run_until_complete(bank.close())
+
+        data_path = os.path.join(legacy_dir, "segment.dat")
+        os.remove(os.path.join(legacy_dir, "segment.idx"))
+        with open(data_path, "ab") as f:
+            f.write(b"\x00\x05\x00")
+
+        bank = self._open_bank()
+        self.assertEqual(self.loop.run_until_complete(bank.retrieve("readme", "docs")), "hello")
+        self.loop.run_until_complete(bank.close())
+
+
+if __name__ == "__main__":
+    unittest.main()
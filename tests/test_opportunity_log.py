@@ -0,0 +1,156 @@
+"""
+Tests for the opportunity log and tracker persistence.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from arbitrage_bot.core.events.event_emitter import EventEmitter
+from arbitrage_bot.core.events.opportunity_log import OpportunityLog
+from arbitrage_bot.core.events.opportunity_tracker import (
+    ArbitrageOpportunity,
+    OpportunityTracker,
+)
+
+
+def _opportunity(index, profit=10**20):
+    return ArbitrageOpportunity(
+        id=f"opp_{index}",
+        timestamp=time.time() - 100 + index,
+        input_token="0xaaa",
+        output_token="0xaaa",
+        route=[{"dex": "uniswap"}, {"dex": "sushiswap"}],
+        input_amount=10**21,
+        expected_output=10**21 + profit,
+        expected_profit=profit,
+    )
+
+
+class TestOpportunityLog(unittest.TestCase):
+    """Tests for the OpportunityLog class."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log = OpportunityLog(self.temp_dir.name)
+
+    def tearDown(self):
+        """Close the log and remove the directory."""
+        self.log.close()
+        self.temp_dir.cleanup()
+
+    def test_latest_state_wins(self):
+        """Replay, get and scan read the indexed records, including big ints."""
+        first = _opportunity(1).to_dict()
+        second = _opportunity(2).to_dict()
+        self.log.append([("opp_1", first["timestamp"], first), ("opp_2", second["timestamp"], second)])
+        first["execution_status"] = "executed"
+        self.log.append([("opp_1", first["timestamp"], first)])
+
+        states = self.log.replay()
+        self.assertEqual([s["id"] for s in states], ["opp_2", "opp_1"])
+        self.assertEqual(states[1]["execution_status"], "executed")
+        self.assertEqual(states[0]["expected_output"], 10**21 + 10**20)
+        self.assertEqual(self.log.get("opp_1")["execution_status"], "executed")
+        self.assertIsNone(self.log.get("missing"))
+        self.assertEqual(len(list(self.log.scan(start_time=second["timestamp"]))), 1)
+        self.assertEqual(len(self.log.replay(limit=1)), 1)
+
+    def test_async_appends_written_in_order_off_the_loop(self):
+        """Async appends run on the writer thread and keep submission order."""
+        threads = set()
+        append = self.log._append
+
+        def recording_append(records):
+            threads.add(threading.current_thread())
+            return append(records)
+
+        self.log._append = recording_append
+
+        async def scenario():
+            writes = []
+            for status in ("pending", "submitted", "executed"):
+                state = _opportunity(1).to_dict()
+                state["execution_status"] = status
+                writes.append(self.log.append_async([("opp_1", state["timestamp"], state)]))
+            return await asyncio.gather(*writes)
+
+        loop = asyncio.new_event_loop()
+        try:
+            written = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+
+        self.assertEqual(written, [1, 1, 1])
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(self.log.get("opp_1")["execution_status"], "executed")
+
+    def test_torn_tail_is_repaired(self):
+        """A partial record after a crash is dropped before new appends."""
+        data = _opportunity(1).to_dict()
+        self.log.append([("opp_1", data["timestamp"], data)])
+        day = self.log.days()[0]
+        self.log.close()
+        with open(os.path.join(self.temp_dir.name, f"opportunities-{day}.log"), "ab") as f:
+            f.write(b"\x00\x00\x10\x00partial")
+
+        reopened = OpportunityLog(self.temp_dir.name)
+        data["id"] = "opp_2"
+        reopened.append([("opp_2", data["timestamp"], data)])
+        reopened.close()
+
+        self.assertEqual([s["id"] for s in reopened.replay()], ["opp_1", "opp_2"])
+
+
+class TestOpportunityTrackerPersistence(unittest.TestCase):
+    """Tests for OpportunityTracker persistence through the log."""
+
+    def setUp(self):
+        """Create an event loop and data directory."""
+        self.loop = asyncio.new_event_loop()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Close the event loop and remove the directory."""
+        self.loop.close()
+        self.temp_dir.cleanup()
+
+    def test_persist_writes_changes_once_and_reloads(self):
+        """Each persist cycle only writes opportunities changed since the last."""
+
+        async def scenario():
+            tracker = OpportunityTracker(
+                EventEmitter(), data_dir=self.temp_dir.name, auto_persist=False
+            )
+            await tracker.start()
+            for i in range(5):
+                await tracker.track_opportunity(_opportunity(i))
+            await tracker.persist_opportunities()
+            after_first = tracker._log.stats["records_written"]
+
+            await tracker.persist_opportunities()
+            after_idle = tracker._log.stats["records_written"]
+
+            await tracker.update_opportunity_execution("opp_3", "executed", tx_hash="0x1")
+            await tracker.stop()
+
+            reloaded = OpportunityTracker(EventEmitter(), data_dir=self.temp_dir.name)
+            await reloaded._load_opportunities()
+            return after_first, after_idle, tracker._log.stats["records_written"], reloaded
+
+        after_first, after_idle, total, reloaded = self.loop.run_until_complete(scenario())
+
+        self.assertEqual(after_first, 5)
+        self.assertEqual(after_idle, 5)
+        self.assertEqual(total, 6)
+        self.assertEqual(len(reloaded.get_opportunities()), 5)
+        self.assertEqual(reloaded.get_opportunity("opp_3").execution_status, "executed")
+        self.assertEqual(reloaded.get_opportunity("opp_0").expected_profit, 10**20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for the sampling profiler and its API endpoints.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from arbitrage_bot.core.api.api import APISystem
+from arbitrage_bot.utils.profiler import NO_TASK, SamplingProfiler
+
+
+def spin(seconds):
+    """Burn CPU for a while."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def price_worker(stop):
+    while not stop.is_set():
+        spin(0.01)
+
+
+async def hot_detector(stop):
+    while not stop.is_set():
+        spin(0.05)
+        await asyncio.sleep(0)
+
+
+class TestProfiler(unittest.TestCase):
+    """Tests for SamplingProfiler and the profiler API."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_capture_attributes_tasks_and_threads(self):
+        """Samples cover worker threads and name the running asyncio task."""
+        stop = threading.Event()
+        worker = threading.Thread(target=price_worker, args=(stop,), name="price-worker")
+
+        async def run():
+            worker.start()
+            task = asyncio.create_task(hot_detector(stop))
+            profile = await SamplingProfiler().capture(0.3, interval=0.005)
+            stop.set()
+            await task
+            return profile
+
+        profile = self.loop.run_until_complete(run())
+        worker.join()
+
+        self.assertGreater(profile.samples, 10)
+        summary = profile.summary()
+        threads = {entry["name"] for entry in summary["threads"]}
+        self.assertIn("thread:price-worker", threads)
+        self.assertNotIn("thread:sampling-profiler", threads)
+        tasks = {entry["name"] for entry in summary["tasks"]}
+        self.assertIn("task:hot_detector", tasks)
+        self.assertTrue(all(name.startswith("task:") for name in tasks))
+        self.assertEqual(NO_TASK, "task:<none>")
+
+        # Collapsed format: root-first frames and an integer count per line
+        for line in profile.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("thread:"))
+            self.assertGreater(int(count), 0)
+        self.assertIn("spin (", profile.collapsed())
+        self.assertTrue(profile.to_svg().startswith("<svg"))
+
+    def test_one_capture_at_a_time(self):
+        """Overlapping captures are rejected and durations are capped."""
+        profiler = SamplingProfiler(max_duration=0.05)
+
+        async def run():
+            first = asyncio.create_task(profiler.capture(10.0))
+            await asyncio.sleep(0.01)
+            self.assertTrue(profiler.running)
+            with self.assertRaises(RuntimeError):
+                await profiler.capture(0.1)
+            return await first
+
+        profile = self.loop.run_until_complete(run())
+        self.assertLess(profile.duration, 1.0)
+        self.assertFalse(profiler.running)
+        self.assertEqual(profiler.get_stats()["captures"], 1)
+        with self.assertRaises(RuntimeError):
+            profiler.stop()
+
+    def test_api_endpoints(self):
+        """The API captures profiles when enabled and refuses otherwise."""
+        system = APISystem({"secret_key": "test", "profiler_enabled": True})
+        token = HTTPAuthorizationCredentials(
+            scheme="Bearer", credentials=system._create_token({"sub": "ops"})
+        )
+        routes = {route.path: route.endpoint for route in system.app.routes}
+
+        async def run():
+            summary = await routes["/api/v1/profiler/capture"](
+                duration=0.05, interval=0.005, output="json", token=token
+            )
+            svg = await routes["/api/v1/profiler/last"](output="svg", token=token)
+            status = await routes["/api/v1/profiler/status"](token=token)
+            with self.assertRaises(HTTPException) as bad_output:
+                await routes["/api/v1/profiler/last"](output="pdf", token=token)
+            return summary, svg, status, bad_output.exception
+
+        summary, svg, status, bad_output = self.loop.run_until_complete(run())
+        self.assertGreater(summary["samples"], 0)
+        self.assertEqual(svg.media_type, "image/svg+xml")
+        self.assertEqual(status["captures"], 1)
+        self.assertEqual(bad_output.status_code, 400)
+
+        disabled = APISystem({"secret_key": "test"})
+        routes = {route.path: route.endpoint for route in disabled.app.routes}
+        with self.assertRaises(HTTPException) as ctx:
+            self.loop.run_until_complete(routes["/api/v1/profiler/status"](token=token))
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
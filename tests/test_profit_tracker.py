@@ -8,7 +8,7 @@
 import os
 import tempfile
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from arbitrage_bot.core.analytics.profit_tracker import ProfitTracker, create_profit_tracker
 
@@ -57,7 +57,6 @@ def test_initialization(self):
         self.assertFalse(tracker.initialized)
         self.assertEqual(tracker.storage_dir, self.temp_dir.name)
         self.assertEqual(tracker.cache_ttl, 60)
-        self.assertEqual(tracker._profit_history, [])
         self.assertEqual(tracker._token_pair_profits, {})
         self.assertEqual(list(tracker._timeframe_profits.keys()), ["1h", "24h", "7d", "30d", "all"])
     
@@ -80,8 +79,7 @@ async def async_test_track_profit(self):
         await tracker.track_profit(self.sample_trade)
         
         # Check that the entry was added
-        self.assertEqual(len(tracker._profit_history), 1)
-        self.assertEqual(tracker._profit_history[0]['profit'], 0.02)
+        self.assertEqual(tracker._timeframe_profits["all"].stats.total, 0.02)
         
         # Check that the token pair was added
         token_pair = f"{self.token_a}_{self.token_b}"
@@ -92,8 +90,9 @@ async def async_test_track_profit(self):
         for timeframe in tracker._timeframe_profits:
             self.assertEqual(len(tracker._timeframe_profits[timeframe]), 1)
         
-        # Check that the file was created
-        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, 'profit_history.json')))
+        # Check that the entry was appended to the store
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, 'analytics.db')))
+        self.assertEqual(tracker.store.count("profit"), 1)
     
     async def async_test_get_profit_by_token_pair(self):
         """Test getting profit metrics by token pair."""
@@ -234,7 +233,7 @@ async def async_test_create_profit_tracker(self):
         with patch('arbitrage_bot.core.analytics.profit_tracker.ProfitTracker') as mock_tracker:
             # Setup mock
             mock_instance = MagicMock()
-            mock_instance.initialize.return_value = True
+            mock_instance.initialize = AsyncMock(return_value=True)
             mock_tracker.return_value = mock_instance
             
             # Call factory function
@@ -246,18 +245,28 @@ async def async_test_create_profit_tracker(self):
             # Check that initialize was called
             mock_instance.initialize.assert_called_once()
     
+    def _fresh_storage(self):
+        """Give the next async test its own storage directory."""
+        self.temp_dir.cleanup()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config['storage_dir'] = self.temp_dir.name
+
     def test_all_async(self):
         """Run all async tests."""
         loop = asyncio.get_event_loop()
-        loop.run_until_complete(self.async_test_initialize())
-        loop.run_until_complete(self.async_test_track_profit())
-        loop.run_until_complete(self.async_test_get_profit_by_token_pair())
-        loop.run_until_complete(self.async_test_get_roi())
-        loop.run_until_complete(self.async_test_get_profit_time_series())
-        loop.run_until_complete(self.async_test_get_top_token_pairs())
-        loop.run_until_complete(self.async_test_get_profit_summary())
-        loop.run_until_complete(self.async_test_create_profit_tracker())
-
+        for test in (
+            self.async_test_initialize,
+            self.async_test_track_profit,
+            self.async_test_get_profit_by_token_pair,
+            self.async_test_get_roi,
+            self.async_test_get_profit_time_series,
+            self.async_test_get_top_token_pairs,
+            self.async_test_get_profit_summary,
+            self.async_test_create_profit_tracker,
+        ):
+            # History is persisted, so each test starts from an empty store
+            self._fresh_storage()
+            loop.run_until_complete(test())
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
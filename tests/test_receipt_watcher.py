@@ -0,0 +1,148 @@
+"""
+Tests for the block-driven ReceiptWatcher.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from arbitrage_bot.core.web3.receipt_watcher import ReceiptWatcher
+
+
+class FakeChain:
+    """Async chain stand-in that counts receipt requests."""
+
+    def __init__(self):
+        self.head = 100
+        self.mined = {}  # block number -> list of receipts
+        self.requests = 0
+        self.receipts = {}  # tx hash -> receipt mined before watching started
+
+    async def get_transaction_receipt(self, tx_hash):
+        if tx_hash not in self.receipts:
+            raise LookupError(f"Transaction {tx_hash} not found")
+        return self.receipts[tx_hash]
+
+    async def get_block(self, identifier):
+        return {"number": self.head, "timestamp": 1_700_000_000 + self.head}
+
+    async def make_request(self, method, params):
+        self.requests += 1
+        return {"result": self.mined.get(int(params[0], 16), [])}
+
+    def mine(self, tx_hashes, status=1):
+        self.head += 1
+        self.mined[self.head] = [
+            {
+                "transactionHash": h,
+                "blockNumber": hex(self.head),
+                "blockHash": "0x" + "ab" * 32,
+                "status": hex(status),
+                "gasUsed": hex(150_000),
+                "effectiveGasPrice": hex(10**9),
+            }
+            for h in tx_hashes
+        ]
+
+
+def _hash(i):
+    return "0x" + f"{i:064x}"
+
+
+class TestReceiptWatcher(unittest.TestCase):
+    """Tests for the ReceiptWatcher class."""
+
+    def setUp(self):
+        """Create a watcher over a fake chain."""
+        self.chain = FakeChain()
+        self.watcher = ReceiptWatcher(SimpleNamespace(eth=self.chain, provider=self.chain))
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        """Close the watcher and event loop."""
+        self.loop.run_until_complete(self.watcher.close())
+        self.loop.close()
+
+    def test_one_request_per_block(self):
+        """Many pending transactions are resolved with one receipt call per block."""
+
+        async def scenario():
+            hashes = [_hash(i) for i in range(50)]
+            futures = [self.watcher.watch(h, confirmations=0) for h in hashes]
+            await self.watcher.poll_once()  # Prime at the current head
+
+            self.chain.mine(hashes)
+            before = self.chain.requests
+            await self.watcher.poll_once()
+            return futures, self.chain.requests - before
+
+        futures, requests = self.loop.run_until_complete(scenario())
+        self.assertEqual(requests, 1)
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(futures[0].result().gas_used, 150_000)
+        self.assertEqual(self.watcher.pending_count, 0)
+
+    def test_confirmations_and_listeners(self):
+        """Futures resolve after the required confirmations; listeners see reverts."""
+        updates = []
+
+        async def listener(update):
+            updates.append((update.tx_hash, update.confirmations, update.reverted))
+
+        self.watcher.add_listener(listener)
+
+        async def scenario():
+            future = self.watcher.watch(_hash(1), confirmations=3)
+            await self.watcher.poll_once()
+            self.chain.mine([_hash(1)], status=0)
+            await self.watcher.poll_once()
+            self.assertFalse(future.done())
+            self.chain.mine([])
+            self.chain.mine([])
+            await self.watcher.poll_once()
+            return future
+
+        future = self.loop.run_until_complete(scenario())
+        self.assertTrue(future.done())
+        self.assertTrue(future.result().reverted)
+        self.assertEqual([u[1] for u in updates], [1, 3])
+
+
+    def test_already_mined_transaction_resolves(self):
+        """A transaction mined before the scan window is found by the initial lookup."""
+        self.chain.receipts[_hash(7)] = {
+            "transactionHash": _hash(7),
+            "blockNumber": hex(self.chain.head - 5),
+            "blockHash": "0x" + "cd" * 32,
+            "status": "0x1",
+            "gasUsed": hex(21_000),
+        }
+
+        async def scenario():
+            future = self.watcher.watch(_hash(7), confirmations=1)
+            await self.watcher.poll_once()
+            return await asyncio.wait_for(future, timeout=1)
+
+        update = self.loop.run_until_complete(scenario())
+        self.assertEqual(update.block_number, 95)
+        self.assertEqual(update.gas_used, 21_000)
+        self.assertEqual(self.watcher.pending_count, 0)
+
+    def test_unmined_transaction_times_out(self):
+        """Hashes that never show up are dropped after the watch timeout."""
+        self.watcher.watch_timeout = 0
+
+        async def scenario():
+            future = self.watcher.watch(_hash(9), confirmations=1)
+            await self.watcher.poll_once()
+            return future
+
+        future = self.loop.run_until_complete(scenario())
+        self.assertIsInstance(future.exception(), asyncio.TimeoutError)
+        self.assertEqual(self.watcher.pending_count, 0)
+        self.assertEqual(self.watcher.get_stats()["timed_out"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for chain fixtures, the replay RPC node and the replay benchmark.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from web3 import AsyncWeb3
+from web3.exceptions import Web3RPCError
+
+from arbitrage_bot.testing.chain_fixtures import (
+    SYNC_TOPIC,
+    decode_sync_data,
+    fixture_stats,
+    load_fixture,
+    record_fixture,
+    save_fixture,
+    scale_fixture,
+    synthesize_fixture,
+)
+from arbitrage_bot.testing.replay_benchmark import (
+    HARNESS_STAGES,
+    compare_reports,
+    run_replay_benchmark,
+)
+from arbitrage_bot.testing.replay_rpc import ReplayChain, ReplayProvider
+from arbitrage_bot.utils.latency import STAGES
+
+
+class TestReplayBenchmark(unittest.TestCase):
+    """Tests for the block-replay harness."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.fixture = synthesize_fixture(blocks=6, seed=3)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_fixture_files_scaling_and_recording(self):
+        """Fixtures round-trip through files, scale, and re-record from the replay node."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json.gz")
+            save_fixture(self.fixture, path)
+            self.assertEqual(load_fixture(path), self.fixture)
+
+        stats, scaled = fixture_stats(self.fixture), fixture_stats(scale_fixture(self.fixture, 10))
+        for key in ("tokens", "pools", "pairs", "logs", "pending"):
+            self.assertEqual(scaled[key], stats[key] * 10)
+        self.assertEqual(scaled["blocks"], stats["blocks"])
+
+        # Recording the replayed chain reproduces the fixture
+        chain = ReplayChain(self.fixture)
+        while chain.advance():
+            pass
+        w3 = AsyncWeb3(ReplayProvider(chain))
+        pools = {address: pool["dex"] for address, pool in self.fixture["pools"].items()}
+        routers = {dex_id: dex["router"] for dex_id, dex in self.fixture["dexes"].items()}
+        start = self.fixture["start_block"]
+        recorded = self.loop.run_until_complete(
+            record_fixture(w3, pools, routers, start, start + 2)
+        )
+        self.assertEqual(recorded["pools"], self.fixture["pools"])
+        self.assertEqual(recorded["tokens"], self.fixture["tokens"])
+        self.assertEqual(recorded["blocks"], self.fixture["blocks"][:3])
+
+    def test_replay_provider(self):
+        """web3 reads blocks, logs and state from the replayed chain."""
+        chain = ReplayChain(self.fixture)
+        provider = ReplayProvider(chain)
+        w3 = AsyncWeb3(provider)
+        start = self.fixture["start_block"]
+        pool, info = next(iter(self.fixture["pools"].items()))
+
+        async def run():
+            chain.advance()
+            chain.advance()
+            head = await w3.eth.block_number
+            pending = await w3.eth.get_block("pending", full_transactions=True)
+            logs = await w3.eth.get_logs({"fromBlock": start, "toBlock": "latest", "topics": [SYNC_TOPIC]})
+            before = await w3.eth.get_storage_at(pool, 8, start - 1)
+            with self.assertRaises(Web3RPCError):
+                await w3.eth.get_storage_at(pool, 8, head + 5)
+            return head, pending, logs, before
+
+        head, pending, logs, before = self.loop.run_until_complete(run())
+        self.assertEqual(head, start + 1)
+        self.assertEqual(pending["number"], start + 2)
+        self.assertEqual(len(pending["transactions"]), len(self.fixture["blocks"][1]["pending"]))
+        self.assertEqual(len(logs), sum(len(b["logs"]) for b in self.fixture["blocks"][:2]))
+        last_sync = self.fixture["blocks"][1]["logs"][-1]["data"]
+        self.assertEqual(decode_sync_data(logs[-1]["data"]), decode_sync_data(last_sync))
+
+        packed = int.from_bytes(bytes(before), "big")
+        self.assertEqual(packed & ((1 << 112) - 1), int(info["reserve0"], 16))
+        self.assertEqual((packed >> 112) & ((1 << 112) - 1), int(info["reserve1"], 16))
+        self.assertEqual(provider.get_stats()["head"], start + 1)
+
+    def test_benchmark_runs_pipeline_and_flags_regressions(self):
+        """Every block goes through all stages, and slower runs are reported."""
+        report = self.loop.run_until_complete(run_replay_benchmark(synthesize_fixture(blocks=10)))
+
+        self.assertEqual(report["blocks"], 10)
+        self.assertGreater(report["candidates"], 0)
+        self.assertGreater(report["bundles"], 0)
+        self.assertEqual(report["rpc_requests"]["eth_sendBundle"], report["bundles"])
+        self.assertEqual(list(report["stages"]), [s for s in STAGES if s in report["stages"]])
+        self.assertEqual(report["stages"]["candidates_generated"]["count"], 10)
+        self.assertIn("tx_submitted", report["stages"])
+        self.assertGreater(report["blocks_per_second"], 0)
+        self.assertIn("peak_rss_mb", report["memory"])
+        self.assertEqual(report["ingester"]["blocks_ingested"], 10)
+        self.assertEqual(set(report["harness_stages"]), set(HARNESS_STAGES))
+        self.assertNotIn("tx_signed", report["harness_stages"])
+
+        self.assertEqual(compare_reports(report, report), [])
+        slower = {**report, "blocks_per_second": report["blocks_per_second"] / 2}
+        regressions = compare_reports(slower, report, max_regression=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("blocks_per_second", regressions[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Tests for the rolling aggregates engine.
+"""
+
+import asyncio
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from arbitrage_bot.core.analytics.performance_analyzer import PerformanceAnalyzer
+from arbitrage_bot.core.analytics.rolling_aggregates import (
+    DAY,
+    HOUR,
+    MINUTE,
+    RollingAggregator,
+    Sample,
+)
+
+NOW = 1_700_000_000.0
+
+
+class TestRollingAggregator(unittest.TestCase):
+    """Tests for the RollingAggregator class."""
+
+    def setUp(self):
+        """Create an aggregator with an hourly and an all-time window."""
+        self.aggregator = RollingAggregator({"1h": HOUR, "all": None})
+
+    def test_window_expires_per_bucket(self):
+        """Samples leave the window once their bucket is older than the span."""
+        for minutes_ago, value in [(90, 1.0), (30, 2.0), (5, 3.0)]:
+            self.aggregator.add(
+                Sample(NOW - minutes_ago * MINUTE, value, volume=10.0, key="A-B"),
+                now=NOW - minutes_ago * MINUTE,
+            )
+
+        hourly = self.aggregator.window("1h", now=NOW)
+        self.assertEqual(len(hourly), 2)
+        self.assertAlmostEqual(hourly.stats.total, 5.0)
+        self.assertAlmostEqual(hourly.keys["A-B"].volume, 20.0)
+
+        hourly = self.aggregator.window("1h", now=NOW + 2 * HOUR)
+        self.assertEqual(len(hourly), 0)
+        self.assertEqual(hourly.keys, {})
+        self.assertEqual(len(self.aggregator.window("all", now=NOW + 2 * HOUR)), 3)
+
+    def test_statistics_match_numpy(self):
+        """Running sums reproduce mean and sample standard deviation."""
+        values = np.random.default_rng(7).normal(0.01, 0.05, 200)
+        for i, value in enumerate(values):
+            self.aggregator.add(Sample(NOW - i, float(value), ret=float(value)), now=NOW)
+
+        window = self.aggregator.window("1h", now=NOW)
+        self.assertAlmostEqual(window.stats.mean, values.mean())
+        self.assertAlmostEqual(window.returns.std, values.std(ddof=1))
+        self.assertEqual(window.downside.count, int((values < 0).sum()))
+        self.assertEqual(window.first.timestamp, NOW - 199)
+        self.assertEqual(window.last.timestamp, NOW)
+
+    def test_tiers_serve_series_and_periods(self):
+        """Tiers pick the coarsest usable resolution and sum calendar ranges."""
+        day_start = NOW - NOW % DAY
+        for hours in range(48):
+            self.aggregator.add(Sample(day_start - DAY + hours * HOUR, 1.0), now=NOW)
+
+        self.assertEqual(self.aggregator.tier_for(4 * HOUR, day_start).resolution, HOUR)
+        self.assertEqual(self.aggregator.tier_for(DAY, day_start).resolution, DAY)
+        self.assertEqual(self.aggregator.tier_for(5 * MINUTE, day_start).resolution, MINUTE)
+
+        day = self.aggregator.tiers["day"]
+        self.assertEqual(day.total(day_start, day_start + DAY).count, 24)
+        self.assertEqual(len(list(day.range())), 2)
+
+
+class TestPerformanceAggregates(unittest.TestCase):
+    """Tests for PerformanceAnalyzer metrics backed by the aggregates."""
+
+    def setUp(self):
+        """Create an event loop and storage directory."""
+        self.loop = asyncio.new_event_loop()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Close the event loop and remove the directory."""
+        self.loop.close()
+        self.temp_dir.cleanup()
+
+    def test_metrics_from_aggregates(self):
+        """Returns, win rate and drawdown follow the tracked portfolio values."""
+        values = [100.0, 110.0, 88.0, 99.0, 121.0]
+        now = datetime.utcnow()
+
+        async def scenario():
+            analyzer = PerformanceAnalyzer({"storage_dir": self.temp_dir.name})
+            await analyzer.initialize()
+            previous = values[0]
+            for i, value in enumerate(values):
+                await analyzer.track_performance(
+                    {
+                        "portfolio_value": value,
+                        "profit_loss": value - previous,
+                        "timestamp": now - timedelta(days=len(values) - i),
+                    }
+                )
+                previous = value
+            metrics = await analyzer.get_performance_metrics("all")
+            drawdown = await analyzer.get_drawdown_analysis("all")
+
+            # A restarted analyzer rebuilds the same aggregates from the store
+            restarted = PerformanceAnalyzer({"storage_dir": self.temp_dir.name})
+            await restarted.initialize()
+            self.assertEqual(await restarted.get_performance_metrics("all"), metrics)
+            return metrics, drawdown
+
+        metrics, drawdown = self.loop.run_until_complete(scenario())
+
+        returns = np.diff(values) / np.array(values[:-1])
+        self.assertAlmostEqual(metrics["total_return"], 0.21)
+        self.assertAlmostEqual(metrics["volatility"], returns.std(ddof=1))
+        self.assertAlmostEqual(metrics["max_drawdown"], 0.2)
+        self.assertAlmostEqual(metrics["win_rate"], 3 / 5)
+        self.assertAlmostEqual(metrics["profit_factor"], (10 + 11 + 22) / 22)
+        self.assertEqual(drawdown["current_drawdown"], 0)
+        self.assertEqual(len(drawdown["drawdown_periods"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,6 +19,7 @@
     SharedStateManager,
     MemoryRegionType,
     MemoryRegionNotFoundError,
+    SharedMemoryError,
     SchemaValidationError
 )
 
@@ -404,6 +405,29 @@ def test_get_all_metrics(self):
         self.assertEqual(all_metrics["system"], system_metrics)
         self.assertEqual(all_metrics["market"], market_metrics)
 
+    def test_attached_reader(self):
+        """Another store attached by table name reads metrics and their TTL."""
+        reader = SharedMetricsStore(SharedMemoryManager(base_dir=self.test_dir), name=self.metrics_store.name)
+        self.loop.run_until_complete(reader.initialize())
+
+        test_metrics = {"cpu": 50.0, "memory": 75.0}
+        self.loop.run_until_complete(
+            self.metrics_store.store_metrics("system", test_metrics)
+        )
+        self.assertEqual(self.loop.run_until_complete(reader.get_metrics("system")), test_metrics)
+        self.assertEqual(self.loop.run_until_complete(reader.get_all_metrics()), {"system": test_metrics})
+
+        # Only the creating process writes
+        with self.assertRaises(SharedMemoryError):
+            self.loop.run_until_complete(reader.store_metrics("system", {}))
+        self.assertEqual(self.loop.run_until_complete(reader.get_metrics("system")), test_metrics)
+
+        # A TTL set after storing reaches the reader
+        self.loop.run_until_complete(self.metrics_store.set_ttl("system", 0.05))
+        self.assertEqual(self.loop.run_until_complete(reader.get_ttl("system")), 0.05)
+        time.sleep(0.1)
+        self.assertIsNone(self.loop.run_until_complete(reader.get_metrics("system")))
+
 class TestSharedStateManager(unittest.TestCase):
     """Tests for the SharedStateManager class."""
     
@@ -0,0 +1,124 @@
+"""
+Tests for the seqlocked shared memory rings and tables.
+"""
+
+import multiprocessing
+import unittest
+
+import numpy as np
+
+from arbitrage_bot.core.optimization.shared_memory import SchemaValidationError
+from arbitrage_bot.core.optimization.shm_ring import (
+    SCHEMAS,
+    SchemaRegistry,
+    SeqlockRing,
+    SeqlockTable,
+)
+
+
+def _read_ring(name, queue):
+    ring = SeqlockRing.attach(name)
+    records, head = ring.read()
+    queue.put((records["value"].tolist(), head))
+    ring.close()
+
+
+def _check_table(name, rounds, queue):
+    """Read a row while the parent rewrites it; every field must agree."""
+    table = SeqlockTable.attach(name)
+    torn = 0
+    seen = 0
+    while seen < rounds:
+        row = table.read(0)
+        if row is None:
+            continue
+        values = {row["block_number"], row["reserve0"], row["reserve1"], row["price"]}
+        torn += len(values) != 1
+        seen += 1
+    queue.put(torn)
+    table.close()
+
+
+class TestShmRing(unittest.TestCase):
+    """Tests for SeqlockRing and SeqlockTable."""
+
+    def test_ring_wraps_and_reads_across_processes(self):
+        """A reader in another process sees the newest capacity records."""
+        ring = SeqlockRing.create(None, "metric_sample", 8)
+        try:
+            for i in range(20):
+                ring.append((float(i), 1, float(i)))
+
+            records, head = ring.read()
+            self.assertEqual(head, 20)
+            self.assertEqual(records["value"].tolist(), [float(i) for i in range(12, 20)])
+            self.assertEqual(ring.read(since=18)[0]["value"].tolist(), [18.0, 19.0])
+            self.assertEqual(ring.latest(1)["value"].tolist(), [19.0])
+
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_read_ring, args=(ring.name, queue))
+            process.start()
+            values, remote_head = queue.get(timeout=10)
+            process.join(10)
+            self.assertEqual(values, records["value"].tolist())
+            self.assertEqual(remote_head, 20)
+        finally:
+            ring.unlink()
+
+    def test_table_reads_are_never_torn(self):
+        """Concurrent reads of a row being rewritten always see whole records."""
+        table = SeqlockTable.create(None, "pool_state", 4)
+        try:
+            self.assertIsNone(table.read(0))
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=_check_table, args=(table.name, 2000, queue)
+            )
+            process.start()
+
+            i = 0
+            while process.is_alive() and i < 10**7:
+                i += 1
+                value = float(i)
+                table.write(0, (0.0, i, value, value, value, 0.0))
+                if not queue.empty():
+                    break
+
+            self.assertEqual(queue.get(timeout=10), 0)
+            process.join(10)
+
+            rows, written = table.snapshot()
+            self.assertEqual(written.tolist(), [True, False, False, False])
+            self.assertEqual(table.version(0), i)
+            self.assertIsInstance(table.view(), np.ndarray)
+        finally:
+            table.unlink()
+
+    def test_schema_registry(self):
+        """Schemas are stored in the region and checked against the registry."""
+        registry = SchemaRegistry()
+        registry.register("tick", [("price", "<f8")])
+        registry.register("tick", [("price", "<f8")])
+        with self.assertRaises(SchemaValidationError):
+            registry.register("tick", [("price", "<f4")])
+        with self.assertRaises(SchemaValidationError):
+            registry.get("missing")
+
+        ring = SeqlockRing.create(None, "tick", 4, registry=registry)
+        try:
+            # Readers without the schema registered still get typed records
+            reader = SeqlockRing.attach(ring.name, registry=SCHEMAS)
+            ring.append((1.5,))
+            self.assertEqual(reader.latest(1)["price"].tolist(), [1.5])
+            reader.close()
+
+            conflicting = SchemaRegistry()
+            conflicting.register("tick", [("price", "<i8")])
+            with self.assertRaises(SchemaValidationError):
+                SeqlockRing.attach(ring.name, registry=conflicting)
+        finally:
+            ring.unlink()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Tests for the flashbots bundle SimulationService.
+"""
+
+import asyncio
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from eth_account import Account
+
+from arbitrage_bot.core.flashbots.bundle import BundleManager
+from arbitrage_bot.core.flashbots.simulation import SimulationManager
+from arbitrage_bot.core.flashbots.simulation_service import (
+    BundleCandidate,
+    LocalSimulationBackend,
+    RelaySimulationBackend,
+    SimulationBackend,
+    SimulationOutcome,
+    SimulationService,
+)
+
+
+class CountingBackend(SimulationBackend):
+    """Backend that records every simulation and yields to the loop."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = []
+
+    async def simulate(self, candidate):
+        self.calls.append(candidate.cache_key)
+        await asyncio.sleep(0.01)
+        return SimulationOutcome(
+            success=True,
+            coinbase_profit=candidate.priority_fee,
+            gas_used=21000,
+            backend=self.name,
+            raw={"coinbaseDiff": hex(candidate.priority_fee)},
+        )
+
+
+def _candidate(tx="0x01", block=100, **kwargs):
+    return BundleCandidate(signed_transactions=[tx], target_block=block, **kwargs)
+
+
+class TestSimulationService(unittest.TestCase):
+    """Tests for the SimulationService class."""
+
+    def setUp(self):
+        """Create an event loop for the async tests."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        """Close the event loop."""
+        self.loop.close()
+
+    def test_duplicate_bundles_simulated_once(self):
+        """Sequential and concurrent duplicates share one backend call."""
+        backend = CountingBackend()
+        service = SimulationService(backend)
+
+        async def scenario():
+            concurrent = await asyncio.gather(
+                *(service.simulate(_candidate()) for _ in range(5))
+            )
+            again = await service.simulate(_candidate())
+            return concurrent, again
+
+        concurrent, again = self.loop.run_until_complete(scenario())
+        self.assertEqual(len(backend.calls), 1)
+        self.assertTrue(all(o.success for o in concurrent))
+        self.assertTrue(again.cached)
+        self.assertEqual(service.get_stats()["cache_hits"], 5)
+
+    def test_stale_blocks_pruned(self):
+        """Results for blocks that can no longer be targeted are dropped."""
+        service = SimulationService(CountingBackend())
+
+        async def scenario():
+            await service.simulate(_candidate(block=100))
+            await service.simulate(_candidate(block=101))
+            await service.simulate(_candidate(block=103))
+
+        self.loop.run_until_complete(scenario())
+        self.assertEqual({key[0] for key in service._cache}, {103})
+
+    def test_relay_errors_not_cached(self):
+        """A relay error is retried while a successful response is reused."""
+        responses = [
+            {"error": {"code": -32000, "message": "relay overloaded"}},
+            {"result": {"coinbaseDiff": "0x10", "totalGasUsed": "0x5208"}},
+        ]
+        calls = []
+
+        async def make_request(method, params):
+            calls.append(method)
+            return responses[len(calls) - 1]
+
+        service = SimulationService(RelaySimulationBackend(make_request))
+
+        async def scenario():
+            first = await service.simulate(_candidate())
+            second = await service.simulate(_candidate())
+            third = await service.simulate(_candidate())
+            return first, second, third
+
+        first, second, third = self.loop.run_until_complete(scenario())
+        self.assertFalse(first.success)
+        self.assertEqual(first.error, "relay overloaded")
+        self.assertTrue(second.success)
+        self.assertFalse(second.cached)
+        self.assertTrue(third.cached)
+        self.assertEqual(len(calls), 2)
+
+    def test_best_candidate_by_coinbase_profit(self):
+        """The variant paying the builder most while staying profitable wins."""
+        backend = LocalSimulationBackend(base_fee=10 * 10**9, default_gas=200_000)
+        service = SimulationService(backend)
+        route = [
+            {"reserve_in": 1000 * 10**18, "reserve_out": 2_000_000 * 10**6, "fee": 30},
+            {"reserve_in": 1_900_000 * 10**6, "reserve_out": 1000 * 10**18, "fee": 30},
+        ]
+        tips = [1 * 10**9, 5 * 10**9, 10**12]
+        candidates = [
+            _candidate(
+                tx=hex(i + 1),
+                label=f"tip{i}",
+                priority_fee=tip,
+                amount_in=10**18,
+                route=route,
+            )
+            for i, tip in enumerate(tips)
+        ]
+
+        best = self.loop.run_until_complete(service.best_candidate(candidates))
+        self.assertIsNotNone(best)
+        candidate, outcome = best
+        # The largest tip eats the whole spread and would revert
+        self.assertEqual(candidate.label, "tip1")
+        self.assertEqual(outcome.coinbase_profit, 5 * 10**9 * 200_000)
+        self.assertGreater(outcome.searcher_profit, 0)
+
+    def test_select_best_gas_variant_signs_and_picks(self):
+        """Gas variants are signed as EIP-1559 transactions and simulated together."""
+        service = SimulationService(
+            LocalSimulationBackend(base_fee=10 * 10**9, default_gas=200_000), timeout=5.0
+        )
+        flashbots = SimpleNamespace(account=Account.create(), _make_request=None)
+        bundle_manager = BundleManager(
+            flashbots, Decimal("0"), Decimal("100"), Decimal("2"), simulation_service=service
+        )
+        manager = SimulationManager(
+            flashbots, bundle_manager, simulation_timeout=1.0, simulation_service=service
+        )
+        bundle = {
+            # As built by BundleManager.create_bundle, with a legacy gasPrice
+            "transactions": [
+                {
+                    "to": "0x" + "11" * 20,
+                    "value": 0,
+                    "data": "0x",
+                    "gas": 200_000,
+                    "nonce": 0,
+                    "chainId": 8453,
+                    "gasPrice": 11 * 10**9,
+                }
+            ],
+            "target_block": 100,
+            "amount_in": 10**18,
+            "route": [
+                {"reserve_in": 1000 * 10**18, "reserve_out": 2_000_000 * 10**6, "fee": 30},
+                {"reserve_in": 1_900_000 * 10**6, "reserve_out": 1000 * 10**18, "fee": 30},
+            ],
+        }
+
+        variant, outcome = self.loop.run_until_complete(
+            manager.select_best_gas_variant(bundle, base_fee=10 * 10**9)
+        )
+        self.assertIsNotNone(variant)
+        self.assertEqual(variant["priority_fee"], 2 * 10**9)
+        self.assertNotIn("gasPrice", variant["transactions"][0])
+        self.assertEqual(outcome.coinbase_profit, 2 * 10**9 * 200_000)
+        self.assertEqual(service.backend_calls, 5)
+        # The manager's timeout is per call; the shared service keeps its own
+        self.assertEqual(service.timeout, 5.0)
+
+        # Re-simulating the chosen variant before submission hits the cache
+        again = self.loop.run_until_complete(
+            service.simulate(bundle_manager.build_candidate(variant))
+        )
+        self.assertTrue(again.cached)
+        self.assertEqual(service.backend_calls, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
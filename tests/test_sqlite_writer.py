@@ -0,0 +1,140 @@
+"""
+Tests for the group-committing SQLite writer thread.
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from arbitrage_bot.utils.sqlite_writer import SQLiteWriter, WriteQueueFull
+
+
+def _create_table(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+
+
+class TestSQLiteWriter(unittest.TestCase):
+    """Tests for the SQLiteWriter class."""
+
+    def setUp(self):
+        """Create a database path in a temporary directory."""
+        self.loop = asyncio.new_event_loop()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "writer.db")
+
+    def tearDown(self):
+        """Close the event loop and remove the directory."""
+        self.loop.close()
+        self.temp_dir.cleanup()
+
+    def _names(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return [row[0] for row in conn.execute("SELECT name FROM items ORDER BY id")]
+        finally:
+            conn.close()
+
+    def test_group_commit_and_acknowledgments(self):
+        """Queued writes share commits; each caller gets its own result or error."""
+        writer = SQLiteWriter(self.path, max_delay=0.05, setup=_create_table).start()
+
+        async def scenario():
+            results = await asyncio.gather(
+                *(writer.write("INSERT INTO items (name) VALUES (?)", (f"n{i}",)) for i in range(50)),
+                writer.write("INSERT INTO items (name) VALUES (?)", ("n0",)),
+                return_exceptions=True,
+            )
+            batch = await writer.write_batch(
+                [
+                    ("INSERT INTO items (name) VALUES (?)", ("b1",)),
+                    ("INSERT INTO items (name) VALUES (?)", ("b2",)),
+                ]
+            )
+            return results, batch
+
+        results, batch = self.loop.run_until_complete(scenario())
+        writer.close()
+
+        self.assertEqual(results[0].lastrowid, 1)
+        self.assertIsInstance(results[-1], sqlite3.IntegrityError)
+        self.assertEqual([r.rowcount for r in batch], [1, 1])
+        self.assertEqual(len(self._names()), 52)
+        self.assertLess(writer.stats["commits"], 10)
+        self.assertEqual(writer.stats["failed"], 1)
+
+    def test_close_flushes_queued_writes(self):
+        """Fire-and-forget writes queued before close are committed."""
+        writer = SQLiteWriter(self.path, setup=_create_table).start()
+        futures = [
+            writer.submit("INSERT INTO items (name) VALUES (?)", (f"n{i}",)) for i in range(200)
+        ]
+        writer.close()
+
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(len(self._names()), 200)
+        with self.assertRaises(RuntimeError):
+            writer.submit("INSERT INTO items (name) VALUES ('late')")
+
+    def test_backpressure(self):
+        """A full queue rejects non-blocking writes and reports congestion."""
+        gate = threading.Event()
+
+        def setup(conn):
+            _create_table(conn)
+            conn.create_function("wait_gate", 0, lambda: gate.wait(5))
+
+        writer = SQLiteWriter(self.path, max_queue=2, setup=setup).start()
+        blocker = writer.submit("SELECT wait_gate()")
+        while writer._queue.qsize():
+            time.sleep(0.001)  # until the writer is stuck on the gate
+
+        writer.submit("INSERT INTO items (name) VALUES ('a')")
+        writer.submit("INSERT INTO items (name) VALUES ('b')")
+        self.assertTrue(writer.congested)
+        with self.assertRaises(WriteQueueFull):
+            writer.submit("INSERT INTO items (name) VALUES ('c')", block=False)
+
+        gate.set()
+        writer.close()
+        self.assertTrue(blocker.done())
+        self.assertEqual(self._names(), ["a", "b"])
+
+    def test_cancelled_write_keeps_writer_running(self):
+        """Cancelling a task waiting on a write does not stop the writer thread."""
+        gate = threading.Event()
+
+        def setup(conn):
+            _create_table(conn)
+            conn.create_function("wait_gate", 0, lambda: gate.wait(5))
+
+        writer = SQLiteWriter(self.path, setup=setup).start()
+
+        async def scenario():
+            blocker = asyncio.ensure_future(writer.write("SELECT wait_gate()"))
+            await asyncio.sleep(0)
+            while writer._queue.qsize():
+                await asyncio.sleep(0.001)  # until the writer is stuck on the gate
+            queued = asyncio.ensure_future(writer.write("INSERT INTO items (name) VALUES ('skipped')"))
+            await asyncio.sleep(0.01)
+            blocker.cancel()
+            queued.cancel()
+            await asyncio.gather(blocker, queued, return_exceptions=True)
+            gate.set()
+            return await asyncio.wait_for(
+                writer.write("INSERT INTO items (name) VALUES ('after')"), 5
+            )
+
+        result = self.loop.run_until_complete(scenario())
+        writer.close()
+
+        self.assertEqual(result.rowcount, 1)
+        self.assertEqual(self._names(), ["after"])
+        self.assertEqual(writer.stats["cancelled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
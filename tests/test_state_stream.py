@@ -0,0 +1,116 @@
+"""
+Tests for the dashboard's delta state stream.
+"""
+
+import asyncio
+import copy
+import json
+import unittest
+import zlib
+
+from new_dashboard.dashboard.services.state_stream import (
+    StateStream,
+    apply_patch,
+    diff,
+)
+
+
+class TestStateStream(unittest.TestCase):
+    """Tests for JSON-patch diffs and StateStream delivery."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_diff_round_trips(self):
+        """Applying the diff reproduces the new state; appends stay appends."""
+        old = {
+            "metrics": {"total_trades": 3, "a/b": 1, "gone": True},
+            "trade_history": [{"id": 1}, {"id": 2}],
+            "prices": [1.0, 2.0],
+        }
+        new = {
+            "metrics": {"total_trades": 4, "a/b": 2, "new": {"x": None}},
+            "trade_history": [{"id": 1}, {"id": 2}, {"id": 3}],
+            "prices": (2.0, 3.0),
+        }
+        ops = diff(old, new)
+
+        self.assertIn({"op": "add", "path": "/trade_history/-", "value": {"id": 3}}, ops)
+        self.assertIn({"op": "replace", "path": "/metrics/a~1b", "value": 2}, ops)
+        self.assertIn({"op": "remove", "path": "/metrics/gone"}, ops)
+        patched = apply_patch(copy.deepcopy(old), json.loads(json.dumps(ops)))
+        self.assertEqual(patched, json.loads(json.dumps(new)))
+        self.assertEqual(diff(patched, new), [])
+
+    def test_frames_are_shared_and_versioned(self):
+        """Connections on a path share frames; patches chain by version."""
+
+        async def run():
+            stream = StateStream()
+            stream.update({"system": {"cpu": 1}, "trade_history": []})
+            first = stream.subscribe()
+            second = stream.subscribe()
+            system = stream.subscribe("/system")
+
+            snapshot = await first.next_frame()
+            self.assertIs(await second.next_frame(), snapshot)
+            self.assertEqual(json.loads(snapshot.text)["data"]["system"], {"cpu": 1})
+            self.assertEqual(json.loads((await system.next_frame()).text)["data"], {"cpu": 1})
+
+            stream.update({"system": {"cpu": 1}, "trade_history": [{"id": 1}]})
+            stream.update({"system": {"cpu": 2}, "trade_history": [{"id": 1}]})
+            self.assertEqual(stream.update({"system": {"cpu": 2}, "trade_history": [{"id": 1}]}), 0)
+
+            patch = await first.next_frame()
+            self.assertIs(await second.next_frame(), patch)
+            message = json.loads(patch.text)
+            self.assertEqual((message["base"], message["version"]), (1, 2))
+            self.assertEqual(message["ops"], [{"op": "add", "path": "/trade_history/-", "value": {"id": 1}}])
+
+            # The system view only sees its own change, re-rooted
+            message = json.loads((await system.next_frame()).text)
+            self.assertEqual((message["base"], message["version"]), (1, 3))
+            self.assertEqual(message["ops"], [{"op": "replace", "path": "/cpu", "value": 2}])
+
+            stream.update({"system": {"cpu": 5, "disk": 9}})
+            self.assertEqual(stream.update(None), 1)
+            ops = json.loads((await system.next_frame()).text)["ops"]
+            self.assertEqual([op["path"] for op in ops], ["/cpu", "/disk"])
+            root = json.loads((await system.next_frame()).text)["ops"]
+            self.assertEqual(root, [{"op": "replace", "path": "", "value": None}])
+
+        self.loop.run_until_complete(run())
+
+    def test_lagging_client_resyncs_with_snapshot(self):
+        """A subscriber past max_pending gets one snapshot, optionally compressed."""
+
+        async def run():
+            stream = StateStream(max_pending=3)
+            subscriber = stream.subscribe("/history")
+            await subscriber.next_frame()
+
+            for i in range(10):
+                stream.update({"history": list(range(i * 50))})
+            frame = await subscriber.next_frame()
+            message = json.loads(frame.text)
+            self.assertEqual(message["type"], "snapshot")
+            self.assertEqual(message["version"], 10)
+            self.assertEqual(len(message["data"]), 450)
+            self.assertGreater(subscriber.resyncs, 0)
+
+            payload = frame.payload(compress=True)
+            self.assertIsInstance(payload, bytes)
+            self.assertEqual(zlib.decompress(payload).decode(), frame.text)
+            self.assertIsInstance(frame.payload(compress=False), str)
+
+            stream.unsubscribe(subscriber)
+            self.assertEqual(stream.get_stats()["views"], {})
+
+        self.loop.run_until_complete(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the streaming statistics estimators.
+"""
+
+import unittest
+
+import numpy as np
+
+from arbitrage_bot.utils.streaming_stats import (
+    EWMA,
+    P2Quantile,
+    RingBuffer,
+    RollingTrend,
+    WindowedQuantile,
+)
+
+
+class TestStreamingStats(unittest.TestCase):
+    """Tests for the quantile, EWMA and trend estimators."""
+
+    def test_quantiles_track_numpy(self):
+        """P-square estimates stay close to np.percentile, exactly for small counts."""
+        rng = np.random.default_rng(7)
+        samples = rng.lognormal(mean=-5, sigma=0.5, size=20000)
+
+        estimator = P2Quantile(0.95)
+        for i, value in enumerate(samples):
+            estimator.add(value)
+            if i < 4:
+                self.assertAlmostEqual(estimator.value(), np.percentile(samples[: i + 1], 95))
+        self.assertAlmostEqual(
+            estimator.value(), np.percentile(samples, 95), delta=0.02 * np.percentile(samples, 95)
+        )
+
+        # A shift in level is picked up within one window
+        windowed = WindowedQuantile(0.5, 200)
+        for value in samples[:1000]:
+            windowed.add(value)
+        for value in samples[1000:1200] * 10:
+            windowed.add(value)
+        self.assertLessEqual(len(windowed), 200)
+        self.assertGreater(windowed.value(), 5 * np.median(samples))
+        self.assertIsNone(WindowedQuantile(0.5, 10).value())
+
+    def test_rolling_trend_matches_polyfit(self):
+        """The running fit equals np.polyfit over the same window."""
+        rng = np.random.default_rng(3)
+        timestamps = 1.7e9 + np.cumsum(rng.uniform(5, 20, size=1000))
+        prices = 30 + 0.002 * (timestamps - timestamps[0]) + rng.normal(size=1000)
+
+        trend = RollingTrend(100)
+        self.assertIsNone(trend.fit())
+        for t, price in zip(timestamps, prices):
+            trend.add(t, price)
+
+        window_t = timestamps[-100:] - timestamps[-100]
+        slope, intercept = np.polyfit(window_t, prices[-100:], 1)
+        horizon = timestamps[-1] + 60
+        self.assertAlmostEqual(
+            trend.predict(horizon), slope * (horizon - timestamps[-100]) + intercept, places=6
+        )
+        self.assertAlmostEqual(trend.y_std, np.std(prices[-100:]), places=6)
+        self.assertEqual(trend.last_x, timestamps[-1])
+
+    def test_ewma_and_ring_buffer(self):
+        """EWMA follows the recurrence and the ring keeps the newest values."""
+        average = EWMA(alpha=0.5)
+        for value in (1.0, 3.0):
+            average.add(value)
+        self.assertEqual(average.mean, 2.0)
+        self.assertEqual(average.variance, 1.0)
+        with self.assertRaises(ValueError):
+            EWMA()
+
+        ring = RingBuffer(3)
+        evicted = [ring.append(float(i)) for i in range(5)]
+        self.assertEqual(evicted, [None, None, None, 0.0, 1.0])
+        self.assertEqual(ring.values().tolist(), [2.0, 3.0, 4.0])
+        self.assertEqual((ring[0], ring[-1]), (2.0, 4.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
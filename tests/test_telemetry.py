@@ -0,0 +1,159 @@
+"""
+Tests for the telemetry channel and the log parser bridge built on it.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from arbitrage_bot.core.log_parser.log_parser_bridge import LogParserBridge
+from arbitrage_bot.core.opportunity_tracker import OpportunityTracker
+from arbitrage_bot.utils.telemetry import (
+    FrameDecoder,
+    RecordType,
+    TelemetryPublisher,
+    TelemetrySubscriber,
+    encode_frame,
+)
+
+
+async def _wait_until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestTelemetry(unittest.TestCase):
+    """Tests for frame encoding, publish/subscribe and the bridge."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "telemetry.sock")
+
+    def tearDown(self):
+        self.loop.close()
+        self.tmpdir.cleanup()
+
+    def test_frames_decode_across_partial_reads(self):
+        """Frames split at arbitrary points decode once complete."""
+        stream = encode_frame(RecordType.METRIC, {"name": "gas", "value": Decimal("1.5")})
+        stream += encode_frame(RecordType.TRADE, [1, 2, 3], timestamp=123.0)
+
+        decoder = FrameDecoder()
+        records = []
+        for i in range(0, len(stream), 5):
+            records.extend(decoder.feed(stream[i:i + 5]))
+
+        self.assertEqual([r.kind for r in records], [RecordType.METRIC, RecordType.TRADE])
+        self.assertEqual(records[0].data, {"name": "gas", "value": "1.5"})
+        self.assertEqual((records[1].timestamp, records[1].data), (123.0, [1, 2, 3]))
+
+    def test_subscribers_receive_requested_kinds(self):
+        """Each subscriber only receives the record types it asked for."""
+
+        async def run():
+            publisher = TelemetryPublisher(self.socket_path)
+            await publisher.start()
+            trades = TelemetrySubscriber(self.socket_path, kinds=[RecordType.TRADE])
+            everything = TelemetrySubscriber(self.socket_path)
+            received = {"trades": [], "all": []}
+            tasks = [
+                asyncio.ensure_future(trades.run(received["trades"].append)),
+                asyncio.ensure_future(everything.run(received["all"].append)),
+            ]
+            await _wait_until(lambda: publisher.get_stats()["subscribers"] == 2)
+            await asyncio.sleep(0.05)
+
+            publisher.publish(RecordType.METRIC, {"name": "cpu", "value": 3})
+            publisher.publish(RecordType.TRADE, {"tx_hash": "0x1"})
+            await _wait_until(lambda: len(received["all"]) == 2 and received["trades"])
+
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await publisher.stop()
+            return received
+
+        received = self.loop.run_until_complete(run())
+        self.assertEqual([r.data for r in received["trades"]], [{"tx_hash": "0x1"}])
+        self.assertEqual(
+            [r.kind for r in received["all"]], [RecordType.METRIC, RecordType.TRADE]
+        )
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_loopback_tcp_transport(self):
+        """A tcp:// address serves async and blocking subscribers over loopback."""
+
+        async def run():
+            publisher = TelemetryPublisher("tcp://127.0.0.1:0")
+            await publisher.start()
+            address = publisher.socket_path
+            received = []
+            subscriber = TelemetrySubscriber(address, kinds=[RecordType.TRADE])
+            task = asyncio.ensure_future(subscriber.run(received.append))
+            blocking = TelemetrySubscriber(address, reconnect_delay=0.05)
+            records = blocking.iter_blocking()
+            first = asyncio.get_running_loop().run_in_executor(None, next, records)
+            await _wait_until(lambda: publisher.get_stats()["subscribers"] == 2)
+            await asyncio.sleep(0.05)
+
+            publisher.publish(RecordType.TRADE, {"tx_hash": "0x2"})
+            await _wait_until(lambda: received)
+            blocking_record = await asyncio.wait_for(first, 2.0)
+
+            blocking.close()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await publisher.stop()
+            return address, received, blocking_record
+
+        address, received, blocking_record = self.loop.run_until_complete(run())
+        self.assertRegex(address, r"^tcp://127\.0\.0\.1:\d+$")
+        self.assertNotEqual(address, "tcp://127.0.0.1:0")
+        self.assertEqual([r.data for r in received], [{"tx_hash": "0x2"}])
+        self.assertEqual(blocking_record.data, {"tx_hash": "0x2"})
+
+    def test_bridge_forwards_records_to_tracker(self):
+        """Opportunity and execution records reach the OpportunityTracker."""
+
+        async def run():
+            publisher = TelemetryPublisher(self.socket_path)
+            await publisher.start()
+            tracker = OpportunityTracker()
+            bridge = LogParserBridge(self.tmpdir.name, tracker, update_frequency=0.05)
+            await bridge.start()
+            await _wait_until(lambda: publisher.get_stats()["subscribers"] == 1)
+            await asyncio.sleep(0.05)
+
+            publisher.publish(
+                RecordType.OPPORTUNITY,
+                {"dex_from": "uniswap", "dex_to": "sushiswap", "token": "WETH",
+                 "price_diff": 0.01, "profit_usd": 12.5},
+            )
+            publisher.publish(
+                RecordType.EXECUTION,
+                {"tx_hash": "0xabc", "status": "success", "profit_usd": 10.0,
+                 "gas_cost_usd": 2.0},
+            )
+            publisher.publish(RecordType.METRIC, {"name": "ignored", "value": 1})
+            await _wait_until(lambda: bridge.records_processed == 2)
+
+            await bridge.stop()
+            await publisher.stop()
+            return tracker
+
+        tracker = self.loop.run_until_complete(run())
+        execution, opportunity = tracker.get_opportunities()
+        self.assertEqual(opportunity["source_dex"], "uniswap")
+        self.assertAlmostEqual(opportunity["price_diff_pct"], 1.0)
+        self.assertEqual(execution["net_profit_usd"], 8.0)
+        self.assertEqual(tracker.get_stats()["successful_executions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for the append-only analytics trade store.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from arbitrage_bot.core.analytics.profit_tracker import ProfitTracker
+from arbitrage_bot.core.analytics.trade_store import TradeStore, get_trade_store
+
+
+class TestTradeStore(unittest.TestCase):
+    """Tests for the TradeStore class."""
+
+    def setUp(self):
+        """Create a store in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = TradeStore(os.path.join(self.temp_dir.name, "analytics.db"))
+        self.now = datetime.utcnow()
+
+    def tearDown(self):
+        """Close the store and remove the directory."""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_append_scan_and_columns(self):
+        """Records come back in time order, filtered by range and key."""
+        for i, pair in enumerate(["A-B", "C-D", "A-B"]):
+            self.store.append(
+                "profit",
+                {"timestamp": self.now - timedelta(hours=3 - i), "token_pair": pair},
+                key=pair,
+                value=i + 1,
+                cost=0.1,
+            )
+
+        records = [r for _, r in self.store.scan("profit")]
+        self.assertEqual([r["token_pair"] for r in records], ["A-B", "C-D", "A-B"])
+        self.assertIsInstance(records[0]["timestamp"], datetime)
+
+        recent = list(self.store.scan("profit", start=self.now - timedelta(hours=2, minutes=30)))
+        self.assertEqual(len(recent), 2)
+
+        columns = self.store.columns("profit", ("value", "cost"), key="A-B")
+        self.assertEqual(columns["value"].tolist(), [1.0, 3.0])
+        self.assertAlmostEqual(columns["cost"].sum(), 0.2)
+        self.assertEqual(self.store.count("journal"), 0)
+
+    def test_prune_and_replace(self):
+        """Old records are pruned and payloads can be rewritten in place."""
+        old_id = self.store.append("price", {"timestamp": self.now - timedelta(days=100)}, key="t")
+        new_id = self.store.append("price", {"timestamp": self.now, "note": "a"}, key="t")
+
+        self.assertEqual(self.store.prune("price", self.now - timedelta(days=90)).result().rowcount, 1)
+        self.store.replace(new_id, {"timestamp": self.now, "note": "b"})
+
+        rows = list(self.store.scan("price"))
+        self.assertEqual([row_id for row_id, _ in rows], [new_id])
+        self.assertNotEqual(old_id, new_id)
+        self.assertEqual(rows[0][1]["note"], "b")
+
+    def test_legacy_import_runs_once(self):
+        """Legacy JSON rows are imported into empty streams and the file is retired."""
+        legacy = os.path.join(self.temp_dir.name, "profit_history.json")
+        with open(legacy, "w") as f:
+            json.dump([], f)
+
+        rows = [({"timestamp": self.now, "profit": 1.0}, {"key": "A-B", "value": 1.0})]
+        self.assertEqual(self.store.import_legacy(legacy, {"profit": rows}), 1)
+        self.assertFalse(os.path.exists(legacy))
+        self.assertTrue(os.path.exists(legacy + ".migrated"))
+        self.assertEqual(self.store.import_legacy(legacy, {"profit": rows}), 0)
+        self.assertEqual(self.store.count("profit"), 1)
+
+    def test_async_variants_see_queued_writes(self):
+        """The async readers wait for queued writes and match the sync ones."""
+        legacy = os.path.join(self.temp_dir.name, "journal.json")
+        with open(legacy, "w") as f:
+            json.dump({}, f)
+        rows = [({"timestamp": self.now, "id": 1}, {"value": 2.0})]
+
+        async def scenario():
+            imported = await self.store.import_legacy_async(legacy, {"journal": rows})
+            self.store.append("journal", {"timestamp": self.now, "id": 2}, value=3.0)
+            await self.store.append_many_async("journal", rows)
+            return (
+                imported,
+                await self.store.scan_async("journal"),
+                await self.store.columns_async("journal", ("value",)),
+                await self.store.count_async("journal"),
+            )
+
+        loop = asyncio.new_event_loop()
+        try:
+            imported, records, columns, count = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(count, 3)
+        self.assertEqual(records, list(self.store.scan("journal")))
+        self.assertEqual(sorted(columns["value"].tolist()), [2.0, 2.0, 3.0])
+
+    def test_profit_tracker_reloads_appended_entries(self):
+        """Entries appended by one tracker are loaded by the next one."""
+        config = {"storage_dir": os.path.join(self.temp_dir.name, "tracker")}
+        trade = {
+            "token_in": "0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984",
+            "token_out": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+            "amount_in": 10.0,
+            "amount_out": 0.05,
+            "profit": 0.02,
+            "gas_cost": 0.005,
+            "timestamp": self.now,
+        }
+
+        async def scenario():
+            first = ProfitTracker(config)
+            await first.initialize()
+            for _ in range(3):
+                await first.track_profit(dict(trade))
+
+            second = ProfitTracker(config)
+            await second.initialize()
+            return second
+
+        loop = asyncio.new_event_loop()
+        try:
+            second = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+
+        store = get_trade_store(config["storage_dir"])
+        self.assertEqual(store.count("profit"), 3)
+        self.assertEqual(len(second._timeframe_profits["all"]), 3)
+        pair = f"{trade['token_in']}_{trade['token_out']}"
+        self.assertAlmostEqual(second._token_pair_profits[pair].total, 0.06)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
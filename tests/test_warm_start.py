@@ -0,0 +1,233 @@
+"""
+Tests for warm-start snapshots.
+"""
+
+import asyncio
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from arbitrage_bot.core.memory.warm_start import (
+    FORMAT_VERSION,
+    Snapshot,
+    SnapshotError,
+    WarmStartManager,
+    write_snapshot,
+)
+from arbitrage_bot.utils.streaming_stats import EWMA, RollingTrend, WindowedQuantile
+
+
+class FakeParticipant:
+    """Participant holding a dict of reserves and applying fake logs."""
+
+    def __init__(self, state=None, block=None):
+        self.state = state or {}
+        self.block = block
+        self.restored_block = None
+        self.applied = []
+
+    def state_block(self):
+        return self.block
+
+    def snapshot_state(self):
+        return self.state
+
+    def restore_state(self, state, block_number):
+        self.state = state
+        self.restored_block = block_number
+
+    def log_addresses(self):
+        return list(self.state)
+
+    def apply_logs(self, logs):
+        for entry in logs:
+            self.state[entry["address"]] = entry["data"]
+            self.applied.append(entry["blockNumber"])
+
+
+class BrokenParticipant:
+    """Participant whose state cannot be serialized."""
+
+    def snapshot_state(self):
+        return {"value": object()}
+
+    def restore_state(self, state, block_number):
+        raise AssertionError("never saved")
+
+
+class FakeEth:
+    """Chain head and logs for the catch-up pass."""
+
+    def __init__(self, head, logs):
+        self.head = head
+        self.logs = logs
+        self.requests = []
+        self.failing = set()
+
+    @property
+    async def block_number(self):
+        return self.head
+
+    async def get_logs(self, params):
+        self.requests.append((params["fromBlock"], params["toBlock"]))
+        if params["fromBlock"] in self.failing:
+            raise ConnectionError("request timed out")
+        return [
+            log
+            for log in self.logs
+            if params["fromBlock"] <= log["blockNumber"] <= params["toBlock"]
+            and log["address"] in params["address"]
+        ]
+
+
+class FakeWeb3:
+    def __init__(self, head, logs=()):
+        self.eth = FakeEth(head, list(logs))
+
+
+class TestWarmStart(unittest.TestCase):
+    """Tests for the snapshot file and WarmStartManager."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "warm_start.snap")
+
+    def tearDown(self):
+        self.loop.close()
+        shutil.rmtree(self.directory)
+
+    def test_snapshot_round_trip_and_validation(self):
+        """Sections decode lazily; corruption and version changes are detected."""
+        write_snapshot(self.path, 123, {"graph": {"0xpool": ["1", "2"]}, "tokens": [1, 2]})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.block_number, 123)
+            self.assertEqual(sorted(snapshot), ["graph", "tokens"])
+            self.assertEqual(snapshot.get("graph"), {"0xpool": ["1", "2"]})
+            self.assertEqual(snapshot.get("tokens"), [1, 2])
+
+        # Flip the last payload byte: only that section fails its checksum
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.get("graph"), {"0xpool": ["1", "2"]})
+            with self.assertRaises(SnapshotError):
+                snapshot.get("tokens")
+
+        with open(self.path, "r+b") as f:
+            f.seek(4)
+            f.write(struct.pack("<H", FORMAT_VERSION + 1))
+        with self.assertRaises(SnapshotError):
+            Snapshot(self.path)
+        with self.assertRaises(SnapshotError):
+            Snapshot(os.path.join(self.directory, "missing.snap"))
+
+    def test_save_restore_and_catch_up(self):
+        """State is restored from the snapshot block and caught up via logs."""
+        # Stamped with the block the state reflects, not the head
+        pools = FakeParticipant({"0xa": 1, "0xb": 2}, block=100)
+        manager = WarmStartManager(self.path, FakeWeb3(120))
+        manager.register("pools", pools)
+        manager.register("broken", BrokenParticipant())
+        self.assertTrue(self.loop.run_until_complete(manager.save()))
+        self.assertEqual(manager.get_stats()["save_errors"], 1)
+
+        logs = [
+            {"address": "0xa", "data": 5, "blockNumber": 99},
+            {"address": "0xa", "data": 7, "blockNumber": 104},
+            {"address": "0xc", "data": 9, "blockNumber": 105},
+            {"address": "0xb", "data": 8, "blockNumber": 110},
+        ]
+        web3 = FakeWeb3(110, logs)
+        restored = FakeParticipant()
+        manager = WarmStartManager(self.path, web3, log_chunk_size=4)
+        manager.register("pools", restored)
+        manager.register("broken", BrokenParticipant())
+
+        block = self.loop.run_until_complete(manager.restore())
+        self.assertEqual(block, 110)
+        self.assertEqual(restored.restored_block, 100)
+        self.assertEqual(restored.state, {"0xa": 7, "0xb": 8})
+        self.assertEqual(restored.applied, [104, 110])
+        self.assertEqual(web3.eth.requests, [(101, 104), (105, 108), (109, 110)])
+        stats = manager.get_stats()
+        self.assertEqual((stats["restored_sections"], stats["caught_up_logs"]), (1, 2))
+
+        # Too far behind the head: start cold
+        manager = WarmStartManager(self.path, FakeWeb3(100_000), max_catch_up_blocks=1000)
+        cold = FakeParticipant()
+        manager.register("pools", cold)
+        self.assertIsNone(self.loop.run_until_complete(manager.restore()))
+        self.assertIsNone(cold.restored_block)
+
+    def test_failed_catch_up_starts_cold(self):
+        """A missing log chunk rolls the restore back; saves use the oldest reported block."""
+        manager = WarmStartManager(self.path, FakeWeb3(500))
+        manager.register("pools", FakeParticipant({"0xa": 1}, block=100))
+        manager.register("gas", FakeParticipant({"0xg": 3}, block=90))
+        manager.register("stats", FakeParticipant({"0xs": 4}))
+        self.assertTrue(self.loop.run_until_complete(manager.save()))
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.block_number, 90)
+
+        web3 = FakeWeb3(110, [{"address": "0xa", "data": 5, "blockNumber": 95}])
+        web3.eth.failing.add(99)
+        restored = FakeParticipant({"0xa": 0})
+        manager = WarmStartManager(self.path, web3, log_chunk_size=4)
+        manager.register("pools", restored)
+
+        self.assertIsNone(self.loop.run_until_complete(manager.restore()))
+        self.assertEqual(restored.state, {"0xa": 0})
+        self.assertEqual(restored.applied, [])
+        self.assertIsNone(restored.restored_block)
+        self.assertEqual(manager.get_stats()["catch_up_failures"], 1)
+
+        # Only the first restore runs, and there is no block to stamp a save with
+        self.assertIsNone(self.loop.run_until_complete(manager.restore()))
+        self.assertEqual(len(web3.eth.requests), 3)
+        self.assertFalse(self.loop.run_until_complete(manager.save()))
+
+    def test_streaming_stats_state_round_trip(self):
+        """Restored estimators continue exactly where the originals left off."""
+        quantile, average, trend = WindowedQuantile(0.95, 50), EWMA(span=10), RollingTrend(20)
+        for i in range(137):
+            value = float((i * 37) % 101)
+            quantile.add(value)
+            average.add(value)
+            trend.add(1000.0 + i, value + 0.5 * i)
+
+        write_snapshot(
+            self.path,
+            1,
+            {
+                "quantile": quantile.to_state(),
+                "average": average.to_state(),
+                "trend": trend.to_state(),
+            },
+        )
+        with Snapshot(self.path) as snapshot:
+            restored_quantile = WindowedQuantile.from_state(snapshot.get("quantile"))
+            restored_average = EWMA.from_state(snapshot.get("average"))
+            restored_trend = RollingTrend.from_state(snapshot.get("trend"))
+
+        for value in (3.0, 99.0, 42.0):
+            quantile.add(value)
+            restored_quantile.add(value)
+        self.assertEqual(restored_quantile.value(), quantile.value())
+        self.assertEqual(len(restored_quantile), len(quantile))
+        self.assertEqual((restored_average.mean, restored_average.variance),
+                         (average.mean, average.variance))
+        self.assertEqual(len(restored_trend), len(trend))
+        for expected, actual in zip(trend.fit(), restored_trend.fit()):
+            self.assertAlmostEqual(expected, actual, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()